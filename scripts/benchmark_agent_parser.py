@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+scripts/benchmark_agent_parser.py
+
+Times `parse_agents_from_phase2` against the parser it replaced.
+
+The first table runs both parsers over recorded Phase 2 plans: the saved plan in
+tests/phase_2_test/output and the captured malformed outputs in
+tests/phase_2_test/plans (code fences, prose between agents, unclosed tags,
+``<agent_1="Name">`` shorthand, bare ampersands). Both must return the same
+agents. The second table scales synthetic messy plans up to hundreds of agents,
+where the old regex fallback grew quadratically; parsing time per KB should stay
+flat for the current parser.
+
+Usage:
+    python scripts/benchmark_agent_parser.py [--repeat N] [--max-agents N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))
+
+from agentrules.core.utils.parsers.agent_parser import parse_agents_from_phase2  # noqa: E402
+from tests.utils import legacy_agent_parser  # noqa: E402
+
+Parser = Callable[[dict | str], list[dict]]
+
+RECORDED_PLANS = (
+    ROOT / "tests" / "phase_2_test" / "output" / "analysis_plan.xml",
+    *sorted((ROOT / "tests" / "phase_2_test" / "plans").iterdir()),
+)
+
+SIZES = (5, 10, 20, 30, 60, 120, 240)
+
+_WORDS = (
+    "module service handler router schema config loader cache queue worker client adapter "
+    "pipeline metrics storage auth session template renderer parser index search"
+).split()
+
+_REASONING = (
+    "The project mixes a {a} layer with a {b} layer; files under {a}/ depend on {b}/ & share "
+    "helpers, so one agent should own both when x=1 < y. Assigning <agent_{n}> to {c} keeps "
+    "related code together while each agent stays under the token budget.\n"
+)
+
+
+def _path(rng: random.Random, agent: int, index: int) -> str:
+    return f"src/{rng.choice(_WORDS)}_{agent}/{rng.choice(_WORDS)}_{index}.py"
+
+
+def _agent_block(rng: random.Random, number: int, files: int) -> str:
+    label = f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()}"
+    variant = number % 6
+    if variant == 0:
+        opening = f'<agent_{number} name="{label} & Friends">'
+    elif variant == 1:
+        opening = f'<agent_{number}="{label}">'
+    elif variant == 2:
+        opening = f"<agent_{number}>\n<name>{label}</name>"
+    elif variant == 3:
+        opening = f'<agent_{number} name="The "{label}" Team">'
+    elif variant == 4:
+        opening = f"<agent_{number} name={label.replace(' ', '')}>"
+    else:
+        opening = f"<agent_{number}>"
+
+    paths = "\n".join(f"    <file_path>{_path(rng, number, index)}</file_path>" for index in range(files))
+    body = (
+        f"{opening}\n"
+        f"  <description>Reviews {label} code: parsing & validation, error paths, R&D notes.</description>\n"
+        f"  <expertise>{rng.choice(_WORDS)}, {rng.choice(_WORDS)}, {rng.choice(_WORDS)}</expertise>\n"
+        "  <responsibilities>\n"
+        f"    <responsibility>Map the {rng.choice(_WORDS)} flow</responsibility>\n"
+        f"    <responsibility>Check {rng.choice(_WORDS)} edge cases</responsibility>\n"
+        "  </responsibilities>\n"
+        f"  <file_assignments>\n{paths}\n  </file_assignments>\n"
+    )
+    # Every sixth agent is left unterminated, as truncated model output often is
+    return body if variant == 5 else f"{body}</agent_{number}>\n"
+
+
+def messy_plan(agents: int, files_per_agent: int = 8, seed: int = 0) -> str:
+    """Build a deterministic messy plan with ``agents`` agents and a preamble that grows with it."""
+    rng = random.Random(seed + agents)
+    preamble = "".join(
+        _REASONING.format(a=rng.choice(_WORDS), b=rng.choice(_WORDS), c=rng.choice(_WORDS), n=rng.randint(1, agents))
+        for _ in range(agents * 4)
+    )
+    blocks = "".join(_agent_block(rng, number, files_per_agent) for number in range(1, agents + 1))
+    return (
+        "Here is the plan.\n\n```xml\n"
+        f"<reasoning>\n{preamble}</reasoning>\n\n"
+        f"<analysis_plan>\n{blocks}</analysis_plan>\n"
+        "```\nLet me know if the team should change.\n"
+    )
+
+
+def _best_of(parser: Parser, plan: str, repeat: int) -> tuple[float, list[dict]]:
+    best = float("inf")
+    parsed: list[dict] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parsed = parser({"plan": plan})
+        best = min(best, time.perf_counter() - started)
+    return best, parsed
+
+
+def _bench_recorded(repeat: int) -> None:
+    print(f"{'recorded plan':<32} {'size KB':>8} {'agents':>6} {'old ms':>8} {'new ms':>8} {'same':>5}")
+    for path in RECORDED_PLANS:
+        plan = path.read_text(encoding="utf-8")
+        old_seconds, old_agents = _best_of(legacy_agent_parser.parse_agents_from_phase2, plan, repeat)
+        new_seconds, new_agents = _best_of(parse_agents_from_phase2, plan, repeat)
+        print(
+            f"{path.name:<32} {len(plan) / 1024:>8.1f} {len(new_agents):>6} "
+            f"{old_seconds * 1000:>8.2f} {new_seconds * 1000:>8.2f} {'yes' if old_agents == new_agents else 'NO':>5}"
+        )
+
+
+def _bench_scaling(repeat: int, max_agents: int) -> None:
+    print(f"{'agents':>6} {'size KB':>8} {'parsed':>6} {'old ms':>9} {'new ms':>9} {'old us/KB':>10} {'new us/KB':>10}")
+    for agents in (size for size in SIZES if size <= max_agents):
+        plan = messy_plan(agents)
+        size_kb = len(plan) / 1024
+        old_seconds, _ = _best_of(legacy_agent_parser.parse_agents_from_phase2, plan, repeat)
+        new_seconds, parsed = _best_of(parse_agents_from_phase2, plan, repeat)
+        print(
+            f"{agents:>6} {size_kb:>8.1f} {len(parsed):>6} {old_seconds * 1000:>9.2f} {new_seconds * 1000:>9.2f} "
+            f"{old_seconds * 1e6 / size_kb:>10.1f} {new_seconds * 1e6 / size_kb:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of repetitions per plan")
+    parser.add_argument("--max-agents", type=int, default=SIZES[-1], help="Largest synthetic plan to time")
+    args = parser.parse_args()
+
+    # The parsers log every fallback they take; keep the tables readable
+    logging.getLogger("project_extractor").setLevel(logging.CRITICAL)
+    _bench_recorded(args.repeat)
+    print()
+    _bench_scaling(args.repeat, args.max_agents)
+
+
+if __name__ == "__main__":
+    main()
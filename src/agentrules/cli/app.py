@@ -8,7 +8,10 @@ from .bootstrap import bootstrap_runtime
 from .commands.analyze import register as register_analyze
 from .commands.configure import register as register_configure
 from .commands.keys import register as register_keys
+from .commands.search import register as register_search
+from .commands.serve import register as register_serve
 from .commands.tree import register as register_tree
+from .commands.worker import register as register_worker
 from .ui.main_menu import run_main_menu
 
 
@@ -25,7 +28,10 @@ def build_app() -> typer.Typer:
     register_analyze(app)
     register_configure(app)
     register_keys(app)
+    register_search(app)
+    register_serve(app)
     register_tree(app)
+    register_worker(app)
 
     @app.callback(invoke_without_command=True)
     def main(
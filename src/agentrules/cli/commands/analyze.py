@@ -7,7 +7,7 @@ from pathlib import Path
 import typer
 
 from ..bootstrap import bootstrap_runtime
-from ..services.pipeline_runner import run_pipeline
+from ..services.pipeline_runner import run_dry_run, run_pipeline
 
 DEFAULT_ANALYZE_PATH = Path.cwd()
 PATH_ARGUMENT = typer.Argument(
@@ -17,6 +17,24 @@ PATH_ARGUMENT = typer.Argument(
     file_okay=False,
     resolve_path=True,
 )
+QUEUE_OPTION = typer.Option(
+    None,
+    "--queue",
+    help=(
+        "Distribute Phase 3 agents to `agentrules worker` processes through a task queue: "
+        "'sqlite' (default location), a SQLite file path, or a redis:// URL."
+    ),
+)
+DRY_RUN_OPTION = typer.Option(
+    False,
+    "--dry-run",
+    help="Report projected tokens, cost, and wall time per phase and agent without calling any model.",
+)
+FORCE_OPTION = typer.Option(
+    False,
+    "--force",
+    help="Analyze even when a cached run matches the current commit and configuration.",
+)
 
 
 def register(app: typer.Typer) -> None:
@@ -26,6 +44,12 @@ def register(app: typer.Typer) -> None:
     def analyze(  # type: ignore[func-returns-value]
         path: Path = PATH_ARGUMENT,
         offline: bool = typer.Option(False, "--offline", help="Run using offline dummy architects (no API calls)."),
+        queue: str | None = QUEUE_OPTION,
+        dry_run: bool = DRY_RUN_OPTION,
+        force: bool = FORCE_OPTION,
     ) -> None:
         context = bootstrap_runtime()
-        run_pipeline(path, offline, context)
+        if dry_run:
+            run_dry_run(path, context)
+            return
+        run_pipeline(path, offline, context, task_queue=queue, force=force)
@@ -0,0 +1,76 @@
+"""Implementation of the `search` subcommand."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+from rich.markup import escape
+from rich.table import Table
+
+from agentrules.core.configuration import get_config_manager
+from agentrules.core.pipeline import build_pipeline_settings, build_project_snapshot
+
+from ..bootstrap import bootstrap_runtime
+
+QUERY_ARGUMENT = typer.Argument(
+    ...,
+    help="Identifiers or words to rank files by, or the text to find with --substring.",
+)
+PATH_OPTION = typer.Option(
+    Path.cwd(),
+    "--path",
+    "-p",
+    exists=True,
+    dir_okay=True,
+    file_okay=False,
+    resolve_path=True,
+    help="Project to search.",
+)
+LIMIT_OPTION = typer.Option(10, "--limit", "-n", min=1, help="Maximum number of results.")
+SUBSTRING_OPTION = typer.Option(
+    False,
+    "--substring",
+    "-s",
+    help="List lines containing the query (case-insensitive) instead of ranking files.",
+)
+
+
+def register(app: typer.Typer) -> None:
+    """Register the `search` subcommand with the provided Typer app."""
+
+    @app.command()
+    def search(  # type: ignore[func-returns-value]
+        query: str = QUERY_ARGUMENT,
+        path: Path = PATH_OPTION,
+        limit: int = LIMIT_OPTION,
+        substring: bool = SUBSTRING_OPTION,
+    ) -> None:
+        """Search the project's files through the local code index."""
+
+        context = bootstrap_runtime()
+        console = context.console
+
+        settings = build_pipeline_settings(path, get_config_manager())
+        index = build_project_snapshot(settings, search_index=True).search_index
+        if index is None:  # pragma: no cover - requested above
+            return
+        hits = index.grep(query, limit=limit) if substring else index.search(query, limit=limit)
+        if not hits:
+            console.print(f"[yellow]No matches for[/] {escape(query)} [dim]({len(index)} files indexed)[/]")
+            return
+
+        table = Table(title=f"[bold]Search results for[/bold] {escape(query)}", pad_edge=False)
+        table.add_column("File", justify="left")
+        table.add_column("Line", justify="right")
+        if not substring:
+            table.add_column("Score", justify="right")
+        table.add_column("Text", justify="left", overflow="ellipsis", no_wrap=True)
+        for hit in hits:
+            row = [escape(hit.path), str(hit.line_number or "")]
+            if not substring:
+                row.append(f"{hit.score:.2f}")
+            row.append(escape(hit.line))
+            table.add_row(*row)
+        console.print(table)
+        console.print(f"[dim]{len(index)} files indexed under {path}.[/]")
@@ -0,0 +1,74 @@
+"""Implementation of the `serve` subcommand."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import typer
+
+from agentrules.core.configuration import constants as configuration_constants
+from agentrules.core.daemon import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    AnalysisDaemon,
+    AnalysisService,
+    JobStore,
+    PipelineJobRunner,
+)
+
+from ..bootstrap import bootstrap_runtime
+from ..services.pipeline_runner import activate_offline_mode
+
+HOST_OPTION = typer.Option(DEFAULT_HOST, "--host", help="Interface to bind. Defaults to localhost only.")
+PORT_OPTION = typer.Option(DEFAULT_PORT, "--port", "-p", help="Port to listen on (0 picks a free port).", min=0)
+CONCURRENCY_OPTION = typer.Option(
+    1,
+    "--concurrency",
+    "-c",
+    help="Maximum number of analysis jobs executed at the same time.",
+    min=1,
+)
+OFFLINE_OPTION = typer.Option(False, "--offline", help="Run jobs using offline dummy architects (no API calls).")
+STATE_DIR_OPTION = typer.Option(
+    None,
+    "--state-dir",
+    help="Directory for persisted job records. Defaults to <config dir>/daemon/jobs.",
+    file_okay=False,
+    resolve_path=True,
+)
+
+
+def register(app: typer.Typer) -> None:
+    """Register the `serve` subcommand with the provided Typer app."""
+
+    @app.command()
+    def serve(  # type: ignore[func-returns-value]
+        host: str = HOST_OPTION,
+        port: int = PORT_OPTION,
+        concurrency: int = CONCURRENCY_OPTION,
+        state_dir: Path | None = STATE_DIR_OPTION,
+        offline: bool = OFFLINE_OPTION,
+    ) -> None:
+        """Run a local HTTP daemon that queues and executes analysis jobs."""
+
+        context = bootstrap_runtime()
+        if offline:
+            os.environ["OFFLINE"] = "1"
+        activate_offline_mode(context)
+
+        jobs_dir = state_dir or configuration_constants.CONFIG_DIR / "daemon" / "jobs"
+        service = AnalysisService(JobStore(jobs_dir), runner=PipelineJobRunner(), concurrency=concurrency)
+        daemon = AnalysisDaemon(service, host=host, port=port)
+        daemon.start()
+
+        bound_host, bound_port = daemon.address
+        context.console.print(f"[green]agentrules daemon listening on[/] http://{bound_host}:{bound_port}")
+        context.console.print(f"[dim]Concurrency: {concurrency} · Job records: {jobs_dir}[/]")
+        context.console.print("[dim]Press Ctrl+C to stop.[/]")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            context.console.print("\n[yellow]Shutting down daemon...[/]")
+        finally:
+            daemon.shutdown()
@@ -0,0 +1,77 @@
+"""Implementation of the `worker` subcommand."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+import typer
+
+from agentrules.core.distributed import default_worker_id, open_task_queue, run_worker
+
+from ..bootstrap import bootstrap_runtime
+from ..services.pipeline_runner import activate_offline_mode
+
+QUEUE_OPTION = typer.Option(
+    "sqlite",
+    "--queue",
+    "-q",
+    help="Task queue to pull from: 'sqlite' (default location), a SQLite file path, or a redis:// URL.",
+)
+CONCURRENCY_OPTION = typer.Option(
+    2,
+    "--concurrency",
+    "-c",
+    help="Number of agent tasks this worker runs at the same time.",
+    min=1,
+)
+POLL_OPTION = typer.Option(
+    1.0,
+    "--poll-interval",
+    help="Seconds to wait between polls when the queue is empty.",
+    min=0.05,
+)
+MAX_TASKS_OPTION = typer.Option(None, "--max-tasks", help="Exit after processing this many tasks.", min=1)
+EXIT_WHEN_IDLE_OPTION = typer.Option(False, "--exit-when-idle", help="Exit once the queue is empty.")
+OFFLINE_OPTION = typer.Option(False, "--offline", help="Run tasks using offline dummy architects (no API calls).")
+
+
+def register(app: typer.Typer) -> None:
+    """Register the `worker` subcommand with the provided Typer app."""
+
+    @app.command()
+    def worker(  # type: ignore[func-returns-value]
+        queue: str = QUEUE_OPTION,
+        concurrency: int = CONCURRENCY_OPTION,
+        poll_interval: float = POLL_OPTION,
+        max_tasks: int | None = MAX_TASKS_OPTION,
+        exit_when_idle: bool = EXIT_WHEN_IDLE_OPTION,
+        offline: bool = OFFLINE_OPTION,
+    ) -> None:
+        """Process Phase 3 agent tasks queued by `agentrules analyze --queue`."""
+
+        context = bootstrap_runtime()
+        if offline:
+            os.environ["OFFLINE"] = "1"
+        activate_offline_mode(context)
+
+        task_queue = open_task_queue(queue)
+        worker_id = default_worker_id()
+        context.console.print(f"[green]Worker {worker_id} polling[/] {queue} [dim](concurrency {concurrency})[/]")
+        try:
+            processed = asyncio.run(
+                run_worker(
+                    task_queue,
+                    worker_id=worker_id,
+                    concurrency=concurrency,
+                    poll_interval=poll_interval,
+                    max_tasks=max_tasks,
+                    exit_when_idle=exit_when_idle,
+                )
+            )
+        except KeyboardInterrupt:
+            context.console.print("\n[yellow]Worker stopped.[/]")
+            return
+        finally:
+            task_queue.close()
+        context.console.print(f"[green]Worker finished after {processed} task(s).[/]")
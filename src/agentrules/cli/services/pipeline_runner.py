@@ -8,24 +8,35 @@ import time
 from pathlib import Path
 from typing import Any
 
+from rich.table import Table
+
 from agentrules.cli.ui.analysis_view import AnalysisView
 from agentrules.cli.ui.event_sink import ViewEventSink
+from agentrules.core.analysis.scheduling import ThroughputStore
 from agentrules.core.configuration import get_config_manager
+from agentrules.core.distributed import open_task_queue
 from agentrules.core.pipeline import (
-    EffectiveExclusions,
     PipelineMetrics,
     PipelineOutputOptions,
     PipelineOutputWriter,
     PipelineResult,
     PipelineSettings,
+    build_context_options,
+    build_output_options,
+    build_pipeline_settings,
     build_project_snapshot,
     create_default_pipeline,
 )
+from agentrules.core.pipeline.dry_run import DryRunReport, build_dry_run_report
+from agentrules.core.pipeline.fingerprint import compute_run_fingerprint
+from agentrules.core.pipeline.run_cache import RunCache
 
 from ..context import CliContext
 
+DRY_RUN_REDUCTION_ROWS = 15
+
 
-def _activate_offline_mode(context: CliContext) -> None:
+def activate_offline_mode(context: CliContext) -> None:
     if os.getenv("OFFLINE", "0") != "1":
         return
 
@@ -38,37 +49,72 @@ def _activate_offline_mode(context: CliContext) -> None:
         context.console.print(f"[red]Failed to enable OFFLINE mode: {error}[/]")
 
 
-def run_pipeline(path: Path, offline: bool, context: CliContext) -> None:
-    """Execute the analysis pipeline for the given path."""
+def run_pipeline(
+    path: Path,
+    offline: bool,
+    context: CliContext,
+    *,
+    task_queue: str | None = None,
+    force: bool = False,
+) -> None:
+    """Execute the analysis pipeline for the given path.
+
+    ``task_queue`` names a queue backend (see `open_task_queue`) used to hand Phase 3
+    agents to `agentrules worker` processes. Results are cached under a fingerprint of
+    the project's git state and effective configuration; a matching earlier run is
+    re-materialized instead of analysing again unless ``force`` is set.
+    """
 
     if offline:
         os.environ["OFFLINE"] = "1"
 
-    _activate_offline_mode(context)
+    activate_offline_mode(context)
 
     config_manager = get_config_manager()
-    exclusion_overrides = config_manager.get_exclusion_overrides()
-    effective_dirs, effective_files, effective_exts = config_manager.get_effective_exclusions()
-    settings = PipelineSettings(
-        target_directory=path,
-        tree_max_depth=config_manager.get_tree_max_depth(),
-        respect_gitignore=config_manager.should_respect_gitignore(),
-        effective_exclusions=EffectiveExclusions(
-            directories=frozenset(effective_dirs),
-            files=frozenset(effective_files),
-            extensions=frozenset(effective_exts),
-        ),
-        exclusion_overrides=exclusion_overrides,
+    settings = build_pipeline_settings(path, config_manager)
+    output_options = build_output_options(config_manager)
+    researcher_enabled = config_manager.is_researcher_enabled()
+    context_options = build_context_options(config_manager)
+    phase2_planning = config_manager.get_phase2_planning()
+
+    run_cache = RunCache()
+    fingerprint = compute_run_fingerprint(
+        settings,
+        researcher_enabled=researcher_enabled,
+        rules_filename=output_options.rules_filename,
+        context_options=context_options,
+        phase2_planning=phase2_planning,
     )
+    cached = run_cache.load(fingerprint) if fingerprint is not None and not force else None
 
     snapshot = build_project_snapshot(settings)
 
-    researcher_enabled = config_manager.is_researcher_enabled()
+    if cached is not None:
+        analyzed_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(cached.created_at))
+        context.console.print(
+            f"[green]Reusing analysis from {analyzed_at}[/] [dim](run {fingerprint.short}; "
+            "same commit and configuration). Pass --force to analyze again.[/]"
+        )
+        _persist(context, path, cached.to_result(snapshot), settings, output_options)
+        return
+
     view = AnalysisView(context.console)
     event_sink = ViewEventSink(view)
+    queue = open_task_queue(task_queue) if task_queue is not None else None
+    if queue is not None:
+        context.console.print(
+            f"[cyan]Phase 3 agents will be dispatched to workers via '{task_queue}'.[/] "
+            f"[dim]Start workers with: agentrules worker --queue {task_queue}[/]"
+        )
     pipeline = create_default_pipeline(
         researcher_enabled=researcher_enabled,
         event_sink=event_sink,
+        task_queue=queue,
+        phase3_max_concurrency=config_manager.get_phase3_max_concurrency(),
+        # Dummy architects finish instantly; their durations would skew later predictions
+        throughput=None if os.getenv("OFFLINE", "0") == "1" else ThroughputStore(),
+        context_options=context_options,
+        phase2_planning=phase2_planning,
     )
 
     async def _execute() -> PipelineResult:
@@ -93,35 +139,50 @@ def run_pipeline(path: Path, offline: bool, context: CliContext) -> None:
             "blue",
             "Designing a targeted analysis plan",
         )
-        phase2_results = await view.run_with_spinner(
-            "Creating analysis plan...",
-            "blue",
-            pipeline.run_phase2(phase1_results, snapshot),
-        )
-        raw_agents = phase2_results.get("agents")
-        agent_plan: list[dict[str, Any]] = (
-            [entry for entry in raw_agents if isinstance(entry, dict)]
-            if isinstance(raw_agents, list)
-            else []
-        )
-        view.render_completion("Analysis plan created", "blue")
-
-        view.render_phase_header(
-            "Phase 3 · Deep Analysis",
-            "yellow",
-            "Executing specialized agents across files",
-        )
-        if agent_plan:
-            view.start_agent_progress("phase3", agent_plan, color="yellow")
+        if pipeline.streams_phase2:
+            view.render_phase_header(
+                "Phase 3 · Deep Analysis",
+                "yellow",
+                "Executing specialized agents as the plan defines them",
+            )
+            view.start_agent_progress("phase3", [], color="yellow")
+            phase2_results, phase3_results = await view.run_with_spinner(
+                "Streaming the plan and analyzing files in depth...",
+                "yellow",
+                pipeline.run_phase2_and_3(phase1_results, settings, snapshot),
+            )
+            view.stop_agent_progress("phase3")
+            view.render_completion("Analysis plan created and deep analysis finished", "yellow")
         else:
-            view.render_note("Specialized agents running on project files", style="dim")
-        phase3_results = await view.run_with_spinner(
-            "Analyzing files in depth...",
-            "yellow",
-            pipeline.run_phase3(phase2_results, settings, snapshot),
-        )
-        view.stop_agent_progress("phase3")
-        view.render_completion("Deep analysis finished", "yellow")
+            phase2_results = await view.run_with_spinner(
+                "Creating analysis plan...",
+                "blue",
+                pipeline.run_phase2(phase1_results, snapshot),
+            )
+            raw_agents = phase2_results.get("agents")
+            agent_plan: list[dict[str, Any]] = (
+                [entry for entry in raw_agents if isinstance(entry, dict)]
+                if isinstance(raw_agents, list)
+                else []
+            )
+            view.render_completion("Analysis plan created", "blue")
+
+            view.render_phase_header(
+                "Phase 3 · Deep Analysis",
+                "yellow",
+                "Executing specialized agents across files",
+            )
+            if agent_plan:
+                view.start_agent_progress("phase3", agent_plan, color="yellow")
+            else:
+                view.render_note("Specialized agents running on project files", style="dim")
+            phase3_results = await view.run_with_spinner(
+                "Analyzing files in depth...",
+                "yellow",
+                pipeline.run_phase3(phase2_results, settings, snapshot),
+            )
+            view.stop_agent_progress("phase3")
+            view.render_completion("Deep analysis finished", "yellow")
 
         view.render_phase_header(
             "Phase 4 · Synthesis",
@@ -178,22 +239,142 @@ def run_pipeline(path: Path, offline: bool, context: CliContext) -> None:
         )
 
     try:
-        result = asyncio.run(_execute())
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
         try:
-            result = loop.run_until_complete(_execute())
-        finally:
-            loop.close()
+            result = asyncio.run(_execute())
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            try:
+                result = loop.run_until_complete(_execute())
+            finally:
+                loop.close()
+    finally:
+        if queue is not None:
+            queue.close()
+
+    if fingerprint is not None and run_cache.store(fingerprint, result) is not None:
+        context.console.print(f"[dim]Cached run {fingerprint.short} for unchanged re-runs.[/]")
+
+    _persist(context, path, result, settings, output_options)
 
+
+def _persist(
+    context: CliContext,
+    path: Path,
+    result: PipelineResult,
+    settings: PipelineSettings,
+    output_options: PipelineOutputOptions,
+) -> None:
     output_writer = PipelineOutputWriter()
-    output_options = PipelineOutputOptions(
-        rules_filename=config_manager.get_rules_filename(),
-        generate_phase_outputs=config_manager.should_generate_phase_outputs(),
-        generate_cursorignore=config_manager.should_generate_cursorignore(),
-    )
     summary = output_writer.persist(result, settings, output_options)
     for message in summary.messages:
         context.console.print(message)
 
     context.console.print(f"\n[green]Analysis finished for:[/] {path}")
+
+
+def run_dry_run(path: Path, context: CliContext) -> DryRunReport:
+    """Project tokens, cost, and wall time for analysing ``path`` without calling any model."""
+
+    config_manager = get_config_manager()
+    settings = build_pipeline_settings(path, config_manager)
+    snapshot = build_project_snapshot(settings)
+    concurrency = config_manager.get_phase3_max_concurrency()
+    report = build_dry_run_report(
+        settings,
+        snapshot,
+        researcher_enabled=config_manager.is_researcher_enabled(),
+        phase3_max_concurrency=concurrency,
+        throughput=ThroughputStore(),
+        context_options=build_context_options(config_manager),
+        phase2_planning=config_manager.get_phase2_planning(),
+    )
+    _render_dry_run(context, report)
+    return report
+
+
+def _format_cost(cost: float | None) -> str:
+    return "[dim]n/a[/]" if cost is None else f"${cost:,.4f}"
+
+
+def _render_dry_run(context: CliContext, report: DryRunReport) -> None:
+    console = context.console
+    phases = Table(title="[bold]Dry run · projected usage[/bold]", pad_edge=False)
+    for column in ("Phase", "Model", "Calls", "Files", "Input bytes", "Input tokens", "Output tokens", "Cost", "Time"):
+        phases.add_column(column, justify="left" if column in {"Phase", "Model"} else "right")
+    for phase in report.phases:
+        phases.add_row(
+            phase.phase,
+            phase.model_name or "[dim]?[/]",
+            str(len(phase.calls)),
+            str(phase.file_count or ""),
+            f"{phase.input_bytes:,}",
+            f"{phase.input_tokens:,}",
+            f"~{phase.output_tokens:,}",
+            _format_cost(phase.cost),
+            f"{phase.wall_seconds:,.0f}s",
+        )
+    phases.add_row(
+        "[bold]total[/bold]",
+        "",
+        str(sum(len(phase.calls) for phase in report.phases)),
+        "",
+        f"{sum(phase.input_bytes for phase in report.phases):,}",
+        f"{report.input_tokens:,}",
+        f"~{report.output_tokens:,}",
+        _format_cost(report.cost),
+        f"{report.wall_seconds:,.0f}s",
+    )
+    console.print(phases)
+
+    phase3 = report.phase("phase3")
+    agents = Table(title="[bold]Phase 3 agents[/bold]", pad_edge=False)
+    for column in ("Agent", "Files", "Input bytes", "Input tokens", "Time"):
+        agents.add_column(column, justify="left" if column == "Agent" else "right")
+    for call in phase3.calls:
+        agents.add_row(
+            call.label,
+            str(call.file_count),
+            f"{call.input_bytes:,}",
+            f"{call.input_tokens:,}",
+            f"{call.seconds:,.0f}s",
+        )
+    console.print(agents)
+
+    if report.reductions:
+        reductions = Table(title="[bold]Phase 3 context reduction[/bold]", pad_edge=False)
+        for column in ("File", "Method", "Bytes saved", "Tokens saved"):
+            reductions.add_column(column, justify="left" if column in {"File", "Method"} else "right")
+        for reduction in report.reductions[:DRY_RUN_REDUCTION_ROWS]:
+            reductions.add_row(
+                reduction.path,
+                reduction.method,
+                f"{reduction.bytes_saved:,}",
+                f"{reduction.tokens_saved:,}",
+            )
+        hidden = len(report.reductions) - DRY_RUN_REDUCTION_ROWS
+        if hidden > 0:
+            reductions.add_row(f"[dim]… {hidden} more[/]", "", "", "")
+        reductions.add_row(
+            "[bold]total[/bold]",
+            "",
+            f"{sum(reduction.bytes_saved for reduction in report.reductions):,}",
+            f"{sum(reduction.tokens_saved for reduction in report.reductions):,}",
+        )
+        console.print(reductions)
+
+    if report.omitted:
+        omitted = Table(title="[bold]Phase 3 files omitted by the agent token budget[/bold]", pad_edge=False)
+        for column in ("File", "Tokens", "Reason"):
+            omitted.add_column(column, justify="right" if column == "Tokens" else "left")
+        for item in report.omitted[:DRY_RUN_REDUCTION_ROWS]:
+            omitted.add_row(item.path, f"{item.tokens:,}", item.reason)
+        hidden = len(report.omitted) - DRY_RUN_REDUCTION_ROWS
+        if hidden > 0:
+            omitted.add_row(f"[dim]… {hidden} more[/]", "", "")
+        console.print(omitted)
+
+    concurrency = report.phase3_max_concurrency or "unlimited"
+    console.print(
+        f"[dim]Plan source: {report.plan_source}. Phase 3 concurrency: {concurrency}. "
+        "Output tokens and timings are estimates; no model calls were made.[/]"
+    )
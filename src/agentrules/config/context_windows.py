@@ -0,0 +1,65 @@
+"""
+config/context_windows.py
+
+Context window sizes and output reservations for the models referenced in
+`config/agents.py`. Prompt builders use them to keep each request within what
+the configured model accepts; models without an entry fall back to
+`DEFAULT_MODEL_LIMITS`.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class ModelLimits(NamedTuple):
+    """Token limits of a model: total context window and the share kept free for the response."""
+
+    context_window: int
+    output_reserve: int
+
+
+DEFAULT_MODEL_LIMITS = ModelLimits(128_000, 16_000)
+
+PROMPT_SAFETY_RATIO = 0.85
+"""Fraction of the input budget used, absorbing the error of the character-based token estimate."""
+
+MODEL_LIMITS: dict[str, ModelLimits] = {
+    # Anthropic
+    "claude-sonnet-4-5": ModelLimits(200_000, 32_000),
+    "claude-haiku-4-5": ModelLimits(200_000, 32_000),
+    "claude-opus-4-1": ModelLimits(200_000, 32_000),
+    "claude-opus-4-5-20251101": ModelLimits(200_000, 32_000),
+    # DeepSeek
+    "deepseek-chat": ModelLimits(128_000, 8_000),
+    "deepseek-reasoner": ModelLimits(128_000, 32_000),
+    # Google
+    "gemini-2.5-flash": ModelLimits(1_048_576, 65_536),
+    "gemini-2.5-pro": ModelLimits(1_048_576, 65_536),
+    "gemini-3-pro-preview": ModelLimits(1_048_576, 65_536),
+    # OpenAI
+    "gpt-4.1": ModelLimits(1_047_576, 32_768),
+    "gpt-5": ModelLimits(400_000, 128_000),
+    "gpt-5.1": ModelLimits(400_000, 128_000),
+    "gpt-5.1-codex": ModelLimits(400_000, 128_000),
+    "o3": ModelLimits(200_000, 100_000),
+    "o4-mini": ModelLimits(200_000, 100_000),
+    # xAI
+    "grok-4-0709": ModelLimits(256_000, 32_000),
+    "grok-4-fast-reasoning": ModelLimits(2_000_000, 32_000),
+    "grok-4-fast-non-reasoning": ModelLimits(2_000_000, 32_000),
+    "grok-code-fast-1": ModelLimits(256_000, 32_000),
+}
+
+
+def get_model_limits(model_name: str) -> ModelLimits:
+    """Return the limits of ``model_name``, or conservative defaults for unknown models."""
+
+    return MODEL_LIMITS.get(model_name, DEFAULT_MODEL_LIMITS)
+
+
+def prompt_token_budget(model_name: str) -> int:
+    """Estimated prompt tokens that can safely be sent to ``model_name`` in one request."""
+
+    limits = get_model_limits(model_name)
+    return max(1, int((limits.context_window - limits.output_reserve) * PROMPT_SAFETY_RATIO))
@@ -0,0 +1,56 @@
+"""
+config/pricing.py
+
+Approximate per-token list prices for the models referenced in `config/agents.py`.
+The values are used for cost projections (e.g. `agentrules analyze --dry-run`) and
+are expressed in US dollars per million tokens. Update them when providers change
+their published rates; models without an entry are reported without a cost.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class ModelPricing(NamedTuple):
+    """Price of a model in USD per million input and output tokens."""
+
+    input_per_mtok: float
+    output_per_mtok: float
+
+
+MODEL_PRICING: dict[str, ModelPricing] = {
+    # Anthropic
+    "claude-sonnet-4-5": ModelPricing(3.00, 15.00),
+    "claude-haiku-4-5": ModelPricing(1.00, 5.00),
+    "claude-opus-4-1": ModelPricing(15.00, 75.00),
+    "claude-opus-4-5-20251101": ModelPricing(5.00, 25.00),
+    # DeepSeek
+    "deepseek-chat": ModelPricing(0.28, 0.42),
+    "deepseek-reasoner": ModelPricing(0.28, 0.42),
+    # Google
+    "gemini-2.5-flash": ModelPricing(0.30, 2.50),
+    "gemini-2.5-pro": ModelPricing(1.25, 10.00),
+    "gemini-3-pro-preview": ModelPricing(2.00, 12.00),
+    # OpenAI
+    "gpt-4.1": ModelPricing(2.00, 8.00),
+    "gpt-5": ModelPricing(1.25, 10.00),
+    "gpt-5.1": ModelPricing(1.25, 10.00),
+    "gpt-5.1-codex": ModelPricing(1.25, 10.00),
+    "o3": ModelPricing(2.00, 8.00),
+    "o4-mini": ModelPricing(1.10, 4.40),
+    # xAI
+    "grok-4-0709": ModelPricing(3.00, 15.00),
+    "grok-4-fast-reasoning": ModelPricing(0.20, 0.50),
+    "grok-4-fast-non-reasoning": ModelPricing(0.20, 0.50),
+    "grok-code-fast-1": ModelPricing(0.20, 1.50),
+}
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> float | None:
+    """Return the projected USD cost of a call, or ``None`` when the model is not priced."""
+
+    pricing = MODEL_PRICING.get(model_name)
+    if pricing is None:
+        return None
+    return (input_tokens * pricing.input_per_mtok + output_tokens * pricing.output_per_mtok) / 1_000_000
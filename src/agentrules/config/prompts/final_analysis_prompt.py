@@ -422,3 +422,39 @@ def format_final_analysis_prompt(
         current_month=current_month,
         current_year=current_year
     )
+
+
+# Prompt used when the consolidated report is too large for a single Final Analysis call.
+# Each slice is condensed by the final-phase model and the partial reports are merged recursively.
+FINAL_ANALYSIS_PARTIAL_PROMPT = """You are preparing material for writing Agent rules (`AGENTS.md`) for a project.
+The project report is too large to read at once, so it has been split into slices.
+This is slice {index} of {total} at merge level {level}; other slices are handled separately and
+your output will be merged with theirs before the rules are written.
+
+<project_report_slice>
+{chunk}
+</project_report_slice>
+
+Your tasks:
+1. Keep everything an AI coding agent needs to work on this project: technology stack and versions,
+   directory layout, architecture and component responsibilities, coding conventions, build, test and
+   run commands, and known pitfalls
+2. Keep concrete file paths, component names and recommendations exactly as written
+3. Remove repetition and boilerplate
+4. Keep the result as short as possible without dropping facts
+5. Do not invent information that is not in the slice"""
+
+def format_final_analysis_partial_prompt(chunk: str, *, index: int, total: int, level: int) -> str:
+    """
+    Format the prompt used to condense one slice of an oversized consolidated report.
+
+    Args:
+        chunk: Rendered text of the slice to condense
+        index: 1-based position of the slice within its merge level
+        total: Number of slices at this merge level
+        level: Merge level (0 for the raw report, higher for merged partial reports)
+
+    Returns:
+        Formatted prompt string
+    """
+    return FINAL_ANALYSIS_PARTIAL_PROMPT.format(chunk=chunk, index=index, total=total, level=level)
@@ -6,8 +6,16 @@ Centralizing prompts here makes it easier to edit and maintain them without
 modifying the core logic of the agents.
 """
 
+from __future__ import annotations
+
 import json
+from collections import defaultdict
 from collections.abc import Sequence
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agentrules.core.analysis.clustering import FileCluster
 
 # Base prompt template for Phase 2 (Methodical Planning)
 PHASE_2_PROMPT = """You are a project documentation planner tasked with processing the <initial_findings>...</initial_findings> from the given <project_structure>...</project_structure> in order to:
@@ -27,7 +35,7 @@ PHASE_2_PROMPT = """You are a project documentation planner tasked with processi
 {project_structure}
 
 ---
-
+{module_graph}
 <initial_findings>
 {phase1_results}
 </initial_findings>
@@ -104,7 +112,186 @@ def format_phase2_prompt(
 
     structure_str = "\n".join(structure_lines)
 
+    findings = dict(phase1_results)
+    module_graph = _module_graph_section(findings)
     return PHASE_2_PROMPT.format(
-        phase1_results=json.dumps(phase1_results, indent=2),
-        project_structure=structure_str
+        phase1_results=json.dumps(findings, indent=2),
+        project_structure=structure_str,
+        module_graph=module_graph,
+    )
+
+
+def _module_graph_section(findings: dict) -> str:
+    """Pop the import graph summary from ``findings`` and render it as text rather than escaped JSON."""
+
+    module_graph = findings.pop("module_graph", None)
+    if not module_graph:
+        return ""
+    return (
+        "\nThe import graph below was extracted from the source files. Prefer keeping modules that import "
+        "each other, and especially import cycles, with the same agent.\n\n"
+        f"<module_graph>\n{module_graph}\n</module_graph>\n\n---\n"
+    )
+
+
+# Prompt used when the plan is requested as JSON conforming to a schema
+PHASE_2_STRUCTURED_PROMPT = """You are a project documentation planner tasked with processing the <initial_findings>...</initial_findings> from the given <project_structure>...</project_structure> in order to:
+
+1. Create a listing of a team of 3 to 5 agents that would be the best fit to analyze the contents of each file shown within the project structure.
+
+2. Assign each file to the applicable agent you created until all files have been assigned.
+
+# Approach
+
+- Agent Creation: Identify roles and expertise suitable for the project's needs.
+
+- File Assignment: Distribute files based on agent expertise to ensure efficient analysis.
+
+---
+
+{project_structure}
+
+---
+{module_graph}
+<initial_findings>
+{phase1_results}
+</initial_findings>
+
+---
+
+# OUTPUT REQUIREMENTS
+# 1. Respond with a single JSON object and nothing else
+# 2. Give every file as its path relative to the project root, exactly as in the project structure
+# 3. Assign each file to exactly one agent
+
+The JSON object must conform to this schema:
+
+{schema}
+"""
+
+
+def format_phase2_structured_prompt(
+    phase1_results: dict,
+    project_structure: Sequence[str] | None,
+    schema: dict,
+) -> str:
+    """
+    Format the Phase 2 prompt that asks for the agent plan as JSON.
+
+    Args:
+        phase1_results: Dictionary containing the results from Phase 1
+        project_structure: List of strings representing the project tree structure
+        schema: JSON schema of the plan, included for providers that only offer a JSON mode
+
+    Returns:
+        Formatted prompt string
+    """
+    findings = dict(phase1_results)
+    module_graph = _module_graph_section(findings)
+    structure = list(project_structure) if project_structure is not None else ["No project structure provided"]
+    return PHASE_2_STRUCTURED_PROMPT.format(
+        phase1_results=json.dumps(findings, indent=2),
+        project_structure="\n".join(structure),
+        module_graph=module_graph,
+        schema=json.dumps(schema, indent=2),
+    )
+
+
+# Prompt used when the files were already clustered locally into balanced groups
+PHASE_2_CLUSTERED_PROMPT = """You are a project documentation planner. The project's source files have already been split into balanced <file_groups> by directory locality, imports and size. Using the <initial_findings>, turn those groups into a team of analysis agents:
+
+1. Create one agent per group, or combine closely related groups into one agent when they are small. Use 3 to 5 agents when there are at least that many groups.
+
+2. Name each agent and describe its role and expertise based on the files in its groups.
+
+3. Only if a file clearly belongs with another agent's files, move it by listing its path under that agent's <file_assignments>. Otherwise leave <file_assignments> out.
+
+---
+{module_graph}
+<file_groups>
+{file_groups}
+</file_groups>
+
+---
+
+<initial_findings>
+{phase1_results}
+</initial_findings>
+
+---
+
+# OUTPUT REQUIREMENTS
+# 1. Use valid XML format with proper closing tags **NOT IN A CODE BLOCK**
+# 2. DO NOT use special characters like &, <, > in agent names or descriptions
+# 3. Use only alphanumeric characters and spaces in names
+# 4. Keep agent IDs exactly as shown: agent_1, agent_2, agent_3)
+# 5. Every group id must appear in exactly one agent's <groups>
+
+---
+
+## OUTPUT FORMAT
+
+<reasoning>
+Describe your approach or reasoning here.
+</reasoning>
+
+<analysis_plan>
+<agent_1 name="agent-name">
+<description>Brief description of this agent's role and expertise.</description>
+<groups>group_1, group_2</groups>
+</agent_1>
+
+<agent_2 name="agent-name">
+<description>Brief description of this agent's role and expertise.</description>
+<groups>group_3</groups>
+<file_assignments>
+<file_path>[Path of a file moved here from another group]</file_path>
+</file_assignments>
+</agent_2>
+
+<!-- Add further agents with the same structure if needed -->
+</analysis_plan>
+
+"""
+
+
+def format_file_groups(clusters: Sequence[FileCluster]) -> str:
+    """Render file groups compactly, listing file names per directory."""
+
+    blocks = []
+    for cluster in clusters:
+        by_directory: dict[str, list[str]] = defaultdict(list)
+        for path in cluster.files:
+            parent = PurePosixPath(path).parent.as_posix()
+            by_directory[parent].append(PurePosixPath(path).name)
+        lines = [f"- {directory}/: {', '.join(names)}" for directory, names in by_directory.items()]
+        blocks.append(
+            f'<group id="{cluster.id}" files="{len(cluster.files)}" tokens="{cluster.tokens}">\n'
+            + "\n".join(lines)
+            + "\n</group>"
+        )
+    return "\n".join(blocks)
+
+
+def format_phase2_clustered_prompt(phase1_results: dict, clusters: Sequence[FileCluster]) -> str:
+    """
+    Format the Phase 2 prompt that asks the model to name and adjust pre-clustered file groups.
+
+    The raw project tree is not included; the groups already cover every source file.
+
+    Args:
+        phase1_results: Dictionary containing the results from Phase 1
+        clusters: File groups from `agentrules.core.analysis.clustering`
+
+    Returns:
+        Formatted prompt string
+    """
+    findings = dict(phase1_results)
+    module_graph = findings.pop("module_graph", None)
+    module_graph_str = f"\n<module_graph>\n{module_graph}\n</module_graph>\n" if module_graph else ""
+
+    return PHASE_2_CLUSTERED_PROMPT.format(
+        phase1_results=json.dumps(findings, indent=2),
+        file_groups=format_file_groups(clusters),
+        module_graph=module_graph_str,
     )
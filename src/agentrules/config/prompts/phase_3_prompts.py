@@ -64,3 +64,77 @@ Analyze the code following these guidelines:
 5. Summarize your findings in a clear, structured format
 
 Format your response as a structured report with clear sections and findings for each file."""
+
+
+def format_phase3_tools_prompt(context: dict) -> str:
+    """
+    Format the prompt for a Phase 3 agent that fetches its files through tools.
+
+    Instead of inlining file contents, the prompt lists the assigned files with
+    their sizes; the agent reads what it needs with `read_file`, `grep` and
+    `list_dir`, and the results of its earlier calls are appended each turn.
+
+    Args:
+        context: Agent context with ``file_manifest`` entries (``path``/``size``),
+            the ``tool_results`` executed so far and ``final_turn``
+
+    Returns:
+        Formatted prompt string
+    """
+    agent_name = context.get("agent_name", "Analysis Agent")
+    agent_role = context.get("agent_role", "analyzing code files")
+
+    tree_structure = context.get("tree_structure", [])
+    if isinstance(tree_structure, list):
+        tree_structure = "\n".join(tree_structure)
+
+    manifest_lines = []
+    for item in context.get("file_manifest", []) or []:
+        size = item.get("size")
+        manifest_lines.append(f"- {item['path']} ({size:,} bytes)" if size is not None else f"- {item['path']}")
+    manifest = "\n".join(manifest_lines)
+
+    tool_results = context.get("tool_results", []) or []
+    if tool_results:
+        calls = []
+        for record in tool_results:
+            arguments = ", ".join(f"{key}={value!r}" for key, value in (record.get("args") or {}).items())
+            calls.append(f"<tool_result call=\"{record.get('name')}({arguments})\">\n{record.get('result')}\n</tool_result>")
+        results_section = "TOOL RESULTS SO FAR:\n" + "\n\n".join(calls)
+    else:
+        results_section = "TOOL RESULTS SO FAR:\n(none yet)"
+
+    if context.get("final_turn"):
+        next_step = (
+            "No further tool calls are available. Write your final report now from the tool results above."
+        )
+    else:
+        next_step = (
+            "Use the read_file, grep and list_dir tools to read the parts of your assigned files you need; "
+            "request several calls at once when you can. Read selectively: prefer line ranges and grep over "
+            "reading large files whole. When you have seen enough, stop calling tools and write your final report."
+        )
+
+    return f"""You are {agent_name}, responsible for {agent_role}.
+
+Your task is to perform a deep analysis of the code files assigned to you in this project.
+Their contents are not included below; fetch them with the provided tools.
+
+TREE STRUCTURE:
+{tree_structure}
+
+ASSIGNED FILES:
+{manifest}
+
+{results_section}
+
+{next_step}
+
+Analyze the code following these guidelines:
+1. Focus on understanding the purpose and functionality of each file
+2. Identify key patterns and design decisions
+3. Note any potential issues, optimizations, or improvements
+4. Pay attention to relationships between different components
+5. Summarize your findings in a clear, structured format
+
+Format your response as a structured report with clear sections and findings for each file."""
@@ -31,3 +31,35 @@ def format_phase5_prompt(results: dict) -> str:
         Formatted prompt string
     """
     return PHASE_5_PROMPT.format(results=json.dumps(results, indent=2))
+
+
+# Prompt used when the combined results are too large for a single consolidation call.
+# Each slice is condensed independently and the partial reports are merged recursively.
+PHASE_5_PARTIAL_PROMPT = """As the Report Agent, you are condensing one slice of a larger multi-phase analysis.
+This is slice {index} of {total} at merge level {level}; other slices are handled separately and
+your output will be merged with theirs.
+
+Analysis Slice:
+{chunk}
+
+Your tasks:
+1. Preserve every concrete finding, file path, component name and recommendation
+2. Remove repetition and boilerplate
+3. Organize by component/module
+4. Keep the result as short as possible without dropping facts
+5. Do not invent information that is not in the slice"""
+
+def format_phase5_partial_prompt(chunk: str, *, index: int, total: int, level: int) -> str:
+    """
+    Format the prompt used to condense one slice of oversized Phase 5 input.
+
+    Args:
+        chunk: Rendered text of the slice to condense
+        index: 1-based position of the slice within its merge level
+        total: Number of slices at this merge level
+        level: Merge level (0 for raw results, higher for merged partial reports)
+
+    Returns:
+        Formatted prompt string
+    """
+    return PHASE_5_PARTIAL_PROMPT.format(chunk=chunk, index=index, total=total, level=level)
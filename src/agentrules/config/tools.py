@@ -6,6 +6,7 @@ It provides standardized tool definitions that work across different model provi
 and configures which tools are available in each phase.
 """
 
+from agentrules.core.agent_tools.project_files import PROJECT_FILE_TOOLS
 from agentrules.core.agent_tools.web_search import TAVILY_SEARCH_TOOL_SCHEMA
 from agentrules.core.types.tool_config import ToolSets
 
@@ -18,7 +19,8 @@ TOOL_SETS: ToolSets = {
     "RESEARCHER_TOOLS": [TAVILY_SEARCH_TOOL_SCHEMA],
     "PHASE_1_TOOLS": [],
     "PHASE_2_TOOLS": [],
-    "PHASE_3_TOOLS": [],
+    # Used when Phase 3 runs in tool-driven context mode
+    "PHASE_3_TOOLS": list(PROJECT_FILE_TOOLS),
     "PHASE_4_TOOLS": [],
     "PHASE_5_TOOLS": [],
     "FINAL_TOOLS": [],
@@ -0,0 +1,19 @@
+"""
+core/agent_tools/project_files/__init__.py
+"""
+
+from .tools import (
+    GREP_TOOL_SCHEMA,
+    LIST_DIR_TOOL_SCHEMA,
+    PROJECT_FILE_TOOLS,
+    READ_FILE_TOOL_SCHEMA,
+    ProjectFileTools,
+)
+
+__all__ = [
+    "GREP_TOOL_SCHEMA",
+    "LIST_DIR_TOOL_SCHEMA",
+    "PROJECT_FILE_TOOLS",
+    "READ_FILE_TOOL_SCHEMA",
+    "ProjectFileTools",
+]
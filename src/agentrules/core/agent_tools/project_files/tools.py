@@ -0,0 +1,234 @@
+"""
+core/agent_tools/project_files/tools.py
+
+This module provides local file access tools for Phase 3 agents.
+Agents receive a manifest of their files and fetch contents on demand with
+`read_file`, `grep` and `list_dir`, which run against the project snapshot.
+"""
+
+# ====================================================
+# Importing Required Libraries
+# ====================================================
+
+import json
+import re
+from pathlib import PurePosixPath
+from typing import Any, cast
+
+from agentrules.core.types.tool_config import Tool
+from agentrules.core.utils.file_system.bounded_reader import DEFAULT_MAX_FILE_BYTES, read_bounded
+from agentrules.core.utils.file_system.file_index import FileIndex
+from agentrules.core.utils.file_system.file_sniffer import sniff_content, summarize_flagged
+
+# ====================================================
+# Limits
+# Every tool result is inlined into the next prompt, so each one is capped.
+# ====================================================
+
+READ_FILE_MAX_LINES = 400
+GREP_MAX_MATCHES = 50
+LIST_DIR_MAX_ENTRIES = 200
+MAX_RESULT_CHARS = 24_000
+
+# ====================================================
+# Tool Definitions
+# ====================================================
+
+READ_FILE_TOOL_SCHEMA: Tool = cast(Tool, {
+    "type": "function",
+    "function": {
+        "name": "read_file",
+        "description": (
+            "Read a project file, optionally only a range of lines. "
+            f"Returns at most {READ_FILE_MAX_LINES} numbered lines per call."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "Project-relative file path."},
+                "start_line": {"type": "integer", "description": "First line to return (1-based).", "default": 1},
+                "end_line": {"type": "integer", "description": "Last line to return (inclusive)."},
+            },
+            "required": ["path"],
+        },
+    },
+})
+
+GREP_TOOL_SCHEMA: Tool = cast(Tool, {
+    "type": "function",
+    "function": {
+        "name": "grep",
+        "description": (
+            "Search project files for a regular expression (case-insensitive). "
+            f"Returns up to {GREP_MAX_MATCHES} matching lines with their paths and line numbers."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "description": "Regular expression to search for."},
+                "path": {"type": "string", "description": "Only search files under this directory or file."},
+            },
+            "required": ["pattern"],
+        },
+    },
+})
+
+LIST_DIR_TOOL_SCHEMA: Tool = cast(Tool, {
+    "type": "function",
+    "function": {
+        "name": "list_dir",
+        "description": "List the files (with sizes) and subdirectories directly inside a project directory.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "Project-relative directory; empty for the root."},
+            },
+            "required": [],
+        },
+    },
+})
+
+PROJECT_FILE_TOOLS: list[Tool] = [READ_FILE_TOOL_SCHEMA, GREP_TOOL_SCHEMA, LIST_DIR_TOOL_SCHEMA]
+
+# ====================================================
+# Tool Execution
+# ====================================================
+
+
+class ProjectFileTools:
+    """
+    Executes the project file tools against a snapshot's file index.
+
+    Only indexed files are readable, so exclusions, `.gitignore` rules and the
+    project root confine what an agent can see. File texts are cached for the
+    lifetime of the instance.
+    """
+
+    def __init__(self, file_index: FileIndex, *, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES) -> None:
+        self._file_index = file_index
+        self._max_file_bytes = max_file_bytes
+        self._texts: dict[str, str] = {}
+
+    def manifest(self, paths: list[str]) -> list[dict[str, Any]]:
+        """
+        Describe the given files for an agent's prompt.
+
+        Returns:
+            One ``{"path", "size"}`` entry per path; ``size`` is ``None`` for
+            paths that are not in the index
+        """
+        manifest: list[dict[str, Any]] = []
+        for path in paths:
+            entry = self._file_index.resolve(str(path))
+            if entry is None or entry.excluded:
+                manifest.append({"path": path, "size": None})
+            else:
+                manifest.append({"path": entry.path, "size": entry.size})
+        return manifest
+
+    def execute(self, name: Any, args: dict[str, Any]) -> dict[str, Any]:
+        """
+        Run one tool call.
+
+        Returns:
+            An execution record with ``name``, ``args``, a JSON ``result`` and
+            either ``success`` or ``error``, as recorded for researcher tools
+        """
+        handlers = {"read_file": self.read_file, "grep": self.grep, "list_dir": self.list_dir}
+        handler = handlers.get(name)
+        if handler is None:
+            return _record(name, args, {"error": f"unsupported tool '{name}'"})
+        try:
+            payload = handler(**{key: value for key, value in args.items() if key in _PARAMETERS[name]})
+        except (TypeError, ValueError, re.error) as error:
+            payload = {"error": str(error)}
+        return _record(name, args, payload)
+
+    def read_file(self, path: str, start_line: int | None = 1, end_line: int | None = None) -> dict[str, Any]:
+        entry = self._file_index.resolve(str(path))
+        if entry is None or entry.excluded:
+            return {"error": f"no such file in the project: {path}"}
+        text = self._text(entry.path)
+        lines = text.splitlines()
+        start = max(1, int(start_line or 1))
+        end = min(len(lines), int(end_line) if end_line else start + READ_FILE_MAX_LINES - 1)
+        end = min(end, start + READ_FILE_MAX_LINES - 1)
+        numbered = "\n".join(f"{number}: {lines[number - 1]}" for number in range(start, end + 1))
+        return {
+            "path": entry.path,
+            "start_line": start,
+            "end_line": end,
+            "total_lines": len(lines),
+            "content": numbered[:MAX_RESULT_CHARS],
+        }
+
+    def grep(self, pattern: str, path: str | None = None) -> dict[str, Any]:
+        regex = re.compile(str(pattern), re.IGNORECASE)
+        prefix = _normalize_dir(path)
+        matches: list[dict[str, Any]] = []
+        for entry in self._file_index.files():
+            if entry.is_binary or entry.is_generated:
+                continue
+            if prefix and entry.path != prefix and not entry.path.startswith(f"{prefix}/"):
+                continue
+            for number, line in enumerate(self._text(entry.path).splitlines(), start=1):
+                if regex.search(line):
+                    matches.append({"path": entry.path, "line": number, "text": line.strip()[:300]})
+                    if len(matches) >= GREP_MAX_MATCHES:
+                        return {"matches": matches, "truncated": True}
+        return {"matches": matches, "truncated": False}
+
+    def list_dir(self, path: str | None = None) -> dict[str, Any]:
+        prefix = _normalize_dir(path)
+        files: list[dict[str, Any]] = []
+        directories: set[str] = set()
+        for entry in self._file_index.files():
+            parent = PurePosixPath(entry.path).parent.as_posix()
+            parent = "" if parent == "." else parent
+            if parent == prefix:
+                files.append({"name": entry.name, "size": entry.size})
+            elif not prefix or parent.startswith(f"{prefix}/"):
+                relative = parent[len(prefix) + 1:] if prefix else parent
+                directories.add(relative.split("/", 1)[0])
+        if not files and not directories:
+            return {"error": f"no such directory in the project: {path}"}
+        return {
+            "path": prefix,
+            "directories": sorted(directories)[:LIST_DIR_MAX_ENTRIES],
+            "files": sorted(files, key=lambda item: item["name"])[:LIST_DIR_MAX_ENTRIES],
+        }
+
+    def _text(self, path: str) -> str:
+        if path not in self._texts:
+            absolute = self._file_index.absolute_path(path)
+            try:
+                bounded = read_bounded(absolute, self._max_file_bytes)
+            except OSError as error:
+                self._texts[path] = f"[unreadable: {error}]"
+                return self._texts[path]
+            sniffed = sniff_content(bounded.head)
+            self._texts[path] = summarize_flagged(sniffed, bounded.size) if sniffed.flagged else bounded.text()
+        return self._texts[path]
+
+
+_PARAMETERS = {
+    schema["function"]["name"]: frozenset(schema["function"]["parameters"]["properties"])
+    for schema in PROJECT_FILE_TOOLS
+}
+
+
+def _normalize_dir(path: str | None) -> str:
+    normalized = str(path or "").replace("\\", "/").strip()
+    while normalized.startswith("./"):
+        normalized = normalized[2:]
+    normalized = normalized.strip("/")
+    return "" if normalized == "." else normalized
+
+
+def _record(name: Any, args: dict[str, Any], payload: dict[str, Any]) -> dict[str, Any]:
+    record: dict[str, Any] = {"name": name, "args": args, "result": json.dumps(payload, ensure_ascii=False)}
+    if payload.get("error"):
+        record["error"] = str(payload["error"])
+    else:
+        record["success"] = True
+    return record
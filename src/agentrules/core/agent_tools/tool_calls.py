@@ -0,0 +1,52 @@
+"""
+core/agent_tools/tool_calls.py
+
+Normalization of the tool calls returned by the provider architects.
+"""
+
+import json
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+
+class ToolCall(NamedTuple):
+    """A tool invocation requested by a model."""
+
+    name: Any
+    args: dict[str, Any]
+
+
+def parse_tool_calls(response: Mapping[str, Any]) -> list[ToolCall]:
+    """
+    Extract the tool calls from an architect response.
+
+    Handles OpenAI-style ``tool_calls`` (JSON-encoded ``function.arguments``),
+    Anthropic-style ``tool_calls`` (an ``input`` mapping) and Gemini-style
+    ``function_calls`` (``name`` and ``args``).
+
+    Args:
+        response: Result returned by an architect's ``analyze``
+
+    Returns:
+        The requested calls in order; malformed arguments become an empty mapping
+    """
+    calls: list[ToolCall] = []
+    for call in response.get("tool_calls") or []:
+        function = call.get("function", {}) or {}
+        raw_args = function.get("arguments")
+        args: Any = {}
+        if isinstance(raw_args, str):
+            try:
+                args = json.loads(raw_args)
+            except json.JSONDecodeError:
+                args = {}
+        elif isinstance(raw_args, Mapping):
+            args = raw_args
+        elif isinstance(call.get("input"), Mapping):
+            args = call.get("input")
+        name = function.get("name") or call.get("name")
+        calls.append(ToolCall(name, dict(args) if isinstance(args, Mapping) else {}))
+    for call in response.get("function_calls") or []:
+        args = call.get("args", {}) or {}
+        calls.append(ToolCall(call.get("name"), dict(args) if isinstance(args, Mapping) else {}))
+    return calls
@@ -9,6 +9,7 @@ from typing import Any
 from agentrules.core.agents.base import BaseArchitect, ModelProvider, ReasoningMode
 from agentrules.core.streaming import StreamChunk, StreamEventType
 from agentrules.core.utils.async_stream import iterate_in_thread
+from agentrules.core.utils.parsers.structured_plan import PLAN_TOOL_NAME
 
 from .client import execute_message_request, get_client
 from .prompting import default_prompt_template, format_prompt
@@ -168,6 +169,37 @@ class AnthropicArchitect(BaseArchitect):
             response["tool_calls"] = result["tool_calls"]
         return response
 
+    async def create_structured_plan(
+        self,
+        phase1_results: dict,
+        prompt: str,
+        schema: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Create an analysis plan by forcing a tool call whose input schema is the plan schema."""
+        plan_tool = {
+            "name": PLAN_TOOL_NAME,
+            "description": "Submit the analysis plan: the team of agents and the files assigned to each.",
+            "input_schema": schema,
+        }
+        try:
+            prepared = prepare_request(
+                model_name=self.model_name,
+                prompt=prompt,
+                reasoning=self.reasoning,
+                tools=None,
+                forced_tool=plan_tool,
+            )
+            parsed = parse_response(execute_message_request(prepared.payload))
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.error(f"[bold red]Error in {self.name or 'Claude Architect'}:[/bold red] {str(exc)}")
+            return {"error": str(exc)}
+
+        for call in parsed.tool_calls or []:
+            if call.get("name") == PLAN_TOOL_NAME and isinstance(call.get("input"), dict):
+                return {"plan": json.dumps(call["input"])}
+        # Without a tool call (possible with thinking enabled) the text may still hold the JSON
+        return {"plan": parsed.findings or ""}
+
     async def synthesize_findings(self, phase3_results: dict, prompt: str | None = None) -> dict[str, Any]:
         context: dict[str, Any] = {"phase3_results": phase3_results}
         if prompt:
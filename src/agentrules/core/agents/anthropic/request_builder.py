@@ -24,7 +24,15 @@ def prepare_request(
     reasoning: ReasoningMode,
     max_tokens: int = DEFAULT_MAX_TOKENS,
     tools: list[Any] | None,
+    forced_tool: dict[str, Any] | None = None,
 ) -> PreparedRequest:
+    """
+    Build a Messages API payload.
+
+    ``forced_tool`` is added to the tools and the model is required to call it,
+    which is how structured output is requested. Extended thinking only allows
+    automatic tool choice, so with thinking enabled the call is left to the prompt.
+    """
     payload: dict[str, Any] = {
         "model": model_name,
         "max_tokens": max_tokens,
@@ -43,6 +51,13 @@ def prepare_request(
     if tools:
         payload["tools"] = tools
 
+    if forced_tool is not None:
+        payload["tools"] = [*payload.get("tools", []), forced_tool]
+        if thinking is None:
+            payload["tool_choice"] = {"type": "tool", "name": forced_tool["name"]}
+        else:
+            payload["tool_choice"] = {"type": "auto"}
+
     return PreparedRequest(payload=payload)
 
 
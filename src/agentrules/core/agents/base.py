@@ -180,6 +180,28 @@ class BaseArchitect(ABC):
         """
         pass
 
+    async def create_structured_plan(
+        self,
+        phase1_results: dict,
+        prompt: str,
+        schema: dict[str, Any],
+    ) -> dict:
+        """
+        Create an analysis plan as JSON conforming to ``schema``.
+
+        Implementations override this to enforce the schema with the provider's
+        native structured-output mechanism; by default the prompt alone asks for JSON.
+
+        Args:
+            phase1_results: Dictionary containing the results from Phase 1
+            prompt: Prompt asking for the plan as JSON
+            schema: JSON schema the plan must conform to
+
+        Returns:
+            Dictionary with the plan's JSON text under "plan", or an "error"
+        """
+        return await self.create_analysis_plan(phase1_results, prompt)
+
     def stream_analyze(
         self,
         context: dict[str, Any],
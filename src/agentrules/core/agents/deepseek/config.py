@@ -18,6 +18,7 @@ class ModelDefaults:
     default_reasoning: ReasoningMode
     max_output_tokens: int | None = None
     tools_allowed: bool = True
+    json_output_allowed: bool = True
 
 
 _MODEL_DEFAULTS: dict[str, ModelDefaults] = {
@@ -29,6 +30,7 @@ _MODEL_DEFAULTS: dict[str, ModelDefaults] = {
         default_reasoning=ReasoningMode.ENABLED,
         max_output_tokens=32_000,
         tools_allowed=False,
+        json_output_allowed=False,
     ),
 }
 
@@ -25,13 +25,15 @@ def prepare_request(
     defaults: ModelDefaults,
     tools: list[Any] | None,
     temperature: float | None = None,
+    json_mode: bool = False,
 ) -> PreparedRequest:
     """
     Construct the request payload sent to the DeepSeek Chat Completions API.
 
     DeepSeek exposes an OpenAI-compatible interface. Reasoning behaviour is
     driven by the selected model, so the ``reasoning`` argument is currently
-    advisory but retained for future parity with other providers.
+    advisory but retained for future parity with other providers. ``json_mode``
+    asks for a JSON object where the model supports it.
     """
     del reasoning  # Reasoning mode is inferred by the model; retained for parity.
 
@@ -55,4 +57,7 @@ def prepare_request(
     if temperature is not None and defaults.tools_allowed:
         payload["temperature"] = temperature
 
+    if json_mode and defaults.json_output_allowed:
+        payload["response_format"] = {"type": "json_object"}
+
     return PreparedRequest(payload=payload)
@@ -13,6 +13,7 @@ from google.genai import types as genai_types
 from agentrules.core.agents.base import BaseArchitect, ModelProvider, ReasoningMode
 from agentrules.core.streaming import StreamChunk, StreamEventType
 from agentrules.core.utils.async_stream import iterate_in_thread
+from agentrules.core.utils.parsers.structured_plan import schema_without_additional_properties
 
 from .client import build_gemini_client, generate_content_async
 from .prompting import default_prompt_template, format_prompt
@@ -161,6 +162,36 @@ class GeminiArchitect(BaseArchitect):
             "error": result.get("error"),
         }
 
+    async def create_structured_plan(
+        self,
+        phase1_results: dict,
+        prompt: str,
+        schema: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Create an analysis plan as JSON constrained by ``response_schema``."""
+        client = self.client
+        if client is None:
+            return {"error": self._client_error_hint or "Gemini client not initialized."}
+
+        config_kwargs: dict[str, Any] = {
+            "response_mime_type": "application/json",
+            "response_schema": schema_without_additional_properties(schema),
+        }
+        thinking_config = self._build_thinking_config()
+        if thinking_config is not None:
+            config_kwargs["thinking_config"] = thinking_config
+        try:
+            response = await generate_content_async(
+                client,
+                model=self.model_name,
+                contents=prompt,
+                config=GenerateContentConfig(**config_kwargs),
+            )
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.error(f"[bold red]Error in {self.name or 'Gemini Architect'}:[/bold red] {str(exc)}")
+            return {"error": str(exc)}
+        return {"plan": parse_generate_response(response).findings or ""}
+
     async def synthesize_findings(self, phase3_results: dict, prompt: str | None = None) -> dict[str, Any]:
         context: dict[str, Any] = {"phase3_results": phase3_results}
         if prompt:
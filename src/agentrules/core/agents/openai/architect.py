@@ -204,6 +204,17 @@ Format your response as a structured report with clear sections and findings."""
             empty_value="No plan generated",
         )
 
+    async def create_structured_plan(self, phase1_results: dict, prompt: str, schema: dict[str, Any]) -> dict:
+        """Create an analysis plan as JSON enforced by a strict JSON schema response format."""
+        try:
+            prepared = self._prepare_request(prompt, response_schema=schema, schema_name="agent_plan")
+            response = execute_request(prepared)
+            parsed = parse_response(response, prepared.api)
+            return {"plan": parsed.findings or ""}
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.error(f"Error during OpenAI structured plan request: {str(exc)}")
+            return {"error": str(exc)}
+
     async def synthesize_findings(self, phase3_results: dict, prompt: str | None = None) -> dict:
         """Synthesize findings from Phase 3."""
         return await self._run_simple_request(
@@ -240,6 +251,8 @@ Format your response as a structured report with clear sections and findings."""
         self,
         content: str,
         tools: list[Any] | None = None,
+        response_schema: dict[str, Any] | None = None,
+        schema_name: str = "response",
     ) -> PreparedRequest:
         return prepare_request(
             model_name=self.model_name,
@@ -249,6 +262,8 @@ Format your response as a structured report with clear sections and findings."""
             tools=tools,
             text_verbosity=self.text_verbosity,
             use_responses_api=self._use_responses_api,
+            response_schema=response_schema,
+            schema_name=schema_name,
         )
 
     def _resolve_tools(self, tools: list[Any] | None) -> list[Any] | None:
@@ -26,8 +26,15 @@ def prepare_request(
     tools: list[Any] | None,
     text_verbosity: str | None,
     use_responses_api: bool,
+    response_schema: dict[str, Any] | None = None,
+    schema_name: str = "response",
 ) -> PreparedRequest:
-    """Build an OpenAI SDK request payload based on the active model pathway."""
+    """
+    Build an OpenAI SDK request payload based on the active model pathway.
+
+    ``response_schema`` requests strict JSON output conforming to it, through
+    ``text.format`` on the Responses API or ``response_format`` on Chat Completions.
+    """
     if use_responses_api:
         payload: dict[str, Any] = {
             "model": model_name,
@@ -39,6 +46,11 @@ def prepare_request(
             payload["reasoning"] = reasoning_payload
 
         text_config = _build_text_config(text_verbosity)
+        if response_schema is not None:
+            text_config = {
+                **(text_config or {}),
+                "format": {"type": "json_schema", "name": schema_name, "schema": response_schema, "strict": True},
+            }
         if text_config:
             payload["text"] = text_config
 
@@ -65,6 +77,12 @@ def prepare_request(
     if _should_attach_temperature(model_name, reasoning, temperature):
         payload["temperature"] = temperature
 
+    if response_schema is not None:
+        payload["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": schema_name, "schema": response_schema, "strict": True},
+        }
+
     if tools:
         payload["tools"] = tools
         payload["tool_choice"] = "auto"
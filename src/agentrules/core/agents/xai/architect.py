@@ -172,6 +172,20 @@ class XaiArchitect(BaseArchitect):
             context["formatted_prompt"] = prompt
         return await self._run_phase_request(context, result_key="plan", empty_value="No plan generated")
 
+    async def create_structured_plan(
+        self,
+        phase1_results: dict,
+        prompt: str,
+        schema: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Create an analysis plan in JSON mode; the schema itself is spelled out in the prompt."""
+        try:
+            parsed = parse_response(self._execute(self._prepare_request(prompt, None, json_mode=True)))
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.error(f"[bold red]Error in {self.name or 'xAI Architect'}:[/bold red] {str(exc)}")
+            return {"error": str(exc)}
+        return {"plan": parsed.findings or ""}
+
     async def synthesize_findings(self, phase3_results: dict, prompt: str | None = None) -> dict[str, Any]:
         context: dict[str, Any] = {"phase3_results": phase3_results}
         if prompt:
@@ -225,7 +239,7 @@ class XaiArchitect(BaseArchitect):
         return execute_chat_completion(prepared.payload, base_url=self.base_url)
 
     # Internal helpers -----------------------------------------------------------
-    def _prepare_request(self, content: str, tools: list[Any] | None) -> PreparedRequest:
+    def _prepare_request(self, content: str, tools: list[Any] | None, json_mode: bool = False) -> PreparedRequest:
         return prepare_request(
             model_name=self.model_name,
             content=content,
@@ -233,6 +247,7 @@ class XaiArchitect(BaseArchitect):
             defaults=self._defaults,
             tools=tools,
             temperature=self.temperature,
+            json_mode=json_mode,
         )
 
     async def _run_phase_request(
@@ -25,9 +25,12 @@ def prepare_request(
     defaults: ModelDefaults,
     tools: list[Any] | None,
     temperature: float | None = None,
+    json_mode: bool = False,
 ) -> PreparedRequest:
     """
     Construct the request payload sent to the xAI Chat Completions API.
+
+    ``json_mode`` asks for the response as a JSON object.
     """
     payload: dict[str, Any] = {
         "model": model_name,
@@ -50,6 +53,9 @@ def prepare_request(
     if temperature is not None:
         payload["temperature"] = temperature
 
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+
     return PreparedRequest(payload=payload)
 
 
@@ -0,0 +1,342 @@
+"""Deterministic grouping of project files into balanced agent workloads.
+
+Before Phase 2 the project's source files are clustered locally so the planner
+only names, describes and adjusts groups instead of writing file lists from the
+raw tree:
+
+1. Directory subtrees that fit one group's token capacity become indivisible
+   units; larger directories are split into their subdirectories, and their own
+   files are chunked in path order.
+2. Units are packed largest first into a fixed number of groups. Each unit goes
+   to the group it shares the most import edges with (see `module_graph`), then
+   the one sharing the deepest directory, among groups that still have room.
+
+The same input always yields the same groups, and no group exceeds its share of
+the project's tokens by more than `BALANCE_SLACK` unless one unit already does.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import posixpath
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any
+
+from agentrules.core.utils.file_system.bounded_reader import DEFAULT_MAX_FILE_BYTES
+from agentrules.core.utils.file_system.file_index import FileIndex
+from agentrules.core.utils.module_graph import ModuleGraph
+from agentrules.core.utils.tokens import CHARS_PER_TOKEN
+
+logger = logging.getLogger("project_extractor")
+
+DEFAULT_MAX_GROUPS = 5
+DEFAULT_MIN_GROUP_TOKENS = 8_000
+"""Projects are split into another group only for every this many estimated tokens."""
+BALANCE_SLACK = 1.15
+"""A group may hold up to this multiple of the mean group size before spilling into another."""
+
+_GROUP_ID = re.compile(r"^group_\d+$")
+_NAME_SEPARATORS = re.compile(r"[^A-Za-z0-9]+")
+
+
+@dataclass(frozen=True)
+class FileCluster:
+    """A group of files planned as one Phase 3 agent's workload."""
+
+    id: str
+    files: tuple[str, ...]
+    tokens: int
+    directories: tuple[str, ...]
+    """Directories holding the group's files, most tokens first."""
+
+    @property
+    def label(self) -> str:
+        return self.directories[0] if self.directories else "."
+
+
+def cluster_files(
+    file_index: FileIndex,
+    module_graph: ModuleGraph | None = None,
+    *,
+    max_groups: int = DEFAULT_MAX_GROUPS,
+    min_group_tokens: int = DEFAULT_MIN_GROUP_TOKENS,
+) -> list[FileCluster]:
+    """
+    Cluster the snapshot's source files into balanced groups.
+
+    Args:
+        file_index: Index of the project files from the snapshot walk
+        module_graph: Optional import graph; import edges pull units into the same group
+        max_groups: Upper bound on the number of groups
+        min_group_tokens: Estimated tokens per additional group
+
+    Returns:
+        The groups ordered by their first file, with ids ``group_1``, ``group_2``, ...
+    """
+    tokens = {
+        entry.path: max(1, min(entry.size, DEFAULT_MAX_FILE_BYTES) // CHARS_PER_TOKEN)
+        for entry in file_index.source_files()
+    }
+    return cluster_paths(tokens, module_graph, max_groups=max_groups, min_group_tokens=min_group_tokens)
+
+
+def cluster_paths(
+    tokens: Mapping[str, int],
+    module_graph: ModuleGraph | None = None,
+    *,
+    max_groups: int = DEFAULT_MAX_GROUPS,
+    min_group_tokens: int = DEFAULT_MIN_GROUP_TOKENS,
+) -> list[FileCluster]:
+    """Cluster paths with known token estimates; see `cluster_files`."""
+
+    if not tokens:
+        return []
+    total = sum(tokens.values())
+    group_count = max(1, min(max_groups, total // max(1, min_group_tokens), len(tokens)))
+    capacity = math.ceil(total / group_count * BALANCE_SLACK)
+
+    units = _directory_units(tokens, capacity)
+    links = _unit_links(units, tokens, module_graph)
+    unit_tokens = [sum(tokens[path] for path in unit) for unit in units]
+    unit_roots = [_common_directory(unit) for unit in units]
+
+    groups: list[list[int]] = [[] for _ in range(group_count)]
+    loads = [0] * group_count
+    membership: dict[int, int] = {}
+    for unit in sorted(range(len(units)), key=lambda index: (-unit_tokens[index], units[index][0])):
+        def _preference(group: int, unit: int = unit) -> tuple[int, int, int, int]:
+            shared = sum(count for other, count in links[unit].items() if membership.get(other) == group)
+            depth = max((_shared_depth(unit_roots[unit], unit_roots[other]) for other in groups[group]), default=0)
+            return shared, depth, -loads[group], -group
+
+        fitting = [group for group in range(group_count) if loads[group] + unit_tokens[unit] <= capacity]
+        if fitting:
+            chosen = max(fitting, key=_preference)
+        else:
+            chosen = min(range(group_count), key=lambda group: (loads[group], group))
+        groups[chosen].append(unit)
+        loads[chosen] += unit_tokens[unit]
+        membership[unit] = chosen
+
+    clusters = []
+    for members in groups:
+        files = sorted(path for unit in members for path in units[unit])
+        if files:
+            clusters.append(files)
+    clusters.sort(key=lambda files: files[0])
+    return [
+        FileCluster(
+            id=f"group_{number}",
+            files=tuple(files),
+            tokens=sum(tokens[path] for path in files),
+            directories=_directories_by_weight(files, tokens),
+        )
+        for number, files in enumerate(clusters, start=1)
+    ]
+
+
+def local_agent_plan(clusters: Sequence[FileCluster]) -> list[dict[str, Any]]:
+    """Agent definitions for the groups as they are, named after their directories."""
+
+    agents = []
+    names: Counter[str] = Counter()
+    for number, cluster in enumerate(clusters, start=1):
+        base = _agent_name(cluster)
+        names[base] += 1
+        name = base if names[base] == 1 else f"{base} {names[base]}"
+        shown = ", ".join(directory or "." for directory in cluster.directories[:3])
+        more = f" and {len(cluster.directories) - 3} more directories" if len(cluster.directories) > 3 else ""
+        agents.append(
+            {
+                "id": f"agent_{number}",
+                "name": name,
+                "description": (
+                    f"Analyzes the {len(cluster.files)} files in {shown}{more} "
+                    f"(about {cluster.tokens:,} tokens), grouped by directory and imports"
+                ),
+                "expertise": [],
+                "responsibilities": [],
+                "file_assignments": list(cluster.files),
+            }
+        )
+    return agents
+
+
+def apply_cluster_plan(agents: Sequence[dict[str, Any]], clusters: Sequence[FileCluster]) -> list[dict[str, Any]]:
+    """
+    Expand a Phase 2 plan that assigns groups into per-agent file lists.
+
+    Each agent receives the files of the groups it names (in ``groups`` or as
+    ``group_N`` entries of its file list), plus individual files it lists, which
+    are then removed from the agent owning their group. Groups no agent named go
+    to the agent with the fewest tokens, and agents left without files are dropped.
+    Without usable agents the groups are planned locally.
+    """
+    by_id = {cluster.id: cluster for cluster in clusters}
+    tokens = {path: cluster.tokens / max(1, len(cluster.files)) for cluster in clusters for path in cluster.files}
+    owners: dict[str, int] = {}
+    moved: dict[str, int] = {}
+    for index, agent in enumerate(agents):
+        named = [*(agent.get("groups") or []), *(agent.get("file_assignments") or [])]
+        for entry in named:
+            entry = str(entry).strip()
+            if _GROUP_ID.match(entry):
+                if entry in by_id:
+                    owners.setdefault(entry, index)
+            elif entry:
+                moved.setdefault(entry, index)
+    if not owners and not moved:
+        logger.warning("[bold yellow]Warning:[/bold yellow] Phase 2 plan named no file groups; using the local plan")
+        return local_agent_plan(clusters)
+
+    assignments: dict[int, dict[str, None]] = defaultdict(dict)
+    for cluster in clusters:
+        if cluster.id in owners:
+            owner = owners[cluster.id]
+        else:
+            loads = {
+                index: sum(tokens.get(path, 0) for path in assignments[index]) for index in range(len(agents))
+            }
+            owner = min(range(len(agents)), key=lambda index: (loads[index], index))
+        for path in cluster.files:
+            assignments[moved.get(path, owner)][path] = None
+    for path, index in moved.items():
+        if path not in tokens:
+            # Files outside the groups (e.g. documentation) are kept where the planner put them
+            assignments[index][path] = None
+
+    plan = []
+    for index, agent in enumerate(agents):
+        files = list(assignments.get(index, {}))
+        if not files:
+            logger.debug(f"Dropping agent {agent.get('name')!r}: no files after expanding groups")
+            continue
+        expanded = {key: value for key, value in agent.items() if key != "groups"}
+        expanded["id"] = f"agent_{len(plan) + 1}"
+        expanded["file_assignments"] = files
+        plan.append(expanded)
+    return plan
+
+
+def _directory_units(tokens: Mapping[str, int], capacity: int) -> list[list[str]]:
+    files_in: dict[str, list[str]] = defaultdict(list)
+    children: dict[str, set[str]] = defaultdict(set)
+    subtree: Counter[str] = Counter()
+    for path in sorted(tokens):
+        directory = _directory(path)
+        files_in[directory].append(path)
+        parts = directory.split("/") if directory else []
+        for depth in range(1, len(parts) + 1):
+            ancestor = "/".join(parts[:depth])
+            children["/".join(parts[: depth - 1])].add(ancestor)
+            subtree[ancestor] += tokens[path]
+    subtree[""] = sum(tokens.values())
+
+    units: list[list[str]] = []
+    pending = [""]
+    while pending:
+        directory = pending.pop()
+        if subtree[directory] <= capacity:
+            units.append(sorted(_subtree_files(directory, files_in, children)))
+            continue
+        pending.extend(sorted(children[directory], reverse=True))
+        chunk: list[str] = []
+        chunk_tokens = 0
+        for path in files_in[directory]:
+            if chunk and chunk_tokens + tokens[path] > capacity:
+                units.append(chunk)
+                chunk, chunk_tokens = [], 0
+            chunk.append(path)
+            chunk_tokens += tokens[path]
+        if chunk:
+            units.append(chunk)
+    return [unit for unit in units if unit]
+
+
+def _subtree_files(directory: str, files_in: Mapping[str, list[str]], children: Mapping[str, set[str]]) -> list[str]:
+    files: list[str] = []
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        files.extend(files_in.get(current, ()))
+        pending.extend(children.get(current, ()))
+    return files
+
+
+def _unit_links(
+    units: Sequence[Sequence[str]],
+    tokens: Mapping[str, int],
+    module_graph: ModuleGraph | None,
+) -> list[Counter[int]]:
+    links: list[Counter[int]] = [Counter() for _ in units]
+    if module_graph is None:
+        return links
+    unit_of = {path: index for index, unit in enumerate(units) for path in unit}
+    # Go packages are graph nodes named after their directory; they belong to their files' units
+    package_units: dict[str, set[int]] = defaultdict(set)
+    for path, index in unit_of.items():
+        if path.endswith(".go"):
+            package_units[f"{_directory(path) or '.'}/"].add(index)
+
+    def _units_of(module: str) -> Iterable[int]:
+        if module in unit_of:
+            return (unit_of[module],)
+        return package_units.get(module, ())
+
+    for source, targets in module_graph.edges.items():
+        for source_unit in _units_of(source):
+            for target in targets:
+                for target_unit in _units_of(target):
+                    if target_unit != source_unit:
+                        links[source_unit][target_unit] += 1
+                        links[target_unit][source_unit] += 1
+    return links
+
+
+def _directories_by_weight(files: Sequence[str], tokens: Mapping[str, int]) -> tuple[str, ...]:
+    weights: Counter[str] = Counter()
+    for path in files:
+        weights[_directory(path)] += tokens[path]
+    return tuple(directory for directory, _ in sorted(weights.items(), key=lambda item: (-item[1], item[0])))
+
+
+def _agent_name(cluster: FileCluster) -> str:
+    parts = [part for part in cluster.label.split("/") if part and part not in ("src", "lib")][-2:]
+    words = _NAME_SEPARATORS.sub(" ", " ".join(parts)).strip()
+    return f"{words.title()} Agent" if words else "Project Root Agent"
+
+
+def _common_directory(paths: Sequence[str]) -> str:
+    directory = posixpath.commonpath([_directory(path) or "." for path in paths]) if paths else ""
+    return "" if directory == "." else directory
+
+
+def _shared_depth(left: str, right: str) -> int:
+    depth = 0
+    for left_part, right_part in zip(left.split("/"), right.split("/"), strict=False):
+        if not left_part or left_part != right_part:
+            break
+        depth += 1
+    return depth
+
+
+def _directory(path: str) -> str:
+    parent = PurePosixPath(path).parent.as_posix()
+    return "" if parent == "." else parent
+
+
+__all__ = [
+    "BALANCE_SLACK",
+    "DEFAULT_MAX_GROUPS",
+    "DEFAULT_MIN_GROUP_TOKENS",
+    "FileCluster",
+    "apply_cluster_plan",
+    "cluster_files",
+    "cluster_paths",
+    "local_agent_plan",
+]
@@ -0,0 +1,328 @@
+"""Hierarchical (tree-reduce) consolidation for oversized analysis payloads.
+
+Phase 5 and the final analysis historically serialised every upstream result
+into a single prompt. On large repositories that prompt can exceed the model's
+context window. The helpers here split the payload into token-bounded sections,
+condense packed chunks in parallel and merge the partial reports recursively
+until the combined text fits within the budget. Budgets are derived from the
+context window of the model that receives the final prompt, less whatever the
+rest of that prompt (template, project tree) already uses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from agentrules.config.context_windows import prompt_token_budget
+from agentrules.config.prompts.phase_5_prompts import format_phase5_partial_prompt
+from agentrules.core.utils.tokens import estimate_tokens, tokens_to_chars
+
+logger = logging.getLogger("project_extractor")
+
+MIN_CONSOLIDATION_TOKEN_BUDGET = 1_000
+"""Floor of a derived budget, so a prompt whose template nearly fills the window still gets condensed input."""
+
+DEFAULT_MAX_PARALLEL_REDUCTIONS = 4
+"""Maximum number of chunk consolidations that run concurrently."""
+
+MAX_REDUCTION_LEVELS = 5
+"""Safety bound on merge depth; remaining sections are truncated once it is reached."""
+
+ReduceFn = Callable[[str, int, int, int], Awaitable[str]]
+"""Callable condensing ``(chunk_text, level, index, total)`` into a shorter text."""
+
+PartialPromptFn = Callable[..., str]
+"""Formats the prompt condensing one chunk: ``(chunk, *, index, total, level)``."""
+
+
+@dataclass(frozen=True)
+class ConsolidationSection:
+    """A labelled piece of the payload whose estimated size is known."""
+
+    label: str
+    content: str
+    tokens: int
+
+    def render(self) -> str:
+        return f"### {self.label}\n{self.content}" if self.label else self.content
+
+
+def _make_section(label: str, content: str) -> ConsolidationSection:
+    return ConsolidationSection(label=label, content=content, tokens=estimate_tokens(content))
+
+
+def _serialise(payload: Any) -> str:
+    if isinstance(payload, str):
+        return payload
+    return json.dumps(payload, indent=2, default=str)
+
+
+def _split_text(label: str, text: str, max_tokens: int) -> list[ConsolidationSection]:
+    max_chars = max(1, tokens_to_chars(max_tokens))
+    pieces: list[str] = []
+    current: list[str] = []
+    current_len = 0
+    for line in text.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                pieces.append("".join(current))
+                current, current_len = [], 0
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current_len + len(line) > max_chars and current:
+            pieces.append("".join(current))
+            current, current_len = [], 0
+        current.append(line)
+        current_len += len(line)
+    if current:
+        pieces.append("".join(current))
+    if len(pieces) == 1:
+        return [_make_section(label, pieces[0])]
+    return [_make_section(f"{label} (part {idx})", piece) for idx, piece in enumerate(pieces, start=1)]
+
+
+def split_into_sections(payload: Any, max_tokens: int, label: str = "") -> list[ConsolidationSection]:
+    """
+    Split a payload into sections that each fit within ``max_tokens``.
+
+    Mappings and sequences are descended structurally so sections keep meaningful
+    labels (``phase3.findings[2]``); oversized strings are split on line boundaries.
+    """
+    text = _serialise(payload)
+    if estimate_tokens(text) <= max_tokens:
+        return [_make_section(label, text)] if text else []
+
+    sections: list[ConsolidationSection] = []
+    if isinstance(payload, dict) and payload:
+        for key, value in payload.items():
+            child_label = f"{label}.{key}" if label else str(key)
+            sections.extend(split_into_sections(value, max_tokens, child_label))
+        return sections
+    if isinstance(payload, list | tuple) and payload:
+        for idx, value in enumerate(payload):
+            sections.extend(split_into_sections(value, max_tokens, f"{label}[{idx}]"))
+        return sections
+    return _split_text(label, text, max_tokens)
+
+
+def pack_sections(
+    sections: Sequence[ConsolidationSection],
+    max_tokens: int,
+) -> list[list[ConsolidationSection]]:
+    """Greedily pack sections, in order, into chunks whose total stays within ``max_tokens``."""
+    chunks: list[list[ConsolidationSection]] = []
+    current: list[ConsolidationSection] = []
+    current_tokens = 0
+    for section in sections:
+        if current and current_tokens + section.tokens > max_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(section)
+        current_tokens += section.tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def render_sections(sections: Sequence[ConsolidationSection]) -> str:
+    """Render sections into a single text block."""
+    return "\n\n".join(section.render() for section in sections)
+
+
+def _truncate_sections(
+    sections: Sequence[ConsolidationSection],
+    max_tokens: int,
+) -> list[ConsolidationSection]:
+    if not sections:
+        return []
+    share = tokens_to_chars(max(1, max_tokens // len(sections)))
+    truncated: list[ConsolidationSection] = []
+    for section in sections:
+        content = section.content
+        if len(content) > share:
+            content = content[:share] + "\n... [truncated]"
+        truncated.append(_make_section(section.label, content))
+    return truncated
+
+
+class TreeReduceConsolidator:
+    """Condense payloads that exceed a token budget via parallel, recursive merges."""
+
+    def __init__(
+        self,
+        reduce_fn: ReduceFn,
+        *,
+        token_budget: int,
+        max_parallel: int = DEFAULT_MAX_PARALLEL_REDUCTIONS,
+        max_levels: int = MAX_REDUCTION_LEVELS,
+    ) -> None:
+        if token_budget <= 0:
+            raise ValueError("token_budget must be positive")
+        self._reduce_fn = reduce_fn
+        self._token_budget = token_budget
+        self._max_parallel = max(1, max_parallel)
+        self._max_levels = max(1, max_levels)
+
+    @property
+    def token_budget(self) -> int:
+        return self._token_budget
+
+    def fits(self, payload: Any) -> bool:
+        """Return True when ``payload`` can be sent in a single call."""
+        return estimate_tokens(_serialise(payload)) <= self._token_budget
+
+    async def reduce(self, payload: Any) -> list[ConsolidationSection]:
+        """
+        Reduce ``payload`` until the combined sections fit within the budget.
+
+        Returns:
+            Sections whose total estimated size is at most the token budget.
+        """
+        sections = split_into_sections(payload, self._token_budget)
+        level = 0
+        while sum(section.tokens for section in sections) > self._token_budget:
+            if level >= self._max_levels:
+                logger.warning(
+                    "[bold yellow]Consolidation:[/bold yellow] merge depth limit reached; truncating %d sections",
+                    len(sections),
+                )
+                return _truncate_sections(sections, self._token_budget)
+
+            chunks = pack_sections(sections, self._token_budget)
+            logger.info(
+                "[bold]Consolidation:[/bold] merge level %d condensing %d sections in %d chunks",
+                level,
+                len(sections),
+                len(chunks),
+            )
+            summaries = await self._reduce_level(chunks, level)
+            sections = []
+            for idx, summary in enumerate(summaries, start=1):
+                sections.extend(split_into_sections(summary, self._token_budget, f"partial report {level + 1}.{idx}"))
+            level += 1
+        return sections
+
+    async def _reduce_level(self, chunks: list[list[ConsolidationSection]], level: int) -> list[str]:
+        semaphore = asyncio.Semaphore(self._max_parallel)
+        total = len(chunks)
+        fallback_tokens = max(1, self._token_budget // max(1, total))
+
+        async def _run(index: int, chunk: list[ConsolidationSection]) -> str:
+            text = render_sections(chunk)
+            async with semaphore:
+                try:
+                    return await self._reduce_fn(text, level, index, total)
+                except Exception as exc:  # keep other chunks alive; degrade to truncated input
+                    logger.warning(
+                        "[bold yellow]Consolidation:[/bold yellow] chunk %d/%d at level %d failed: %s",
+                        index,
+                        total,
+                        level,
+                        exc,
+                    )
+                    return render_sections(_truncate_sections(chunk, fallback_tokens))
+
+        return list(await asyncio.gather(*(_run(idx, chunk) for idx, chunk in enumerate(chunks, start=1))))
+
+
+def _result_text(result: dict) -> str:
+    if result.get("error"):
+        raise RuntimeError(str(result["error"]))
+    for key in ("report", "analysis", "findings"):
+        value = result.get(key)
+        if value:
+            return value if isinstance(value, str) else json.dumps(value, indent=2, default=str)
+    raise RuntimeError("consolidation call returned no content")
+
+
+def consolidation_token_budget(model_name: str, template: str) -> int:
+    """
+    Payload tokens that fit in one request to ``model_name`` next to ``template``.
+
+    ``template`` is the prompt rendered with an empty payload, so the template
+    text and anything else it embeds (such as the project tree) are counted.
+    """
+    return max(MIN_CONSOLIDATION_TOKEN_BUDGET, prompt_token_budget(model_name) - estimate_tokens(template))
+
+
+def architect_model_name(architect: Any) -> str:
+    """Model behind ``architect``; empty (default limits) when it does not say."""
+
+    return getattr(architect, "model_name", None) or ""
+
+
+def architect_reducer(
+    architect: Any,
+    *,
+    method: str = "consolidate_results",
+    format_prompt: PartialPromptFn = format_phase5_partial_prompt,
+) -> ReduceFn:
+    """Build a reduce callable that condenses chunks via ``architect.<method>`` with the given prompt."""
+
+    call = getattr(architect, method)
+
+    async def _reduce(chunk: str, level: int, index: int, total: int) -> str:
+        prompt = format_prompt(chunk, index=index, total=total, level=level)
+        result = await call({"partial": chunk}, prompt)
+        return _result_text(result)
+
+    return _reduce
+
+
+async def reduce_payload(
+    payload: dict,
+    architect: Any,
+    *,
+    token_budget: int | None = None,
+    max_parallel: int = DEFAULT_MAX_PARALLEL_REDUCTIONS,
+    method: str = "consolidate_results",
+    format_prompt: PartialPromptFn = format_phase5_partial_prompt,
+) -> dict:
+    """
+    Return ``payload`` unchanged when it fits the budget, otherwise a condensed form.
+
+    Chunks are condensed by calling ``architect.<method>`` with ``format_prompt``.
+    Without an explicit ``token_budget`` the budget is what the architect's model
+    accepts next to that prompt. The condensed form maps each remaining section
+    label to its text so prompt templates that ``json.dumps`` their input keep
+    working unchanged.
+    """
+    if token_budget is None:
+        template = format_prompt("", index=1, total=1, level=0)
+        token_budget = consolidation_token_budget(architect_model_name(architect), template)
+    consolidator = TreeReduceConsolidator(
+        architect_reducer(architect, method=method, format_prompt=format_prompt),
+        token_budget=token_budget,
+        max_parallel=max_parallel,
+    )
+    if consolidator.fits(payload):
+        return payload
+    sections = await consolidator.reduce(payload)
+    return {
+        "partial_reports": {
+            section.label or f"section {idx}": section.content for idx, section in enumerate(sections, start=1)
+        }
+    }
+
+
+__all__ = [
+    "ConsolidationSection",
+    "DEFAULT_MAX_PARALLEL_REDUCTIONS",
+    "MAX_REDUCTION_LEVELS",
+    "MIN_CONSOLIDATION_TOKEN_BUDGET",
+    "PartialPromptFn",
+    "ReduceFn",
+    "TreeReduceConsolidator",
+    "architect_model_name",
+    "architect_reducer",
+    "consolidation_token_budget",
+    "pack_sections",
+    "reduce_payload",
+    "render_sections",
+    "split_into_sections",
+]
@@ -0,0 +1,253 @@
+"""Token-aware packing of Phase 3 agent contexts.
+
+`format_phase3_prompt` inlines every assigned file. When an agent's files do not
+fit the configured model's context window, the agent is split into balanced
+sub-requests: files are bin-packed by estimated tokens (largest first onto the
+least loaded request) and the partial findings are merged back into one result
+afterwards, so downstream phases still see one entry per planned agent.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from agentrules.config.context_windows import prompt_token_budget
+from agentrules.config.prompts.phase_3_prompts import format_phase3_prompt
+from agentrules.core.analysis.context_reduction import duplicate_references
+from agentrules.core.utils.tokens import estimate_tokens, tokens_to_chars
+
+logger = logging.getLogger("project_extractor")
+
+TRUNCATION_MARKER = "\n... [truncated]"
+TREE_TRUNCATION_MARKER = "... (tree truncated to fit the context window)"
+
+MAX_TREE_SHARE = 0.25
+"""Share of the budget the project tree may use once it crowds out the file contents."""
+
+
+@dataclass(frozen=True)
+class AgentRequest:
+    """One model request for a Phase 3 agent (or a part of a split agent)."""
+
+    agent: dict[str, Any]
+    tree: list[str]
+    file_contents: dict[str, str]
+    part: int = 1
+    total: int = 1
+    truncated_files: tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def is_split(self) -> bool:
+        return self.total > 1
+
+
+def phase3_token_budget(model_config: Mapping[str, Any] | None = None) -> int:
+    """Prompt budget of the model currently configured for Phase 3."""
+
+    if model_config is None:
+        from agentrules.config.agents import MODEL_CONFIG
+
+        model_config = MODEL_CONFIG
+    return prompt_token_budget(model_config["phase3"].model_name)
+
+
+def estimate_prompt_tokens(agent_def: Mapping[str, Any], tree: Sequence[str], file_contents: Mapping[str, str]) -> int:
+    """Estimated size of the Phase 3 prompt built from these inputs."""
+
+    return estimate_tokens(
+        format_phase3_prompt(
+            {
+                "agent_name": agent_def.get("name", "Analysis Agent"),
+                "agent_role": agent_def.get("description", "Analyzing the project"),
+                "assigned_files": list(agent_def.get("file_assignments", []) or []),
+                "file_contents": dict(file_contents),
+                "tree_structure": list(tree),
+            }
+        )
+    )
+
+
+def pack_agent_requests(
+    agent_def: dict[str, Any],
+    tree: Sequence[str],
+    file_contents: Mapping[str, str],
+    *,
+    token_budget: int,
+) -> list[AgentRequest]:
+    """
+    Split an agent's context into requests that each fit ``token_budget``.
+
+    Args:
+        agent_def: Agent definition from the Phase 2 plan
+        tree: Project tree included in every request
+        file_contents: Loaded contents of the agent's assigned files
+        token_budget: Estimated prompt tokens allowed per request
+
+    Returns:
+        A single request carrying ``agent_def`` unchanged when everything fits,
+        otherwise one request per part with a derived agent definition
+    """
+    tree = list(tree)
+    if estimate_prompt_tokens(agent_def, tree, file_contents) <= token_budget:
+        return [AgentRequest(agent=agent_def, tree=tree, file_contents=dict(file_contents))]
+
+    empty_agent = {**agent_def, "file_assignments": []}
+    base_tokens = estimate_prompt_tokens(empty_agent, tree, {})
+    if base_tokens > token_budget // 2:
+        tree = truncate_tree(tree, int(token_budget * MAX_TREE_SHARE))
+        base_tokens = estimate_prompt_tokens(empty_agent, tree, {})
+    capacity = max(1, token_budget - base_tokens)
+
+    costs: dict[str, int] = {}
+    contents: dict[str, str] = {}
+    truncated: list[str] = []
+    for path, content in file_contents.items():
+        cost = file_token_cost(path, content)
+        if cost > capacity:
+            content = _truncate_content(path, content, capacity)
+            cost = file_token_cost(path, content)
+            truncated.append(path)
+        contents[path] = content
+        costs[path] = cost
+
+    # A deduplicated file travels with the file its stub or diff refers to
+    bins = _balanced_bins(costs, capacity, duplicate_references(contents))
+    if len(bins) <= 1:
+        return [AgentRequest(agent=agent_def, tree=tree, file_contents=contents, truncated_files=tuple(truncated))]
+
+    total = len(bins)
+    agent_id = agent_def.get("id") or agent_def.get("name") or "agent"
+    agent_name = agent_def.get("name", "Analysis Agent")
+    logger.info(
+        f"[bold]Phase 3:[/bold] {agent_name} exceeds the {token_budget:,}-token prompt budget; "
+        f"splitting {len(contents)} files into {total} requests"
+    )
+    requests = []
+    for index, paths in enumerate(bins, start=1):
+        part_agent = {
+            **agent_def,
+            "id": f"{agent_id}.{index}",
+            "name": f"{agent_name} (part {index}/{total})",
+            "file_assignments": paths,
+            "parent_id": agent_id,
+        }
+        requests.append(
+            AgentRequest(
+                agent=part_agent,
+                tree=tree,
+                file_contents={path: contents[path] for path in paths},
+                part=index,
+                total=total,
+                truncated_files=tuple(path for path in truncated if path in paths),
+            )
+        )
+    return requests
+
+
+def merge_agent_results(agent_def: Mapping[str, Any], results: Sequence[Any]) -> dict[str, Any]:
+    """Combine the results of a split agent's requests into one result for the planned agent."""
+
+    agent_name = agent_def.get("name", "Analysis Agent")
+    total = len(results)
+    sections: list[str] = []
+    errors: list[str] = []
+    for index, result in enumerate(results, start=1):
+        if isinstance(result, BaseException):
+            errors.append(f"part {index}/{total}: {result}")
+            continue
+        if not isinstance(result, Mapping):
+            sections.append(f"## Part {index}/{total}\n{result}")
+            continue
+        if result.get("error"):
+            errors.append(f"part {index}/{total}: {result['error']}")
+        findings = result.get("findings")
+        if findings:
+            text = findings if isinstance(findings, str) else str(findings)
+            sections.append(f"## Part {index}/{total}\n{text}")
+
+    merged: dict[str, Any] = {"agent": agent_name, "findings": "\n\n".join(sections) or None, "parts": total}
+    if errors:
+        merged["errors"] = errors
+        if not sections:
+            merged["error"] = "; ".join(errors)
+    return merged
+
+
+def truncate_tree(tree: Sequence[str], max_tokens: int) -> list[str]:
+    """Keep the leading tree lines that fit ``max_tokens`` and mark the cut."""
+
+    kept: list[str] = []
+    used = 0
+    for line in tree:
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            return [*kept, TREE_TRUNCATION_MARKER]
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def file_token_cost(path: str, content: str) -> int:
+    """Estimated prompt tokens one file adds: its block, its ASSIGNED FILES line and the separators."""
+
+    return estimate_tokens(f'<file path="{path}">\n{content}\n</file>') + estimate_tokens(f"- {path}") + 2
+
+
+def _truncate_content(path: str, content: str, capacity: int) -> str:
+    overhead = file_token_cost(path, "") + estimate_tokens(TRUNCATION_MARKER)
+    keep_chars = tokens_to_chars(max(0, capacity - overhead))
+    return content[:keep_chars] + TRUNCATION_MARKER
+
+
+def _balanced_bins(
+    costs: Mapping[str, int],
+    capacity: int,
+    attached: Mapping[str, str] | None = None,
+) -> list[list[str]]:
+    """
+    Pack files into the fewest requests the budget allows, balancing their sizes.
+
+    Files are placed largest first onto the least loaded request that still has
+    room; a new request is opened only when none has. Files in ``attached`` are
+    placed together with the file they map to. Each request keeps the original
+    file order.
+    """
+    if not costs:
+        return []
+    attached = attached or {}
+    units: dict[str, list[str]] = {}
+    for path in costs:
+        units.setdefault(attached.get(path, path), []).append(path)
+    unit_costs = {unit: sum(costs[path] for path in paths) for unit, paths in units.items()}
+    count = max(1, math.ceil(sum(costs.values()) / capacity))
+    loads = [0] * count
+    members: list[set[str]] = [set() for _ in range(count)]
+    for unit in sorted(unit_costs, key=lambda item: (-unit_costs[item], item)):
+        candidates = [index for index in range(len(loads)) if loads[index] + unit_costs[unit] <= capacity]
+        if candidates:
+            target = min(candidates, key=lambda index: (loads[index], index))
+        else:
+            loads.append(0)
+            members.append(set())
+            target = len(loads) - 1
+        loads[target] += unit_costs[unit]
+        members[target].update(units[unit])
+    order = list(costs)
+    return [[path for path in order if path in group] for group in members if group]
+
+
+__all__ = [
+    "AgentRequest",
+    "MAX_TREE_SHARE",
+    "TRUNCATION_MARKER",
+    "estimate_prompt_tokens",
+    "file_token_cost",
+    "merge_agent_results",
+    "pack_agent_requests",
+    "phase3_token_budget",
+    "truncate_tree",
+]
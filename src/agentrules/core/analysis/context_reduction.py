@@ -0,0 +1,276 @@
+"""Size reduction of Phase 3 file contents before they are packed into prompts.
+
+The minification pass (see `agentrules.core.utils.minify`) normalizes every
+file: license banners, trailing whitespace and blank-line runs, and optionally
+comments and long literal tables. Files repeating another assigned file are then
+sent once (see `agentrules.core.utils.dedupe`): exact copies become a reference
+to the first copy and, optionally, near-copies become a diff against it.
+
+In outline mode, source files above a size threshold are replaced by structural
+outlines (see `agentrules.core.utils.outline`). The files most central to the
+agent's role keep their full bodies: those named in the agent's description or
+responsibilities, then those referenced most by the agent's other files. Files
+that other files were deduplicated against always keep their full bodies, since
+the references and diffs pointing at them assume the agent sees them in full.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any
+
+from agentrules.core.utils.dedupe import find_identical, find_near_duplicates, unified_diff_text
+from agentrules.core.utils.minify import minify_text
+from agentrules.core.utils.outline import outline_source, supports_outline
+from agentrules.core.utils.tokens import estimate_tokens
+
+logger = logging.getLogger("project_extractor")
+
+DEFAULT_OUTLINE_THRESHOLD_KB = 16
+DEFAULT_OUTLINE_KEEP_FULL = 2
+_INDEX_STEMS = frozenset({"__init__", "index", "mod", "main"})
+_WORD = re.compile(r"\w+")
+_DUPLICATE_REFERENCE = re.compile(r"^\[(?:identical to (?P<identical>[^\n]+)\]$|near-duplicate of (?P<near>[^;\n]+);)")
+
+
+@dataclass(frozen=True)
+class ContextOptions:
+    """How Phase 3 file contents are reduced before packing."""
+
+    outline: bool = False
+    outline_threshold_bytes: int = DEFAULT_OUTLINE_THRESHOLD_KB * 1024
+    keep_full_files: int = DEFAULT_OUTLINE_KEEP_FULL
+    minify: bool = False
+    drop_comments: bool = False
+    drop_literal_tables: bool = False
+    dedupe: bool = True
+    near_duplicates: bool = False
+    agent_token_budget: int | None = None
+    """When set, only the highest-ranked files fitting this many tokens are sent (see `file_selection`)."""
+    tool_access: bool = False
+    """When set, agents receive a file manifest and read files through tools instead of inlined contents."""
+
+    @property
+    def active(self) -> bool:
+        return self.outline or self.minify or self.dedupe or self.near_duplicates
+
+
+@dataclass(frozen=True)
+class FileReduction:
+    """Bytes and estimated tokens a reduction removed from one file."""
+
+    path: str
+    method: str
+    bytes_before: int
+    bytes_after: int
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def rank_central_files(agent_def: Mapping[str, Any], file_contents: Mapping[str, str]) -> list[str]:
+    """
+    Order an agent's files from most to least central to its role.
+
+    Files whose name appears in the agent's name, description or responsibilities
+    come first; within each group files are ordered by how many of the agent's
+    other files mention them, then by plan order.
+    """
+    role_text = " ".join(
+        str(part)
+        for part in (
+            agent_def.get("name", ""),
+            agent_def.get("description", ""),
+            *(agent_def.get("responsibilities", []) or []),
+        )
+    ).lower()
+    paths = list(file_contents)
+    lowered = {path: text.lower() for path, text in file_contents.items()}
+    # Each text is split into words once; a name made of word characters is then
+    # mentioned exactly when it is one of those words.
+    words = {path: set(_WORD.findall(text)) for path, text in lowered.items()}
+    files_mentioning = Counter(word for found in words.values() for word in found)
+    role_words = set(_WORD.findall(role_text))
+    scores: dict[str, tuple[int, int]] = {}
+    for path in paths:
+        name = _module_name(path)
+        if len(name) < 3:
+            scores[path] = (int(path.lower() in role_text), 0)
+            continue
+        if _WORD.fullmatch(name):
+            in_role = path.lower() in role_text or name in role_words
+            references = files_mentioning[name] - (name in words[path])
+        else:
+            pattern = re.compile(rf"\b{re.escape(name)}\b")
+            in_role = path.lower() in role_text or pattern.search(role_text) is not None
+            references = sum(1 for other in paths if other != path and pattern.search(lowered[other]) is not None)
+        scores[path] = (int(in_role), references)
+    position = {path: index for index, path in enumerate(paths)}
+    return sorted(paths, key=lambda path: (-scores[path][0], -scores[path][1], position[path]))
+
+
+def prepare_file_contents(
+    agent_def: Mapping[str, Any],
+    file_contents: Mapping[str, str],
+    options: ContextOptions | None,
+) -> dict[str, str]:
+    """Apply ``options`` to an agent's loaded files; see `reduce_file_contents`."""
+
+    contents, _ = reduce_file_contents(agent_def, file_contents, options)
+    return contents
+
+
+def reduce_file_contents(
+    agent_def: Mapping[str, Any],
+    file_contents: Mapping[str, str],
+    options: ContextOptions | None,
+) -> tuple[dict[str, str], list[FileReduction]]:
+    """
+    Apply ``options`` to an agent's loaded files.
+
+    Args:
+        agent_def: Agent definition from the Phase 2 plan
+        file_contents: Loaded contents of the agent's assigned files
+        options: Reduction options; ``None`` leaves the contents untouched
+
+    Returns:
+        The file contents to inline in the agent's prompt, in the original order,
+        and one entry per file that got smaller
+    """
+    contents = dict(file_contents)
+    if options is None or not options.active:
+        return contents, []
+    methods: dict[str, list[str]] = {}
+    if options.minify:
+        for path, text in contents.items():
+            minified = minify_text(
+                path,
+                text,
+                drop_comments=options.drop_comments,
+                drop_literal_tables=options.drop_literal_tables,
+            )
+            if len(minified) < len(text):
+                contents[path] = minified
+                methods.setdefault(path, []).append("minify")
+    references: dict[str, str] = {}
+    if options.dedupe or options.near_duplicates:
+        for path, (method, original) in _deduplicate(contents, near_duplicates=options.near_duplicates).items():
+            references[path] = original
+            methods.setdefault(path, []).append(method)
+    if options.outline:
+        # Duplicates are already short, and the files they point to must stay whole
+        keep = set(references) | set(references.values())
+        for path in _outline_candidates(agent_def, contents, options):
+            if path in keep:
+                continue
+            outline = outline_source(path, contents[path])
+            if outline is not None:
+                contents[path] = outline
+                methods.setdefault(path, []).append("outline")
+
+    reductions = [
+        _measure(path, "+".join(applied), file_contents[path], contents[path]) for path, applied in methods.items()
+    ]
+    if reductions:
+        for reduction in reductions:
+            logger.debug(
+                f"Phase 3: {reduction.path} ({reduction.method}) saved {reduction.bytes_saved:,} bytes, "
+                f"~{reduction.tokens_saved:,} tokens"
+            )
+        logger.info(
+            f"[bold]Phase 3:[/bold] reduced {len(reductions)} file(s) for "
+            f"{agent_def.get('name', 'Analysis Agent')}, "
+            f"~{sum(reduction.tokens_saved for reduction in reductions):,} tokens saved"
+        )
+    return contents, reductions
+
+
+def duplicate_references(file_contents: Mapping[str, str]) -> dict[str, str]:
+    """Map each deduplicated file in ``file_contents`` to the file its stub or diff refers to."""
+
+    references: dict[str, str] = {}
+    for path, text in file_contents.items():
+        match = _DUPLICATE_REFERENCE.match(text)
+        if match is None:
+            continue
+        original = match["identical"] or match["near"]
+        if original in file_contents and original != path:
+            references[path] = original
+    return references
+
+
+def _deduplicate(contents: dict[str, str], *, near_duplicates: bool) -> dict[str, tuple[str, str]]:
+    """Replace repeated files in ``contents`` in place; returns the method and original per replaced path."""
+
+    applied: dict[str, tuple[str, str]] = {}
+    for path, original in find_identical(contents).items():
+        contents[path] = f"[identical to {original}]"
+        applied[path] = ("dedupe", original)
+    if near_duplicates:
+        remaining = {path: text for path, text in contents.items() if path not in applied}
+        for path, base in find_near_duplicates(remaining).items():
+            diff = unified_diff_text(base, contents[base], path, contents[path])
+            note = f"[near-duplicate of {base}; unified diff against it follows]\n{diff}"
+            # A diff only helps when it is clearly smaller than the file itself
+            if len(note) < len(contents[path]) // 2:
+                contents[path] = note
+                applied[path] = ("near-duplicate", base)
+    return applied
+
+
+def _outline_candidates(
+    agent_def: Mapping[str, Any],
+    contents: Mapping[str, str],
+    options: ContextOptions,
+) -> list[str]:
+    candidates = [
+        path
+        for path, text in contents.items()
+        if supports_outline(path) and len(text.encode("utf-8", "replace")) >= options.outline_threshold_bytes
+    ]
+    if not candidates:
+        return []
+    keep_full = set(rank_central_files(agent_def, contents)[: options.keep_full_files])
+    return [path for path in candidates if path not in keep_full]
+
+
+def _measure(path: str, method: str, before: str, after: str) -> FileReduction:
+    return FileReduction(
+        path=path,
+        method=method,
+        bytes_before=len(before.encode("utf-8", "replace")),
+        bytes_after=len(after.encode("utf-8", "replace")),
+        tokens_before=estimate_tokens(before),
+        tokens_after=estimate_tokens(after),
+    )
+
+
+def _module_name(path: str) -> str:
+    pure = PurePosixPath(path)
+    if pure.stem in _INDEX_STEMS and pure.parent.name:
+        return pure.parent.name.lower()
+    return pure.stem.lower()
+
+
+__all__ = [
+    "ContextOptions",
+    "DEFAULT_OUTLINE_KEEP_FULL",
+    "DEFAULT_OUTLINE_THRESHOLD_KB",
+    "FileReduction",
+    "duplicate_references",
+    "prepare_file_contents",
+    "rank_central_files",
+    "reduce_file_contents",
+]
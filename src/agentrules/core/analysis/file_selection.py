@@ -0,0 +1,283 @@
+"""Budgeted selection of the files a Phase 3 agent is shown.
+
+Without a budget every assigned file is sent, splitting the agent into several
+requests when needed. With a per-agent token budget the files are ranked by a
+weighted score instead and the budget is filled greedily from the top, so a
+cheap run over a large repository still covers the files that matter most:
+
+- import centrality: how many of the agent's other files import the file
+- churn: how many recent local commits touched the file
+- entry points: ``main`` modules, CLIs, servers and package indexes
+- size: smaller files cost less of the budget
+
+Files that do not fit are reported with the reason they were left out.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import subprocess
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from agentrules.core.analysis.context_packing import file_token_cost
+
+logger = logging.getLogger("project_extractor")
+
+DEFAULT_CHURN_DAYS = 180
+DEFAULT_CHURN_MAX_COMMITS = 2000
+_GIT_TIMEOUT_SECONDS = 10
+
+ENTRY_POINT_STEMS = frozenset({"main", "__main__", "app", "cli", "server", "manage", "wsgi", "asgi", "index", "lib"})
+_INDEX_STEMS = frozenset({"__init__", "index", "mod", "main"})
+_MAIN_GUARD = re.compile(r"""^if __name__ == ['"]__main__['"]\s*:""", re.MULTILINE)
+_IMPORT_LINE = re.compile(
+    r"""^\s*(?:from\s+\S+\s+import\b|import\b|export\b.*\bfrom\s+['"]|.*\brequire\(\s*['"]|use\s+[\w:]+|"""
+    r"""#include\s|mod\s+\w+\s*;).*$""",
+    re.MULTILINE,
+)
+
+
+@dataclass(frozen=True)
+class SelectionWeights:
+    """Relative weight of each ranking signal; the score is their weighted sum."""
+
+    centrality: float = 0.4
+    churn: float = 0.3
+    entry_point: float = 0.2
+    size: float = 0.1
+
+
+@dataclass(frozen=True)
+class FileScore:
+    """Ranking signals of one file and the score derived from them."""
+
+    path: str
+    score: float
+    tokens: int
+    importers: int = 0
+    commits: int = 0
+    entry_point: bool = False
+
+
+@dataclass(frozen=True)
+class OmittedFile:
+    """A file left out of an agent's context, and why."""
+
+    path: str
+    reason: str
+    tokens: int
+    score: float
+
+
+@dataclass(frozen=True)
+class FileSelection:
+    """Files kept within an agent's budget, in plan order, and those omitted."""
+
+    contents: dict[str, str]
+    omitted: tuple[OmittedFile, ...] = ()
+    scores: tuple[FileScore, ...] = ()
+
+    @property
+    def kept_tokens(self) -> int:
+        return sum(score.tokens for score in self.scores if score.path in self.contents)
+
+
+def git_churn(
+    directory: Path,
+    *,
+    since_days: int = DEFAULT_CHURN_DAYS,
+    max_commits: int = DEFAULT_CHURN_MAX_COMMITS,
+) -> dict[str, int]:
+    """
+    Count recent commits touching each file under ``directory`` from the local git history.
+
+    Paths are relative to ``directory``. Returns an empty mapping outside a git
+    work tree or when git is unavailable.
+    """
+    try:
+        completed = subprocess.run(
+            [
+                "git",
+                "-C",
+                str(directory),
+                "log",
+                f"--since={since_days}.days",
+                f"--max-count={max_commits}",
+                "--no-merges",
+                "--no-renames",
+                "--relative",
+                "--name-only",
+                "--pretty=format:",
+            ],
+            capture_output=True,
+            check=False,
+            timeout=_GIT_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.SubprocessError) as error:
+        logger.debug(f"git log failed: {error}")
+        return {}
+    if completed.returncode != 0:
+        return {}
+    lines = completed.stdout.decode("utf-8", errors="replace").splitlines()
+    return dict(Counter(line.strip() for line in lines if line.strip()))
+
+
+def import_counts(file_contents: Mapping[str, str]) -> dict[str, int]:
+    """Number of the other given files whose import statements name each file's module."""
+
+    paths = list(file_contents)
+    import_text = {path: "\n".join(_IMPORT_LINE.findall(text)).lower() for path, text in file_contents.items()}
+    counts: dict[str, int] = {}
+    for path in paths:
+        name = _module_name(path)
+        if len(name) < 3:
+            counts[path] = 0
+            continue
+        pattern = re.compile(rf"(?<![\w-]){re.escape(name)}(?![\w-])")
+        counts[path] = sum(1 for other in paths if other != path and pattern.search(import_text[other]))
+    return counts
+
+
+def is_entry_point(path: str, text: str = "") -> bool:
+    """Whether ``path`` looks like a program or package entry point."""
+
+    pure = PurePosixPath(path)
+    if pure.stem.lower() in ENTRY_POINT_STEMS:
+        return True
+    return _MAIN_GUARD.search(text) is not None
+
+
+def score_files(
+    file_contents: Mapping[str, str],
+    *,
+    churn: Mapping[str, int] | None = None,
+    weights: SelectionWeights | None = None,
+) -> list[FileScore]:
+    """Score each file on import centrality, churn, entry-point status and size, in plan order."""
+
+    churn = churn or {}
+    weights = weights or SelectionWeights()
+    tokens = {path: file_token_cost(path, text) for path, text in file_contents.items()}
+    importers = import_counts(file_contents)
+    commits = {path: churn.get(path, 0) for path in file_contents}
+    top_importers = max(importers.values(), default=0)
+    top_commits = max(commits.values(), default=0)
+    top_tokens = max(tokens.values(), default=0)
+
+    scores = []
+    for path, text in file_contents.items():
+        entry_point = is_entry_point(path, text)
+        score = (
+            weights.centrality * _scaled(importers[path], top_importers)
+            + weights.churn * _scaled(commits[path], top_commits)
+            + weights.entry_point * entry_point
+            + weights.size * (1.0 - _scaled(tokens[path], top_tokens))
+        )
+        scores.append(
+            FileScore(
+                path=path,
+                score=round(score, 4),
+                tokens=tokens[path],
+                importers=importers[path],
+                commits=commits[path],
+                entry_point=entry_point,
+            )
+        )
+    return scores
+
+
+def select_files(
+    agent_def: Mapping[str, Any],
+    file_contents: Mapping[str, str],
+    *,
+    token_budget: int,
+    churn: Mapping[str, int] | None = None,
+    weights: SelectionWeights | None = None,
+) -> FileSelection:
+    """
+    Keep the highest-ranked files of an agent that fit ``token_budget``.
+
+    Files are taken in score order and each one that still fits is kept, so a
+    large file that does not fit leaves room for smaller ones after it.
+
+    Args:
+        agent_def: Agent definition from the Phase 2 plan
+        file_contents: Loaded contents of the agent's assigned files
+        token_budget: Estimated tokens the kept file blocks may use
+        churn: Optional commit counts per path (see `git_churn`)
+        weights: Weights of the ranking signals; defaults to `SelectionWeights()`
+
+    Returns:
+        The kept contents in plan order with the omitted files and all scores
+    """
+    scores = score_files(file_contents, churn=churn, weights=weights)
+    ranked = sorted(range(len(scores)), key=lambda index: (-scores[index].score, index))
+    kept: set[str] = set()
+    omitted: list[OmittedFile] = []
+    used = 0
+    for rank, index in enumerate(ranked, start=1):
+        entry = scores[index]
+        if used + entry.tokens <= token_budget:
+            kept.add(entry.path)
+            used += entry.tokens
+            continue
+        omitted.append(
+            OmittedFile(
+                path=entry.path,
+                reason=(
+                    f"ranked {rank} of {len(scores)} (score {entry.score:.2f}); needs ~{entry.tokens:,} tokens, "
+                    f"{token_budget - used:,} left in the budget"
+                ),
+                tokens=entry.tokens,
+                score=entry.score,
+            )
+        )
+
+    selection = FileSelection(
+        contents={path: text for path, text in file_contents.items() if path in kept},
+        omitted=tuple(omitted),
+        scores=tuple(scores),
+    )
+    if omitted:
+        agent_name = agent_def.get("name", "Analysis Agent")
+        logger.info(
+            f"[bold]Phase 3:[/bold] {agent_name} keeps {len(kept)} of {len(scores)} files "
+            f"(~{used:,} of {token_budget:,} budgeted tokens); {len(omitted)} omitted"
+        )
+        for item in omitted:
+            logger.debug(f"  omitted {item.path}: {item.reason}")
+    return selection
+
+
+def _scaled(value: int, top: int) -> float:
+    # Logarithmic so one outlier does not flatten every other file's signal
+    if top <= 0:
+        return 0.0
+    return math.log1p(value) / math.log1p(top)
+
+
+def _module_name(path: str) -> str:
+    pure = PurePosixPath(path)
+    if pure.stem in _INDEX_STEMS and pure.parent.name:
+        return pure.parent.name.lower()
+    return pure.stem.lower()
+
+
+__all__ = [
+    "DEFAULT_CHURN_DAYS",
+    "FileScore",
+    "FileSelection",
+    "OmittedFile",
+    "SelectionWeights",
+    "git_churn",
+    "import_counts",
+    "is_entry_point",
+    "score_files",
+    "select_files",
+]
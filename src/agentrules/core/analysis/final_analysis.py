@@ -14,8 +14,14 @@ import logging  # Used for logging events and errors.
 from collections.abc import Sequence
 
 from agentrules.config.prompts.final_analysis_prompt import (
+    format_final_analysis_partial_prompt,  # Function to format the prompt condensing an oversized report.
     format_final_analysis_prompt,  # Function to format the final analysis prompt.
 )
+from agentrules.core.analysis.consolidation import (
+    architect_model_name,
+    consolidation_token_budget,
+    reduce_payload,
+)
 
 # Architect factory is resolved at call time to honor test monkeypatching
 
@@ -47,9 +53,17 @@ class FinalAnalysis:
     # This method sets up the initial state of the FinalAnalysis class.
     # ====================================================
 
-    def __init__(self):
-        """Initialize Final Analysis. Architect resolved lazily in run()."""
+    def __init__(self, token_budget: int | None = None):
+        """Initialize Final Analysis. Architect resolved lazily in run().
+
+        Args:
+            token_budget: Maximum estimated tokens of the consolidated report sent in a
+                single call; larger reports are condensed hierarchically first. Defaults
+                to what the final model's context window leaves next to the prompt
+                template and the project structure.
+        """
         self.architect = None
+        self.token_budget = token_budget
 
     # ====================================================
     # Run Method
@@ -72,9 +86,6 @@ class FinalAnalysis:
             Dictionary containing the final analysis and token usage.
         """
         try:
-            # Format the prompt using the template from the prompts file.
-            prompt = format_final_analysis_prompt(consolidated_report, project_structure)
-
             logger.info("[bold]Final Analysis:[/bold] Creating Agent rules from consolidated report")
 
             # Resolve architect at call time to allow test monkeypatches
@@ -82,6 +93,22 @@ class FinalAnalysis:
                 from agentrules.core.agents.factory import factory as _factory
                 self.architect = _factory.get_architect_for_phase("final")
 
+            # Condense oversized reports so the final prompt, tree included, stays within the model's context.
+            token_budget = self.token_budget or consolidation_token_budget(
+                architect_model_name(self.architect),
+                format_final_analysis_prompt({}, project_structure),
+            )
+            consolidated_report = await reduce_payload(
+                consolidated_report,
+                self.architect,
+                token_budget=token_budget,
+                method="final_analysis",
+                format_prompt=format_final_analysis_partial_prompt,
+            )
+
+            # Format the prompt using the template from the prompts file.
+            prompt = format_final_analysis_prompt(consolidated_report, project_structure)
+
             # Use the architect to perform the final analysis with the formatted prompt.
             result = await self.architect.final_analysis(consolidated_report, prompt)
 
@@ -24,6 +24,7 @@ from agentrules.config.prompts.phase_1_prompts import (  # Prompts used for conf
     get_dependency_agent_prompt,
 )
 from agentrules.config.tools import TOOL_SETS
+from agentrules.core.agent_tools.tool_calls import parse_tool_calls
 from agentrules.core.agents.factory.factory import get_architect_for_phase, get_researcher_architect
 from agentrules.core.types.tool_config import Tool
 
@@ -99,13 +100,15 @@ class Phase1Analysis:
     # Run Method
     # Executes the Initial Discovery phase.
     # ----------------------------------------------------
-    async def run(self, tree: list[str], package_info: dict) -> dict:
+    async def run(self, tree: list[str], package_info: dict, module_graph: str | None = None) -> dict:
         """
         Run the Initial Discovery Phase.
 
         Args:
             tree: List of strings representing the project directory tree
             package_info: Dictionary containing information about project dependencies
+            module_graph: Optional summary of the project's import graph (modules,
+                import cycles, directory coupling) given to the structure agents
 
         Returns:
             Dictionary containing the results of the phase
@@ -164,6 +167,8 @@ class Phase1Analysis:
             "research_agent_error": research_findings.get("error"),
             "research_status": research_findings.get("status"),
         }
+        if module_graph:
+            structure_context["module_graph"] = module_graph
         tech_stack_context = dict(structure_context)
 
         logging.info("[bold]Phase 1, Part 3:[/bold] Running structure and tech stack agents in parallel")
@@ -181,12 +186,15 @@ class Phase1Analysis:
         ]
 
         # Return the combined results.
-        return {
+        results = {
             "phase": "Initial Discovery",
             "initial_findings": initial_results,
             "documentation_research": research_findings,
             "package_info": package_info,
         }
+        if module_graph:
+            results["module_graph"] = module_graph
+        return results
 
     async def _run_researcher_with_tools(
         self,
@@ -290,36 +298,15 @@ class Phase1Analysis:
     async def _handle_anthropic_tool_calls(self, tool_calls: Any) -> list[dict[str, Any]]:
         """Execute Anthropic-style tool calls and return structured results."""
         results: list[dict[str, Any]] = []
-        if not tool_calls:
-            return results
-
-        for call in tool_calls or []:
-            fn_name = (call.get("function", {}) or {}).get("name") or call.get("name")
-            raw_args = (call.get("function", {}) or {}).get("arguments")
-            args: dict[str, Any] = {}
-            if isinstance(raw_args, str):
-                try:
-                    args = json.loads(raw_args)
-                except Exception:
-                    args = {}
-            elif isinstance(call.get("input"), dict):
-                args = call.get("input")
-
-            results.append(await self._execute_supported_tool(fn_name, args))
-
+        for call in parse_tool_calls({"tool_calls": tool_calls}):
+            results.append(await self._execute_supported_tool(call.name, call.args))
         return results
 
     async def _handle_gemini_function_calls(self, function_calls: Any) -> list[dict[str, Any]]:
         """Execute Gemini-style function calls and return structured results."""
         results: list[dict[str, Any]] = []
-        if not function_calls:
-            return results
-
-        for fc in function_calls or []:
-            fn_name = fc.get("name")
-            args = fc.get("args", {}) or {}
-            results.append(await self._execute_supported_tool(fn_name, args))
-
+        for call in parse_tool_calls({"function_calls": function_calls}):
+            results.append(await self._execute_supported_tool(call.name, call.args))
         return results
 
     async def _execute_supported_tool(self, fn_name: Any, args: dict[str, Any]) -> dict[str, Any]:
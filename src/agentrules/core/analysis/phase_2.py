@@ -10,17 +10,30 @@ It defines the methods needed for creating a detailed analysis plan based on Pha
 # ====================================================
 
 import logging  # Used for logging messages
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 
 from agentrules.config.prompts.phase_2_prompts import (  # Prompts for Phase 2
+    format_file_groups,
+    format_phase2_clustered_prompt,
     format_phase2_prompt,
+    format_phase2_structured_prompt,
 )
 from agentrules.core.agents import get_architect_for_phase  # Added import for dynamic model configuration
+from agentrules.core.analysis.clustering import FileCluster, apply_cluster_plan, local_agent_plan
 from agentrules.core.analysis.events import AnalysisEvent, AnalysisEventSink, NullEventSink
+from agentrules.core.configuration.models import PlanningMode
+from agentrules.core.streaming import StreamEventType
+from agentrules.core.utils.file_system.file_index import FileIndex
 from agentrules.core.utils.parsers.agent_parser import (  # Function to parse agent definitions
+    IncrementalAgentParser,
     extract_agent_fallback,
     parse_agents_from_phase2,
 )
+from agentrules.core.utils.parsers.structured_plan import (
+    AGENT_PLAN_SCHEMA,
+    PlanValidationError,
+    parse_structured_plan,
+)
 
 # ====================================================
 # Logger Initialization
@@ -45,13 +58,27 @@ class Phase2Analysis:
     # Initialization
     # Sets up the Phase 2 analysis.
     # ====================================================
-    def __init__(self, events: AnalysisEventSink | None = None):
+    def __init__(self, events: AnalysisEventSink | None = None, planning: PlanningMode = "model"):
         """
         Initialize the Phase 2 analysis with the architect from configuration.
+
+        Args:
+            events: Optional sink receiving the parsed agent plan
+            planning: ``"model"`` lets the model assign files from the tree;
+                ``"clustered"`` has it name and adjust locally clustered file groups
+                (planning locally when there is only one group); ``"local"`` never
+                calls the model; ``"structured"`` requests the plan as JSON conforming
+                to a schema, enforced by the provider
         """
         # Use the factory function to get the appropriate architect based on configuration
         self.architect = get_architect_for_phase("phase2")
         self._events: AnalysisEventSink = events or NullEventSink()
+        self.planning: PlanningMode = planning
+
+    @property
+    def streams_agents(self) -> bool:
+        """Whether `run` can hand out agents while the plan is still being generated."""
+        return self.planning == "model" and bool(getattr(self.architect, "supports_streaming", False))
 
     def set_event_sink(self, events: AnalysisEventSink | None) -> None:
         """Update the event sink after construction."""
@@ -62,17 +89,34 @@ class Phase2Analysis:
     # Run Method
     # Executes the methodical planning phase.
     # ====================================================
-    async def run(self, phase1_results: dict, tree: Sequence[str] | None = None) -> dict:
+    async def run(
+        self,
+        phase1_results: dict,
+        tree: Sequence[str] | None = None,
+        clusters: Sequence[FileCluster] | None = None,
+        on_agent: Callable[[dict], None] | None = None,
+        file_index: FileIndex | None = None,
+    ) -> dict:
         """
         Run the Methodical Planning Phase using the configured model.
 
         Args:
             phase1_results: Dictionary containing the results from Phase 1
             tree: List of strings representing the project directory tree
+            clusters: Locally clustered file groups; used unless planning is ``"model"``
+            on_agent: Called with each agent definition as soon as the streamed plan
+                closes it (see `streams_agents`); otherwise the plan is generated whole
+            file_index: Snapshot index that structured plans are validated against
 
         Returns:
             Dictionary containing the analysis plan and token usage
         """
+        if clusters and self.planning != "model":
+            return await self._run_clustered(phase1_results, clusters)
+        if self.planning == "structured":
+            return await self._run_structured(phase1_results, tree, file_index)
+        if on_agent is not None and self.streams_agents:
+            return await self._run_streaming(phase1_results, tree, on_agent)
         try:
             # ====================================================
             # Prompt Formatting
@@ -142,6 +186,127 @@ class Phase2Analysis:
             logger.error(f"[bold red]Error:[/bold red] in Phase 2: {str(e)}")
             return {"error": str(e)}
 
+    async def _run_clustered(self, phase1_results: dict, clusters: Sequence[FileCluster]) -> dict:
+        """Plan from pre-clustered file groups, asking the model only to name and adjust them."""
+
+        if self.planning == "local" or len(clusters) == 1:
+            logger.info(f"[bold]Phase 2:[/bold] Planning {len(clusters)} file groups locally without a model call")
+            agents = local_agent_plan(clusters)
+            self._publish_agent_plan(phase="phase2", agents=agents)
+            return {"plan": format_file_groups(clusters), "agents": agents, "planning": "local"}
+
+        try:
+            prompt = format_phase2_clustered_prompt(phase1_results, clusters)
+            logger.info(f"[bold]Phase 2:[/bold] Naming and adjusting {len(clusters)} pre-clustered file groups")
+            analysis_plan_response = await self.architect.create_analysis_plan(phase1_results, prompt)
+            if "error" in analysis_plan_response and analysis_plan_response["error"]:
+                logger.error(f"[bold red]Error:[/bold red] {analysis_plan_response['error']}")
+                return analysis_plan_response
+
+            plan_text = analysis_plan_response.get("plan", "")
+            agents = apply_cluster_plan(parse_agents_from_phase2(plan_text), clusters)
+            logger.info(f"[bold green]Success:[/bold green] Planned {len(agents)} agents from the file groups")
+            self._publish_agent_plan(phase="phase2", agents=agents)
+            analysis_plan_response["agents"] = agents
+            analysis_plan_response["planning"] = "clustered"
+            return analysis_plan_response
+        except Exception as e:
+            logger.error(f"[bold red]Error:[/bold red] in Phase 2: {str(e)}")
+            return {"error": str(e)}
+
+    async def _run_structured(
+        self,
+        phase1_results: dict,
+        tree: Sequence[str] | None,
+        file_index: FileIndex | None,
+    ) -> dict:
+        """Request the plan as schema-conforming JSON and validate it against the file index."""
+
+        try:
+            prompt = format_phase2_structured_prompt(phase1_results, tree, AGENT_PLAN_SCHEMA)
+            logger.info("[bold]Phase 2:[/bold] Creating a structured (JSON schema) analysis plan")
+            response = await self.architect.create_structured_plan(phase1_results, prompt, AGENT_PLAN_SCHEMA)
+            if response.get("error"):
+                logger.error(f"[bold red]Error:[/bold red] {response['error']}")
+                return response
+
+            plan_text = response.get("plan") or ""
+            plan = parse_structured_plan(plan_text, file_index)
+            logger.info(f"[bold green]Success:[/bold green] Structured plan defines {len(plan.agents)} agents")
+            self._publish_agent_plan(phase="phase2", agents=plan.agents)
+            return {
+                "plan": plan_text,
+                "reasoning": plan.reasoning,
+                "agents": plan.agents,
+                "planning": "structured",
+                "unknown_files": plan.unknown_files,
+            }
+        except PlanValidationError as e:
+            logger.error(f"[bold red]Error:[/bold red] Invalid structured plan: {e}")
+            return {"error": f"Invalid structured plan: {e}", "agents": []}
+        except Exception as e:
+            logger.error(f"[bold red]Error:[/bold red] in Phase 2: {str(e)}")
+            return {"error": str(e)}
+
+    async def _run_streaming(
+        self,
+        phase1_results: dict,
+        tree: Sequence[str] | None,
+        on_agent: Callable[[dict], None],
+    ) -> dict:
+        """Stream the plan, handing out each agent as it closes and stopping at ``</analysis_plan>``."""
+
+        parser = IncrementalAgentParser()
+        try:
+            prompt = format_phase2_prompt(phase1_results, tree)
+            logger.info("[bold]Phase 2:[/bold] Streaming analysis plan; agents start as soon as they are defined")
+            stream = self.architect.stream_analyze({"phase1_results": phase1_results, "formatted_prompt": prompt})
+            try:
+                async for chunk in stream:
+                    if chunk.event_type == StreamEventType.ERROR:
+                        raise RuntimeError(chunk.text or "Phase 2 stream failed")
+                    if chunk.event_type != StreamEventType.TEXT_DELTA or not chunk.text:
+                        continue
+                    for agent in parser.feed(chunk.text):
+                        logger.info(
+                            "  [bold cyan]Agent %s:[/bold cyan] %s with %d files (dispatched)",
+                            agent["id"].split("_")[-1],
+                            agent.get("name", "Unknown"),
+                            len(agent.get("file_assignments", [])),
+                        )
+                        on_agent(agent)
+                    if parser.complete:
+                        logger.info("[bold]Phase 2:[/bold] Plan complete; stopping generation")
+                        break
+            finally:
+                aclose = getattr(stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+            plan_text = parser.text
+            agents = list(parser.agents)
+            # The whole plan is parsed once more: agents left unterminated at ``</analysis_plan>`` or at the
+            # end of the stream, and plans that do not follow the agent tag format, are only found this way
+            full_parse = parse_agents_from_phase2(plan_text)
+            if not full_parse and not agents:
+                full_parse = extract_agent_fallback(plan_text)
+            seen = {_agent_key(agent) for agent in agents}
+            late = [agent for agent in full_parse if _agent_key(agent) not in seen]
+            if late and agents:
+                logger.info(f"[bold]Phase 2:[/bold] {len(late)} agents were only complete in the full plan")
+            for agent in late:
+                seen.add(_agent_key(agent))
+                agents.append(agent)
+                on_agent(agent)
+            logger.info(f"[bold green]Success:[/bold green] Found {len(agents)} agents in the streamed plan")
+            if agents:
+                self._publish_agent_plan(phase="phase2", agents=agents)
+            return {"plan": plan_text, "agents": agents, "streamed": True}
+        except Exception as e:
+            logger.error(f"[bold red]Error:[/bold red] in Phase 2: {str(e)}")
+            # Agents already handed out keep running; they are reported with the error
+            return {"error": str(e), "plan": parser.text, "agents": list(parser.agents)}
+
     def _publish_agent_plan(self, *, phase: str, agents: Sequence[dict]) -> None:
         """Emit a structured event describing the parsed agent plan."""
 
@@ -159,3 +324,9 @@ class Phase2Analysis:
 
         event = AnalysisEvent(phase=phase, type="agent_plan", payload={"agents": summaries})
         self._events.publish(event)
+
+
+def _agent_key(agent: dict) -> str:
+    """Identity of an agent across the incremental and the full-text parse."""
+
+    return str(agent.get("name") or agent.get("id") or "").strip().lower()
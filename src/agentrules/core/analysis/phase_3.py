@@ -12,13 +12,39 @@ It defines the agents and methods needed for in-depth analysis of the project's
 
 import asyncio
 import logging
-import os
 import time
+from collections.abc import AsyncIterator
 from pathlib import Path
 
-from agentrules.config.prompts.phase_3_prompts import format_phase3_prompt
+from agentrules.config.prompts.phase_3_prompts import format_phase3_prompt, format_phase3_tools_prompt
+from agentrules.config.tools import TOOL_SETS
+from agentrules.core.agent_tools.project_files import ProjectFileTools
+from agentrules.core.agent_tools.tool_calls import parse_tool_calls
 from agentrules.core.agents import get_architect_for_phase
+from agentrules.core.analysis.context_packing import (
+    AgentRequest,
+    merge_agent_results,
+    pack_agent_requests,
+    phase3_token_budget,
+)
+from agentrules.core.analysis.context_reduction import ContextOptions, prepare_file_contents
 from agentrules.core.analysis.events import AnalysisEvent, AnalysisEventSink, NullEventSink
+from agentrules.core.analysis.file_selection import git_churn, select_files
+from agentrules.core.analysis.scheduling import (
+    PrioritySemaphore,
+    ThroughputStore,
+    estimate_input_tokens,
+    lpt_order,
+    projected_makespan,
+)
+from agentrules.core.distributed import TaskCoordinator, TaskQueue, build_agent_payload
+from agentrules.core.utils.file_system.file_index import FileIndex, build_file_index
+from agentrules.core.utils.file_system.file_loader import AsyncFileLoader, load_files
+from agentrules.core.utils.file_system.path_resolver import log_assignment_resolution
+from agentrules.core.utils.tokens import estimate_tokens
+
+# Model turns allowed per agent in tool-driven context mode; the last one is made without tools
+PHASE3_MAX_TOOL_ITERATIONS = 8
 
 # ====================================================
 # Phase 3 Analysis Class
@@ -38,13 +64,47 @@ class Phase3Analysis:
     # Initialization (__init__)
     # This method sets up the initial state of the Phase3Analysis class.
     # ====================================================
-    def __init__(self, events: AnalysisEventSink | None = None):
+    def __init__(
+        self,
+        events: AnalysisEventSink | None = None,
+        task_queue: TaskQueue | None = None,
+        max_concurrency: int | None = None,
+        token_budget: int | None = None,
+        throughput: ThroughputStore | None = None,
+        context_options: ContextOptions | None = None,
+    ):
         """
         Initialize the Phase 3 analysis with required components.
+
+        Args:
+            events: Optional sink receiving agent lifecycle events
+            task_queue: Optional queue backend; when set, agents are executed by
+                `agentrules worker` processes instead of in this process
+            max_concurrency: Maximum number of agents running at the same time
+                (unlimited when None)
+            token_budget: Estimated prompt tokens allowed per agent request; defaults
+                to the context window of the model configured for Phase 3
+            throughput: Optional store of per-model call durations; completed agents
+                are recorded in it and it is used to predict the phase's wall time
+            context_options: Optional reduction of file contents (e.g. outlining large
+                source files) applied before packing, and the per-agent budget used to
+                select the files worth sending; with ``tool_access`` agents fetch their
+                files through local tools instead
         """
         # The actual architects will be created dynamically based on Phase 2 output
         self.architects = []
         self._events: AnalysisEventSink = events or NullEventSink()
+        self._task_queue = task_queue
+        self._coordinator: TaskCoordinator | None = None
+        self._run_id: str | None = None
+        self._max_concurrency = max_concurrency
+        self._semaphore: PrioritySemaphore | None = None
+        self._file_loader: AsyncFileLoader | None = None
+        self._token_budget = token_budget
+        self._throughput = throughput
+        self._context_options = context_options
+        self._churn: dict[str, int] | None = None
+        self._file_tools: ProjectFileTools | None = None
 
     def set_event_sink(self, events: AnalysisEventSink | None) -> None:
         """Update the event sink after construction."""
@@ -55,7 +115,13 @@ class Phase3Analysis:
     # Run Analysis Function
     # This function runs the deep analysis using the created agents.
     # ====================================================
-    async def run(self, analysis_plan: dict, tree: list[str], directory: Path) -> dict:
+    async def run(
+        self,
+        analysis_plan: dict,
+        tree: list[str],
+        directory: Path,
+        file_index: FileIndex | None = None,
+    ) -> dict:
         """
         Run the Deep Analysis Phase.
 
@@ -63,120 +129,55 @@ class Phase3Analysis:
             analysis_plan: Dictionary containing the analysis plan from Phase 2
             tree: List of strings representing the project directory tree
             directory: Path to the project directory
+            file_index: Optional index from the project snapshot used to select
+                fallback files and resolve assigned paths
 
         Returns:
             Dictionary containing the results of the phase
         """
         try:
-            # Default fallback agents in case no agents were defined in Phase 2
-            fallback_agents = [
-                {
-                    "id": "agent_1",
-                    "name": "Code Analysis Agent",
-                    "description": "Analyzes code quality, patterns, and implementation details",
-                    "file_assignments": []  # Will be populated with all files
-                },
-                {
-                    "id": "agent_2",
-                    "name": "Dependency Mapping Agent",
-                    "description": "Maps dependencies between files and modules",
-                    "file_assignments": []  # Will be populated with all files
-                },
-                {
-                    "id": "agent_3",
-                    "name": "Architecture Agent",
-                    "description": "Analyzes overall architecture and design patterns",
-                    "file_assignments": []  # Will be populated with all files
-                }
-            ]
-
-            # Get agent definitions from Phase 2
-            agent_definitions = analysis_plan.get("agents", [])
-
-            # Use fallback if no agents were defined
-            if not agent_definitions:
-                logging.warning(
-                    "[bold yellow]Warning:[/bold yellow] No agents defined in Phase 2 output, "
-                    "using fallback agents",
-                )
-                agent_definitions = fallback_agents
-
-                # Assign all files to all fallback agents
-                all_file_paths = []
-                for line in tree:
-                    if ".py" in line or ".js" in line or ".ts" in line or ".jsx" in line or ".tsx" in line:
-                        path_match = line.strip().split(" ")[-1]  # Extract the file path
-                        all_file_paths.append(path_match)
-
-                for agent in agent_definitions:
-                    agent["file_assignments"] = all_file_paths
+            agent_definitions = resolve_agent_definitions(analysis_plan, tree, file_index)
 
             # Create architects for each agent
             self.architects = []
 
             logging.info(f"[bold]Phase 3:[/bold] Creating {len(agent_definitions)} specialized analysis agents")
             for agent_def in agent_definitions:
-                agent_name = agent_def.get("name", "Unknown Agent")
-                files_count = len(agent_def.get('file_assignments', []))
-                logging.info(
-                    "  [bold cyan]Agent %s:[/bold cyan] %s with %d files",
-                    agent_def["id"].split("_")[1],
-                    agent_name,
-                    files_count,
-                )
-
-                # Create an architect for this agent
-                architect = get_architect_for_phase(
-                    "phase3",
-                    name=agent_name,
-                    role=agent_def.get("description", "Analyzing the project"),
-                    responsibilities=agent_def.get("responsibilities", [])
-                )
-                self.architects.append((architect, agent_def))
-                self._publish_agent_event(
-                    "agent_registered",
-                    phase="phase3",
-                    agent=agent_def,
-                    extra={"file_count": files_count},
-                )
+                self.architects.append((self._create_architect(agent_def), agent_def))
 
             # Create analysis tasks for each architect
             analysis_tasks = []
+            costs: list[int] = []
 
             logging.info("[bold]Phase 3:[/bold] Beginning parallel analysis of files")
             for architect, agent_def in self.architects:
-                # Get the files assigned to this agent
-                assigned_files = agent_def.get("file_assignments", [])
-
                 # Skip if no files assigned
-                if not assigned_files:
+                if not agent_def.get("file_assignments", []):
                     logging.warning(
                         "[bold yellow]Warning:[/bold yellow] No files assigned to %s, skipping",
                         agent_def.get("name", "Unknown Agent"),
                     )
                     continue
 
-                # Get the content of assigned files
-                file_contents = await self._get_file_contents(directory, assigned_files)
-
-                # Create the context for this agent
-                context = {
-                    "agent_name": agent_def.get("name", "Analysis Agent"),
-                    "agent_role": agent_def.get("description", "Analyzing the project"),
-                    "assigned_files": assigned_files,
-                    "file_contents": file_contents,
-                    "tree_structure": tree,
-                }
-
-                # Create a formatted prompt for this agent
-                formatted_prompt = format_phase3_prompt(context)
-                context["formatted_prompt"] = formatted_prompt
-
-                # Add the analysis task
-                analysis_tasks.append(self._execute_agent(architect, agent_def, context))
+                # Files are loaded inside the task so each agent dispatches as soon as its own files are ready
+                cost = estimate_input_tokens(agent_def["file_assignments"], directory, file_index)
+                analysis_tasks.append(self._prepare_and_execute(architect, agent_def, tree, directory, cost))
+                costs.append(cost)
 
             # Run all analysis tasks in parallel
-            results = await asyncio.gather(*analysis_tasks)
+            file_index = await self._start(directory, file_index)
+            if self._semaphore is not None:
+                self._log_predicted_makespan(costs)
+
+            # Tasks are started largest first so they claim the first slots; results keep the plan order
+            order = lpt_order(costs)
+            try:
+                ordered_results = await asyncio.gather(*(analysis_tasks[index] for index in order))
+            finally:
+                await self._finish()
+            results = [None] * len(analysis_tasks)
+            for index, result in zip(order, ordered_results, strict=True):
+                results[index] = result
 
             logging.info(f"[bold green]Phase 3:[/bold green] All {len(analysis_tasks)} agents completed their analysis")
 
@@ -192,7 +193,274 @@ class Phase3Analysis:
                 "error": str(e)
             }
 
-    async def _execute_agent(self, architect, agent_def: dict, context: dict) -> dict:
+    async def run_streaming(
+        self,
+        agents: AsyncIterator[dict],
+        tree: list[str],
+        directory: Path,
+        file_index: FileIndex | None = None,
+    ) -> dict:
+        """
+        Run the Deep Analysis Phase on agents as Phase 2 defines them.
+
+        Each agent starts as soon as it arrives instead of after the whole plan;
+        with a concurrency cap, free slots still go to the largest waiting agent.
+
+        Args:
+            agents: Agent definitions in plan order, ending when the plan is complete
+            tree: List of strings representing the project directory tree
+            directory: Path to the project directory
+            file_index: Optional index from the project snapshot
+
+        Returns:
+            Dictionary containing the results of the phase, in plan order
+        """
+        tasks: list[asyncio.Future] = []
+        try:
+            self.architects = []
+            file_index = await self._start(directory, file_index)
+            try:
+                async for agent_def in agents:
+                    tasks.extend(self._dispatch(agent_def, tree, directory, file_index))
+                if not self.architects:
+                    logging.info("[bold]Phase 3:[/bold] Phase 2 streamed no agents")
+                    for agent_def in resolve_agent_definitions({}, tree, file_index):
+                        tasks.extend(self._dispatch(agent_def, tree, directory, file_index))
+                results = await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await self._finish()
+
+            logging.info(f"[bold green]Phase 3:[/bold green] All {len(tasks)} agents completed their analysis")
+            return {
+                "phase": "Deep Analysis",
+                "findings": list(results)
+            }
+        except Exception as e:
+            logging.error(f"[bold red]Error in Phase 3:[/bold red] {str(e)}")
+            return {
+                "phase": "Deep Analysis",
+                "error": str(e)
+            }
+
+    def _dispatch(
+        self,
+        agent_def: dict,
+        tree: list[str],
+        directory: Path,
+        file_index: FileIndex | None,
+    ) -> list[asyncio.Future]:
+        """Create the agent's architect and start it right away; agents without files are skipped."""
+
+        agent_def = resolve_assignments([agent_def], file_index)[0]
+        architect = self._create_architect(agent_def)
+        self.architects.append((architect, agent_def))
+        if not agent_def.get("file_assignments"):
+            logging.warning(
+                "[bold yellow]Warning:[/bold yellow] No files assigned to %s, skipping",
+                agent_def.get("name", "Unknown Agent"),
+            )
+            return []
+        cost = estimate_input_tokens(agent_def["file_assignments"], directory, file_index)
+        return [asyncio.ensure_future(self._prepare_and_execute(architect, agent_def, tree, directory, cost))]
+
+    def _create_architect(self, agent_def: dict):
+        """Create the architect for an agent definition and announce the agent."""
+
+        agent_name = agent_def.get("name", "Unknown Agent")
+        files_count = len(agent_def.get('file_assignments', []))
+        logging.info(
+            "  [bold cyan]Agent %s:[/bold cyan] %s with %d files",
+            str(agent_def.get("id", "agent_?")).split("_")[-1],
+            agent_name,
+            files_count,
+        )
+        architect = get_architect_for_phase(
+            "phase3",
+            name=agent_name,
+            role=agent_def.get("description", "Analyzing the project"),
+            responsibilities=agent_def.get("responsibilities", [])
+        )
+        self._publish_agent_event(
+            "agent_registered",
+            phase="phase3",
+            agent=agent_def,
+            extra={"file_count": files_count},
+        )
+        return architect
+
+    async def _start(self, directory: Path, file_index: FileIndex | None) -> FileIndex | None:
+        """Set up the execution backend, concurrency cap and shared file loader for a run."""
+
+        if self._tool_access:
+            if self._task_queue is not None:
+                logging.warning(
+                    "[bold yellow]Warning:[/bold yellow] Tool-driven context mode runs Phase 3 agents "
+                    "in-process; the task queue is not used"
+                )
+            if file_index is None:
+                file_index = await asyncio.to_thread(build_file_index, directory)
+            self._file_tools = ProjectFileTools(file_index)
+            logging.info("[bold]Phase 3:[/bold] Agents fetch their files through read_file, grep and list_dir")
+        elif self._task_queue is not None:
+            self._coordinator = TaskCoordinator(self._task_queue)
+            self._run_id = TaskCoordinator.new_run_id()
+            logging.info("[bold]Phase 3:[/bold] Dispatching agents to the task queue for worker processes")
+        if self._max_concurrency:
+            self._semaphore = PrioritySemaphore(self._max_concurrency)
+            logging.info(
+                f"[bold]Phase 3:[/bold] Running at most {self._max_concurrency} agents at a time, largest first"
+            )
+
+        if self._context_options is not None and self._context_options.agent_token_budget:
+            self._churn = await asyncio.to_thread(git_churn, directory)
+        self._file_loader = AsyncFileLoader(directory, file_index=file_index)
+        return file_index
+
+    async def _finish(self) -> None:
+        """Release the resources set up by `_start` and persist the observed throughput."""
+
+        if self._file_loader is not None:
+            self._file_loader.close()
+        self._file_loader = None
+        self._semaphore = None
+        self._churn = None
+        self._file_tools = None
+        self._save_throughput()
+        if self._coordinator is not None:
+            await self._coordinator.close(self._run_id)
+            self._coordinator = None
+            self._run_id = None
+
+    async def _prepare_and_execute(
+        self,
+        architect,
+        agent_def: dict,
+        tree: list[str],
+        directory: Path,
+        cost: int = 0,
+    ) -> dict:
+        """Load an agent's files, build its context and run it, split into parts when it exceeds the budget."""
+
+        assigned_files = agent_def.get("file_assignments", [])
+        if self._file_tools is not None:
+            return await self._execute_agent(architect, agent_def, self._tool_context(agent_def, tree), priority=cost)
+        if self._semaphore is None:
+            file_contents = await self._get_file_contents(directory, assigned_files)
+            requests = self._pack(agent_def, tree, file_contents)
+            if len(requests) == 1:
+                return await self._run_agent(architect, agent_def, self._request_context(requests[0]))
+            return await self._run_parts(architect, agent_def, requests)
+
+        # Files are read while the agent waits; a free slot goes to the largest waiting agent
+        prefetch = asyncio.ensure_future(self._get_file_contents(directory, assigned_files))
+        try:
+            async with self._semaphore.slot(cost):
+                file_contents = await prefetch
+                requests = self._pack(agent_def, tree, file_contents)
+                if len(requests) == 1:
+                    return await self._run_agent(architect, agent_def, self._request_context(requests[0]))
+        finally:
+            prefetch.cancel()
+        # Parts of a split agent queue for slots individually
+        return await self._run_parts(architect, agent_def, requests)
+
+    def _pack(self, agent_def: dict, tree: list[str], file_contents: dict[str, str]) -> list[AgentRequest]:
+        token_budget = self._token_budget or phase3_token_budget()
+        # Select before reducing, so a dedupe stub never outlives the original it points to
+        agent_def, file_contents = self._select(agent_def, file_contents)
+        file_contents = prepare_file_contents(agent_def, file_contents, self._context_options)
+        return pack_agent_requests(agent_def, tree, file_contents, token_budget=token_budget)
+
+    def _select(self, agent_def: dict, file_contents: dict[str, str]) -> tuple[dict, dict[str, str]]:
+        """Keep the files ranked highest within the configured per-agent budget, if any."""
+
+        options = self._context_options
+        if options is None or not options.agent_token_budget:
+            return agent_def, file_contents
+        selection = select_files(
+            agent_def, file_contents, token_budget=options.agent_token_budget, churn=self._churn
+        )
+        if not selection.omitted:
+            return agent_def, file_contents
+        return {**agent_def, "file_assignments": list(selection.contents)}, selection.contents
+
+    async def _run_parts(self, architect, agent_def: dict, requests: list[AgentRequest]) -> dict:
+        results = await asyncio.gather(
+            *(
+                self._execute_agent(
+                    architect,
+                    request.agent,
+                    self._request_context(request),
+                    priority=sum(map(estimate_tokens, request.file_contents.values())),
+                )
+                for request in requests
+            ),
+            return_exceptions=True,
+        )
+        return merge_agent_results(agent_def, results)
+
+    def _request_context(self, request: AgentRequest) -> dict:
+        context = build_agent_context(request.agent, request.tree, request.file_contents)
+
+        # Create a formatted prompt for this agent (workers build their own when distributed)
+        if self._task_queue is None:
+            context["formatted_prompt"] = format_phase3_prompt(context)
+        return context
+
+    @property
+    def _tool_access(self) -> bool:
+        return self._context_options is not None and self._context_options.tool_access
+
+    def _tool_context(self, agent_def: dict, tree: list[str]) -> dict:
+        """Build a context listing the agent's files instead of their contents."""
+
+        if self._file_tools is None:
+            raise RuntimeError("Project file tools are not initialized")
+        context = build_agent_context(agent_def, tree, {})
+        context["file_manifest"] = self._file_tools.manifest(agent_def.get("file_assignments", []))
+        context["tool_results"] = []
+        context["formatted_prompt"] = format_phase3_tools_prompt(context)
+        return context
+
+    async def _analyze_with_tools(self, architect, context: dict) -> dict:
+        """
+        Run an agent in tool-driven mode until it stops requesting files.
+
+        Each turn re-renders the prompt with every tool result so far, so the loop
+        works for any provider without provider-specific message threading.
+        """
+        if self._file_tools is None:
+            raise RuntimeError("Project file tools are not initialized")
+        tools = TOOL_SETS["PHASE_3_TOOLS"]
+        executed: list[dict] = []
+        result: dict = {}
+        for iteration in range(1, PHASE3_MAX_TOOL_ITERATIONS + 1):
+            final_turn = iteration == PHASE3_MAX_TOOL_ITERATIONS
+            context["tool_results"] = executed
+            context["final_turn"] = final_turn
+            context["formatted_prompt"] = format_phase3_tools_prompt(context)
+            result = await architect.analyze(context, tools=None if final_turn else tools)
+            calls = [] if final_turn or result.get("error") else parse_tool_calls(result)
+            if not calls:
+                break
+            for call in calls:
+                executed.append(await asyncio.to_thread(self._file_tools.execute, call.name, call.args))
+
+        result = {key: value for key, value in result.items() if key not in ("tool_calls", "function_calls")}
+        result["executed_tools"] = executed
+        return result
+
+    async def _execute_agent(self, architect, agent_def: dict, context: dict, priority: int = 0) -> dict:
+        """Run an individual agent, honouring the concurrency cap when one is configured."""
+
+        if self._semaphore is None:
+            return await self._run_agent(architect, agent_def, context)
+        async with self._semaphore.slot(priority):
+            return await self._run_agent(architect, agent_def, context)
+
+    async def _run_agent(self, architect, agent_def: dict, context: dict) -> dict:
         """Run an individual agent while emitting lifecycle events."""
 
         files = list(agent_def.get("file_assignments", []) or [])
@@ -206,7 +474,19 @@ class Phase3Analysis:
 
         started = time.perf_counter()
         try:
-            result = await architect.analyze(context)
+            if self._coordinator is not None and self._run_id is not None:
+                agent_id = agent_def.get("id") or agent_def.get("name") or str(id(agent_def))
+                # Larger agents are queued first so the longest tasks start earliest.
+                result = await self._coordinator.run(
+                    self._run_id,
+                    f"{self._run_id}:{agent_id}",
+                    build_agent_payload(agent_def, context),
+                    priority=_context_tokens(context),
+                )
+            elif self._file_tools is not None:
+                result = await self._analyze_with_tools(architect, context)
+            else:
+                result = await architect.analyze(context)
         except Exception as error:  # pragma: no cover - defensive + passthrough
             duration = time.perf_counter() - started
             self._publish_agent_event(
@@ -218,6 +498,8 @@ class Phase3Analysis:
             raise
 
         duration = time.perf_counter() - started
+        if self._throughput is not None:
+            self._throughput.record(_phase3_model_name(), _context_tokens(context), duration)
         self._publish_agent_event(
             "agent_completed",
             phase="phase3",
@@ -226,6 +508,29 @@ class Phase3Analysis:
         )
         return result
 
+    def _log_predicted_makespan(self, costs: list[int]) -> None:
+        """Log the phase wall time predicted from previous runs' throughput, when known."""
+
+        if self._throughput is None or not costs:
+            return
+        model_name = _phase3_model_name()
+        durations = [self._throughput.predict_seconds(model_name, cost) for cost in costs]
+        if any(duration is None for duration in durations):
+            return
+        ordered = sorted((duration for duration in durations if duration is not None), reverse=True)
+        logging.info(
+            f"[bold]Phase 3:[/bold] Predicted wall time {projected_makespan(ordered, self._max_concurrency):.0f}s "
+            f"for {len(costs)} agents on {self._max_concurrency} slots"
+        )
+
+    def _save_throughput(self) -> None:
+        if self._throughput is None:
+            return
+        try:
+            self._throughput.save()
+        except OSError as error:
+            logging.warning(f"[bold yellow]Warning:[/bold yellow] Could not save throughput data: {error}")
+
     async def _get_file_contents(self, directory: Path, assigned_files: list[str]) -> dict[str, str]:
         """
         Get the contents of files assigned to an agent.
@@ -237,35 +542,10 @@ class Phase3Analysis:
         Returns:
             Dictionary of {file_path: file_content}
         """
-        # Simple async wrapper around synchronous file operations
-        # In a real implementation, you might want to use asyncio.to_thread or similar
-        file_contents = {}
-
-        for file_path in assigned_files:
-            try:
-                # Handle both absolute and relative paths
-                full_path = os.path.join(directory, file_path)
-
-                # Try to read the file
-                if os.path.exists(full_path) and os.path.isfile(full_path):
-                    with open(full_path, encoding='utf-8', errors='replace') as f:
-                        content = f.read()
-                    file_contents[file_path] = content
-                else:
-                    # Try relative path
-                    rel_path = file_path.lstrip('./')  # Remove leading ./ if present
-                    full_path = os.path.join(directory, rel_path)
-
-                    if os.path.exists(full_path) and os.path.isfile(full_path):
-                        with open(full_path, encoding='utf-8', errors='replace') as f:
-                            content = f.read()
-                        file_contents[file_path] = content
-                    else:
-                        logging.warning(f"Could not find file: {file_path}")
-            except Exception as e:
-                logging.error(f"Error reading file {file_path}: {str(e)}")
-
-        return file_contents
+        if self._file_loader is not None:
+            return await self._file_loader.load(assigned_files)
+        async with AsyncFileLoader(directory) as loader:
+            return await loader.load(assigned_files)
 
     def _publish_agent_event(self, event_type: str, *, phase: str, agent: dict, extra: dict | None = None) -> None:
         payload = {
@@ -277,3 +557,131 @@ class Phase3Analysis:
             payload.update(extra)
         event = AnalysisEvent(phase=phase, type=event_type, payload=payload)
         self._events.publish(event)
+
+
+def _phase3_model_name() -> str:
+    from agentrules.config.agents import MODEL_CONFIG
+
+    return MODEL_CONFIG["phase3"].model_name
+
+
+def _context_tokens(context: dict) -> int:
+    """Estimated prompt tokens of an agent context (its file contents dominate)."""
+
+    prompt = context.get("formatted_prompt")
+    if prompt:
+        return estimate_tokens(prompt)
+    return sum(estimate_tokens(content) for content in (context.get("file_contents") or {}).values())
+
+
+# ====================================================
+# Agent Planning Helpers
+# Shared with `agentrules analyze --dry-run`, which assembles the same contexts
+# without calling any model.
+# ====================================================
+
+FALLBACK_AGENTS = (
+    {
+        "id": "agent_1",
+        "name": "Code Analysis Agent",
+        "description": "Analyzes code quality, patterns, and implementation details",
+    },
+    {
+        "id": "agent_2",
+        "name": "Dependency Mapping Agent",
+        "description": "Maps dependencies between files and modules",
+    },
+    {
+        "id": "agent_3",
+        "name": "Architecture Agent",
+        "description": "Analyzes overall architecture and design patterns",
+    },
+)
+
+
+def resolve_agent_definitions(
+    analysis_plan: dict,
+    tree: list[str],
+    file_index: FileIndex | None = None,
+) -> list[dict]:
+    """
+    Return the agents defined by the Phase 2 plan, or the fallback agents.
+
+    Args:
+        analysis_plan: Dictionary containing the analysis plan from Phase 2
+        tree: List of strings representing the project directory tree
+        file_index: Optional snapshot index; when given, assigned paths are mapped to
+            canonical project paths and the fallback agents receive its source files
+            instead of names scraped from the tree lines
+
+    Returns:
+        List of agent definitions with their file assignments
+    """
+    agent_definitions = analysis_plan.get("agents", [])
+    if agent_definitions:
+        return resolve_assignments(agent_definitions, file_index)
+
+    logging.warning(
+        "[bold yellow]Warning:[/bold yellow] No agents defined in Phase 2 output, "
+        "using fallback agents",
+    )
+
+    # Assign all files to all fallback agents
+    if file_index is not None:
+        all_file_paths = [entry.path for entry in file_index.source_files()]
+        return [{**agent, "file_assignments": list(all_file_paths)} for agent in FALLBACK_AGENTS]
+
+    all_file_paths = []
+    for line in tree:
+        if ".py" in line or ".js" in line or ".ts" in line or ".jsx" in line or ".tsx" in line:
+            path_match = line.strip().split(" ")[-1]  # Extract the file path
+            all_file_paths.append(path_match)
+
+    return [{**agent, "file_assignments": list(all_file_paths)} for agent in FALLBACK_AGENTS]
+
+
+def resolve_assignments(agent_definitions: list[dict], file_index: FileIndex | None) -> list[dict]:
+    """
+    Map each agent's file assignments onto canonical project paths before dispatch.
+
+    Entries that match no indexed file, or several, are dropped and reported.
+    Without an index the definitions are returned unchanged.
+    """
+    if file_index is None:
+        return agent_definitions
+    resolution = file_index.path_resolver().resolve_agents(agent_definitions)
+    log_assignment_resolution(resolution)
+    return resolution.agents
+
+
+def build_agent_context(agent_def: dict, tree: list[str], file_contents: dict[str, str]) -> dict:
+    """Create the analysis context handed to a Phase 3 agent."""
+
+    return {
+        "agent_name": agent_def.get("name", "Analysis Agent"),
+        "agent_role": agent_def.get("description", "Analyzing the project"),
+        "assigned_files": agent_def.get("file_assignments", []),
+        "file_contents": file_contents,
+        "tree_structure": tree,
+    }
+
+
+def load_assigned_files(
+    directory: Path,
+    assigned_files: list[str],
+    cache: dict[str, str | None] | None = None,
+    file_index: FileIndex | None = None,
+) -> dict[str, str]:
+    """
+    Read the files assigned to an agent synchronously.
+
+    Args:
+        directory: Project directory
+        assigned_files: List of file paths assigned to the agent
+        cache: Optional cache shared between agents so each file is read once
+        file_index: Optional snapshot index used to resolve the assigned paths
+
+    Returns:
+        Dictionary of {file_path: file_content}
+    """
+    return load_files(directory, assigned_files, cache, file_index)
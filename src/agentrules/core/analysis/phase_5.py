@@ -20,6 +20,11 @@ import logging
 
 from agentrules.config.prompts.phase_5_prompts import format_phase5_prompt
 from agentrules.core.agents import get_architect_for_phase
+from agentrules.core.analysis.consolidation import (
+    architect_model_name,
+    consolidation_token_budget,
+    reduce_payload,
+)
 
 # =============================================================================
 # Initialize the Anthropic Client and Logger
@@ -44,12 +49,18 @@ class Phase5Analysis:
     # Initialization Method
     # Sets up the Phase 5 analysis with the model from configuration.
     # =========================================================================
-    def __init__(self):
+    def __init__(self, token_budget: int | None = None):
         """
         Initialize the Phase 5 analysis with the architect from configuration.
+
+        Args:
+            token_budget: Maximum estimated tokens of results sent in a single call;
+                larger inputs are consolidated hierarchically first. Defaults to what
+                the Phase 5 model's context window leaves next to the prompt template
         """
         # Use the factory function to get the appropriate architect based on configuration
         self.architect = get_architect_for_phase("phase5")
+        self.token_budget = token_budget
 
     # =========================================================================
     # Run Method
@@ -66,13 +77,19 @@ class Phase5Analysis:
             Dictionary containing the consolidated report
         """
         try:
-            # Format the prompt using the template from the prompts file
-            prompt = format_phase5_prompt(all_results)
-
             logger.info("[bold]Phase 5:[/bold] Consolidating results from all previous phases")
 
+            # Condense oversized inputs chunk by chunk so the final prompt stays bounded
+            token_budget = self.token_budget or consolidation_token_budget(
+                architect_model_name(self.architect), format_phase5_prompt({})
+            )
+            payload = await reduce_payload(all_results, self.architect, token_budget=token_budget)
+
+            # Format the prompt using the template from the prompts file
+            prompt = format_phase5_prompt(payload)
+
             # Use the architect to consolidate results
-            result = await self.architect.consolidate_results(all_results, prompt)
+            result = await self.architect.consolidate_results(payload, prompt)
 
             logger.info("[bold green]Phase 5:[/bold green] Consolidation completed successfully")
 
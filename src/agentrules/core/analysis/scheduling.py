@@ -0,0 +1,230 @@
+"""Longest-processing-time-first scheduling of Phase 3 agents.
+
+With a concurrency cap, the order in which agents obtain a slot decides the wall
+time of the phase: starting the largest agent last leaves it running long after
+the others finished. Agents are therefore ranked by their estimated input tokens
+and slots are handed to the largest waiting agent first (LPT scheduling).
+
+`ThroughputStore` keeps a per-model latency fit learned from previous runs so
+durations, and with them the phase makespan, can be predicted from token counts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from agentrules.core.utils.file_system.bounded_reader import DEFAULT_MAX_FILE_BYTES
+from agentrules.core.utils.tokens import CHARS_PER_TOKEN
+
+if TYPE_CHECKING:
+    from agentrules.core.utils.file_system.file_index import FileIndex
+
+logger = logging.getLogger("project_extractor")
+
+DEFAULT_THROUGHPUT_FILENAME = "throughput.json"
+THROUGHPUT_DECAY = 0.8
+"""Weight kept by older samples each time a new one is recorded."""
+
+
+class PrioritySemaphore:
+    """Semaphore that grants free slots to the waiter with the highest priority."""
+
+    def __init__(self, value: int) -> None:
+        if value < 1:
+            raise ValueError("value must be at least 1")
+        self._value = value
+        self._waiters: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, priority: float = 0) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        # Ties are served in arrival order
+        heapq.heappush(self._waiters, (-priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before cancellation; pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._value += 1
+
+    @asynccontextmanager
+    async def slot(self, priority: float = 0):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def estimate_input_tokens(
+    file_paths: Iterable[str],
+    directory: Path,
+    file_index: FileIndex | None = None,
+) -> int:
+    """
+    Estimate the prompt tokens of ``file_paths`` from their sizes, without reading them.
+
+    Sizes are capped at the loader's per-file limit, matching what is actually sent.
+    """
+    total_bytes = 0
+    for file_path in file_paths:
+        entry = file_index.resolve(file_path) if file_index is not None else None
+        if entry is not None:
+            total_bytes += min(entry.size, DEFAULT_MAX_FILE_BYTES)
+            continue
+        try:
+            total_bytes += min((directory / file_path).stat().st_size, DEFAULT_MAX_FILE_BYTES)
+        except (OSError, ValueError):
+            continue
+    return total_bytes // CHARS_PER_TOKEN
+
+
+def lpt_order(costs: Sequence[float]) -> list[int]:
+    """Indices of ``costs`` ordered largest first; equal costs keep their original order."""
+
+    return sorted(range(len(costs)), key=lambda index: (-costs[index], index))
+
+
+def projected_makespan(durations: Sequence[float], max_concurrency: int | None) -> float:
+    """Wall time of ``durations`` started in order on at most ``max_concurrency`` slots."""
+
+    if not durations:
+        return 0.0
+    slots = len(durations) if not max_concurrency else min(max_concurrency, len(durations))
+    finish_times = [0.0] * slots
+    for duration in durations:
+        start = heapq.heappop(finish_times)
+        heapq.heappush(finish_times, start + duration)
+    return max(finish_times)
+
+
+@dataclass
+class ThroughputFit:
+    """Exponentially weighted least-squares fit of ``seconds = overhead + tokens / rate``."""
+
+    weight: float = 0.0
+    sum_tokens: float = 0.0
+    sum_seconds: float = 0.0
+    sum_tokens_sq: float = 0.0
+    sum_tokens_seconds: float = 0.0
+    samples: int = 0
+
+    def add(self, tokens: int, seconds: float) -> None:
+        decay = THROUGHPUT_DECAY if self.samples else 1.0
+        self.weight = self.weight * decay + 1
+        self.sum_tokens = self.sum_tokens * decay + tokens
+        self.sum_seconds = self.sum_seconds * decay + seconds
+        self.sum_tokens_sq = self.sum_tokens_sq * decay + tokens * tokens
+        self.sum_tokens_seconds = self.sum_tokens_seconds * decay + tokens * seconds
+        self.samples += 1
+
+    def predict(self, tokens: int) -> float | None:
+        if not self.samples or self.weight <= 0:
+            return None
+        mean_tokens = self.sum_tokens / self.weight
+        mean_seconds = self.sum_seconds / self.weight
+        variance = self.sum_tokens_sq / self.weight - mean_tokens * mean_tokens
+        if variance > 1e-6:
+            slope = (self.sum_tokens_seconds / self.weight - mean_tokens * mean_seconds) / variance
+            if slope > 0:
+                overhead = max(0.0, mean_seconds - slope * mean_tokens)
+                return overhead + slope * tokens
+        if mean_tokens <= 0:
+            return mean_seconds
+        return mean_seconds * tokens / mean_tokens
+
+
+class ThroughputStore:
+    """Per-model latency fits persisted as JSON (``<config dir>/throughput.json`` by default)."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        if path is None:
+            from agentrules.core.configuration import constants as configuration_constants
+
+            path = configuration_constants.CONFIG_DIR / DEFAULT_THROUGHPUT_FILENAME
+        self._path = path
+        self._fits: dict[str, ThroughputFit] | None = None
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _load(self) -> dict[str, ThroughputFit]:
+        if self._fits is None:
+            self._fits = {}
+            try:
+                payload = json.loads(self._path.read_text(encoding="utf-8"))
+                for model_name, values in payload.get("models", {}).items():
+                    self._fits[model_name] = ThroughputFit(**values)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError, AttributeError) as error:
+                logger.warning(f"[bold yellow]Warning:[/bold yellow] Ignoring unreadable throughput data: {error}")
+        return self._fits
+
+    def record(self, model_name: str, input_tokens: int, seconds: float) -> None:
+        """Add an observed call duration for ``model_name``."""
+
+        if seconds <= 0:
+            return
+        self._load().setdefault(model_name, ThroughputFit()).add(max(0, input_tokens), seconds)
+        self._dirty = True
+
+    def predict_seconds(self, model_name: str, input_tokens: int) -> float | None:
+        """Predicted duration of a call, or ``None`` when the model has no history."""
+
+        fit = self._load().get(model_name)
+        return fit.predict(input_tokens) if fit is not None else None
+
+    def save(self) -> Path | None:
+        """Write recorded samples to disk; returns the path when anything was written."""
+
+        if not self._dirty or self._fits is None:
+            return None
+        payload: dict[str, Any] = {"models": {name: asdict(fit) for name, fit in sorted(self._fits.items())}}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                json.dump(payload, stream, indent=2)
+            os.replace(temp_name, self._path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        self._dirty = False
+        return self._path
+
+
+__all__ = [
+    "DEFAULT_THROUGHPUT_FILENAME",
+    "PrioritySemaphore",
+    "ThroughputFit",
+    "ThroughputStore",
+    "estimate_input_tokens",
+    "lpt_order",
+    "projected_makespan",
+]
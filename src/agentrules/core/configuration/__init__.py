@@ -21,7 +21,10 @@ from .constants import (
 from .manager import ConfigManager
 from .models import (
     CLIConfig,
+    ContextMode,
+    ContextPreferences,
     ExclusionOverrides,
+    ExecutionPreferences,
     FeatureToggles,
     OutputPreferences,
     ProviderConfig,
@@ -31,10 +34,13 @@ from .models import (
 __all__ = [
     "CLIConfig",
     "ConfigManager",
+    "ContextMode",
+    "ContextPreferences",
     "CONFIG_DIR",
     "CONFIG_FILE",
     "DEFAULT_VERBOSITY",
     "ExclusionOverrides",
+    "ExecutionPreferences",
     "FeatureToggles",
     "OutputPreferences",
     "PROVIDER_ENV_MAP",
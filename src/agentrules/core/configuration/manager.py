@@ -7,9 +7,16 @@ from collections.abc import MutableMapping
 from agentrules.core.utils.constants import DEFAULT_RULES_FILENAME
 
 from .environment import EnvironmentManager
-from .models import CLIConfig, ExclusionOverrides, OutputPreferences, ResearcherMode
+from .models import (
+    CLIConfig,
+    ContextPreferences,
+    ExclusionOverrides,
+    OutputPreferences,
+    PlanningMode,
+    ResearcherMode,
+)
 from .repository import ConfigRepository, TomlConfigRepository
-from .services import exclusions, features, outputs, phase_models, providers
+from .services import context, exclusions, execution, features, outputs, phase_models, providers
 from .services import logging as logging_service
 
 
@@ -215,3 +222,75 @@ class ConfigManager:
         exclusions.reset_tree_max_depth(config)
         self._repository.save(config)
         return config
+
+    # ------------------------------------------------------------------
+    # Execution preferences
+    # ------------------------------------------------------------------
+    def get_phase3_max_concurrency(self) -> int | None:
+        config = self._repository.load()
+        return execution.get_phase3_max_concurrency(config)
+
+    def set_phase3_max_concurrency(self, value: int | None) -> CLIConfig:
+        config = self._repository.load()
+        execution.set_phase3_max_concurrency(config, value)
+        self._repository.save(config)
+        return config
+
+    def get_phase2_planning(self) -> PlanningMode:
+        config = self._repository.load()
+        return execution.get_phase2_planning(config)
+
+    def set_phase2_planning(self, mode: str) -> CLIConfig:
+        config = self._repository.load()
+        execution.set_phase2_planning(config, mode)
+        self._repository.save(config)
+        return config
+
+    # ------------------------------------------------------------------
+    # Context preferences
+    # ------------------------------------------------------------------
+    def get_context_preferences(self) -> ContextPreferences:
+        config = self._repository.load()
+        return context.get_context_preferences(config)
+
+    def set_context_mode(self, mode: str) -> CLIConfig:
+        config = self._repository.load()
+        context.set_context_mode(config, mode)
+        self._repository.save(config)
+        return config
+
+    def set_outline_threshold_kb(self, value: int | None) -> CLIConfig:
+        config = self._repository.load()
+        context.set_outline_threshold_kb(config, value)
+        self._repository.save(config)
+        return config
+
+    def set_outline_keep_full(self, value: int | None) -> CLIConfig:
+        config = self._repository.load()
+        context.set_outline_keep_full(config, value)
+        self._repository.save(config)
+        return config
+
+    def set_minify(
+        self,
+        enabled: bool,
+        *,
+        drop_comments: bool = False,
+        drop_literal_tables: bool = False,
+    ) -> CLIConfig:
+        config = self._repository.load()
+        context.set_minify(config, enabled, drop_comments=drop_comments, drop_literal_tables=drop_literal_tables)
+        self._repository.save(config)
+        return config
+
+    def set_deduplication(self, enabled: bool, *, near_duplicates: bool = False) -> CLIConfig:
+        config = self._repository.load()
+        context.set_deduplication(config, enabled, near_duplicates=near_duplicates)
+        self._repository.save(config)
+        return config
+
+    def set_agent_token_budget(self, value: int | None) -> CLIConfig:
+        config = self._repository.load()
+        context.set_agent_token_budget(config, value)
+        self._repository.save(config)
+        return config
@@ -8,6 +8,8 @@ from typing import Literal
 from agentrules.core.utils.constants import DEFAULT_RULES_FILENAME
 
 ResearcherMode = Literal["on", "off"]
+ContextMode = Literal["full", "outline", "tools"]
+PlanningMode = Literal["model", "clustered", "local", "structured"]
 
 
 @dataclass
@@ -54,6 +56,31 @@ class FeatureToggles:
         return self.researcher_mode == "off"
 
 
+@dataclass
+class ExecutionPreferences:
+    phase3_max_concurrency: int | None = None
+    phase2_planning: PlanningMode = "model"
+
+    def is_default(self) -> bool:
+        return self == ExecutionPreferences()
+
+
+@dataclass
+class ContextPreferences:
+    mode: ContextMode = "full"
+    outline_threshold_kb: int | None = None
+    outline_keep_full: int | None = None
+    minify: bool = False
+    minify_drop_comments: bool = False
+    minify_drop_literal_tables: bool = False
+    dedupe: bool = True
+    near_duplicates: bool = False
+    agent_token_budget: int | None = None
+
+    def is_default(self) -> bool:
+        return self == ContextPreferences()
+
+
 @dataclass
 class CLIConfig:
     providers: dict[str, ProviderConfig] = field(default_factory=dict)
@@ -62,3 +89,5 @@ class CLIConfig:
     outputs: OutputPreferences = field(default_factory=OutputPreferences)
     exclusions: ExclusionOverrides = field(default_factory=ExclusionOverrides)
     features: FeatureToggles = field(default_factory=FeatureToggles)
+    execution: ExecutionPreferences = field(default_factory=ExecutionPreferences)
+    context: ContextPreferences = field(default_factory=ContextPreferences)
@@ -7,11 +7,21 @@ from typing import Any, cast
 
 from agentrules.core.utils.constants import DEFAULT_RULES_FILENAME
 
-from .models import CLIConfig, ExclusionOverrides, FeatureToggles, OutputPreferences, ProviderConfig
+from .models import (
+    CLIConfig,
+    ContextPreferences,
+    ExclusionOverrides,
+    ExecutionPreferences,
+    FeatureToggles,
+    OutputPreferences,
+    ProviderConfig,
+)
 from .utils import (
     coerce_bool,
     coerce_positive_int,
     coerce_string_list,
+    normalize_context_mode,
+    normalize_planning_mode,
     normalize_researcher_mode,
     normalize_rules_filename,
     normalize_verbosity_label,
@@ -80,6 +90,33 @@ def config_from_dict(payload: Mapping[str, Any]) -> CLIConfig:
         )
     )
 
+    execution_payload = payload.get("execution")
+    execution = ExecutionPreferences(
+        phase3_max_concurrency=coerce_positive_int(
+            execution_payload.get("phase3_max_concurrency") if isinstance(execution_payload, Mapping) else None,
+            minimum=1,
+            default=None,
+        ),
+        phase2_planning=normalize_planning_mode(
+            execution_payload.get("phase2_planning") if isinstance(execution_payload, Mapping) else None,
+            default="model",
+        ),
+    )
+
+    context_payload = payload.get("context")
+    context_values = context_payload if isinstance(context_payload, Mapping) else {}
+    context = ContextPreferences(
+        mode=normalize_context_mode(context_values.get("mode"), default="full"),
+        outline_threshold_kb=coerce_positive_int(context_values.get("outline_threshold_kb"), minimum=1, default=None),
+        outline_keep_full=coerce_positive_int(context_values.get("outline_keep_full"), minimum=0, default=None),
+        minify=coerce_bool(context_values.get("minify"), default=False),
+        minify_drop_comments=coerce_bool(context_values.get("minify_drop_comments"), default=False),
+        minify_drop_literal_tables=coerce_bool(context_values.get("minify_drop_literal_tables"), default=False),
+        dedupe=coerce_bool(context_values.get("dedupe"), default=True),
+        near_duplicates=coerce_bool(context_values.get("near_duplicates"), default=False),
+        agent_token_budget=coerce_positive_int(context_values.get("agent_token_budget"), minimum=1, default=None),
+    )
+
     return CLIConfig(
         providers=providers,
         models=models,
@@ -87,6 +124,8 @@ def config_from_dict(payload: Mapping[str, Any]) -> CLIConfig:
         outputs=outputs,
         exclusions=exclusions,
         features=features,
+        execution=execution,
+        context=context,
     )
 
 
@@ -137,4 +176,30 @@ def config_to_dict(config: CLIConfig) -> dict[str, Any]:
             "researcher_mode": config.features.researcher_mode,
         }
 
+    if not config.execution.is_default():
+        execution_payload: dict[str, Any] = {}
+        if config.execution.phase3_max_concurrency is not None:
+            execution_payload["phase3_max_concurrency"] = config.execution.phase3_max_concurrency
+        if config.execution.phase2_planning != "model":
+            execution_payload["phase2_planning"] = config.execution.phase2_planning
+        payload["execution"] = execution_payload
+
+    if not config.context.is_default():
+        context_payload: dict[str, Any] = {"mode": config.context.mode}
+        if config.context.outline_threshold_kb is not None:
+            context_payload["outline_threshold_kb"] = config.context.outline_threshold_kb
+        if config.context.outline_keep_full is not None:
+            context_payload["outline_keep_full"] = config.context.outline_keep_full
+        if config.context.minify:
+            context_payload["minify"] = True
+            context_payload["minify_drop_comments"] = config.context.minify_drop_comments
+            context_payload["minify_drop_literal_tables"] = config.context.minify_drop_literal_tables
+        if not config.context.dedupe:
+            context_payload["dedupe"] = False
+        if config.context.near_duplicates:
+            context_payload["near_duplicates"] = True
+        if config.context.agent_token_budget is not None:
+            context_payload["agent_token_budget"] = config.context.agent_token_budget
+        payload["context"] = context_payload
+
     return payload
@@ -1,9 +1,11 @@
 """Domain-specific helpers for configuration management."""
 
-from . import exclusions, features, logging, outputs, phase_models, providers
+from . import context, exclusions, execution, features, logging, outputs, phase_models, providers
 
 __all__ = [
+    "context",
     "exclusions",
+    "execution",
     "features",
     "logging",
     "outputs",
@@ -0,0 +1,51 @@
+"""Context preference helpers."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+from ..models import CLIConfig, ContextPreferences
+from ..utils import coerce_bool, coerce_positive_int, normalize_context_mode
+
+
+def get_context_preferences(config: CLIConfig) -> ContextPreferences:
+    preferences = config.context
+    return replace(
+        preferences,
+        mode=normalize_context_mode(preferences.mode, default="full"),
+        outline_threshold_kb=coerce_positive_int(preferences.outline_threshold_kb, minimum=1, default=None),
+        outline_keep_full=coerce_positive_int(preferences.outline_keep_full, minimum=0, default=None),
+        minify=coerce_bool(preferences.minify, default=False),
+        minify_drop_comments=coerce_bool(preferences.minify_drop_comments, default=False),
+        minify_drop_literal_tables=coerce_bool(preferences.minify_drop_literal_tables, default=False),
+        dedupe=coerce_bool(preferences.dedupe, default=True),
+        near_duplicates=coerce_bool(preferences.near_duplicates, default=False),
+        agent_token_budget=coerce_positive_int(preferences.agent_token_budget, minimum=1, default=None),
+    )
+
+
+def set_context_mode(config: CLIConfig, mode: str) -> None:
+    config.context.mode = normalize_context_mode(mode, default="full")
+
+
+def set_outline_threshold_kb(config: CLIConfig, value: int | None) -> None:
+    config.context.outline_threshold_kb = coerce_positive_int(value, minimum=1, default=None)
+
+
+def set_outline_keep_full(config: CLIConfig, value: int | None) -> None:
+    config.context.outline_keep_full = coerce_positive_int(value, minimum=0, default=None)
+
+
+def set_minify(config: CLIConfig, enabled: bool, *, drop_comments: bool, drop_literal_tables: bool) -> None:
+    config.context.minify = bool(enabled)
+    config.context.minify_drop_comments = bool(enabled and drop_comments)
+    config.context.minify_drop_literal_tables = bool(enabled and drop_literal_tables)
+
+
+def set_deduplication(config: CLIConfig, enabled: bool, *, near_duplicates: bool) -> None:
+    config.context.dedupe = bool(enabled)
+    config.context.near_duplicates = bool(enabled and near_duplicates)
+
+
+def set_agent_token_budget(config: CLIConfig, value: int | None) -> None:
+    config.context.agent_token_budget = coerce_positive_int(value, minimum=1, default=None)
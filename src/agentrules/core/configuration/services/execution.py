@@ -0,0 +1,22 @@
+"""Execution preference helpers."""
+
+from __future__ import annotations
+
+from ..models import CLIConfig, PlanningMode
+from ..utils import coerce_positive_int, normalize_planning_mode
+
+
+def get_phase3_max_concurrency(config: CLIConfig) -> int | None:
+    return coerce_positive_int(config.execution.phase3_max_concurrency, minimum=1, default=None)
+
+
+def set_phase3_max_concurrency(config: CLIConfig, value: int | None) -> None:
+    config.execution.phase3_max_concurrency = coerce_positive_int(value, minimum=1, default=None)
+
+
+def get_phase2_planning(config: CLIConfig) -> PlanningMode:
+    return normalize_planning_mode(config.execution.phase2_planning, default="model")
+
+
+def set_phase2_planning(config: CLIConfig, mode: str) -> None:
+    config.execution.phase2_planning = normalize_planning_mode(mode, default="model")
@@ -5,7 +5,7 @@ from __future__ import annotations
 from collections.abc import Iterable, Mapping
 from typing import cast
 
-from .models import ResearcherMode
+from .models import ContextMode, PlanningMode, ResearcherMode
 
 
 def coerce_bool(value: object, default: bool = False) -> bool:
@@ -140,6 +140,22 @@ def normalize_researcher_mode(value: object, *, default: ResearcherMode) -> Rese
     return default
 
 
+def normalize_context_mode(value: object, *, default: ContextMode) -> ContextMode:
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        if normalized in {"full", "outline", "tools"}:
+            return cast(ContextMode, normalized)
+    return default
+
+
+def normalize_planning_mode(value: object, *, default: PlanningMode) -> PlanningMode:
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        if normalized in {"model", "clustered", "local", "structured"}:
+            return cast(PlanningMode, normalized)
+    return default
+
+
 def normalize_verbosity_label(label: str | None) -> str | None:
     if not label:
         return None
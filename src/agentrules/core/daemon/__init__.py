@@ -0,0 +1,17 @@
+"""Long-running analysis daemon: job queue, persistence and HTTP front-end."""
+
+from .jobs import Job, JobStatus, JobStore
+from .server import DEFAULT_HOST, DEFAULT_PORT, AnalysisDaemon
+from .service import AnalysisService, JobRunner, PipelineJobRunner
+
+__all__ = [
+    "AnalysisDaemon",
+    "AnalysisService",
+    "DEFAULT_HOST",
+    "DEFAULT_PORT",
+    "Job",
+    "JobRunner",
+    "JobStatus",
+    "JobStore",
+    "PipelineJobRunner",
+]
@@ -0,0 +1,112 @@
+"""Job records and persistence for the analysis daemon."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+
+class JobStatus(StrEnum):
+    """Lifecycle states for an analysis job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_terminal(self) -> bool:
+        return self in {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+@dataclass
+class Job:
+    """A single analysis request tracked by the daemon."""
+
+    id: str
+    target_directory: str
+    priority: int = 0
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+    result: dict[str, Any] | None = None
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def create(cls, target_directory: Path | str, priority: int = 0) -> Job:
+        return cls(id=uuid.uuid4().hex[:12], target_directory=str(target_directory), priority=priority)
+
+    def to_dict(self, *, include_events: bool = False, include_result: bool = True) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "id": self.id,
+            "target_directory": self.target_directory,
+            "priority": self.priority,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "event_count": len(self.events),
+        }
+        if include_result:
+            payload["result"] = self.result
+        if include_events:
+            payload["events"] = list(self.events)
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> Job:
+        return cls(
+            id=str(payload["id"]),
+            target_directory=str(payload["target_directory"]),
+            priority=int(payload.get("priority", 0)),
+            status=JobStatus(payload.get("status", JobStatus.QUEUED.value)),
+            created_at=float(payload.get("created_at") or time.time()),
+            started_at=payload.get("started_at"),
+            finished_at=payload.get("finished_at"),
+            error=payload.get("error"),
+            result=payload.get("result"),
+            events=list(payload.get("events") or []),
+        )
+
+
+class JobStore:
+    """Persist job records as one JSON document per job."""
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def save(self, job: Job) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._directory / f"{job.id}.json"
+        tmp_path = path.with_suffix(".json.tmp")
+        payload = job.to_dict(include_events=True)
+        tmp_path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def load_all(self) -> list[Job]:
+        if not self._directory.exists():
+            return []
+        jobs: list[Job] = []
+        for path in sorted(self._directory.glob("*.json")):
+            try:
+                jobs.append(Job.from_dict(json.loads(path.read_text(encoding="utf-8"))))
+            except (OSError, ValueError, KeyError):
+                continue
+        return jobs
+
+
+__all__ = ["Job", "JobStatus", "JobStore"]
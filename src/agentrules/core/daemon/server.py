@@ -0,0 +1,248 @@
+"""Local HTTP front-end for the analysis daemon."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from .jobs import Job
+from .service import AnalysisService
+
+logger = logging.getLogger("project_extractor")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+STREAM_HEARTBEAT_SECONDS = 15.0
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class _DaemonHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: AnalysisService) -> None:
+        super().__init__(address, _DaemonRequestHandler)
+        self.service = service
+
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+
+    - ``GET  /health``                   service status and job counts
+    - ``GET  /jobs``                     job summaries, newest first
+    - ``POST /jobs``                     queue ``{"path": ..., "priority": 0}``
+    - ``GET  /jobs/<id>``                job status and persisted result
+    - ``GET  /jobs/<id>/events?since=N`` events recorded after sequence ``N``
+    - ``GET  /jobs/<id>/stream?since=N`` newline-delimited JSON event stream
+    - ``POST /jobs/<id>/cancel``         cancel a queued or running job
+    """
+
+    server: _DaemonHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        logger.debug("daemon http: " + format, *args)
+
+    # ------------------------------------------------------------------ routing
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        parsed = urlparse(self.path)
+        parts = [part for part in parsed.path.split("/") if part]
+        query = parse_qs(parsed.query)
+        service = self.server.service
+
+        if parts == ["health"]:
+            self._send_json(
+                {"status": "ok", "concurrency": service.concurrency, "jobs": service.status_counts()}
+            )
+        elif parts == ["jobs"]:
+            self._send_json({"jobs": [job.to_dict(include_result=False) for job in service.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = service.get(parts[1])
+            self._send_job(job)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            since = _int_param(query, "since")
+            waited = service.wait_for_events(parts[1], since, timeout=0)
+            if waited is None:
+                self._send_error(HTTPStatus.NOT_FOUND, "job not found")
+                return
+            events, status = waited
+            self._send_json({"status": status.value, "events": events, "next": since + len(events)})
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "stream":
+            self._stream_events(parts[1], _int_param(query, "since"))
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "unknown route")
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        service = self.server.service
+
+        if parts == ["jobs"]:
+            body = self._read_json()
+            if body is None:
+                return
+            raw_path = body.get("path")
+            if not isinstance(raw_path, str) or not raw_path:
+                self._send_error(HTTPStatus.BAD_REQUEST, "'path' is required")
+                return
+            target = Path(raw_path).expanduser().resolve()
+            if not target.is_dir():
+                self._send_error(HTTPStatus.BAD_REQUEST, f"not a directory: {target}")
+                return
+            try:
+                priority = int(body.get("priority", 0))
+            except (TypeError, ValueError):
+                self._send_error(HTTPStatus.BAD_REQUEST, "'priority' must be an integer")
+                return
+            job = service.submit(target, priority=priority)
+            self._send_json(job.to_dict(), status=HTTPStatus.ACCEPTED)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            self._send_job(service.cancel(parts[1]))
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "unknown route")
+
+    # ------------------------------------------------------------------ helpers
+
+    def _stream_events(self, job_id: str, since: int) -> None:
+        service = self.server.service
+        waited = service.wait_for_events(job_id, since, timeout=0)
+        if waited is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "job not found")
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        cursor = since
+        try:
+            while True:
+                waited = service.wait_for_events(job_id, cursor, timeout=STREAM_HEARTBEAT_SECONDS)
+                if waited is None:
+                    return
+                events, status = waited
+                if not events and not status.is_terminal:
+                    self._write_line({"type": "heartbeat", "status": status.value})
+                for event in events:
+                    self._write_line(event)
+                cursor += len(events)
+                if status.is_terminal and not events:
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _write_line(self, payload: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(payload, default=str).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def _read_json(self) -> dict[str, Any] | None:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_REQUEST_BYTES:
+            self._send_error(HTTPStatus.BAD_REQUEST, "invalid request body size")
+            return None
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            body = json.loads(raw.decode("utf-8") or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            self._send_error(HTTPStatus.BAD_REQUEST, "request body must be JSON")
+            return None
+        if not isinstance(body, dict):
+            self._send_error(HTTPStatus.BAD_REQUEST, "request body must be a JSON object")
+            return None
+        return body
+
+    def _send_job(self, job: Job | None) -> None:
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "job not found")
+            return
+        self._send_json(job.to_dict())
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json({"error": message}, status=status)
+
+    def _send_json(self, payload: dict[str, Any], status: HTTPStatus = HTTPStatus.OK) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _int_param(query: dict[str, list[str]], name: str) -> int:
+    try:
+        return max(0, int(query.get(name, ["0"])[0]))
+    except ValueError:
+        return 0
+
+
+class AnalysisDaemon:
+    """Run an `AnalysisService` on a background event loop behind an HTTP server."""
+
+    def __init__(self, service: AnalysisService, *, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self._service = service
+        self._host = host
+        self._port = port
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="agentrules-daemon", daemon=True)
+        self._httpd: _DaemonHTTPServer | None = None
+        self._serving = False
+
+    @property
+    def address(self) -> tuple[str, int]:
+        if self._httpd is None:
+            return (self._host, self._port)
+        host, port = self._httpd.server_address[:2]
+        return (str(host), int(port))
+
+    def start(self) -> None:
+        """Start the service loop and bind the HTTP server."""
+
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._service.start(), self._loop).result()
+        self._httpd = _DaemonHTTPServer((self._host, self._port), self._service)
+
+    def serve_forever(self) -> None:
+        if self._httpd is None:
+            self.start()
+        assert self._httpd is not None
+        self._serving = True
+        self._httpd.serve_forever()
+
+    def serve_in_background(self) -> threading.Thread:
+        """Serve requests from a daemon thread and return it."""
+
+        if self._httpd is None:
+            self.start()
+        thread = threading.Thread(target=self.serve_forever, name="agentrules-daemon-http", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self) -> None:
+        """Stop accepting requests, cancel running jobs and stop the loop."""
+
+        if self._httpd is not None:
+            if self._serving:
+                self._httpd.shutdown()
+            self._httpd.server_close()
+        if self._thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self._service.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop.close()
+
+
+__all__ = ["AnalysisDaemon", "DEFAULT_HOST", "DEFAULT_PORT"]
@@ -0,0 +1,317 @@
+"""Prioritized job execution for the long-running analysis daemon."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from agentrules.core.analysis.events import AnalysisEvent, AnalysisEventSink
+from agentrules.core.analysis.scheduling import ThroughputStore
+from agentrules.core.configuration import ConfigManager, get_config_manager
+from agentrules.core.pipeline import (
+    AnalysisPipeline,
+    PipelineOutputWriter,
+    build_context_options,
+    build_output_options,
+    build_pipeline_settings,
+    create_default_pipeline,
+)
+from agentrules.core.pipeline.snapshot_cache import SnapshotCache
+
+from .jobs import Job, JobStatus, JobStore
+
+logger = logging.getLogger("project_extractor")
+
+JobRunner = Callable[[Job, AnalysisEventSink], Awaitable[dict[str, Any]]]
+"""Coroutine executing a job and returning a JSON-serialisable result summary."""
+
+
+class PipelineJobRunner:
+    """
+    Run the standard analysis pipeline for a job, reusing warm process state.
+
+    Snapshots come from a `SnapshotCache`, and pipelines (with the provider
+    clients their architects hold) are kept between jobs. Each pipeline serves
+    one job at a time; idle ones are reused while the configuration they were
+    built from is unchanged.
+    """
+
+    def __init__(
+        self,
+        *,
+        config_manager: ConfigManager | None = None,
+        snapshot_cache: SnapshotCache | None = None,
+        output_writer: PipelineOutputWriter | None = None,
+        pipeline_factory: Callable[..., AnalysisPipeline] = create_default_pipeline,
+    ) -> None:
+        self._config_manager = config_manager or get_config_manager()
+        self._snapshot_cache = snapshot_cache or SnapshotCache()
+        self._output_writer = output_writer or PipelineOutputWriter()
+        self._pipeline_factory = pipeline_factory
+        self._idle_pipelines: dict[str, list[AnalysisPipeline]] = {}
+        # Offline jobs run dummy architects, whose durations must not train predictions
+        self._throughput = None if os.getenv("OFFLINE", "0") == "1" else ThroughputStore()
+
+    @property
+    def snapshot_cache(self) -> SnapshotCache:
+        return self._snapshot_cache
+
+    async def __call__(self, job: Job, sink: AnalysisEventSink) -> dict[str, Any]:
+        config_manager = self._config_manager
+        settings = build_pipeline_settings(Path(job.target_directory), config_manager)
+        snapshot = await asyncio.to_thread(self._snapshot_cache.get, settings)
+        key, pipeline = self._acquire_pipeline(sink)
+        try:
+            result = await pipeline.run(settings, snapshot)
+        finally:
+            pipeline.set_event_sink(None)
+            self._idle_pipelines.setdefault(key, []).append(pipeline)
+        options = build_output_options(config_manager)
+        summary = await asyncio.to_thread(self._output_writer.persist, result, settings, options)
+        return {
+            "elapsed_seconds": result.metrics.elapsed_seconds,
+            "rules_path": str(settings.target_directory / options.rules_filename),
+            "messages": list(summary.messages),
+            "final_analysis": dict(result.final_analysis),
+        }
+
+    def _acquire_pipeline(self, sink: AnalysisEventSink) -> tuple[str, AnalysisPipeline]:
+        """Take an idle pipeline built for the current configuration, or build one."""
+
+        config_manager = self._config_manager
+        researcher_enabled = config_manager.is_researcher_enabled()
+        key = f"{researcher_enabled}:{config_manager.load()!r}"
+        idle = self._idle_pipelines.get(key)
+        if idle:
+            pipeline = idle.pop()
+            pipeline.set_event_sink(sink)
+            return key, pipeline
+        if key not in self._idle_pipelines:
+            # The configuration changed; pipelines built from an older one are not reused
+            self._idle_pipelines = {key: []}
+        pipeline = self._pipeline_factory(
+            researcher_enabled=researcher_enabled,
+            event_sink=sink,
+            phase3_max_concurrency=config_manager.get_phase3_max_concurrency(),
+            throughput=self._throughput,
+            context_options=build_context_options(config_manager),
+            phase2_planning=config_manager.get_phase2_planning(),
+        )
+        return key, pipeline
+
+
+class _JobEventSink:
+    """Route pipeline events into the owning job's event log."""
+
+    def __init__(self, service: AnalysisService, job_id: str) -> None:
+        self._service = service
+        self._job_id = job_id
+
+    def publish(self, event: AnalysisEvent) -> None:
+        self._service.record_event(self._job_id, event.phase, event.type, dict(event.payload))
+
+
+class AnalysisService:
+    """
+    Queue analysis jobs by priority and execute them with bounded concurrency.
+
+    All job state is guarded by a single condition variable so HTTP handler threads
+    can read status and block on new events while jobs run on the service loop.
+    """
+
+    def __init__(self, store: JobStore, *, runner: JobRunner, concurrency: int = 1) -> None:
+        self._store = store
+        self._runner = runner
+        self._concurrency = max(1, concurrency)
+        self._jobs: dict[str, Job] = {}
+        self._running: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.PriorityQueue[tuple[int, int, str]] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    async def start(self) -> None:
+        """Restore persisted jobs and start the worker tasks on the running loop."""
+
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.PriorityQueue()
+        for job in self._store.load_all():
+            if job.status in {JobStatus.QUEUED, JobStatus.RUNNING}:
+                job.status = JobStatus.QUEUED
+                job.started_at = None
+                self._jobs[job.id] = job
+                self.record_event(job.id, "job", "requeued", {"reason": "daemon restart"})
+                self._queue.put_nowait((-job.priority, next(self._sequence), job.id))
+            else:
+                self._jobs[job.id] = job
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self._concurrency)]
+
+    async def stop(self) -> None:
+        """Cancel running jobs and worker tasks."""
+
+        for task in list(self._running.values()):
+            task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, target_directory: Path | str, priority: int = 0) -> Job:
+        """Queue a new analysis job; safe to call from any thread."""
+
+        if self._loop is None or self._queue is None:
+            raise RuntimeError("AnalysisService.start() must be awaited before submitting jobs")
+        job = Job.create(target_directory, priority)
+        with self._condition:
+            self._jobs[job.id] = job
+            self._append_event(job, "job", "queued", {"priority": priority})
+            self._store.save(job)
+            submitted = self._copy(job)
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (-priority, next(self._sequence), job.id))
+        return submitted
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancel a queued or running job; safe to call from any thread."""
+
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status is JobStatus.QUEUED:
+                self._finish(job, JobStatus.CANCELLED)
+            elif job.status is JobStatus.RUNNING and self._loop is not None:
+                task = self._running.get(job_id)
+                if task is not None:
+                    self._loop.call_soon_threadsafe(task.cancel)
+            return self._copy(job)
+
+    def get(self, job_id: str) -> Job | None:
+        with self._condition:
+            job = self._jobs.get(job_id)
+            return self._copy(job) if job is not None else None
+
+    def list_jobs(self) -> list[Job]:
+        with self._condition:
+            jobs = sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+            return [self._copy(job) for job in jobs]
+
+    def status_counts(self) -> dict[str, int]:
+        with self._condition:
+            return dict(Counter(job.status.value for job in self._jobs.values()))
+
+    def record_event(self, job_id: str, phase: str, event_type: str, payload: dict[str, Any]) -> None:
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._append_event(job, phase, event_type, payload)
+
+    def wait_for_events(
+        self,
+        job_id: str,
+        since: int,
+        timeout: float | None = None,
+    ) -> tuple[list[dict[str, Any]], JobStatus] | None:
+        """
+        Block until the job has more than ``since`` events, finishes, or ``timeout`` expires.
+
+        Returns:
+            The new events and the job status, or None for unknown jobs.
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._condition.wait_for(lambda: len(job.events) > since or job.status.is_terminal, timeout)
+            return list(job.events[since:]), job.status
+
+    async def wait_until_idle(self) -> None:
+        """Wait for every queued job to finish (primarily for tests and shutdown)."""
+
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                await self._execute(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job_id: str) -> None:
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status is not JobStatus.QUEUED:
+                return
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            self._append_event(job, "job", "started", {})
+            self._store.save(job)
+
+        logger.info(f"[bold]Daemon:[/bold] running job {job_id} for {job.target_directory}")
+        task = asyncio.ensure_future(self._runner(job, _JobEventSink(self, job_id)))
+        self._running[job_id] = task
+        try:
+            await asyncio.wait({task})
+        finally:
+            self._running.pop(job_id, None)
+
+        with self._condition:
+            if task.cancelled():
+                self._finish(job, JobStatus.CANCELLED)
+            elif task.exception() is not None:
+                error = task.exception()
+                logger.error(f"[bold red]Daemon:[/bold red] job {job_id} failed: {error}")
+                self._finish(job, JobStatus.FAILED, error=str(error))
+            else:
+                self._finish(job, JobStatus.SUCCEEDED, result=task.result())
+
+    def _finish(
+        self,
+        job: Job,
+        status: JobStatus,
+        *,
+        error: str | None = None,
+        result: dict[str, Any] | None = None,
+    ) -> None:
+        # Caller holds the condition lock.
+        job.status = status
+        job.finished_at = time.time()
+        job.error = error
+        job.result = result
+        self._append_event(job, "job", "finished", {"status": status.value, "error": error})
+        self._store.save(job)
+
+    def _append_event(self, job: Job, phase: str, event_type: str, payload: dict[str, Any]) -> None:
+        # Caller holds the condition lock.
+        job.events.append(
+            {
+                "seq": len(job.events),
+                "time": time.time(),
+                "phase": phase,
+                "type": event_type,
+                "payload": payload,
+            }
+        )
+        self._condition.notify_all()
+
+    @staticmethod
+    def _copy(job: Job) -> Job:
+        return Job.from_dict(job.to_dict(include_events=True))
+
+
+__all__ = ["AnalysisService", "JobRunner", "PipelineJobRunner"]
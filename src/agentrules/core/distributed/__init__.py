@@ -0,0 +1,33 @@
+"""Queue-backed distribution of Phase 3 agent work across worker processes."""
+
+from .base import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, QueuedTask, TaskOutcome, TaskQueue
+from .coordinator import (
+    DEFAULT_MAX_POLL_FAILURES,
+    DEFAULT_POLL_INTERVAL,
+    TaskCoordinator,
+    build_agent_payload,
+    default_worker_id,
+    open_task_queue,
+    run_agent_payload,
+    run_worker,
+)
+from .redis_queue import RedisTaskQueue
+from .sqlite_queue import SqliteTaskQueue
+
+__all__ = [
+    "DEFAULT_LEASE_SECONDS",
+    "DEFAULT_MAX_ATTEMPTS",
+    "DEFAULT_MAX_POLL_FAILURES",
+    "DEFAULT_POLL_INTERVAL",
+    "QueuedTask",
+    "RedisTaskQueue",
+    "SqliteTaskQueue",
+    "TaskCoordinator",
+    "TaskOutcome",
+    "TaskQueue",
+    "build_agent_payload",
+    "default_worker_id",
+    "open_task_queue",
+    "run_agent_payload",
+    "run_worker",
+]
@@ -0,0 +1,68 @@
+"""Task queue abstractions shared by the coordinator and worker processes."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+DEFAULT_LEASE_SECONDS = 600.0
+"""How long a claimed task stays reserved, unless renewed, before another worker may retry it."""
+
+DEFAULT_MAX_ATTEMPTS = 3
+"""Number of claims allowed per task before it is marked as failed."""
+
+
+@dataclass(frozen=True)
+class QueuedTask:
+    """A unit of work claimed by a worker."""
+
+    task_id: str
+    run_id: str
+    payload: Mapping[str, Any]
+    attempts: int
+
+
+@dataclass(frozen=True)
+class TaskOutcome:
+    """Terminal state of a task as reported back to the coordinator."""
+
+    task_id: str
+    succeeded: bool
+    result: Mapping[str, Any] | None = None
+    error: str | None = None
+
+
+class TaskQueue(Protocol):
+    """
+    Storage backend used to hand Phase 3 agent tasks to worker processes.
+
+    Workers keep a claimed task by calling ``renew`` before its lease runs out.
+    ``complete`` and ``fail`` given a ``worker_id`` only record the outcome while
+    that worker still holds the task, and return whether they did.
+    """
+
+    def enqueue(self, run_id: str, task_id: str, payload: Mapping[str, Any], priority: int = 0) -> None: ...
+
+    def claim(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> QueuedTask | None: ...
+
+    def renew(self, task_id: str, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool: ...
+
+    def complete(self, task_id: str, result: Mapping[str, Any], worker_id: str | None = None) -> bool: ...
+
+    def fail(self, task_id: str, error: str, worker_id: str | None = None) -> bool: ...
+
+    def fetch_outcomes(self, task_ids: Iterable[str]) -> dict[str, TaskOutcome]: ...
+
+    def purge_run(self, run_id: str) -> None: ...
+
+    def close(self) -> None: ...
+
+
+__all__ = [
+    "DEFAULT_LEASE_SECONDS",
+    "DEFAULT_MAX_ATTEMPTS",
+    "QueuedTask",
+    "TaskOutcome",
+    "TaskQueue",
+]
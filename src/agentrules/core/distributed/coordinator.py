@@ -0,0 +1,264 @@
+"""Coordinator- and worker-side helpers for distributed Phase 3 execution."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from agentrules.config.prompts.phase_3_prompts import format_phase3_prompt
+
+from .base import DEFAULT_LEASE_SECONDS, TaskQueue
+
+logger = logging.getLogger("project_extractor")
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_MAX_POLL_FAILURES = 5
+DEFAULT_SQLITE_QUEUE_NAME = "phase3-queue.sqlite3"
+
+
+def open_task_queue(spec: str) -> TaskQueue:
+    """
+    Open a task queue from a location string.
+
+    ``sqlite`` uses the default database in the config directory; ``sqlite:///path``
+    or a plain file path selects a specific database; ``redis://``, ``rediss://`` and
+    ``unix://`` URLs use the Redis backend.
+    """
+    from .sqlite_queue import SqliteTaskQueue
+
+    value = spec.strip()
+    if value.startswith(("redis://", "rediss://", "unix://")):
+        from .redis_queue import RedisTaskQueue
+
+        return RedisTaskQueue(value)
+    if value in {"", "sqlite"}:
+        from agentrules.core.configuration import constants as configuration_constants
+
+        return SqliteTaskQueue(configuration_constants.CONFIG_DIR / "queue" / DEFAULT_SQLITE_QUEUE_NAME)
+    if value.startswith("sqlite://"):
+        value = value[len("sqlite://") :]
+    return SqliteTaskQueue(Path(value).expanduser())
+
+
+def build_agent_payload(agent_def: Mapping[str, Any], context: Mapping[str, Any]) -> dict[str, Any]:
+    """Serialise the agent definition and its prepared context for a worker."""
+
+    agent = {
+        key: agent_def.get(key)
+        for key in ("id", "name", "description", "responsibilities", "file_assignments")
+        if key in agent_def
+    }
+    return {"agent": agent, "context": dict(context)}
+
+
+async def run_agent_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """Execute one Phase 3 agent from a queued payload (worker side)."""
+
+    # Resolved at call time so offline patches of the factory apply.
+    from agentrules.core.agents import get_architect_for_phase
+
+    agent = dict(payload.get("agent") or {})
+    context = dict(payload.get("context") or {})
+    if "formatted_prompt" not in context:
+        context["formatted_prompt"] = format_phase3_prompt(context)
+    architect = get_architect_for_phase(
+        "phase3",
+        name=agent.get("name", "Analysis Agent"),
+        role=agent.get("description", "Analyzing the project"),
+        responsibilities=agent.get("responsibilities", []),
+    )
+    return dict(await architect.analyze(context))
+
+
+class TaskCoordinator:
+    """Enqueue tasks and await their outcomes with a single shared poller."""
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        timeout: float | None = None,
+        max_poll_failures: int = DEFAULT_MAX_POLL_FAILURES,
+    ) -> None:
+        self._queue = queue
+        self._poll_interval = poll_interval
+        self._timeout = timeout
+        self._max_poll_failures = max(1, max_poll_failures)
+        self._waiters: dict[str, asyncio.Future[Mapping[str, Any]]] = {}
+        self._poller: asyncio.Task[None] | None = None
+
+    @staticmethod
+    def new_run_id() -> str:
+        return uuid.uuid4().hex
+
+    async def run(
+        self,
+        run_id: str,
+        task_id: str,
+        payload: Mapping[str, Any],
+        *,
+        priority: int = 0,
+    ) -> Mapping[str, Any]:
+        """Enqueue ``payload`` and wait for a worker to report its result."""
+
+        await asyncio.to_thread(self._queue.enqueue, run_id, task_id, payload, priority)
+        future: asyncio.Future[Mapping[str, Any]] = asyncio.get_running_loop().create_future()
+        self._waiters[task_id] = future
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        try:
+            return await asyncio.wait_for(future, self._timeout)
+        finally:
+            self._waiters.pop(task_id, None)
+
+    async def close(self, run_id: str | None = None) -> None:
+        for future in self._waiters.values():
+            if not future.done():
+                future.cancel()
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+        if run_id is not None:
+            await asyncio.to_thread(self._queue.purge_run, run_id)
+
+    async def _poll(self) -> None:
+        failures = 0
+        while self._waiters:
+            pending = [task_id for task_id, future in self._waiters.items() if not future.done()]
+            try:
+                outcomes = await asyncio.to_thread(self._queue.fetch_outcomes, pending)
+            except Exception as error:
+                failures += 1
+                if failures >= self._max_poll_failures:
+                    # Fail the waiters instead of leaving Phase 3 waiting on a queue it cannot read
+                    logger.error(f"[bold red]Error:[/bold red] Task queue polling failed {failures} times: {error}")
+                    self._fail_pending(RuntimeError(f"task queue polling failed: {error}"))
+                    return
+                logger.warning(
+                    f"[bold yellow]Warning:[/bold yellow] Task queue polling failed "
+                    f"({failures}/{self._max_poll_failures}), retrying: {error}"
+                )
+                await asyncio.sleep(self._poll_interval)
+                continue
+            failures = 0
+            for task_id, outcome in outcomes.items():
+                future = self._waiters.get(task_id)
+                if future is None or future.done():
+                    continue
+                if outcome.succeeded:
+                    future.set_result(dict(outcome.result or {}))
+                else:
+                    future.set_exception(RuntimeError(outcome.error or f"task {task_id} failed"))
+            await asyncio.sleep(self._poll_interval)
+
+    def _fail_pending(self, error: Exception) -> None:
+        for future in self._waiters.values():
+            if not future.done():
+                future.set_exception(error)
+
+
+async def _renew_lease(queue: TaskQueue, task_id: str, worker_id: str, lease_seconds: float) -> None:
+    """Renew a claimed task's lease every third of its length; returns once the lease is lost."""
+
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        if not await asyncio.to_thread(queue.renew, task_id, worker_id, lease_seconds):
+            return
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+async def run_worker(
+    queue: TaskQueue,
+    *,
+    worker_id: str | None = None,
+    concurrency: int = 1,
+    poll_interval: float = 1.0,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    max_tasks: int | None = None,
+    exit_when_idle: bool = False,
+) -> int:
+    """
+    Pull agent tasks from ``queue`` and execute them until stopped.
+
+    Args:
+        queue: Task queue shared with the coordinating pipeline
+        worker_id: Identifier recorded on claimed tasks
+        concurrency: Number of tasks processed at the same time
+        poll_interval: Seconds to wait between empty polls
+        lease_seconds: Reservation time before another worker may retry a task;
+            renewed while the task runs
+        max_tasks: Stop after processing this many tasks
+        exit_when_idle: Stop as soon as the queue is empty
+
+    Returns:
+        Number of tasks processed
+    """
+    identity = worker_id or default_worker_id()
+    processed = 0
+    claimed = 0
+
+    async def _slot() -> None:
+        nonlocal processed, claimed
+        while max_tasks is None or claimed < max_tasks:
+            claimed += 1  # reserve the slot before the blocking claim so max_tasks is never exceeded
+            task = await asyncio.to_thread(queue.claim, identity, lease_seconds)
+            if task is None:
+                claimed -= 1
+                if exit_when_idle:
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+            agent_name = (task.payload.get("agent") or {}).get("name", task.task_id)
+            logger.info(f"[bold]Worker:[/bold] running {agent_name} (attempt {task.attempts})")
+            work = asyncio.ensure_future(run_agent_payload(task.payload))
+            heartbeat = asyncio.create_task(_renew_lease(queue, task.task_id, identity, lease_seconds))
+            try:
+                await asyncio.wait({work, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            except BaseException:
+                work.cancel()
+                raise
+            finally:
+                heartbeat.cancel()
+            if not work.done():
+                # The lease was lost, so the task is (or will be) retried elsewhere
+                work.cancel()
+                await asyncio.gather(work, return_exceptions=True)
+                logger.warning(f"[bold yellow]Worker:[/bold yellow] {agent_name} lost its lease; abandoned")
+                continue
+            error = work.exception()
+            if error is not None:
+                logger.error(f"[bold red]Worker:[/bold red] {agent_name} failed: {error}")
+                recorded = await asyncio.to_thread(queue.fail, task.task_id, str(error), identity)
+            else:
+                recorded = await asyncio.to_thread(queue.complete, task.task_id, work.result(), identity)
+            if not recorded:
+                logger.warning(
+                    f"[bold yellow]Worker:[/bold yellow] {agent_name} finished after its lease passed to another "
+                    "worker; result discarded"
+                )
+            processed += 1
+
+    await asyncio.gather(*(_slot() for _ in range(max(1, concurrency))))
+    return processed
+
+
+__all__ = [
+    "DEFAULT_POLL_INTERVAL",
+    "TaskCoordinator",
+    "build_agent_payload",
+    "default_worker_id",
+    "open_task_queue",
+    "run_agent_payload",
+    "run_worker",
+]
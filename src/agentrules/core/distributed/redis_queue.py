@@ -0,0 +1,202 @@
+"""Redis-backed task queue for workers spread across hosts.
+
+Requires the optional ``redis`` package (``pip install agentrules[redis]``).
+Any server speaking the Redis protocol (Redis >= 5, Valkey, KeyDB, ...) works.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from .base import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, QueuedTask, TaskOutcome
+
+_PRIORITY_WEIGHT = 1e10
+
+# KEYS: leases, task hash; ARGV: task id, worker id, new expiry
+_RENEW_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then return 0 end
+if redis.call('HGET', KEYS[2], 'status') ~= 'running' then return 0 end
+if redis.call('HGET', KEYS[2], 'worker_id') ~= ARGV[2] then return 0 end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+# KEYS: leases; ARGV: task id, now. Removes the lease only if it has not been renewed meanwhile.
+_EXPIRE_SCRIPT = """
+local expires = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not expires or tonumber(expires) > tonumber(ARGV[2]) then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+return 1
+"""
+
+# KEYS: leases, task hash; ARGV: task id, worker id ('' for any), then field/value pairs
+_FINISH_SCRIPT = """
+if ARGV[2] ~= '' then
+  if redis.call('HGET', KEYS[2], 'status') ~= 'running' then return 0 end
+  if redis.call('HGET', KEYS[2], 'worker_id') ~= ARGV[2] then return 0 end
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[2], unpack(ARGV, 3))
+return 1
+"""
+
+
+def _load_redis_client(url: str) -> Any:
+    try:
+        import redis  # type: ignore[import-not-found]
+    except ModuleNotFoundError as error:  # pragma: no cover - depends on optional extra
+        raise RuntimeError(
+            "The Redis task queue requires the 'redis' package. Install it with `pip install agentrules[redis]`."
+        ) from error
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+class RedisTaskQueue:
+    """
+    Task queue stored in Redis.
+
+    Pending tasks live in a sorted set ordered by priority then enqueue time and are
+    claimed atomically with ``ZPOPMIN``. Claimed tasks are tracked in a lease set so
+    tasks from crashed workers are returned to the queue until ``max_attempts``;
+    lease renewal and ownership checks run as Lua scripts so they are atomic.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        prefix: str = "agentrules:phase3",
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        client: Any | None = None,
+    ) -> None:
+        self._client = client if client is not None else _load_redis_client(url)
+        self._prefix = prefix
+        self._max_attempts = max(1, max_attempts)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self._prefix, *parts))
+
+    def enqueue(self, run_id: str, task_id: str, payload: Mapping[str, Any], priority: int = 0) -> None:
+        pipe = self._client.pipeline()
+        pipe.hset(
+            self._key("task", task_id),
+            mapping={
+                "run_id": run_id,
+                "payload": json.dumps(payload, default=str),
+                "status": "pending",
+                "attempts": 0,
+            },
+        )
+        pipe.sadd(self._key("run", run_id), task_id)
+        pipe.zadd(self._key("pending"), {task_id: time.time() - priority * _PRIORITY_WEIGHT})
+        pipe.execute()
+
+    def claim(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> QueuedTask | None:
+        self._reclaim_expired()
+        popped = self._client.zpopmin(self._key("pending"), 1)
+        if not popped:
+            return None
+        task_id = popped[0][0]
+        task_key = self._key("task", task_id)
+        attempts = int(self._client.hincrby(task_key, "attempts", 1))
+        pipe = self._client.pipeline()
+        pipe.hset(task_key, mapping={"status": "running", "worker_id": worker_id})
+        pipe.zadd(self._key("leases"), {task_id: time.time() + lease_seconds})
+        pipe.hget(task_key, "run_id")
+        pipe.hget(task_key, "payload")
+        _, _, run_id, payload = pipe.execute()
+        if payload is None:  # purged while queued
+            self._client.zrem(self._key("leases"), task_id)
+            return None
+        return QueuedTask(task_id=task_id, run_id=run_id or "", payload=json.loads(payload), attempts=attempts)
+
+    def _reclaim_expired(self) -> None:
+        leases = self._key("leases")
+        now = time.time()
+        for task_id in self._client.zrangebyscore(leases, "-inf", now):
+            # Removing the lease doubles as a lock: only the worker that removes it requeues the task,
+            # and a lease renewed since the range query is left alone.
+            if not self._client.eval(_EXPIRE_SCRIPT, 1, leases, task_id, now):
+                continue
+            task_key = self._key("task", task_id)
+            attempts = int(self._client.hget(task_key, "attempts") or 0)
+            if attempts >= self._max_attempts:
+                self._client.hset(
+                    task_key,
+                    mapping={"status": "failed", "error": "lease expired too many times"},
+                )
+            else:
+                self._client.hset(task_key, "status", "pending")
+                self._client.zadd(self._key("pending"), {task_id: time.time()})
+
+    def renew(self, task_id: str, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        renewed = self._client.eval(
+            _RENEW_SCRIPT,
+            2,
+            self._key("leases"),
+            self._key("task", task_id),
+            task_id,
+            worker_id,
+            time.time() + lease_seconds,
+        )
+        return bool(renewed)
+
+    def complete(self, task_id: str, result: Mapping[str, Any], worker_id: str | None = None) -> bool:
+        return self._finish(task_id, worker_id, {"status": "succeeded", "result": json.dumps(result, default=str)})
+
+    def fail(self, task_id: str, error: str, worker_id: str | None = None) -> bool:
+        return self._finish(task_id, worker_id, {"status": "failed", "error": error})
+
+    def _finish(self, task_id: str, worker_id: str | None, mapping: dict[str, str]) -> bool:
+        fields = [item for pair in mapping.items() for item in pair]
+        finished = self._client.eval(
+            _FINISH_SCRIPT,
+            2,
+            self._key("leases"),
+            self._key("task", task_id),
+            task_id,
+            worker_id or "",
+            *fields,
+        )
+        return bool(finished)
+
+    def fetch_outcomes(self, task_ids: Iterable[str]) -> dict[str, TaskOutcome]:
+        ids = list(task_ids)
+        if not ids:
+            return {}
+        pipe = self._client.pipeline()
+        for task_id in ids:
+            pipe.hmget(self._key("task", task_id), "status", "result", "error")
+        outcomes: dict[str, TaskOutcome] = {}
+        for task_id, (status, result, error) in zip(ids, pipe.execute(), strict=True):
+            if status not in {"succeeded", "failed"}:
+                continue
+            outcomes[task_id] = TaskOutcome(
+                task_id=task_id,
+                succeeded=status == "succeeded",
+                result=json.loads(result) if result else None,
+                error=error,
+            )
+        return outcomes
+
+    def purge_run(self, run_id: str) -> None:
+        run_key = self._key("run", run_id)
+        task_ids = list(self._client.smembers(run_key))
+        pipe = self._client.pipeline()
+        for task_id in task_ids:
+            pipe.delete(self._key("task", task_id))
+            pipe.zrem(self._key("pending"), task_id)
+            pipe.zrem(self._key("leases"), task_id)
+        pipe.delete(run_key)
+        pipe.execute()
+
+    def close(self) -> None:
+        close = getattr(self._client, "close", None)
+        if callable(close):
+            close()
+
+
+__all__ = ["RedisTaskQueue"]
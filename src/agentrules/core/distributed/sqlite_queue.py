@@ -0,0 +1,176 @@
+"""SQLite-backed task queue usable by processes sharing a filesystem."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .base import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, QueuedTask, TaskOutcome
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_claimable ON tasks (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS tasks_run ON tasks (run_id);
+"""
+
+_PENDING = "pending"
+_RUNNING = "running"
+_SUCCEEDED = "succeeded"
+_FAILED = "failed"
+
+
+class SqliteTaskQueue:
+    """
+    Task queue stored in a single SQLite database (WAL mode).
+
+    Claims run inside ``BEGIN IMMEDIATE`` transactions so concurrent workers never
+    receive the same task; leases that are not renewed in time are reclaimed until
+    ``max_attempts``.
+    """
+
+    def __init__(self, path: Path | str, *, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> None:
+        self._path = Path(path)
+        self._max_attempts = max(1, max_attempts)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._path, timeout=30.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, run_id: str, task_id: str, payload: Mapping[str, Any], priority: int = 0) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, run_id, priority, payload, status, attempts, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                (task_id, run_id, priority, json.dumps(payload, default=str), _PENDING, now, now),
+            )
+
+    def claim(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> QueuedTask | None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, error = ?, updated_at = ? "
+                    "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (_FAILED, "lease expired too many times", now, _RUNNING, now, self._max_attempts),
+                )
+                row = conn.execute(
+                    "SELECT task_id, run_id, payload, attempts FROM tasks "
+                    "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                    "ORDER BY priority DESC, created_at LIMIT 1",
+                    (_PENDING, _RUNNING, now),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                task_id, run_id, payload, attempts = row
+                conn.execute(
+                    "UPDATE tasks SET status = ?, worker_id = ?, attempts = ?, lease_expires = ?, updated_at = ? "
+                    "WHERE task_id = ?",
+                    (_RUNNING, worker_id, attempts + 1, now + lease_seconds, now, task_id),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return QueuedTask(task_id=task_id, run_id=run_id, payload=json.loads(payload), attempts=attempts + 1)
+
+    def renew(self, task_id: str, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE task_id = ? AND status = ? AND worker_id = ?",
+                (now + lease_seconds, now, task_id, _RUNNING, worker_id),
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, task_id: str, result: Mapping[str, Any], worker_id: str | None = None) -> bool:
+        return self._finish(task_id, _SUCCEEDED, worker_id, result=json.dumps(result, default=str))
+
+    def fail(self, task_id: str, error: str, worker_id: str | None = None) -> bool:
+        return self._finish(task_id, _FAILED, worker_id, error=error)
+
+    def _finish(
+        self,
+        task_id: str,
+        status: str,
+        worker_id: str | None,
+        *,
+        result: str | None = None,
+        error: str | None = None,
+    ) -> bool:
+        query = (
+            "UPDATE tasks SET status = ?, result = ?, error = ?, lease_expires = NULL, updated_at = ? "
+            "WHERE task_id = ?"
+        )
+        params: tuple[Any, ...] = (status, result, error, time.time(), task_id)
+        if worker_id is not None:
+            # Only the worker holding the lease may report; a reclaimed task belongs to its new worker
+            query += " AND status = ? AND worker_id = ?"
+            params += (_RUNNING, worker_id)
+        with self._connect() as conn:
+            return conn.execute(query, params).rowcount > 0
+
+    def fetch_outcomes(self, task_ids: Iterable[str]) -> dict[str, TaskOutcome]:
+        ids = list(task_ids)
+        outcomes: dict[str, TaskOutcome] = {}
+        if not ids:
+            return outcomes
+        with self._connect() as conn:
+            for offset in range(0, len(ids), 500):
+                batch = ids[offset : offset + 500]
+                placeholders = ",".join("?" for _ in batch)
+                rows = conn.execute(
+                    f"SELECT task_id, status, result, error FROM tasks "
+                    f"WHERE status IN (?, ?) AND task_id IN ({placeholders})",
+                    (_SUCCEEDED, _FAILED, *batch),
+                ).fetchall()
+                for task_id, status, result, error in rows:
+                    outcomes[task_id] = TaskOutcome(
+                        task_id=task_id,
+                        succeeded=status == _SUCCEEDED,
+                        result=json.loads(result) if result else None,
+                        error=error,
+                    )
+        return outcomes
+
+    def purge_run(self, run_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM tasks WHERE run_id = ?", (run_id,))
+
+    def close(self) -> None:
+        return
+
+
+__all__ = ["SqliteTaskQueue"]
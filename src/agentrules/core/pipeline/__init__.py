@@ -8,7 +8,12 @@ from .config import (
     PipelineSettings,
     ProjectSnapshot,
 )
-from .factory import create_default_pipeline
+from .factory import (
+    build_context_options,
+    build_output_options,
+    build_pipeline_settings,
+    create_default_pipeline,
+)
 from .orchestrator import AnalysisPipeline
 from .output import PipelineOutputOptions, PipelineOutputSummary, PipelineOutputWriter
 from .snapshot import build_project_snapshot
@@ -24,6 +29,9 @@ __all__ = [
     "PipelineResult",
     "PipelineSettings",
     "ProjectSnapshot",
+    "build_context_options",
+    "build_output_options",
+    "build_pipeline_settings",
     "create_default_pipeline",
     "build_project_snapshot",
 ]
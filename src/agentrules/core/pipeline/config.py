@@ -5,11 +5,17 @@ from __future__ import annotations
 from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from pathspec import PathSpec
 
 from agentrules.core.configuration.models import ExclusionOverrides
 
+if TYPE_CHECKING:
+    from agentrules.core.search import SearchIndex
+    from agentrules.core.utils.file_system.file_index import FileIndex
+    from agentrules.core.utils.module_graph import ModuleGraph
+
 
 @dataclass(frozen=True)
 class EffectiveExclusions:
@@ -47,6 +53,9 @@ class ProjectSnapshot:
     tree: tuple[str, ...]
     dependency_info: Mapping[str, object]
     gitignore: GitignoreSnapshot
+    file_index: FileIndex | None = None
+    search_index: SearchIndex | None = None
+    module_graph: ModuleGraph | None = None
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,527 @@
+"""Project the size, cost, and duration of an analysis run without calling any model.
+
+The dry run builds the same project snapshot, Phase 2 file groups and Phase 3
+agent contexts as a real run in the configured planning and context modes.
+Phase 3 prompts are therefore measured exactly. Model outputs are unknown ahead
+of time, so every other phase is estimated from its prompt template plus an
+assumed response size per call.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any
+
+from agentrules.config.context_windows import prompt_token_budget
+from agentrules.config.pricing import estimate_cost
+from agentrules.config.prompts.final_analysis_prompt import format_final_analysis_prompt
+from agentrules.config.prompts.phase_1_prompts import (
+    RESEARCHER_AGENT_PROMPT,
+    STRUCTURE_AGENT_PROMPT,
+    TECH_STACK_AGENT_PROMPT,
+    format_agent_prompt,
+    get_dependency_agent_prompt,
+)
+from agentrules.config.prompts.phase_2_prompts import (
+    format_phase2_clustered_prompt,
+    format_phase2_prompt,
+    format_phase2_structured_prompt,
+)
+from agentrules.config.prompts.phase_3_prompts import format_phase3_prompt, format_phase3_tools_prompt
+from agentrules.config.prompts.phase_4_prompts import format_phase4_prompt
+from agentrules.config.prompts.phase_5_prompts import format_phase5_prompt
+from agentrules.core.agent_tools.project_files import ProjectFileTools
+from agentrules.core.analysis.clustering import FileCluster, cluster_files, local_agent_plan
+from agentrules.core.analysis.consolidation import (
+    DEFAULT_MAX_PARALLEL_REDUCTIONS,
+    consolidation_token_budget,
+)
+from agentrules.core.analysis.context_packing import pack_agent_requests
+from agentrules.core.analysis.context_reduction import ContextOptions, FileReduction, reduce_file_contents
+from agentrules.core.analysis.file_selection import OmittedFile, git_churn, select_files
+from agentrules.core.analysis.phase_3 import build_agent_context, load_assigned_files, resolve_agent_definitions
+from agentrules.core.analysis.scheduling import ThroughputStore, projected_makespan
+from agentrules.core.configuration.models import PlanningMode
+from agentrules.core.utils.file_system.file_index import build_file_index
+from agentrules.core.utils.module_graph import load_module_graph
+from agentrules.core.utils.parsers.agent_parser import parse_agents_from_phase2
+from agentrules.core.utils.parsers.structured_plan import AGENT_PLAN_SCHEMA
+from agentrules.core.utils.tokens import estimate_tokens
+
+from .config import PipelineSettings, ProjectSnapshot
+
+ASSUMED_OUTPUT_TOKENS: dict[str, int] = {
+    "phase1": 1_500,
+    "phase2": 2_000,
+    "phase3": 2_000,
+    "phase4": 2_500,
+    "phase5": 3_000,
+    "final": 3_000,
+}
+"""Response size assumed for a single model call in each phase."""
+
+CALL_OVERHEAD_SECONDS = 2.0
+INPUT_TOKENS_PER_SECOND = 5_000.0
+OUTPUT_TOKENS_PER_SECOND = 60.0
+DETERMINISTIC_PLAN_MAX_AGENTS = 5
+CACHED_PLAN_PATH = PurePosixPath("phases_output") / "phase2_planning.md"
+
+_TREE_ENTRY = re.compile(r"^(?P<indent>(?:│   |    )*)(?:├── |└── )(?P<icon>\S+) (?P<name>.+)$")
+
+
+@dataclass(frozen=True)
+class CallEstimate:
+    """Projected size and latency of a single model call."""
+
+    label: str
+    input_tokens: int
+    output_tokens: int
+    input_bytes: int
+    file_count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class PhaseEstimate:
+    """Projected totals for one pipeline phase."""
+
+    phase: str
+    model_name: str
+    calls: tuple[CallEstimate, ...]
+    wall_seconds: float
+    cost: float | None
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(call.input_tokens for call in self.calls)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(call.output_tokens for call in self.calls)
+
+    @property
+    def input_bytes(self) -> int:
+        return sum(call.input_bytes for call in self.calls)
+
+    @property
+    def file_count(self) -> int:
+        return sum(call.file_count for call in self.calls)
+
+
+@dataclass(frozen=True)
+class DryRunReport:
+    """Projection for a complete pipeline run."""
+
+    plan_source: str
+    phase3_max_concurrency: int | None
+    phases: tuple[PhaseEstimate, ...]
+    reductions: tuple[FileReduction, ...] = ()
+    """Per-file savings of the configured Phase 3 context reduction, largest first."""
+    omitted: tuple[OmittedFile, ...] = ()
+    """Files left out of Phase 3 agents by the per-agent token budget, in agent order."""
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(phase.input_tokens for phase in self.phases)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(phase.output_tokens for phase in self.phases)
+
+    @property
+    def wall_seconds(self) -> float:
+        return sum(phase.wall_seconds for phase in self.phases)
+
+    @property
+    def cost(self) -> float | None:
+        costs = [phase.cost for phase in self.phases]
+        if any(cost is None for cost in costs):
+            return None
+        return sum(cost for cost in costs if cost is not None)
+
+    def phase(self, name: str) -> PhaseEstimate:
+        for estimate in self.phases:
+            if estimate.phase == name:
+                return estimate
+        raise KeyError(name)
+
+
+def build_dry_run_report(
+    settings: PipelineSettings,
+    snapshot: ProjectSnapshot,
+    *,
+    researcher_enabled: bool,
+    phase3_max_concurrency: int | None = None,
+    model_names: Mapping[str, str] | None = None,
+    throughput: ThroughputStore | None = None,
+    context_options: ContextOptions | None = None,
+    phase2_planning: PlanningMode = "model",
+) -> DryRunReport:
+    """
+    Assemble every prompt the pipeline would send and project tokens, cost and time.
+
+    Args:
+        settings: Pipeline settings for the target project
+        snapshot: Project snapshot built from ``settings``
+        researcher_enabled: Whether Phase 1 would run the researcher agent
+        phase3_max_concurrency: Concurrency cap applied to Phase 3 agents
+        model_names: Optional phase -> model name mapping (defaults to ``MODEL_CONFIG``)
+        throughput: Optional per-model durations learned from previous runs, used for
+            Phase 3 call times instead of the static rates
+        context_options: Optional reduction, per-agent file budget and tool access
+            applied to Phase 3 file contents
+        phase2_planning: Configured Phase 2 planning mode; selects the Phase 2 prompt
+            and, without a cached plan, how the Phase 3 agents are planned
+
+    Returns:
+        The projected report
+    """
+    models = dict(model_names) if model_names is not None else _configured_model_names()
+    tree = list(snapshot.tree)
+
+    file_index = snapshot.file_index
+    clusters = _plan_clusters(snapshot) if phase2_planning in ("clustered", "local") else []
+    agents, plan_source = load_cached_plan(settings)
+    if not agents and clusters:
+        agents, plan_source = local_agent_plan(clusters), f"{phase2_planning} file groups"
+    if not agents:
+        file_paths = [entry.path for entry in file_index.files()] if file_index is not None else None
+        agents, plan_source = deterministic_plan(tree, file_paths=file_paths), "deterministic"
+
+    phase1 = _estimate_phase1(snapshot, researcher_enabled, models)
+    phase2 = _estimate_phase2(tree, clusters, phase2_planning, models, upstream_tokens=phase1.output_tokens)
+    reductions: dict[str, FileReduction] = {}
+    omitted: list[OmittedFile] = []
+    phase3 = _estimate_phase3(
+        settings, snapshot, agents, models, phase3_max_concurrency, throughput, context_options, reductions, omitted
+    )
+    phase4 = _estimate_single(
+        "phase4",
+        models,
+        format_phase4_prompt({}),
+        upstream_tokens=phase3.output_tokens,
+        label="Synthesis",
+    )
+    phase5 = _estimate_phase5(
+        models,
+        upstream_tokens=phase1.output_tokens + phase2.output_tokens + phase3.output_tokens + phase4.output_tokens,
+    )
+    final = _estimate_single(
+        "final",
+        models,
+        format_final_analysis_prompt({}, tree),
+        upstream_tokens=phase5.output_tokens,
+        label="Rules",
+    )
+
+    return DryRunReport(
+        plan_source=plan_source,
+        phase3_max_concurrency=phase3_max_concurrency,
+        phases=(phase1, phase2, phase3, phase4, phase5, final),
+        reductions=tuple(sorted(reductions.values(), key=lambda reduction: -reduction.tokens_saved)),
+        omitted=tuple(omitted),
+    )
+
+
+def load_cached_plan(settings: PipelineSettings) -> tuple[list[dict[str, Any]], str]:
+    """Return agents parsed from a previous run's Phase 2 report, if one exists."""
+
+    path = settings.target_directory / CACHED_PLAN_PATH
+    if not path.is_file():
+        return [], ""
+    try:
+        agents = parse_agents_from_phase2(path.read_text(encoding="utf-8"))
+    except Exception:  # pragma: no cover - malformed reports fall back to the deterministic plan
+        return [], ""
+    return [agent for agent in agents if isinstance(agent, dict)], f"cached ({CACHED_PLAN_PATH})"
+
+
+def deterministic_plan(
+    tree: Sequence[str],
+    *,
+    max_agents: int = DETERMINISTIC_PLAN_MAX_AGENTS,
+    file_paths: Sequence[str] | None = None,
+) -> list[dict]:
+    """
+    Build a stand-in Phase 2 plan by grouping files per top-level directory.
+
+    Groups are packed largest-first onto the agent with the fewest files so the
+    projected Phase 3 workload resembles the 3-5 agent plans Phase 2 produces.
+    ``file_paths`` (usually from the snapshot's file index) takes precedence over
+    paths recovered from ``tree``.
+    """
+    groups: dict[str, list[str]] = {}
+    for path in tree_file_paths(tree) if file_paths is None else file_paths:
+        top = path.split("/", 1)[0] if "/" in path else "(root)"
+        groups.setdefault(top, []).append(path)
+    if not groups:
+        return []
+
+    bins: list[tuple[int, int, list[str], list[str]]] = []
+    for index in range(min(max_agents, len(groups))):
+        heapq.heappush(bins, (0, index, [], []))
+    for name, files in sorted(groups.items(), key=lambda item: (-len(item[1]), item[0])):
+        count, index, names, assigned = heapq.heappop(bins)
+        heapq.heappush(bins, (count + len(files), index, [*names, name], assigned + files))
+
+    agents = []
+    for _, index, names, assigned in sorted(bins, key=lambda entry: entry[1]):
+        agents.append(
+            {
+                "id": f"agent_{index + 1}",
+                "name": f"{', '.join(names)} Agent",
+                "description": f"Analyzes {', '.join(names)}",
+                "file_assignments": assigned,
+            }
+        )
+    return agents
+
+
+def tree_file_paths(tree: Sequence[str]) -> list[str]:
+    """Recover relative file paths from the rendered project tree."""
+
+    paths: list[str] = []
+    parents: list[str] = []
+    for line in tree:
+        match = _TREE_ENTRY.match(line)
+        if match is None or match["name"].startswith(("<", "(")) or match["icon"] == "...":
+            continue
+        depth = len(match["indent"]) // 4
+        del parents[depth:]
+        if match["icon"] == "📁":
+            parents.append(match["name"])
+        else:
+            paths.append("/".join([*parents, match["name"]]))
+    return paths
+
+
+def estimate_call_seconds(input_tokens: int, output_tokens: int) -> float:
+    """Projected latency of one model call."""
+
+    return CALL_OVERHEAD_SECONDS + input_tokens / INPUT_TOKENS_PER_SECOND + output_tokens / OUTPUT_TOKENS_PER_SECOND
+
+
+def _configured_model_names() -> dict[str, str]:
+    from agentrules.config.agents import MODEL_CONFIG
+
+    return {phase: config.model_name for phase, config in MODEL_CONFIG.items()}
+
+
+def _call(
+    label: str,
+    prompt: str,
+    output_tokens: int,
+    *,
+    extra_tokens: int = 0,
+    file_count: int = 0,
+    seconds: float | None = None,
+) -> CallEstimate:
+    input_tokens = estimate_tokens(prompt) + extra_tokens
+    return CallEstimate(
+        label=label,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        input_bytes=len(prompt.encode("utf-8")) + extra_tokens * 4,
+        file_count=file_count,
+        seconds=estimate_call_seconds(input_tokens, output_tokens) if seconds is None else seconds,
+    )
+
+
+def _phase(phase: str, models: Mapping[str, str], calls: Sequence[CallEstimate], wall_seconds: float) -> PhaseEstimate:
+    model_name = models.get(phase, "")
+    costs = [estimate_cost(model_name, call.input_tokens, call.output_tokens) for call in calls]
+    cost = None if any(value is None for value in costs) else sum(value for value in costs if value is not None)
+    return PhaseEstimate(phase=phase, model_name=model_name, calls=tuple(calls), wall_seconds=wall_seconds, cost=cost)
+
+
+def _estimate_single(
+    phase: str,
+    models: Mapping[str, str],
+    template: str,
+    *,
+    upstream_tokens: int,
+    label: str,
+) -> PhaseEstimate:
+    call = _call(label, template, ASSUMED_OUTPUT_TOKENS[phase], extra_tokens=upstream_tokens)
+    return _phase(phase, models, [call], call.seconds)
+
+
+def _estimate_phase1(snapshot: ProjectSnapshot, researcher_enabled: bool, models: Mapping[str, str]) -> PhaseEstimate:
+    output = ASSUMED_OUTPUT_TOKENS["phase1"]
+    dependency_info = dict(snapshot.dependency_info)
+    dependency_context = {
+        "dependency_manifests": dependency_info.get("manifests", []),
+        "dependency_summary": dependency_info.get("summary", {}),
+    }
+    shared_context = {
+        "tree_structure": list(snapshot.tree),
+        "dependency_summary": dependency_context["dependency_summary"],
+    }
+
+    def _prompt(agent: Mapping[str, Any], context: Mapping[str, Any]) -> str:
+        return format_agent_prompt(agent, json.dumps(context, indent=2, default=str))
+
+    dependency_prompt = _prompt(get_dependency_agent_prompt(researcher_enabled), dependency_context)
+    dependency = _call("Dependency Agent", dependency_prompt, output)
+    calls = [dependency]
+    wall = dependency.seconds
+    upstream = output
+    if researcher_enabled:
+        research_context = {**dependency_context, "tree_structure": list(snapshot.tree)}
+        research_prompt = _prompt(RESEARCHER_AGENT_PROMPT, research_context)
+        researcher = _call("Researcher Agent", research_prompt, output, extra_tokens=output)
+        calls.append(researcher)
+        wall += researcher.seconds
+        upstream += output
+    parallel = [
+        _call(agent["name"], _prompt(agent, shared_context), output, extra_tokens=upstream)
+        for agent in (STRUCTURE_AGENT_PROMPT, TECH_STACK_AGENT_PROMPT)
+    ]
+    calls.extend(parallel)
+    wall += max(call.seconds for call in parallel)
+    return _phase("phase1", models, calls, wall)
+
+
+def _plan_clusters(snapshot: ProjectSnapshot) -> list[FileCluster]:
+    """File groups Phase 2 would plan from, built like `AnalysisPipeline.run_phase2` does."""
+
+    if snapshot.file_index is None:
+        return []
+    graph = snapshot.module_graph
+    if graph is None:
+        try:
+            graph = load_module_graph(snapshot.file_index)
+        except Exception:  # pragma: no cover - the graph only refines the groups
+            graph = None
+    return cluster_files(snapshot.file_index, graph)
+
+
+def _estimate_phase2(
+    tree: list[str],
+    clusters: Sequence[FileCluster],
+    planning: PlanningMode,
+    models: Mapping[str, str],
+    *,
+    upstream_tokens: int,
+) -> PhaseEstimate:
+    if clusters:
+        # Clustered planning skips the model call for a single group, local planning always does
+        if planning == "local" or len(clusters) == 1:
+            return _phase("phase2", models, [], 0.0)
+        template = format_phase2_clustered_prompt({}, clusters)
+    elif planning == "structured":
+        template = format_phase2_structured_prompt({}, tree, AGENT_PLAN_SCHEMA)
+    else:
+        template = format_phase2_prompt({}, tree)
+    return _estimate_single("phase2", models, template, upstream_tokens=upstream_tokens, label="Planning")
+
+
+def _estimate_phase3(
+    settings: PipelineSettings,
+    snapshot: ProjectSnapshot,
+    agents: list[dict],
+    models: Mapping[str, str],
+    max_concurrency: int | None,
+    throughput: ThroughputStore | None,
+    context_options: ContextOptions | None = None,
+    reductions: dict[str, FileReduction] | None = None,
+    omitted: list[OmittedFile] | None = None,
+) -> PhaseEstimate:
+    tree = list(snapshot.tree)
+    calls = []
+    file_cache: dict[str, str | None] = {}
+    model_name = models.get("phase3", "")
+    token_budget = prompt_token_budget(model_name)
+    agent_budget = context_options.agent_token_budget if context_options is not None else None
+    churn = git_churn(settings.target_directory) if agent_budget else None
+    file_tools = None
+    if context_options is not None and context_options.tool_access:
+        file_tools = ProjectFileTools(snapshot.file_index or build_file_index(settings.target_directory))
+    for agent_def in resolve_agent_definitions({"agents": agents}, tree, snapshot.file_index):
+        assigned = list(agent_def.get("file_assignments", []) or [])
+        if not assigned:
+            continue
+        if file_tools is not None:
+            # Tool-driven agents get a manifest instead of contents; the files they fetch later are not priced
+            context = build_agent_context(agent_def, tree, {})
+            context["file_manifest"] = file_tools.manifest(assigned)
+            context["tool_results"] = []
+            prompt = format_phase3_tools_prompt(context)
+            learned = throughput.predict_seconds(model_name, estimate_tokens(prompt)) if throughput else None
+            calls.append(
+                _call(
+                    agent_def.get("name", "Analysis Agent"),
+                    prompt,
+                    ASSUMED_OUTPUT_TOKENS["phase3"],
+                    file_count=len(assigned),
+                    seconds=learned,
+                )
+            )
+            continue
+        file_contents = load_assigned_files(settings.target_directory, assigned, file_cache, snapshot.file_index)
+        # Same order as Phase 3: select on the loaded files, then reduce the kept ones
+        if agent_budget:
+            selection = select_files(agent_def, file_contents, token_budget=agent_budget, churn=churn)
+            if selection.omitted:
+                agent_def = {**agent_def, "file_assignments": list(selection.contents)}
+                file_contents = selection.contents
+                if omitted is not None:
+                    omitted.extend(selection.omitted)
+        file_contents, file_reductions = reduce_file_contents(agent_def, file_contents, context_options)
+        if reductions is not None:
+            reductions.update((reduction.path, reduction) for reduction in file_reductions)
+        # Agents over the model's prompt budget are split exactly as Phase 3 would split them
+        for request in pack_agent_requests(agent_def, tree, file_contents, token_budget=token_budget):
+            prompt = format_phase3_prompt(build_agent_context(request.agent, request.tree, request.file_contents))
+            learned = throughput.predict_seconds(model_name, estimate_tokens(prompt)) if throughput else None
+            calls.append(
+                _call(
+                    request.agent.get("name", "Analysis Agent"),
+                    prompt,
+                    ASSUMED_OUTPUT_TOKENS["phase3"],
+                    file_count=len(request.file_contents),
+                    seconds=learned,
+                )
+            )
+    # Phase 3 hands slots to the largest agents first
+    wall = projected_makespan(sorted((call.seconds for call in calls), reverse=True), max_concurrency)
+    return _phase("phase3", models, calls, wall)
+
+
+def _estimate_phase5(models: Mapping[str, str], *, upstream_tokens: int) -> PhaseEstimate:
+    output = ASSUMED_OUTPUT_TOKENS["phase5"]
+    template = format_phase5_prompt({})
+    token_budget = consolidation_token_budget(models.get("phase5", ""), template)
+    chunks = math.ceil(upstream_tokens / token_budget) if upstream_tokens else 1
+    if chunks <= 1:
+        call = _call("Consolidation", template, output, extra_tokens=upstream_tokens)
+        return _phase("phase5", models, [call], call.seconds)
+
+    # Oversized inputs are reduced in parallel chunks before the final consolidation call.
+    per_chunk = math.ceil(upstream_tokens / chunks)
+    reductions = [
+        _call(f"Partial report {index + 1}/{chunks}", "", output, extra_tokens=per_chunk) for index in range(chunks)
+    ]
+    consolidation = _call("Consolidation", template, output, extra_tokens=output * chunks)
+    wall = projected_makespan([call.seconds for call in reductions], DEFAULT_MAX_PARALLEL_REDUCTIONS)
+    return _phase("phase5", models, [*reductions, consolidation], wall + consolidation.seconds)
+
+
+__all__ = [
+    "ASSUMED_OUTPUT_TOKENS",
+    "CallEstimate",
+    "DryRunReport",
+    "PhaseEstimate",
+    "build_dry_run_report",
+    "deterministic_plan",
+    "estimate_call_seconds",
+    "load_cached_plan",
+    "projected_makespan",
+    "tree_file_paths",
+]
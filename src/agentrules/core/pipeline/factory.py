@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from agentrules.core.analysis import (
     FinalAnalysis,
     Phase1Analysis,
@@ -10,24 +12,110 @@ from agentrules.core.analysis import (
     Phase4Analysis,
     Phase5Analysis,
 )
+from agentrules.core.analysis.context_reduction import (
+    DEFAULT_OUTLINE_KEEP_FULL,
+    DEFAULT_OUTLINE_THRESHOLD_KB,
+    ContextOptions,
+)
 from agentrules.core.analysis.events import AnalysisEventSink
+from agentrules.core.analysis.scheduling import ThroughputStore
+from agentrules.core.configuration import ConfigManager
+from agentrules.core.configuration.models import PlanningMode
+from agentrules.core.distributed import TaskQueue
 
+from .config import EffectiveExclusions, PipelineSettings
 from .orchestrator import AnalysisPipeline
+from .output import PipelineOutputOptions
 
 
 def create_default_pipeline(
     *,
     researcher_enabled: bool,
     event_sink: AnalysisEventSink | None = None,
+    task_queue: TaskQueue | None = None,
+    phase3_max_concurrency: int | None = None,
+    throughput: ThroughputStore | None = None,
+    context_options: ContextOptions | None = None,
+    phase2_planning: PlanningMode = "model",
 ) -> AnalysisPipeline:
-    """Build an `AnalysisPipeline` with the standard phase implementations."""
+    """Build an `AnalysisPipeline` with the standard phase implementations.
+
+    When ``task_queue`` is provided, Phase 3 agents are executed by worker processes.
+    ``phase3_max_concurrency`` caps how many Phase 3 agents run at the same time;
+    ``throughput`` records agent durations for predicting later runs;
+    ``context_options`` controls how Phase 3 file contents are reduced;
+    ``phase2_planning`` selects how Phase 2 assigns files to agents.
+    """
 
     return AnalysisPipeline(
         phase1=Phase1Analysis(researcher_enabled=researcher_enabled),
-        phase2=Phase2Analysis(),
-        phase3=Phase3Analysis(),
+        phase2=Phase2Analysis(planning=phase2_planning),
+        phase3=Phase3Analysis(
+            task_queue=task_queue,
+            max_concurrency=phase3_max_concurrency,
+            throughput=throughput,
+            context_options=context_options,
+        ),
         phase4=Phase4Analysis(),
         phase5=Phase5Analysis(),
         final=FinalAnalysis(),
         event_sink=event_sink,
     )
+
+
+def build_pipeline_settings(target_directory: Path, config_manager: ConfigManager) -> PipelineSettings:
+    """Resolve `PipelineSettings` for ``target_directory`` from persisted configuration."""
+
+    exclusion_overrides = config_manager.get_exclusion_overrides()
+    effective_dirs, effective_files, effective_exts = config_manager.get_effective_exclusions()
+    return PipelineSettings(
+        target_directory=target_directory,
+        tree_max_depth=config_manager.get_tree_max_depth(),
+        respect_gitignore=config_manager.should_respect_gitignore(),
+        effective_exclusions=EffectiveExclusions(
+            directories=frozenset(effective_dirs),
+            files=frozenset(effective_files),
+            extensions=frozenset(effective_exts),
+        ),
+        exclusion_overrides=exclusion_overrides,
+    )
+
+
+def build_output_options(config_manager: ConfigManager) -> PipelineOutputOptions:
+    """Resolve artifact persistence options from persisted configuration."""
+
+    return PipelineOutputOptions(
+        rules_filename=config_manager.get_rules_filename(),
+        generate_phase_outputs=config_manager.should_generate_phase_outputs(),
+        generate_cursorignore=config_manager.should_generate_cursorignore(),
+    )
+
+
+def build_context_options(config_manager: ConfigManager) -> ContextOptions | None:
+    """Resolve Phase 3 context reduction from persisted configuration; ``None`` sends files unchanged."""
+
+    preferences = config_manager.get_context_preferences()
+    outline = preferences.mode == "outline"
+    if not (
+        outline
+        or preferences.minify
+        or preferences.dedupe
+        or preferences.near_duplicates
+        or preferences.agent_token_budget
+        or preferences.mode == "tools"
+    ):
+        return None
+    threshold_kb = preferences.outline_threshold_kb or DEFAULT_OUTLINE_THRESHOLD_KB
+    keep_full = preferences.outline_keep_full
+    return ContextOptions(
+        outline=outline,
+        outline_threshold_bytes=threshold_kb * 1024,
+        keep_full_files=DEFAULT_OUTLINE_KEEP_FULL if keep_full is None else keep_full,
+        minify=preferences.minify,
+        drop_comments=preferences.minify_drop_comments,
+        drop_literal_tables=preferences.minify_drop_literal_tables,
+        dedupe=preferences.dedupe,
+        near_duplicates=preferences.near_duplicates,
+        agent_token_budget=preferences.agent_token_budget,
+        tool_access=preferences.mode == "tools",
+    )
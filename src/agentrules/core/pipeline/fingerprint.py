@@ -0,0 +1,195 @@
+"""Fingerprints identifying analysis runs that would produce identical artifacts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass, field
+from importlib import resources
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Any
+
+from .config import PipelineSettings
+
+if TYPE_CHECKING:
+    from agentrules.core.analysis.context_reduction import ContextOptions
+
+logger = logging.getLogger("project_extractor")
+
+FINGERPRINT_VERSION = 1
+GENERATED_PATHS = ("phases_output", ".cursorignore")
+"""Artifacts written into the project by a run; they never affect its fingerprint."""
+
+_GIT_TIMEOUT_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class RunFingerprint:
+    """Digest of everything that determines a run's output, plus its inputs for display."""
+
+    digest: str
+    components: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def short(self) -> str:
+        return self.digest[:12]
+
+
+def compute_run_fingerprint(
+    settings: PipelineSettings,
+    *,
+    researcher_enabled: bool,
+    rules_filename: str | None = None,
+    model_config: Mapping[str, Any] | None = None,
+    context_options: ContextOptions | None = None,
+    phase2_planning: str | None = None,
+) -> RunFingerprint | None:
+    """
+    Fingerprint a run from the project's git state and the effective configuration.
+
+    Returns ``None`` when the target is not inside a git work tree, because the
+    project contents cannot then be identified cheaply and the run is not cached.
+
+    Args:
+        settings: Pipeline settings for the target project
+        researcher_enabled: Whether Phase 1 runs the researcher agent
+        rules_filename: Rules file written into the project (ignored by the dirty-tree hash)
+        model_config: Phase -> ``ModelConfig`` mapping (defaults to ``MODEL_CONFIG``)
+        context_options: Reduction applied to Phase 3 file contents, if any
+        phase2_planning: How Phase 2 assigns files to agents (see `Phase2Analysis`)
+
+    Returns:
+        The fingerprint, or None when the run cannot be fingerprinted
+    """
+    generated = [*GENERATED_PATHS, *([rules_filename] if rules_filename else [])]
+    state = git_state(settings, ignore=generated)
+    if state is None:
+        return None
+    head_tree, dirty_hash = state
+
+    if model_config is None:
+        from agentrules.config.agents import MODEL_CONFIG
+
+        model_config = MODEL_CONFIG
+
+    exclusions = settings.effective_exclusions
+    components: dict[str, Any] = {
+        "version": FINGERPRINT_VERSION,
+        "git_tree": head_tree,
+        "dirty": dirty_hash,
+        "tree_max_depth": settings.tree_max_depth,
+        "respect_gitignore": settings.respect_gitignore,
+        "exclusions": {
+            "directories": sorted(exclusions.directories),
+            "files": sorted(exclusions.files),
+            "extensions": sorted(exclusions.extensions),
+        },
+        "models": {phase: _describe_model(config) for phase, config in sorted(model_config.items())},
+        "researcher_enabled": researcher_enabled,
+        "context": asdict(context_options) if context_options is not None else None,
+        "planning": phase2_planning,
+        "offline": os.getenv("OFFLINE", "0") == "1",
+        "prompts": prompt_template_digest(),
+    }
+    encoded = json.dumps(components, sort_keys=True, default=str).encode("utf-8")
+    return RunFingerprint(digest=hashlib.sha256(encoded).hexdigest(), components=components)
+
+
+def git_state(settings: PipelineSettings, *, ignore: Iterable[str] = ()) -> tuple[str, str] | None:
+    """
+    Return the committed tree id of the target directory and a hash of uncommitted changes.
+
+    The tree id (``HEAD:./``) is used rather than the commit id so retried jobs, tags
+    and commits that leave the target directory untouched share a fingerprint. The
+    dirty hash covers tracked modifications and untracked files that the analysis
+    would see, including gitignored files when ``respect_gitignore`` is off; it is
+    ``"clean"`` when there are none.
+    """
+    directory = settings.target_directory
+    head_tree = _git(directory, "rev-parse", "HEAD:./")
+    if head_tree is None:
+        return None
+
+    excludes = [f":(exclude){path}" for path in ignore]
+    status_args = ["status", "--porcelain", "--untracked-files=all"]
+    if not settings.respect_gitignore:
+        # Ignored files are part of the snapshot then, so they must not read as clean.
+        status_args.append("--ignored")
+    status = _git(directory, *status_args, "--", ".", *excludes)
+    if status is None:
+        return None
+    if not status.strip():
+        return head_tree.strip(), "clean"
+
+    digest = hashlib.sha256()
+    diff = _git(directory, "diff", "HEAD", "--binary", "--", ".", *excludes, raw=True)
+    changed = bool(diff)
+    digest.update(diff or b"")
+
+    untracked_args = ["ls-files", "--others", "-z"]
+    if settings.respect_gitignore:
+        untracked_args.append("--exclude-standard")
+    untracked = _git(directory, *untracked_args, "--", ".", *excludes) or ""
+    for relative in sorted(filter(None, untracked.split("\0"))):
+        if _is_excluded(PurePosixPath(relative), settings):
+            continue
+        changed = True
+        digest.update(relative.encode("utf-8") + b"\0")
+        try:
+            digest.update(hashlib.sha256((directory / relative).read_bytes()).digest())
+        except OSError:
+            digest.update(b"<unreadable>")
+    return head_tree.strip(), digest.hexdigest() if changed else "clean"
+
+
+def prompt_template_digest() -> str:
+    """Hash the prompt template modules so prompt edits invalidate cached runs."""
+
+    digest = hashlib.sha256()
+    package = resources.files("agentrules.config.prompts")
+    for entry in sorted(package.iterdir(), key=lambda item: item.name):
+        if entry.name.endswith(".py"):
+            digest.update(entry.name.encode("utf-8") + b"\0" + entry.read_bytes())
+    return digest.hexdigest()
+
+
+def _describe_model(config: Any) -> Any:
+    as_dict = getattr(config, "_asdict", None)
+    return as_dict() if callable(as_dict) else config
+
+
+def _is_excluded(path: PurePosixPath, settings: PipelineSettings) -> bool:
+    exclusions = settings.effective_exclusions
+    if any(part in exclusions.directories for part in path.parts[:-1]):
+        return True
+    return path.name in exclusions.files or path.suffix in exclusions.extensions
+
+
+def _git(directory: Path, *args: str, raw: bool = False) -> Any:
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(directory), *args],
+            capture_output=True,
+            check=False,
+            timeout=_GIT_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.SubprocessError) as error:
+        logger.debug(f"git {args[0]} failed: {error}")
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout if raw else completed.stdout.decode("utf-8", errors="replace")
+
+
+__all__ = [
+    "FINGERPRINT_VERSION",
+    "GENERATED_PATHS",
+    "RunFingerprint",
+    "compute_run_fingerprint",
+    "git_state",
+    "prompt_template_digest",
+]
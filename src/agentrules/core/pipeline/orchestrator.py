@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import time
+from collections.abc import AsyncIterator, Callable
 
 from agentrules.core.analysis import (
     FinalAnalysis,
@@ -12,13 +15,17 @@ from agentrules.core.analysis import (
     Phase4Analysis,
     Phase5Analysis,
 )
-from agentrules.core.analysis.events import AnalysisEventSink
+from agentrules.core.analysis.clustering import cluster_files
+from agentrules.core.analysis.events import AnalysisEvent, AnalysisEventSink
 from agentrules.core.pipeline.config import (
     PipelineMetrics,
     PipelineResult,
     PipelineSettings,
     ProjectSnapshot,
 )
+from agentrules.core.utils.module_graph import ModuleGraph, load_module_graph
+
+logger = logging.getLogger("project_extractor")
 
 
 class AnalysisPipeline:
@@ -42,6 +49,7 @@ class AnalysisPipeline:
         self._phase5 = phase5
         self._final = final
         self._event_sink = None
+        self._module_graph: tuple[ProjectSnapshot, ModuleGraph | None] | None = None
         self.set_event_sink(event_sink)
 
     def set_event_sink(self, sink: AnalysisEventSink | None) -> None:
@@ -53,19 +61,52 @@ class AnalysisPipeline:
         if hasattr(self._phase3, "set_event_sink"):
             self._phase3.set_event_sink(sink)
 
+    def _publish_phase(self, phase: str, event_type: str) -> None:
+        if self._event_sink is not None:
+            self._event_sink.publish(AnalysisEvent(phase=phase, type=event_type, payload={}))
+
     async def run_phase1(self, snapshot: ProjectSnapshot) -> dict[str, object]:
         tree = list(snapshot.tree)
         dependency_info = dict(snapshot.dependency_info)
-        phase1_raw = await self._phase1.run(tree, dependency_info)
+        graph = await self._load_module_graph(snapshot)
+        module_graph = graph.summary() if graph is not None else None
+        phase1_raw = await self._phase1.run(tree, dependency_info, module_graph=module_graph)
         return dict(phase1_raw)
 
+    async def _load_module_graph(self, snapshot: ProjectSnapshot) -> ModuleGraph | None:
+        """Return the snapshot's import graph, building it (once per snapshot) when it has none."""
+
+        if self._module_graph is not None and self._module_graph[0] is snapshot:
+            return self._module_graph[1]
+        graph = snapshot.module_graph
+        if graph is None and snapshot.file_index is not None:
+            try:
+                graph = await asyncio.to_thread(load_module_graph, snapshot.file_index)
+            except Exception as error:  # pragma: no cover - the graph only enriches the prompts
+                logger.warning(f"[bold yellow]Warning:[/bold yellow] Could not build the module graph: {error}")
+        self._module_graph = (snapshot, graph)
+        return graph
+
     async def run_phase2(
         self,
         phase1_results: dict[str, object],
         snapshot: ProjectSnapshot,
+        on_agent: Callable[[dict], None] | None = None,
     ) -> dict[str, object]:
         tree = list(snapshot.tree)
-        phase2_raw = await self._phase2.run(phase1_results, tree)
+        if on_agent is not None:
+            phase2_raw = await self._phase2.run(phase1_results, tree, on_agent=on_agent)
+            return dict(phase2_raw)
+        planning = getattr(self._phase2, "planning", "model")
+        if planning == "structured":
+            phase2_raw = await self._phase2.run(phase1_results, tree, file_index=snapshot.file_index)
+            return dict(phase2_raw)
+        if planning == "model" or snapshot.file_index is None:
+            phase2_raw = await self._phase2.run(phase1_results, tree)
+            return dict(phase2_raw)
+        graph = await self._load_module_graph(snapshot)
+        clusters = cluster_files(snapshot.file_index, graph)
+        phase2_raw = await self._phase2.run(phase1_results, tree, clusters=clusters or None)
         return dict(phase2_raw)
 
     async def run_phase3(
@@ -75,9 +116,54 @@ class AnalysisPipeline:
         snapshot: ProjectSnapshot,
     ) -> dict[str, object]:
         tree = list(snapshot.tree)
-        phase3_raw = await self._phase3.run(phase2_results, tree, settings.target_directory)
+        phase3_raw = await self._phase3.run(phase2_results, tree, settings.target_directory, snapshot.file_index)
         return dict(phase3_raw)
 
+    @property
+    def streams_phase2(self) -> bool:
+        """Whether Phase 3 agents can start while Phase 2 is still writing its plan."""
+
+        return bool(getattr(self._phase2, "streams_agents", False)) and hasattr(self._phase3, "run_streaming")
+
+    async def run_phase2_and_3(
+        self,
+        phase1_results: dict[str, object],
+        settings: PipelineSettings,
+        snapshot: ProjectSnapshot,
+    ) -> tuple[dict[str, object], dict[str, object]]:
+        """Stream the Phase 2 plan and start each Phase 3 agent as soon as the plan defines it."""
+
+        tree = list(snapshot.tree)
+        queue: asyncio.Queue[dict | None] = asyncio.Queue()
+
+        dispatched: list[dict] = []
+
+        async def _agents() -> AsyncIterator[dict]:
+            while (agent := await queue.get()) is not None:
+                yield agent
+
+        def _dispatch(agent: dict) -> None:
+            if not dispatched:
+                self._publish_phase("phase3", "phase_started")
+            dispatched.append(agent)
+            queue.put_nowait(agent)
+
+        phase3_task = asyncio.ensure_future(
+            self._phase3.run_streaming(_agents(), tree, settings.target_directory, snapshot.file_index)
+        )
+        try:
+            phase2_results = await self.run_phase2(phase1_results, snapshot, on_agent=_dispatch)
+        except BaseException:
+            phase3_task.cancel()
+            raise
+        finally:
+            queue.put_nowait(None)
+        self._publish_phase("phase2", "phase_completed")
+        if not dispatched:
+            self._publish_phase("phase3", "phase_started")
+        phase3_results = dict(await phase3_task)
+        return phase2_results, phase3_results
+
     async def run_phase4(self, phase3_results: dict[str, object]) -> dict[str, object]:
         phase4_raw = await self._phase4.run(phase3_results)
         return dict(phase4_raw)
@@ -103,10 +189,21 @@ class AnalysisPipeline:
 
         start_time = time.time()
 
+        self._publish_phase("phase1", "phase_started")
         phase1_results = await self.run_phase1(snapshot)
-        phase2_results = await self.run_phase2(phase1_results, snapshot)
-        phase3_results = await self.run_phase3(phase2_results, settings, snapshot)
+        self._publish_phase("phase1", "phase_completed")
+        self._publish_phase("phase2", "phase_started")
+        if self.streams_phase2:
+            phase2_results, phase3_results = await self.run_phase2_and_3(phase1_results, settings, snapshot)
+        else:
+            phase2_results = await self.run_phase2(phase1_results, snapshot)
+            self._publish_phase("phase2", "phase_completed")
+            self._publish_phase("phase3", "phase_started")
+            phase3_results = await self.run_phase3(phase2_results, settings, snapshot)
+        self._publish_phase("phase3", "phase_completed")
+        self._publish_phase("phase4", "phase_started")
         phase4_results = await self.run_phase4(phase3_results)
+        self._publish_phase("phase4", "phase_completed")
 
         all_results: dict[str, dict[str, object]] = {
             "phase1": phase1_results,
@@ -114,8 +211,12 @@ class AnalysisPipeline:
             "phase3": phase3_results,
             "phase4": phase4_results,
         }
+        self._publish_phase("phase5", "phase_started")
         consolidated_report = await self.run_phase5(all_results)
+        self._publish_phase("phase5", "phase_completed")
+        self._publish_phase("final", "phase_started")
         final_analysis = await self.run_final(consolidated_report, snapshot)
+        self._publish_phase("final", "phase_completed")
 
         metrics = PipelineMetrics(elapsed_seconds=time.time() - start_time)
         return PipelineResult(
@@ -65,6 +65,7 @@ class PipelineOutputWriter:
             gitignore_spec=result.snapshot.gitignore.spec,
             gitignore_info=gitignore_info,
             tree_max_depth=settings.tree_max_depth,
+            file_index=result.snapshot.file_index,
         )
 
         messages: list[str] = []
@@ -0,0 +1,118 @@
+"""On-disk store of finished pipeline results keyed by run fingerprint."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .config import PipelineMetrics, PipelineResult, ProjectSnapshot
+from .fingerprint import RunFingerprint
+
+logger = logging.getLogger("project_extractor")
+
+DEFAULT_RUN_CACHE_DIRNAME = "runs"
+_RESULT_FIELDS = ("phase1", "phase2", "phase3", "phase4", "consolidated_report", "final_analysis")
+
+
+@dataclass(frozen=True)
+class CachedRun:
+    """Phase outputs of a previously completed run."""
+
+    fingerprint: str
+    created_at: float
+    components: Mapping[str, Any]
+    phases: Mapping[str, Mapping[str, object]]
+    elapsed_seconds: float
+
+    def to_result(self, snapshot: ProjectSnapshot) -> PipelineResult:
+        """Rebuild a `PipelineResult` so the usual output writer can persist it again."""
+
+        return PipelineResult(
+            snapshot=snapshot,
+            phase1=self.phases["phase1"],
+            phase2=self.phases["phase2"],
+            phase3=self.phases["phase3"],
+            phase4=self.phases["phase4"],
+            consolidated_report=self.phases["consolidated_report"],
+            final_analysis=self.phases["final_analysis"],
+            metrics=PipelineMetrics(elapsed_seconds=self.elapsed_seconds),
+        )
+
+
+def is_complete(result: PipelineResult) -> bool:
+    """Return True when no phase reported an error, i.e. the result is worth reusing."""
+
+    return all(
+        isinstance(getattr(result, name), Mapping) and not getattr(result, name).get("error")
+        for name in _RESULT_FIELDS
+    )
+
+
+class RunCache:
+    """Store one JSON document per fingerprint under ``directory``."""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        if directory is None:
+            from agentrules.core.configuration import constants as configuration_constants
+
+            directory = configuration_constants.CONFIG_DIR / DEFAULT_RUN_CACHE_DIRNAME
+        self._directory = directory
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def _path(self, digest: str) -> Path:
+        return self._directory / f"{digest}.json"
+
+    def load(self, fingerprint: RunFingerprint | str) -> CachedRun | None:
+        digest = fingerprint.digest if isinstance(fingerprint, RunFingerprint) else fingerprint
+        path = self._path(digest)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            return CachedRun(
+                fingerprint=digest,
+                created_at=float(payload["created_at"]),
+                components=payload.get("components") or {},
+                phases={name: payload["phases"][name] for name in _RESULT_FIELDS},
+                elapsed_seconds=float(payload.get("elapsed_seconds") or 0.0),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logger.warning(f"[bold yellow]Warning:[/bold yellow] Ignoring unreadable cached run {path}: {error}")
+            return None
+
+    def store(self, fingerprint: RunFingerprint, result: PipelineResult) -> Path | None:
+        """Persist ``result`` under ``fingerprint``; incomplete results are not stored."""
+
+        if not is_complete(result):
+            return None
+        payload = {
+            "fingerprint": fingerprint.digest,
+            "created_at": time.time(),
+            "components": dict(fingerprint.components),
+            "elapsed_seconds": result.metrics.elapsed_seconds,
+            "phases": {name: getattr(result, name) for name in _RESULT_FIELDS},
+        }
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(fingerprint.digest)
+        handle, temp_name = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                json.dump(payload, stream, default=str)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return path
+
+
+__all__ = ["CachedRun", "DEFAULT_RUN_CACHE_DIRNAME", "RunCache", "is_complete"]
@@ -5,13 +5,28 @@ from __future__ import annotations
 from collections.abc import Sequence
 
 from agentrules.core.pipeline.config import GitignoreSnapshot, PipelineSettings, ProjectSnapshot
+from agentrules.core.search import load_search_index
 from agentrules.core.utils.dependency_scanner import collect_dependency_info
+from agentrules.core.utils.file_system.file_index import build_file_index
 from agentrules.core.utils.file_system.gitignore import load_gitignore_spec
 from agentrules.core.utils.file_system.tree_generator import get_project_tree
+from agentrules.core.utils.module_graph import load_module_graph
 
 
-def build_project_snapshot(settings: PipelineSettings) -> ProjectSnapshot:
-    """Collect the project state required by the analysis pipeline."""
+def build_project_snapshot(
+    settings: PipelineSettings,
+    *,
+    search_index: bool = False,
+    module_graph: bool = False,
+) -> ProjectSnapshot:
+    """
+    Collect the project state required by the analysis pipeline.
+
+    With ``search_index``, the persisted code search index of the project is
+    also brought up to date from the walk and attached to the snapshot. With
+    ``module_graph``, the import graph is built up front; otherwise the pipeline
+    builds it when Phase 1 starts.
+    """
 
     gitignore_spec = None
     gitignore_path = None
@@ -25,6 +40,14 @@ def build_project_snapshot(settings: PipelineSettings) -> ProjectSnapshot:
     exclude_files = set(settings.effective_exclusions.files)
     exclude_exts = set(settings.effective_exclusions.extensions)
 
+    file_index = build_file_index(
+        settings.target_directory,
+        max_depth=settings.tree_max_depth,
+        exclude_dirs=exclude_dirs,
+        exclude_files=exclude_files,
+        exclude_extensions=exclude_exts,
+        gitignore_spec=gitignore_spec,
+    )
     tree_with_delimiters = get_project_tree(
         settings.target_directory,
         max_depth=settings.tree_max_depth,
@@ -32,12 +55,14 @@ def build_project_snapshot(settings: PipelineSettings) -> ProjectSnapshot:
         exclude_files=exclude_files,
         exclude_extensions=exclude_exts,
         gitignore_spec=gitignore_spec,
+        file_index=file_index,
     )
     tree = _strip_tree_delimiters(tree_with_delimiters)
 
     dependency_info = collect_dependency_info(
         settings.target_directory,
         gitignore_spec=gitignore_spec,
+        file_index=file_index,
     )
 
     return ProjectSnapshot(
@@ -45,6 +70,9 @@ def build_project_snapshot(settings: PipelineSettings) -> ProjectSnapshot:
         tree=tuple(tree),
         dependency_info=dependency_info,
         gitignore=GitignoreSnapshot(spec=gitignore_spec, path=gitignore_path),
+        file_index=file_index,
+        search_index=load_search_index(file_index) if search_index else None,
+        module_graph=load_module_graph(file_index) if module_graph else None,
     )
 
 
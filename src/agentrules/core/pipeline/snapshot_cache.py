@@ -0,0 +1,122 @@
+"""In-memory cache of project snapshots for long-lived processes."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from agentrules.core.pipeline.config import EffectiveExclusions, PipelineSettings, ProjectSnapshot
+from agentrules.core.pipeline.snapshot import build_project_snapshot
+from agentrules.core.utils.file_system.gitignore import load_gitignore_spec
+
+DEFAULT_SNAPSHOT_CACHE_SIZE = 8
+
+_CacheKey = tuple[Path, int, bool, EffectiveExclusions]
+
+
+def compute_tree_signature(settings: PipelineSettings) -> str:
+    """
+    Return a cheap signature that changes when the snapshot would change.
+
+    The walk follows `build_file_index`: excluded directories and, when
+    ``respect_gitignore`` is set, gitignored paths are skipped, so only files the
+    index covers contribute. Directory listings capture files being added,
+    removed or renamed, and each file's size and mtime capture edits, so the
+    snapshot's `FileIndex` (sizes, mtimes and the content hashes it caches) is
+    never served stale. Files are only stat-ed, never read.
+    """
+    root = settings.target_directory
+    excluded_dirs = settings.effective_exclusions.directories
+    loaded = load_gitignore_spec(root) if settings.respect_gitignore else None
+    gitignore_spec = loaded.spec if loaded else None
+
+    def _kept(relative: str, name: str) -> bool:
+        path = f"{relative}/{name}" if relative else name
+        return gitignore_spec is None or not gitignore_spec.match_file(path)
+
+    digest = hashlib.sha1(usedforsecurity=False)
+    for current, dirnames, filenames in os.walk(root):
+        relative = Path(current).relative_to(root).as_posix()
+        relative = "" if relative == "." else relative
+        depth = len(Path(relative).parts)
+        if depth >= settings.tree_max_depth:
+            dirnames[:] = []
+            continue  # The index does not descend this far
+        dirnames[:] = sorted(name for name in dirnames if name not in excluded_dirs and _kept(relative, name))
+        digest.update(f"{relative}/:{'/'.join(dirnames)}\n".encode())
+        for name in sorted(filenames):
+            if not _kept(relative, name):
+                continue
+            try:
+                stat = os.stat(os.path.join(current, name))
+            except OSError:
+                continue
+            digest.update(f"{relative}/{name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _cache_key(settings: PipelineSettings) -> _CacheKey:
+    # Exclusion overrides are already folded into the effective exclusions and are not hashable.
+    return (
+        settings.target_directory,
+        settings.tree_max_depth,
+        settings.respect_gitignore,
+        settings.effective_exclusions,
+    )
+
+
+class SnapshotCache:
+    """Thread-safe LRU cache of `ProjectSnapshot` objects keyed by pipeline settings."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_SNAPSHOT_CACHE_SIZE,
+        builder: Callable[[PipelineSettings], ProjectSnapshot] = build_project_snapshot,
+        signature: Callable[[PipelineSettings], str] = compute_tree_signature,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._builder = builder
+        self._signature = signature
+        self._entries: OrderedDict[_CacheKey, tuple[str, ProjectSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, settings: PipelineSettings) -> ProjectSnapshot:
+        """Return a snapshot for ``settings``, rebuilding it when the project changed."""
+
+        key = _cache_key(settings)
+        signature = self._signature(settings)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == signature:
+                self._entries.move_to_end(key)
+                return cached[1]
+
+        snapshot = self._builder(settings)
+        with self._lock:
+            self._entries[key] = (signature, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, target_directory: Path | None = None) -> None:
+        """Drop cached snapshots, optionally only those for ``target_directory``."""
+
+        with self._lock:
+            if target_directory is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == target_directory]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+__all__ = ["DEFAULT_SNAPSHOT_CACHE_SIZE", "SnapshotCache", "compute_tree_signature"]
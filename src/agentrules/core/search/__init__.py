@@ -0,0 +1,19 @@
+"""Local code search over the files of a project snapshot."""
+
+from .index import (
+    IndexUpdate,
+    SearchHit,
+    SearchIndex,
+    default_index_path,
+    load_search_index,
+    tokenize,
+)
+
+__all__ = [
+    "IndexUpdate",
+    "SearchHit",
+    "SearchIndex",
+    "default_index_path",
+    "load_search_index",
+    "tokenize",
+]
@@ -0,0 +1,385 @@
+"""Local lexical index over the files of a project snapshot.
+
+Every text file is tokenized into identifiers and their camelCase/snake_case
+parts, which are ranked with BM25, and into trigrams, which narrow substring
+searches down to the few files that can contain the substring. The index is
+persisted per project and brought up to date from the snapshot's file index:
+only files whose size or modification time changed are read again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from agentrules.core.utils.file_system.bounded_reader import DEFAULT_MAX_FILE_BYTES, read_bounded
+from agentrules.core.utils.file_system.file_index import FileEntry, FileIndex
+from agentrules.core.utils.file_system.file_sniffer import sniff_content
+from agentrules.core.utils.file_system.path_index import trigrams
+
+logger = logging.getLogger("project_extractor")
+
+INDEX_VERSION = 1
+DEFAULT_SEARCH_DIRNAME = "search"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+PATH_TERM_WEIGHT = 3
+"""Each token of a file's path counts as this many occurrences in the file."""
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[0-9]+")
+_WORD_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased identifiers of ``text`` followed by their camelCase and snake_case parts."""
+
+    tokens: list[str] = []
+    for match in _IDENTIFIER.finditer(text):
+        word = match.group()
+        if len(word) >= 2:
+            tokens.append(word.lower())
+        parts = _WORD_PART.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts if len(part) >= 2)
+    return tokens
+
+
+@dataclass(frozen=True)
+class IndexedDocument:
+    """Terms and trigrams recorded for one file, with the metadata used to detect changes."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    terms: dict[str, int] = field(default_factory=dict)
+    trigrams: frozenset[str] = frozenset()
+
+    @property
+    def length(self) -> int:
+        return sum(self.terms.values())
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A matching file with its best line (1-based; 0 when no single line matches)."""
+
+    path: str
+    score: float
+    line_number: int = 0
+    line: str = ""
+
+
+@dataclass(frozen=True)
+class IndexUpdate:
+    """Files read into the index, and files dropped from it, by `SearchIndex.update`."""
+
+    added: tuple[str, ...] = ()
+    updated: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+def index_document(path: Path, entry: FileEntry, max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> IndexedDocument:
+    """
+    Tokenize one project file.
+
+    Binary, generated, minified and encoded files are recorded without terms so
+    they are not read again until they change.
+    """
+    empty = IndexedDocument(path=entry.path, size=entry.size, mtime_ns=entry.mtime_ns)
+    if entry.is_binary or entry.is_generated:
+        return empty
+    try:
+        bounded = read_bounded(path, max_bytes)
+    except OSError as error:
+        logger.debug(f"Could not index {entry.path}: {error}")
+        return empty
+    if sniff_content(bounded.head).flagged:
+        return empty
+    text = bounded.text()
+    terms = Counter(tokenize(text))
+    for token in tokenize(entry.path):
+        terms[token] += PATH_TERM_WEIGHT
+    return IndexedDocument(
+        path=entry.path,
+        size=entry.size,
+        mtime_ns=entry.mtime_ns,
+        terms=dict(terms),
+        trigrams=frozenset(trigrams(text)),
+    )
+
+
+class SearchIndex:
+    """BM25 and trigram index over the text files of one project."""
+
+    def __init__(self, root: Path, documents: Iterable[IndexedDocument] = ()) -> None:
+        self._root = root
+        self._documents: dict[str, IndexedDocument] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._trigram_postings: dict[str, set[str]] = {}
+        self._total_length = 0
+        for document in documents:
+            self._add(document)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._documents
+
+    def __iter__(self) -> Iterator[IndexedDocument]:
+        return iter(self._documents.values())
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def update(self, file_index: FileIndex, *, max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> IndexUpdate:
+        """Bring the index in line with ``file_index``, reading only new and changed files."""
+
+        current = {entry.path: entry for entry in file_index.files()}
+        removed = tuple(path for path in self._documents if path not in current)
+        for path in removed:
+            self._remove(path)
+        added: list[str] = []
+        updated: list[str] = []
+        for path, entry in current.items():
+            existing = self._documents.get(path)
+            if existing is not None and existing.size == entry.size and existing.mtime_ns == entry.mtime_ns:
+                continue
+            if existing is not None:
+                self._remove(path)
+                updated.append(path)
+            else:
+                added.append(path)
+            self._add(index_document(file_index.absolute_path(entry), entry, max_bytes))
+        return IndexUpdate(added=tuple(added), updated=tuple(updated), removed=removed)
+
+    def _add(self, document: IndexedDocument) -> None:
+        self._documents[document.path] = document
+        self._total_length += document.length
+        for term, frequency in document.terms.items():
+            self._postings.setdefault(term, {})[document.path] = frequency
+        for gram in document.trigrams:
+            self._trigram_postings.setdefault(gram, set()).add(document.path)
+
+    def _remove(self, path: str) -> None:
+        document = self._documents.pop(path)
+        self._total_length -= document.length
+        for term in document.terms:
+            posting = self._postings[term]
+            del posting[path]
+            if not posting:
+                del self._postings[term]
+        for gram in document.trigrams:
+            paths = self._trigram_postings[gram]
+            paths.discard(path)
+            if not paths:
+                del self._trigram_postings[gram]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def search(self, query: str, *, limit: int = 10) -> list[SearchHit]:
+        """
+        Rank files against ``query`` with BM25 over identifiers and their parts.
+
+        Args:
+            query: Free text; identifiers are split like indexed contents
+            limit: Maximum number of hits
+
+        Returns:
+            Hits ordered by score, each with the line matching most query terms
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        document_count = sum(1 for document in self._documents.values() if document.terms)
+        if not terms or not document_count:
+            return []
+        average_length = self._total_length / document_count
+        scores: Counter[str] = Counter()
+        for term in terms:
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (document_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for path, frequency in posting.items():
+                norm = 1 - BM25_B + BM25_B * self._documents[path].length / average_length
+                scores[path] += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        hits = []
+        wanted = set(terms)
+        for path, score in best:
+            line_number, line = self._best_line(path, lambda text: len(wanted.intersection(tokenize(text))))
+            hits.append(SearchHit(path=path, score=round(score, 4), line_number=line_number, line=line))
+        return hits
+
+    def grep(self, substring: str, *, limit: int = 50) -> list[SearchHit]:
+        """Lines containing ``substring`` (case-insensitive), using trigrams to pick the files to read."""
+
+        if not substring:
+            return []
+        needle = substring.lower()
+        hits: list[SearchHit] = []
+        for path in self.candidates(substring):
+            text = self._read(path)
+            if text is None or needle not in text.lower():
+                continue
+            for number, line in enumerate(text.splitlines(), start=1):
+                if needle in line.lower():
+                    hits.append(SearchHit(path=path, score=1.0, line_number=number, line=line.strip()))
+                    if len(hits) >= limit:
+                        return hits
+        return hits
+
+    def candidates(self, substring: str) -> list[str]:
+        """Indexed files that may contain ``substring``: those holding all of its trigrams."""
+
+        grams = trigrams(substring)
+        if not grams:
+            return sorted(path for path, document in self._documents.items() if document.trigrams)
+        paths: set[str] | None = None
+        for gram in sorted(grams, key=lambda gram: len(self._trigram_postings.get(gram, ()))):
+            posting = self._trigram_postings.get(gram)
+            paths = set(posting or ()) if paths is None else paths & (posting or set())
+            if not paths:
+                return []
+        return sorted(paths or ())
+
+    def _best_line(self, path: str, score_line: Callable[[str], int]) -> tuple[int, str]:
+        text = self._read(path)
+        if text is None:
+            return 0, ""
+        best_number, best_line, best_score = 0, "", 0
+        for number, line in enumerate(text.splitlines(), start=1):
+            score = score_line(line)
+            if score > best_score:
+                best_number, best_line, best_score = number, line.strip(), score
+        return best_number, best_line
+
+    def _read(self, path: str) -> str | None:
+        try:
+            return read_bounded(self._root / path).text()
+        except OSError:
+            return None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: Path) -> None:
+        """Write the index to ``path`` atomically."""
+
+        payload = {
+            "version": INDEX_VERSION,
+            "root": str(self._root),
+            "documents": [
+                {
+                    "path": document.path,
+                    "size": document.size,
+                    "mtime_ns": document.mtime_ns,
+                    "terms": document.terms,
+                    "trigrams": sorted(document.trigrams),
+                }
+                for document in self._documents.values()
+            ],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                json.dump(payload, stream, separators=(",", ":"))
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: Path, root: Path) -> SearchIndex:
+        """Read an index saved for ``root``; a missing, stale or unreadable file yields an empty index."""
+
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(root)
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION or payload.get("root") != str(root):
+            return cls(root)
+        try:
+            documents = [
+                IndexedDocument(
+                    path=item["path"],
+                    size=int(item["size"]),
+                    mtime_ns=int(item["mtime_ns"]),
+                    terms={str(term): int(count) for term, count in item["terms"].items()},
+                    trigrams=frozenset(item["trigrams"]),
+                )
+                for item in payload.get("documents", [])
+            ]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            logger.debug(f"Ignoring malformed search index at {path}")
+            return cls(root)
+        return cls(root, documents)
+
+
+def default_index_path(root: Path) -> Path:
+    """Location of the persisted index for the project at ``root``."""
+
+    from agentrules.core.configuration import constants as configuration_constants
+
+    digest = hashlib.sha1(str(root.resolve()).encode("utf-8"), usedforsecurity=False).hexdigest()[:16]
+    return configuration_constants.CONFIG_DIR / DEFAULT_SEARCH_DIRNAME / f"{digest}.json"
+
+
+def load_search_index(file_index: FileIndex, *, path: Path | None = None) -> SearchIndex:
+    """
+    Load the persisted index of ``file_index``'s project and update it incrementally.
+
+    Args:
+        file_index: Index of the project files from the snapshot walk
+        path: Where the index is persisted; defaults to `default_index_path`
+
+    Returns:
+        The up-to-date index, saved back to ``path`` when anything changed
+    """
+    path = path or default_index_path(file_index.root)
+    index = SearchIndex.load(path, file_index.root)
+    update = index.update(file_index)
+    if update.changed:
+        logger.debug(
+            f"Search index: {len(update.added)} added, {len(update.updated)} updated, "
+            f"{len(update.removed)} removed"
+        )
+        try:
+            index.save(path)
+        except OSError as error:
+            logger.warning(f"[bold yellow]Warning:[/bold yellow] Could not save the search index: {error}")
+    return index
+
+
+__all__ = [
+    "DEFAULT_SEARCH_DIRNAME",
+    "INDEX_VERSION",
+    "IndexUpdate",
+    "IndexedDocument",
+    "SearchHit",
+    "SearchIndex",
+    "default_index_path",
+    "index_document",
+    "load_search_index",
+    "tokenize",
+]
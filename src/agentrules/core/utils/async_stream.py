@@ -32,14 +32,25 @@ def iterate_in_thread(iterator_factory: Callable[[], Iterator[T]]) -> AsyncItera
 
     Raises:
         Propagates any exception raised by the iterator on the async consumer side.
+
+    Closing the async iterator early stops the worker before its next item and
+    closes the synchronous iterator, ending the underlying provider stream.
     """
 
     loop = asyncio.get_running_loop()
     queue: asyncio.Queue[object] = asyncio.Queue()
+    stopped = threading.Event()
 
     def _runner() -> None:
+        iterator: Iterator[T] | None = None
         try:
-            for item in iterator_factory():
+            iterator = iterator_factory()
+            for item in iterator:
+                if stopped.is_set():
+                    close = getattr(iterator, "close", None)
+                    if close is not None:
+                        close()
+                    break
                 future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
                 future.result()
         except BaseException as exc:  # pragma: no cover - defensive path
@@ -57,12 +68,15 @@ def iterate_in_thread(iterator_factory: Callable[[], Iterator[T]]) -> AsyncItera
     threading.Thread(target=_runner, daemon=True).start()
 
     async def _aiter() -> AsyncIterator[T]:
-        while True:
-            payload = await queue.get()
-            if payload is _SENTINEL:
-                break
-            if isinstance(payload, _StreamError):
-                raise payload.error
-            yield payload  # type: ignore[misc]
+        try:
+            while True:
+                payload = await queue.get()
+                if payload is _SENTINEL:
+                    break
+                if isinstance(payload, _StreamError):
+                    raise payload.error
+                yield payload  # type: ignore[misc]
+        finally:
+            stopped.set()
 
     return _aiter()
@@ -0,0 +1,151 @@
+"""Detection of identical and near-identical file contents.
+
+Exact duplicates are grouped by a content digest. Near-duplicates are found with
+MinHash: each file is reduced to the minimum hashes of its line shingles under a
+fixed family of hash permutations, and the share of equal minima estimates the
+Jaccard similarity of two files' shingle sets without comparing them directly.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+MINHASH_PERMUTATIONS = 64
+SHINGLE_LINES = 3
+NEAR_DUPLICATE_SIMILARITY = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _permutation_parameters(count: int) -> tuple[tuple[int, int], ...]:
+    # Fixed seeds keep signatures comparable across runs
+    parameters = []
+    for index in range(count):
+        digest = hashlib.blake2b(f"minhash-{index}".encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little") % (_MERSENNE_PRIME - 1) + 1
+        second = int.from_bytes(digest[8:], "little") % _MERSENNE_PRIME
+        parameters.append((first, second))
+    return tuple(parameters)
+
+
+_PERMUTATIONS = _permutation_parameters(MINHASH_PERMUTATIONS)
+
+
+def content_digest(text: str) -> str:
+    """Digest identifying ``text`` exactly."""
+
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class MinHashSignature:
+    """MinHash signature of a text's line shingles."""
+
+    values: tuple[int, ...]
+
+    def similarity(self, other: MinHashSignature) -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+
+        if not self.values or len(self.values) != len(other.values):
+            return 0.0
+        return sum(1 for left, right in zip(self.values, other.values, strict=True) if left == right) / len(
+            self.values
+        )
+
+
+def minhash_signature(text: str, *, shingle_lines: int = SHINGLE_LINES) -> MinHashSignature:
+    """Signature of ``text`` built from shingles of ``shingle_lines`` consecutive non-blank lines."""
+
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines:
+        return MinHashSignature(())
+    width = min(shingle_lines, len(lines))
+    shingles = {
+        int.from_bytes(
+            hashlib.blake2b("\n".join(lines[index:index + width]).encode("utf-8", "surrogatepass"), digest_size=8)
+            .digest(),
+            "little",
+        )
+        for index in range(len(lines) - width + 1)
+    }
+    return MinHashSignature(
+        tuple(
+            min(((first * shingle + second) % _MERSENNE_PRIME) & _MAX_HASH for shingle in shingles)
+            for first, second in _PERMUTATIONS
+        )
+    )
+
+
+def find_identical(contents: Mapping[str, str]) -> dict[str, str]:
+    """Map each file whose contents repeat an earlier file's to that first file."""
+
+    first_by_digest: dict[str, str] = {}
+    duplicates: dict[str, str] = {}
+    for path, text in contents.items():
+        if not text.strip():
+            continue
+        original = first_by_digest.setdefault(content_digest(text), path)
+        if original != path:
+            duplicates[path] = original
+    return duplicates
+
+
+def find_near_duplicates(
+    contents: Mapping[str, str],
+    *,
+    threshold: float = NEAR_DUPLICATE_SIMILARITY,
+) -> dict[str, str]:
+    """
+    Map each file that nearly repeats an earlier file to the most similar such file.
+
+    Only files of comparable size are compared, and a file that is itself a
+    near-duplicate never serves as the base for another.
+    """
+    signatures = {path: minhash_signature(text) for path, text in contents.items() if text.strip()}
+    bases: list[str] = []
+    duplicates: dict[str, str] = {}
+    for path, signature in signatures.items():
+        size = len(contents[path])
+        best, best_similarity = None, threshold
+        for base in bases:
+            base_size = len(contents[base])
+            if min(size, base_size) < 0.5 * max(size, base_size):
+                continue
+            similarity = signature.similarity(signatures[base])
+            if similarity >= best_similarity:
+                best, best_similarity = base, similarity
+        if best is None:
+            bases.append(path)
+        else:
+            duplicates[path] = best
+    return duplicates
+
+
+def unified_diff_text(base_path: str, base: str, path: str, text: str) -> str:
+    """Unified diff turning ``base`` into ``text``."""
+
+    return "".join(
+        difflib.unified_diff(
+            base.splitlines(keepends=True),
+            text.splitlines(keepends=True),
+            fromfile=base_path,
+            tofile=path,
+            n=1,
+        )
+    )
+
+
+__all__ = [
+    "MINHASH_PERMUTATIONS",
+    "MinHashSignature",
+    "NEAR_DUPLICATE_SIMILARITY",
+    "content_digest",
+    "find_identical",
+    "find_near_duplicates",
+    "minhash_signature",
+    "unified_diff_text",
+]
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import fnmatch
 from collections.abc import Iterable, Iterator
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
 
 from pathspec import PathSpec
 
@@ -13,6 +14,9 @@ from agentrules.core.utils.file_system.file_retriever import list_files
 
 from .constants import MANIFEST_FILENAMES, MANIFEST_PATTERNS
 
+if TYPE_CHECKING:
+    from agentrules.core.utils.file_system.file_index import FileIndex
+
 
 def iter_manifest_files(
     directory: Path,
@@ -42,5 +46,15 @@ def iter_manifest_files(
             yield path
 
 
+def iter_indexed_manifest_files(file_index: FileIndex) -> Iterator[Path]:
+    """Yield manifest files recorded in a snapshot's file index without walking the tree again."""
+    for entry in sorted(file_index.files(include_excluded=True), key=lambda item: item.path):
+        name = entry.name
+        if PurePosixPath(name).suffix in EXCLUDED_EXTENSIONS and name not in MANIFEST_FILENAMES:
+            continue
+        if name in MANIFEST_FILENAMES or _matches_any_pattern(name, MANIFEST_PATTERNS):
+            yield file_index.absolute_path(entry)
+
+
 def _matches_any_pattern(name: str, patterns: Iterable[str]) -> bool:
     return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pathspec import PathSpec
 
-from .discovery import iter_manifest_files
+from .discovery import iter_indexed_manifest_files, iter_manifest_files
 from .metadata import build_summary, infer_manifest_type
 from .models import ManifestRecord
 from .parsers import build_parser_registry
 from .registry import ManifestParserRegistry
 
+if TYPE_CHECKING:
+    from agentrules.core.utils.file_system.file_index import FileIndex
+
 _DEFAULT_REGISTRY = build_parser_registry()
 
 
@@ -22,12 +25,22 @@ def collect_dependency_info(
     gitignore_spec: PathSpec | None = None,
     max_depth: int = 5,
     registry: ManifestParserRegistry | None = None,
+    file_index: FileIndex | None = None,
 ) -> dict[str, Any]:
-    """Collect dependency manifest data from the target directory."""
+    """
+    Collect dependency manifest data from the target directory.
+
+    When ``file_index`` is given, manifests are taken from the index built for the
+    project snapshot instead of walking ``directory`` again.
+    """
     active_registry = registry or _DEFAULT_REGISTRY
     records: list[ManifestRecord] = []
 
-    for manifest_path in iter_manifest_files(directory, gitignore_spec, max_depth=max_depth):
+    if file_index is not None:
+        manifest_paths = iter_indexed_manifest_files(file_index)
+    else:
+        manifest_paths = iter_manifest_files(directory, gitignore_spec, max_depth=max_depth)
+    for manifest_path in manifest_paths:
         record = _parse_manifest(manifest_path, active_registry)
         records.append(record)
 
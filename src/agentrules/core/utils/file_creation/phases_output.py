@@ -17,13 +17,16 @@ This module is used by the main analysis process to save results in a structured
 import json  # Used for working with JSON data
 import os  # Used for creating directories
 from pathlib import Path  # Used for interacting with file paths in a more object-oriented way
-from typing import Any  # Used for type hinting, which makes the code easier to understand
+from typing import TYPE_CHECKING, Any  # Used for type hinting, which makes the code easier to understand
 
 from pathspec import PathSpec
 
 from agentrules.core.configuration import get_config_manager
 from agentrules.core.utils.constants import DEFAULT_RULES_FILENAME
 
+if TYPE_CHECKING:
+    from agentrules.core.utils.file_system.file_index import FileIndex
+
 # ====================================================
 # Function to Save Phase Outputs
 # This is the main function that takes the analysis results and saves them into separate files.
@@ -39,6 +42,7 @@ def save_phase_outputs(
     gitignore_spec: PathSpec | None = None,
     gitignore_info: dict | None = None,
     tree_max_depth: int | None = None,
+    file_index: "FileIndex | None" = None,
 ) -> None:
     """
     Save the outputs of each phase to separate markdown files.
@@ -46,6 +50,8 @@ def save_phase_outputs(
     Args:
         directory: Path to the project directory
         analysis_data: Dictionary containing the results from all phases
+        file_index: Optional snapshot index; when given, the project tree is
+            rendered from it instead of walking the directory again
     """
     # Import the MODEL_CONFIG to get model information for each phase
     from agentrules.config.agents import MODEL_CONFIG
@@ -140,17 +146,20 @@ def save_phase_outputs(
     custom_exclude_dirs = DEFAULT_EXCLUDE_DIRS.union(set(exclude_dirs))
 
     # Generate a tree with our custom exclusions
-    if tree_max_depth is None:
-        tree_max_depth = get_config_manager().get_tree_max_depth()
-
-    tree = generate_tree(
-        directory,
-        max_depth=tree_max_depth,
-        exclude_dirs=custom_exclude_dirs,
-        exclude_patterns=DEFAULT_EXCLUDE_PATTERNS,
-        gitignore_spec=gitignore_spec,
-        root=directory,
-    )
+    if file_index is not None:
+        tree = file_index.render_tree(exclude_dirs=custom_exclude_dirs)
+    else:
+        if tree_max_depth is None:
+            tree_max_depth = get_config_manager().get_tree_max_depth()
+
+        tree = generate_tree(
+            directory,
+            max_depth=tree_max_depth,
+            exclude_dirs=custom_exclude_dirs,
+            exclude_patterns=DEFAULT_EXCLUDE_PATTERNS,
+            gitignore_spec=gitignore_spec,
+            root=directory,
+        )
 
     # Add delimiters and format for inclusion in the AGENTS.md file
     tree_section = [
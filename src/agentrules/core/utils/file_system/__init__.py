@@ -1,11 +1,19 @@
+from .file_index import FileEntry, FileIndex, build_file_index
+from .file_loader import AsyncFileLoader
 from .file_retriever import (
     get_file_contents,
     get_filtered_formatted_contents,
     get_formatted_file_contents,
 )
+from .path_resolver import PathResolver
 from .tree_generator import get_project_tree
 
 __all__ = [
+    "AsyncFileLoader",
+    "FileEntry",
+    "FileIndex",
+    "PathResolver",
+    "build_file_index",
     "get_file_contents",
     "get_formatted_file_contents",
     "get_filtered_formatted_contents",
@@ -0,0 +1,119 @@
+"""Size-capped reads of project files.
+
+A committed data dump or log file must not be loaded whole into memory, nor
+inlined whole into a prompt. `read_bounded` returns files up to the cap as they
+are; larger files are memory-mapped and only their head and tail are copied out,
+together with the file's size and line count (counted chunk by chunk over the
+mapping), so memory use stays bounded by the cap whatever the file size.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from .file_sniffer import DEFAULT_ENCODINGS, decode_bytes
+
+DEFAULT_MAX_FILE_BYTES = 256 * 1024
+"""Per-file cap applied when loading Phase 3 agent files."""
+
+HEAD_SHARE = 0.75
+"""Share of the cap given to the head of an oversized file; the rest goes to its tail."""
+
+MMAP_THRESHOLD = 1024 * 1024
+"""Oversized files at least this large are memory-mapped instead of read with seeks."""
+
+_COUNT_CHUNK = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class BoundedRead:
+    """Bytes kept from a file: all of it, or its head and tail when it exceeds the cap."""
+
+    head: bytes
+    tail: bytes
+    size: int
+    line_count: int
+
+    @property
+    def truncated(self) -> bool:
+        return len(self.head) + len(self.tail) < self.size
+
+    def text(self, encodings: tuple[str, ...] | list[str] = DEFAULT_ENCODINGS) -> str:
+        """Decode the kept bytes, joining head and tail with a size and line-count summary."""
+
+        head, encoding = decode_bytes(self.head, encodings)
+        if not self.truncated:
+            return head
+        tail = self.tail.decode(encoding.split(" ")[0], errors="replace")
+        kept_lines = self.head.count(b"\n") + self.tail.count(b"\n")
+        omitted_bytes = self.size - len(self.head) - len(self.tail)
+        summary = (
+            f"... [{omitted_bytes:,} bytes and ~{max(0, self.line_count - kept_lines):,} lines omitted; "
+            f"file has {self.line_count:,} lines, {self.size:,} bytes] ..."
+        )
+        return f"{head.rstrip(chr(10))}\n{summary}\n{tail}"
+
+
+def read_bounded(path: Path, max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> BoundedRead:
+    """
+    Read ``path`` keeping at most about ``max_bytes`` of it.
+
+    Args:
+        path: File to read
+        max_bytes: Per-file cap; smaller files are returned whole
+
+    Returns:
+        The kept bytes with the file's size and line count
+    """
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size <= max_bytes:
+            data = handle.read()
+            return BoundedRead(head=data, tail=b"", size=len(data), line_count=_line_count(data, len(data)))
+        head_bytes = max(1, int(max_bytes * HEAD_SHARE))
+        tail_bytes = max(0, max_bytes - head_bytes)
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                head = mapped[:head_bytes]
+                tail = mapped[size - tail_bytes:] if tail_bytes else b""
+                newlines = sum(
+                    mapped[start:start + _COUNT_CHUNK].count(b"\n") for start in range(0, size, _COUNT_CHUNK)
+                )
+                ends_with_newline = mapped[size - 1:size] == b"\n"
+        else:
+            head = handle.read(head_bytes)
+            handle.seek(size - tail_bytes)
+            tail = handle.read(tail_bytes) if tail_bytes else b""
+            handle.seek(0)
+            newlines = sum(chunk.count(b"\n") for chunk in iter(lambda: handle.read(_COUNT_CHUNK), b""))
+            ends_with_newline = tail.endswith(b"\n") if tail else head.endswith(b"\n")
+    line_count = newlines + (0 if ends_with_newline else 1)
+    return BoundedRead(head=_cut_head(head), tail=_cut_tail(tail), size=size, line_count=line_count)
+
+
+def _line_count(data: bytes, size: int) -> int:
+    if not size:
+        return 0
+    return data.count(b"\n") + (0 if data.endswith(b"\n") else 1)
+
+
+def _cut_head(head: bytes) -> bytes:
+    # Stop at a line boundary, which also avoids splitting a multi-byte character
+    cut = head.rfind(b"\n")
+    return head[: cut + 1] if cut > 0 else head
+
+
+def _cut_tail(tail: bytes) -> bytes:
+    cut = tail.find(b"\n")
+    return tail[cut + 1:] if 0 <= cut < len(tail) - 1 else tail
+
+
+__all__ = [
+    "BoundedRead",
+    "DEFAULT_MAX_FILE_BYTES",
+    "MMAP_THRESHOLD",
+    "read_bounded",
+]
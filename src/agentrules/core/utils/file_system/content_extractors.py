@@ -0,0 +1,41 @@
+"""Per-extension extractors that stand in for a file's raw content in prompts."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+from .data_files import DATA_FILE_HANDLERS, extract_data_file
+from .notebook import NOTEBOOK_SUFFIX, extract_notebook
+
+ContentExtractor = Callable[[Path, int], "str | None"]
+"""Takes a path and a character cap; returns ``None`` to fall back to a plain read."""
+
+
+def _notebook(path: Path, max_chars: int) -> str | None:
+    return extract_notebook(path, max_chars=max_chars)
+
+
+def _data_file(path: Path, max_chars: int) -> str | None:
+    return extract_data_file(path, max_chars=max_chars)
+
+
+CONTENT_EXTRACTORS: dict[str, ContentExtractor] = {
+    NOTEBOOK_SUFFIX: _notebook,
+    **{suffix: _data_file for suffix in DATA_FILE_HANDLERS},
+}
+"""Extractor per lower-case file extension."""
+
+
+def extract_content(path: Path, max_chars: int) -> str | None:
+    """Return the extracted text for ``path``, or ``None`` when it should be read as is."""
+
+    extractor = CONTENT_EXTRACTORS.get(path.suffix.lower())
+    return extractor(path, max_chars) if extractor is not None else None
+
+
+__all__ = [
+    "CONTENT_EXTRACTORS",
+    "ContentExtractor",
+    "extract_content",
+]
@@ -0,0 +1,641 @@
+"""Schema-and-sample summaries of large data files.
+
+Fixtures, seeds and dumps are worth analyzing, but not row by row. The handlers
+here stream CSV/TSV, JSON, NDJSON and YAML files, and read only the footer of
+Parquet files, to report a schema, a row or record count and the first few
+records in place of the content. Memory use is bounded by the sampled records,
+whatever the file size.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import struct
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from .json_stream import JsonStream
+
+logger = logging.getLogger("project_extractor")
+
+DATA_FILE_MIN_BYTES = 64 * 1024
+"""Text data files smaller than this are read whole; Parquet files are always summarized."""
+
+DATA_SAMPLE_RECORDS = 5
+"""Records shown from the start of a data file."""
+
+SCHEMA_SAMPLE_RECORDS = 100
+"""Records inspected to infer the schema."""
+
+PARQUET_MAX_FOOTER_BYTES = 64 * 1024 * 1024
+
+_SAMPLE_CHARS = 300
+_MAX_FIELDS = 50
+_MAX_YAML_SAMPLE_LINES = 20
+_COUNT_CHUNK = 4 * 1024 * 1024
+_CSV_SNIFF_CHARS = 16 * 1024
+_NESTED_ITEMS = 20
+_NESTED_DEPTH = 4
+
+_INTEGER = re.compile(r"^[+-]?\d+$")
+_NUMBER = re.compile(r"^[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?$")
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?$")
+_BOOLEAN = frozenset({"true", "false"})
+_YAML_KEY = re.compile(r"""^(?:"[^"]*"|'[^']*'|[^\s#'"\-?:][^:#]*?|-[^\s:][^:#]*?)\s*:(?:\s|$)""")
+
+
+def summarize_csv(path: Path, samples: int = DATA_SAMPLE_RECORDS) -> str:
+    """Columns with inferred types, an approximate row count and the first rows of a CSV/TSV file."""
+
+    default = csv.excel_tab if path.suffix.lower() == ".tsv" else csv.excel
+    with open(path, encoding="utf-8", errors="replace", newline="") as handle:
+        head = handle.read(_CSV_SNIFF_CHARS)
+        handle.seek(0)
+        try:
+            dialect: Any = csv.Sniffer().sniff(head, delimiters=",\t;|")
+        except csv.Error:
+            dialect = default
+        reader = csv.reader(handle, dialect)
+        header = next(reader, [])
+        rows = list(itertools.islice(reader, SCHEMA_SAMPLE_RECORDS))
+
+    rows_total = max(0, _count_lines(path) - 1)
+    columns = [
+        f"{name or f'column_{index + 1}'} ({_infer_text_type(row[index] for row in rows if index < len(row))})"
+        for index, name in enumerate(header)
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=dialect.delimiter, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows[:samples])
+    sample = "\n".join(_clip(line) for line in buffer.getvalue().splitlines())
+    kind = "TSV" if dialect.delimiter == "\t" else "CSV"
+    return (
+        f"# Data file ({kind}): ~{rows_total:,} rows (from the line count), {len(header)} columns; "
+        f"schema and first {min(samples, len(rows))} rows shown\n"
+        f"# Columns: {_field_list(columns)}\n"
+        f"{sample}\n"
+    )
+
+
+def summarize_ndjson(path: Path, samples: int = DATA_SAMPLE_RECORDS) -> str:
+    """Record count, inferred fields and the first records of a JSON Lines file."""
+
+    records: list[Any] = []
+    count = 0
+    invalid = 0
+    with open(path, "rb") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            count += 1
+            if len(records) < SCHEMA_SAMPLE_RECORDS:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    invalid += 1
+    notes = f"; {invalid} of the first lines are not JSON" if invalid else ""
+    return (
+        f"# Data file (JSON Lines): {count:,} records{notes}; schema and first {min(samples, len(records))} "
+        f"records shown\n"
+        f"# Fields: {_record_schema(records)}\n"
+        + "".join(f"{_sample(record)}\n" for record in records[:samples])
+    )
+
+
+def summarize_json(path: Path, samples: int = DATA_SAMPLE_RECORDS) -> str:
+    """Structure, record counts and sample records of a JSON document, decoded incrementally."""
+
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        stream = JsonStream(handle)
+        first = stream.peek()
+        if first == "[":
+            count, records = _sample_array(stream)
+            return (
+                f"# Data file (JSON array): {count:,} records; schema and first {min(samples, len(records))} "
+                f"records shown\n"
+                f"# Fields: {_record_schema(records)}\n"
+                + "".join(f"{_sample(record)}\n" for record in records[:samples])
+            )
+        if first != "{":
+            raise ValueError("not a JSON object or array")
+
+        lines: list[str] = []
+        keys = 0
+        for key in stream.members():
+            keys += 1
+            if keys > _MAX_FIELDS:
+                stream.skip_value()
+                continue
+            label = f"# {json.dumps(key)}"
+            first = stream.peek()
+            if first == "[":
+                count, records = _sample_array(stream)
+                lines.append(f"{label}: array of {count:,} records; fields: {_record_schema(records)}")
+                lines.extend(f"  {_sample(record)}" for record in records[: max(1, samples // 2)])
+            elif first == "{":
+                count, names, values = _sample_object(stream)
+                if values and all(isinstance(value, dict) for value in values):
+                    lines.append(f"{label}: object of {count:,} keyed records; fields: {_record_schema(values)}")
+                    lines.extend(
+                        f"  {json.dumps(name)}: {_sample(value)}"
+                        for name, value in list(zip(names, values, strict=True))[: max(1, samples // 2)]
+                    )
+                else:
+                    lines.append(f"{label}: object with {count:,} keys ({_field_list(names)})")
+            else:
+                lines.append(f"{label}: {_describe_value(stream.value())}")
+    if keys > _MAX_FIELDS:
+        lines.append(f"# ... and {keys - _MAX_FIELDS:,} more keys")
+    return f"# Data file (JSON object): {keys:,} top-level keys; schema and samples shown\n" + "\n".join(lines) + "\n"
+
+
+def summarize_yaml(path: Path, samples: int = DATA_SAMPLE_RECORDS) -> str:
+    """
+    Documents, top-level entries, entry keys and the first entries of a YAML file.
+
+    The file is scanned line by line from its indentation (column-0 ``- `` items
+    or ``key:`` entries), without building the document.
+    """
+    documents = 0
+    content_in_document = False
+    root: str | None = None
+    entries = 0
+    field_indent: int | None = None
+    fields: dict[str, None] = {}
+    sampled: list[list[str]] = []
+
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for raw in handle:
+            line = raw.rstrip("\r\n")
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            if line.startswith("---"):
+                documents += 1
+                content_in_document = False
+                field_indent = None
+                continue
+            if line.startswith("..."):
+                continue
+            if not content_in_document:
+                content_in_document = True
+                if documents == 0:
+                    documents = 1
+
+            indent = len(line) - len(line.lstrip(" "))
+            if indent == 0 and (line == "-" or line.startswith("- ")):
+                root = root or "sequence"
+                entries += 1
+                content = line[2:]
+                field_indent = 2 if content.strip() else None
+                if content.strip() and entries <= SCHEMA_SAMPLE_RECORDS:
+                    _add_yaml_key(fields, content.strip())
+            elif indent == 0 and _YAML_KEY.match(line):
+                root = root or "mapping"
+                entries += 1
+                field_indent = None
+            elif entries and entries <= SCHEMA_SAMPLE_RECORDS and indent > 0:
+                if field_indent is None:
+                    field_indent = indent
+                if indent == field_indent:
+                    _add_yaml_key(fields, stripped.removeprefix("- ").strip())
+
+            if entries and entries <= samples:
+                if len(sampled) < entries:
+                    sampled.append([])
+                if len(sampled[-1]) < _MAX_YAML_SAMPLE_LINES:
+                    sampled[-1].append(_clip(line))
+
+    documents = max(documents, 1)
+    shape = f"root {root} of {entries:,} entries" if root else "no top-level entries"
+    key_label = "Item keys" if root == "sequence" else "Entry keys"
+    return (
+        f"# Data file (YAML): {documents:,} documents, {shape}; keys and first {len(sampled)} entries shown\n"
+        f"# {key_label}: {_field_list(list(fields)) or 'none'}\n"
+        + "".join("\n".join(lines) + "\n" for lines in sampled)
+    )
+
+
+def summarize_parquet(path: Path, samples: int = DATA_SAMPLE_RECORDS) -> str:
+    """Row count, row groups and column schema of a Parquet file, read from its footer only."""
+
+    del samples  # Rows are not decoded; only the footer metadata is read
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size < 12:
+            raise ValueError("file too small for Parquet")
+        handle.seek(-8, os.SEEK_END)
+        trailer = handle.read(8)
+        if trailer[4:] != b"PAR1":
+            raise ValueError("missing Parquet magic")
+        footer_length = int.from_bytes(trailer[:4], "little")
+        if footer_length > min(size - 12, PARQUET_MAX_FOOTER_BYTES):
+            raise ValueError(f"implausible Parquet footer length {footer_length}")
+        handle.seek(-8 - footer_length, os.SEEK_END)
+        footer = handle.read(footer_length)
+
+    try:
+        metadata = _CompactReader(footer).struct()
+    except (IndexError, struct.error) as error:
+        raise ValueError(f"corrupt Parquet footer: {error}") from error
+    columns = _parquet_columns(metadata.get(2) or [])
+    row_groups = metadata.get(4) or []
+    created_by = _text(metadata.get(6))
+    key_values = [_text(item.get(1)) for item in metadata.get(5) or [] if isinstance(item, dict)]
+    lines = [
+        f"# Data file (Parquet): {int(metadata.get(3) or 0):,} rows in {len(row_groups):,} row groups, "
+        f"{len(columns)} columns; footer metadata only",
+        f"# Columns: {_field_list(columns)}",
+    ]
+    if created_by:
+        lines.append(f"# Created by: {created_by}")
+    if key_values:
+        lines.append(f"# Key-value metadata: {', '.join(key for key in key_values if key)}")
+    return "\n".join(lines) + "\n"
+
+
+DATA_FILE_HANDLERS: dict[str, Callable[[Path, int], str]] = {
+    ".csv": summarize_csv,
+    ".tsv": summarize_csv,
+    ".json": summarize_json,
+    ".ndjson": summarize_ndjson,
+    ".jsonl": summarize_ndjson,
+    ".yaml": summarize_yaml,
+    ".yml": summarize_yaml,
+    ".parquet": summarize_parquet,
+}
+"""Summary handler per file extension."""
+
+
+def is_data_file(path: Path | str) -> bool:
+    return Path(path).suffix.lower() in DATA_FILE_HANDLERS
+
+
+def extract_data_file(
+    path: Path,
+    *,
+    min_bytes: int = DATA_FILE_MIN_BYTES,
+    samples: int = DATA_SAMPLE_RECORDS,
+    max_chars: int | None = None,
+) -> str | None:
+    """
+    Summarize a data file instead of returning its content.
+
+    Args:
+        path: File to summarize
+        min_bytes: Text data files smaller than this are left to be read whole
+        samples: Records shown from the start of the file
+        max_chars: Optional cap on the summary
+
+    Returns:
+        The summary, or ``None`` when the file is not a (large) data file or cannot
+        be parsed as one, so callers read it normally
+    """
+    suffix = path.suffix.lower()
+    handler = DATA_FILE_HANDLERS.get(suffix)
+    if handler is None:
+        return None
+    try:
+        if suffix != ".parquet" and path.stat().st_size < min_bytes:
+            return None
+        summary = handler(path, samples)
+    except (OSError, ValueError, UnicodeError, RecursionError, csv.Error) as error:
+        logger.debug(f"Could not summarize data file {path}: {error}")
+        return None
+    logger.info(f"Summarizing data file {path.name} (schema and samples instead of its content)")
+    if max_chars is not None and len(summary) > max_chars:
+        summary = f"{summary[:max_chars].rstrip()}\n... [{len(summary) - max_chars:,} characters omitted] ...\n"
+    return summary
+
+
+# ====================================================
+# Schema inference
+# ====================================================
+
+
+def _infer_text_type(values: Iterable[str]) -> str:
+    kinds: set[str] = set()
+    empty = False
+    for value in values:
+        value = value.strip()
+        if not value:
+            empty = True
+        elif _INTEGER.match(value):
+            kinds.add("integer")
+        elif _NUMBER.match(value):
+            kinds.add("number")
+        elif value.lower() in _BOOLEAN:
+            kinds.add("boolean")
+        elif _DATE.match(value):
+            kinds.add("date")
+        else:
+            kinds.add("string")
+    if kinds == {"integer", "number"}:
+        kinds = {"number"}
+    if len(kinds) > 1:
+        kinds = {"string"}
+    kind = next(iter(kinds), "empty")
+    return f"{kind}, with blanks" if empty and kinds else kind
+
+
+def _json_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "array" if isinstance(value, list) else "object"
+
+
+def _record_schema(records: list[Any]) -> str:
+    """Fields of dict records with the JSON types seen for each, in first-seen order."""
+
+    if not records:
+        return "none"
+    if not all(isinstance(record, dict) for record in records):
+        return "values of type " + "|".join(sorted({_json_type(record) for record in records}))
+    types: dict[str, set[str]] = {}
+    for record in records:
+        for key, value in record.items():
+            types.setdefault(str(key), set()).add(_json_type(value))
+    present = {key: sum(1 for record in records if key in record) for key in types}
+    return _field_list(
+        f"{key} ({'|'.join(sorted(kinds))}{'' if present[key] == len(records) else ', optional'})"
+        for key, kinds in types.items()
+    )
+
+
+def _describe_value(value: Any) -> str:
+    return f"{_json_type(value)} {_clip(json.dumps(value, ensure_ascii=False))}"
+
+
+def _sample_array(stream: JsonStream) -> tuple[int, list[Any]]:
+    """Count the elements of the array at the stream's position, keeping the first ones."""
+
+    count = 0
+    records: list[Any] = []
+    for _ in stream.elements():
+        count += 1
+        if len(records) < SCHEMA_SAMPLE_RECORDS:
+            records.append(_bounded_value(stream))
+        else:
+            stream.skip_value()
+    return count, records
+
+
+def _sample_object(stream: JsonStream) -> tuple[int, list[str], list[Any]]:
+    """Count the members of the object at the stream's position, keeping the first keys and values."""
+
+    count = 0
+    names: list[str] = []
+    values: list[Any] = []
+    for name in stream.members():
+        count += 1
+        if len(names) < SCHEMA_SAMPLE_RECORDS:
+            names.append(name)
+            values.append(_bounded_value(stream))
+        else:
+            stream.skip_value()
+    return count, names, values
+
+
+def _bounded_value(stream: JsonStream, depth: int = 0) -> Any:
+    """
+    Decode the next value with its containers cut short.
+
+    Arrays and objects keep their first `_NESTED_ITEMS` entries (with a marker
+    for the rest) and are replaced by a marker below `_NESTED_DEPTH`, so a
+    sampled record never pulls a large nested structure into memory.
+    """
+    first = stream.peek()
+    if first not in ("[", "{"):
+        return stream.value()
+    if depth >= _NESTED_DEPTH:
+        stream.skip_value()
+        return "..." if first == "[" else {"...": "nested object"}
+    if first == "[":
+        items: list[Any] = []
+        count = 0
+        for _ in stream.elements():
+            count += 1
+            if count <= _NESTED_ITEMS:
+                items.append(_bounded_value(stream, depth + 1))
+            else:
+                stream.skip_value()
+        if count > _NESTED_ITEMS:
+            items.append(f"... {count - _NESTED_ITEMS:,} more")
+        return items
+    members: dict[str, Any] = {}
+    count = 0
+    for name in stream.members():
+        count += 1
+        if count <= _NESTED_ITEMS:
+            members[name] = _bounded_value(stream, depth + 1)
+        else:
+            stream.skip_value()
+    if count > _NESTED_ITEMS:
+        members["..."] = f"{count - _NESTED_ITEMS:,} more keys"
+    return members
+
+
+def _add_yaml_key(fields: dict[str, None], content: str) -> None:
+    match = _YAML_KEY.match(content)
+    if match and len(fields) < _MAX_FIELDS:
+        fields.setdefault(match.group(0).rstrip().rstrip(":").strip().strip("'\""), None)
+
+
+def _field_list(fields: Iterable[str]) -> str:
+    items = list(fields)
+    shown = ", ".join(items[:_MAX_FIELDS])
+    return f"{shown}, ... ({len(items) - _MAX_FIELDS} more)" if len(items) > _MAX_FIELDS else shown
+
+
+def _sample(record: Any) -> str:
+    return _clip(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def _clip(text: str) -> str:
+    return text if len(text) <= _SAMPLE_CHARS else f"{text[:_SAMPLE_CHARS]}..."
+
+
+def _count_lines(path: Path) -> int:
+    """Lines in a file, counted in fixed-size chunks."""
+
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_COUNT_CHUNK), b""):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    return lines + (last != b"\n")
+
+
+# ====================================================
+# Parquet footer (Thrift compact protocol)
+# ====================================================
+
+_PARQUET_TYPES = ("BOOLEAN", "INT32", "INT64", "INT96", "FLOAT", "DOUBLE", "BYTE_ARRAY", "FIXED_LEN_BYTE_ARRAY")
+_CONVERTED_TYPES = (
+    "UTF8", "MAP", "MAP_KEY_VALUE", "LIST", "ENUM", "DECIMAL", "DATE", "TIME_MILLIS", "TIME_MICROS",
+    "TIMESTAMP_MILLIS", "TIMESTAMP_MICROS", "UINT_8", "UINT_16", "UINT_32", "UINT_64", "INT_8", "INT_16",
+    "INT_32", "INT_64", "JSON", "BSON", "INTERVAL",
+)  # fmt: skip
+_LOGICAL_TYPES = {
+    1: "STRING", 2: "MAP", 3: "LIST", 4: "ENUM", 5: "DECIMAL", 6: "DATE", 7: "TIME", 8: "TIMESTAMP",
+    10: "INTEGER", 11: "NULL", 12: "JSON", 13: "BSON", 14: "UUID", 15: "FLOAT16",
+}  # fmt: skip
+_REPETITION = ("required", "optional", "repeated")
+
+
+class _CompactReader:
+    """Decode Thrift compact-protocol structs into ``{field id: value}`` dictionaries."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+
+    def _byte(self) -> int:
+        value = self._data[self._pos]
+        self._pos += 1
+        return value
+
+    def _varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            byte = self._byte()
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def _zigzag(self) -> int:
+        value = self._varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def struct(self) -> dict[int, Any]:
+        fields: dict[int, Any] = {}
+        last_id = 0
+        while True:
+            header = self._byte()
+            if header == 0:
+                return fields
+            kind = header & 0x0F
+            delta = header >> 4
+            field_id = last_id + delta if delta else self._zigzag()
+            last_id = field_id
+            # Boolean fields carry their value in the type nibble
+            fields[field_id] = kind == 1 if kind in (1, 2) else self._value(kind)
+
+    def _value(self, kind: int) -> Any:
+        if kind in (1, 2):
+            return self._byte() == 1
+        if kind == 3:
+            return struct.unpack("<b", bytes([self._byte()]))[0]
+        if kind in (4, 5, 6):
+            return self._zigzag()
+        if kind == 7:
+            value = struct.unpack_from("<d", self._data, self._pos)[0]
+            self._pos += 8
+            return value
+        if kind == 8:
+            length = self._varint()
+            value = self._data[self._pos : self._pos + length]
+            if len(value) < length:
+                raise IndexError("binary value runs past the footer")
+            self._pos += length
+            return value
+        if kind in (9, 10):
+            header = self._byte()
+            size = header >> 4
+            if size == 15:
+                size = self._varint()
+            return [self._value(header & 0x0F) for _ in range(size)]
+        if kind == 11:
+            size = self._varint()
+            if not size:
+                return {}
+            types = self._byte()
+            return {self._value(types >> 4): self._value(types & 0x0F) for _ in range(size)}
+        if kind == 12:
+            return self.struct()
+        raise ValueError(f"unknown Thrift compact type {kind}")
+
+
+def _parquet_columns(schema: list[Any]) -> list[str]:
+    """Leaf columns of a flattened Parquet schema as ``dotted.path (TYPE ANNOTATION, repetition)``."""
+
+    elements = [element for element in schema if isinstance(element, dict)]
+    columns: list[str] = []
+
+    def visit(index: int, prefix: str) -> int:
+        element = elements[index]
+        name = _text(element.get(4))
+        path = f"{prefix}.{name}" if prefix else name
+        children = int(element.get(5) or 0)
+        index += 1
+        if children:
+            for _ in range(children):
+                if index >= len(elements):
+                    break
+                index = visit(index, path)
+            return index
+        columns.append(f"{path} ({_parquet_type(element)})")
+        return index
+
+    if elements:
+        index = 1
+        for _ in range(int(elements[0].get(5) or 0)):
+            if index >= len(elements):
+                break
+            index = visit(index, "")
+    return columns
+
+
+def _parquet_type(element: dict[int, Any]) -> str:
+    physical = element.get(1)
+    parts = [_PARQUET_TYPES[physical] if isinstance(physical, int) and 0 <= physical < len(_PARQUET_TYPES) else "?"]
+    logical = element.get(10)
+    converted = element.get(6)
+    if isinstance(logical, dict) and logical:
+        parts.append(_LOGICAL_TYPES.get(next(iter(logical)), "LOGICAL"))
+    elif isinstance(converted, int) and 0 <= converted < len(_CONVERTED_TYPES):
+        parts.append(_CONVERTED_TYPES[converted])
+    repetition = element.get(3)
+    if isinstance(repetition, int) and 0 <= repetition < len(_REPETITION):
+        return f"{' '.join(parts)}, {_REPETITION[repetition]}"
+    return " ".join(parts)
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return "" if value is None else str(value)
+
+
+__all__ = [
+    "DATA_FILE_HANDLERS",
+    "DATA_FILE_MIN_BYTES",
+    "DATA_SAMPLE_RECORDS",
+    "SCHEMA_SAMPLE_RECORDS",
+    "extract_data_file",
+    "is_data_file",
+    "summarize_csv",
+    "summarize_json",
+    "summarize_ndjson",
+    "summarize_parquet",
+    "summarize_yaml",
+]
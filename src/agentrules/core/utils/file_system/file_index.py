@@ -0,0 +1,333 @@
+"""Compact index of project files collected by the snapshot's single directory walk."""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import os
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+from pathspec import PathSpec
+
+from .path_resolver import PathResolver
+from .tree_generator import icon_for_name, resolve_exclusions
+
+LANGUAGE_BY_EXTENSION: dict[str, str] = {
+    ".py": "python", ".pyi": "python", ".pyx": "python",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "typescript", ".tsx": "typescript", ".mts": "typescript", ".cts": "typescript",
+    ".go": "go", ".rs": "rust", ".java": "java", ".kt": "kotlin", ".kts": "kotlin",
+    ".scala": "scala", ".swift": "swift", ".rb": "ruby", ".php": "php",
+    ".c": "c", ".h": "c", ".cc": "cpp", ".cpp": "cpp", ".cxx": "cpp", ".hpp": "cpp", ".hh": "cpp",
+    ".cs": "csharp", ".fs": "fsharp", ".m": "objective-c", ".mm": "objective-c",
+    ".dart": "dart", ".lua": "lua", ".r": "r", ".jl": "julia", ".ex": "elixir", ".exs": "elixir",
+    ".erl": "erlang", ".clj": "clojure", ".hs": "haskell", ".ml": "ocaml", ".zig": "zig",
+    ".sh": "shell", ".bash": "shell", ".zsh": "shell", ".ps1": "powershell",
+    ".vue": "vue", ".svelte": "svelte", ".sql": "sql", ".graphql": "graphql", ".proto": "protobuf",
+    ".tf": "terraform", ".html": "html", ".htm": "html", ".css": "css", ".scss": "scss", ".less": "less",
+    ".md": "markdown", ".mdx": "markdown", ".rst": "restructuredtext", ".txt": "text",
+    ".json": "json", ".yaml": "yaml", ".yml": "yaml", ".toml": "toml", ".xml": "xml",
+    ".ini": "ini", ".cfg": "ini", ".csv": "csv", ".ipynb": "notebook",
+}  # fmt: skip
+"""Language detected from a file's extension."""
+
+LANGUAGE_BY_FILENAME: dict[str, str] = {
+    "Dockerfile": "dockerfile",
+    "Makefile": "make",
+    "CMakeLists.txt": "cmake",
+    "Gemfile": "ruby",
+    "Rakefile": "ruby",
+    "Jenkinsfile": "groovy",
+}
+
+SOURCE_LANGUAGES = frozenset(
+    {
+        "python", "javascript", "typescript", "go", "rust", "java", "kotlin", "scala", "swift", "ruby",
+        "php", "c", "cpp", "csharp", "fsharp", "objective-c", "dart", "lua", "r", "julia", "elixir",
+        "erlang", "clojure", "haskell", "ocaml", "zig", "shell", "powershell", "vue", "svelte", "sql",
+    }
+)  # fmt: skip
+"""Languages treated as program source (as opposed to docs, data and configuration)."""
+
+BINARY_EXTENSIONS = frozenset(
+    {
+        ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".tiff", ".psd",
+        ".mp3", ".mp4", ".wav", ".ogg", ".mov", ".avi", ".webm", ".flac",
+        ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".tar", ".jar", ".war", ".whl",
+        ".woff", ".woff2", ".ttf", ".otf", ".eot", ".pdf",
+        ".pyc", ".pyo", ".pyd", ".so", ".dll", ".dylib", ".exe", ".o", ".a", ".class", ".wasm",
+        ".db", ".sqlite", ".sqlite3", ".pkl", ".pickle", ".npy", ".npz", ".parquet", ".bin",
+    }
+)  # fmt: skip
+
+GENERATED_FILENAMES = frozenset(
+    {
+        "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock", "uv.lock",
+        "Cargo.lock", "composer.lock", "Gemfile.lock", "go.sum", "bun.lockb",
+    }
+)  # fmt: skip
+GENERATED_PATTERNS = ("*.min.js", "*.min.css", "*.map", "*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.generated.*")
+
+_TRUNCATED_MARKER = "... (max depth reached)"
+
+
+@dataclass(frozen=True, slots=True)
+class FileEntry:
+    """Metadata recorded for one file during the snapshot walk."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    language: str | None
+    is_binary: bool
+    is_generated: bool
+    excluded: bool = False
+    """True for files hidden by the file/extension exclusions (kept for manifest discovery)."""
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.path).name
+
+    @property
+    def is_source(self) -> bool:
+        return self.language in SOURCE_LANGUAGES and not (self.is_binary or self.is_generated or self.excluded)
+
+
+@dataclass(frozen=True, slots=True)
+class _Child:
+    name: str
+    is_dir: bool
+
+
+def detect_language(name: str) -> str | None:
+    """Return the language of ``name`` based on its file name or extension."""
+
+    if name in LANGUAGE_BY_FILENAME:
+        return LANGUAGE_BY_FILENAME[name]
+    return LANGUAGE_BY_EXTENSION.get(PurePosixPath(name).suffix.lower())
+
+
+def is_generated_name(name: str) -> bool:
+    return name in GENERATED_FILENAMES or any(fnmatch.fnmatch(name, pattern) for pattern in GENERATED_PATTERNS)
+
+
+class FileIndex:
+    """
+    Files and directories of a project as seen by the tree walk.
+
+    Lookups are keyed by POSIX paths relative to ``root``. Content hashes are
+    computed on first request and cached for the lifetime of the index.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        entries: Iterable[FileEntry],
+        *,
+        children: dict[str, list[_Child]] | None = None,
+        truncated: Iterable[str] = (),
+        errors: dict[str, str] | None = None,
+    ) -> None:
+        self._root = root
+        self._entries = {entry.path: entry for entry in entries}
+        self._children = children or {}
+        self._truncated = frozenset(truncated)
+        self._errors = errors or {}
+        self._hashes: dict[str, str | None] = {}
+        self._resolver: PathResolver | None = None
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return iter(self._entries.values())
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self.get(path) is not None
+
+    def get(self, path: str) -> FileEntry | None:
+        """Return the entry for a project-relative path (``./`` and ``/`` prefixes are ignored)."""
+
+        normalized = path.replace("\\", "/")
+        while normalized.startswith("./"):
+            normalized = normalized[2:]
+        return self._entries.get(normalized.lstrip("/"))
+
+    def resolve(self, path: str) -> FileEntry | None:
+        """
+        Match a planner-assigned path, accepting absolute paths, Windows separators
+        and unambiguous suffixes (see `PathResolver`).
+        """
+
+        entry = self.get(path)
+        if entry is not None:
+            return entry
+        resolution = self.path_resolver().resolve(path)
+        if resolution.status in ("exact", "suffix") and resolution.path is not None:
+            return self._entries.get(resolution.path)
+        return None
+
+    def path_resolver(self) -> PathResolver:
+        """Suffix trie over the indexed files, built on first use and kept for the index's lifetime."""
+
+        if self._resolver is None:
+            self._resolver = PathResolver(self._entries, root=self._root, truncated=self._truncated)
+        return self._resolver
+
+    def files(self, *, include_excluded: bool = False) -> list[FileEntry]:
+        return [entry for entry in self._entries.values() if include_excluded or not entry.excluded]
+
+    def source_files(self) -> list[FileEntry]:
+        """Program source files, skipping binary, generated and excluded files."""
+
+        return [entry for entry in self._entries.values() if entry.is_source]
+
+    def select(self, predicate: Callable[[FileEntry], bool], *, include_excluded: bool = False) -> list[FileEntry]:
+        return [entry for entry in self.files(include_excluded=include_excluded) if predicate(entry)]
+
+    def absolute_path(self, entry: FileEntry | str) -> Path:
+        return self._root / (entry.path if isinstance(entry, FileEntry) else entry)
+
+    def content_hash(self, path: str) -> str | None:
+        """SHA-256 of the file's bytes, computed lazily; ``None`` when unknown or unreadable."""
+
+        entry = self.get(path)
+        if entry is None:
+            return None
+        if entry.path not in self._hashes:
+            try:
+                self._hashes[entry.path] = hashlib.sha256(self.absolute_path(entry).read_bytes()).hexdigest()
+            except OSError:
+                self._hashes[entry.path] = None
+        return self._hashes[entry.path]
+
+    def render_tree(self, *, exclude_dirs: Iterable[str] = ()) -> list[str]:
+        """Render the indexed tree in the format produced by `generate_tree`."""
+
+        hidden = set(exclude_dirs)
+        lines: list[str] = []
+
+        def _render(relative: str, prefix: str) -> None:
+            if relative in self._truncated:
+                lines.append(f"{prefix}└── {_TRUNCATED_MARKER}")
+                return
+            children = [
+                child for child in self._children.get(relative, ()) if not (child.is_dir and child.name in hidden)
+            ]
+            for index, child in enumerate(children):
+                is_last = index == len(children) - 1
+                connector = "└── " if is_last else "├── "
+                lines.append(f"{prefix}{connector}{icon_for_name(child.name, child.is_dir)} {child.name}")
+                if child.is_dir:
+                    child_path = f"{relative}/{child.name}" if relative else child.name
+                    _render(child_path, prefix + ("    " if is_last else "│   "))
+            if relative in self._errors:
+                lines.append(f"{prefix}└── {self._errors[relative]}")
+
+        _render("", "")
+        return lines
+
+
+def build_file_index(
+    directory: Path,
+    *,
+    max_depth: int = 5,
+    exclude_dirs: set[str] | None = None,
+    exclude_files: set[str] | None = None,
+    exclude_extensions: set[str] | None = None,
+    gitignore_spec: PathSpec | None = None,
+) -> FileIndex:
+    """
+    Walk ``directory`` once, applying the same rules as `get_project_tree`.
+
+    Files hidden by the file/extension exclusions are still recorded (flagged as
+    ``excluded``) so dependency manifests such as ``requirements.txt`` can be found
+    without another walk; they are omitted from the rendered tree.
+    """
+    dirs, patterns = resolve_exclusions(exclude_dirs, exclude_files, exclude_extensions)
+    lowered_patterns = [pattern.lower() for pattern in patterns]
+    entries: list[FileEntry] = []
+    children: dict[str, list[_Child]] = {}
+    truncated: set[str] = set()
+    errors: dict[str, str] = {}
+
+    def _matches_pattern(name: str) -> bool:
+        lowered = name.lower()
+        return any(fnmatch.fnmatch(lowered, pattern) for pattern in lowered_patterns)
+
+    def _walk(path: Path, relative: str, depth: int) -> None:
+        if depth >= max_depth:
+            truncated.add(relative)
+            return
+        try:
+            with os.scandir(path) as iterator:
+                items = sorted(iterator, key=lambda item: (not _is_dir(item), item.name.lower()))
+        except PermissionError:
+            errors[relative] = "⚠️ <Permission Denied>"
+            return
+        except Exception as error:
+            errors[relative] = f"⚠️ <Error: {str(error)}>"
+            return
+
+        listed = children.setdefault(relative, [])
+        for item in items:
+            item_relative = f"{relative}/{item.name}" if relative else item.name
+            if gitignore_spec is not None and gitignore_spec.match_file(item_relative):
+                continue
+            is_dir = _is_dir(item)
+            if is_dir:
+                if item.name in dirs or _matches_pattern(item.name):
+                    continue
+                listed.append(_Child(item.name, True))
+                _walk(Path(item.path), item_relative, depth + 1)
+                continue
+
+            excluded = _matches_pattern(item.name)
+            if not excluded:
+                listed.append(_Child(item.name, False))
+            entries.append(_file_entry(item, item_relative, excluded=excluded))
+
+    _walk(directory, "", 0)
+    return FileIndex(directory, entries, children=children, truncated=truncated, errors=errors)
+
+
+def _is_dir(item: os.DirEntry[str]) -> bool:
+    try:
+        return item.is_dir()
+    except OSError:
+        return False
+
+
+def _file_entry(item: os.DirEntry[str], relative: str, *, excluded: bool) -> FileEntry:
+    try:
+        stat = item.stat()
+        size, mtime_ns = stat.st_size, stat.st_mtime_ns
+    except OSError:
+        size, mtime_ns = 0, 0
+    suffix = PurePosixPath(item.name).suffix.lower()
+    return FileEntry(
+        path=relative,
+        size=size,
+        mtime_ns=mtime_ns,
+        language=detect_language(item.name),
+        is_binary=suffix in BINARY_EXTENSIONS,
+        is_generated=is_generated_name(item.name),
+        excluded=excluded,
+    )
+
+
+__all__ = [
+    "FileEntry",
+    "FileIndex",
+    "LANGUAGE_BY_EXTENSION",
+    "SOURCE_LANGUAGES",
+    "build_file_index",
+    "detect_language",
+    "is_generated_name",
+]
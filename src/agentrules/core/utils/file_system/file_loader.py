@@ -0,0 +1,181 @@
+"""Concurrent, de-duplicated file reads for building agent contexts."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Iterable, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .bounded_reader import DEFAULT_MAX_FILE_BYTES, read_bounded
+from .content_extractors import extract_content
+from .file_sniffer import sniff_content, summarize_flagged
+
+if TYPE_CHECKING:
+    from .file_index import FileIndex
+
+logger = logging.getLogger("project_extractor")
+
+DEFAULT_FILE_LOADER_WORKERS = 8
+
+
+def resolve_project_file(directory: Path, file_path: str, file_index: FileIndex | None = None) -> Path | None:
+    """
+    Map a path assigned by the planner onto an existing file inside ``directory``.
+
+    With a ``file_index`` the path is resolved by the index's `PathResolver`, so
+    ``./``-prefixed, absolute, Windows-style and partial paths find their file
+    without touching the file system; only paths below directories the tree walk
+    did not enter are checked on disk. Without an index, paths prefixed with
+    ``./`` are retried without the prefix. Returns ``None`` when no file matches.
+    """
+    if file_index is not None:
+        resolution = file_index.path_resolver().resolve(file_path)
+        if resolution.status == "unindexed" and resolution.path is not None:
+            candidate = file_index.absolute_path(resolution.path)
+            return candidate if candidate.is_file() else None
+        return file_index.absolute_path(resolution.path) if resolution.path is not None else None
+    full_path = os.path.join(directory, file_path)
+    if os.path.isfile(full_path):
+        return Path(full_path)
+    rel_path = file_path.lstrip("./")  # Remove leading ./ if present
+    full_path = os.path.join(directory, rel_path)
+    if os.path.isfile(full_path):
+        return Path(full_path)
+    return None
+
+
+def read_project_file(
+    directory: Path,
+    file_path: str,
+    file_index: FileIndex | None = None,
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> str | None:
+    """
+    Read one assigned file as text, returning ``None`` when it is missing or unreadable.
+
+    The file is read once; binary, minified, encoded and generated files (judged
+    from their first bytes) are replaced by a one-line summary, and files above
+    ``max_bytes`` are cut to their head and tail with a size summary. Jupyter
+    notebooks are reduced to their cells, without images or bulky outputs, and
+    large data files (CSV, JSON, YAML, Parquet, ...) to a schema and samples.
+    """
+    resolved = resolve_project_file(directory, file_path, file_index)
+    if resolved is None:
+        logger.warning(f"Could not find file: {file_path}")
+        return None
+    try:
+        extracted = extract_content(resolved, max_bytes)
+    except (ValueError, RecursionError, OSError) as error:
+        logger.warning(f"[bold yellow]Warning:[/bold yellow] Reading {file_path} as is; extraction failed: {error}")
+        extracted = None
+    if extracted is not None:
+        return extracted
+    try:
+        read = read_bounded(resolved, max_bytes)
+    except Exception as error:
+        logger.error(f"Error reading file {file_path}: {str(error)}")
+        return None
+    sniffed = sniff_content(read.head)
+    if sniffed.flagged:
+        logger.info(f"Summarizing {sniffed.kind} file {file_path}: {sniffed.reason}")
+        return summarize_flagged(sniffed, read.size)
+    if read.truncated:
+        logger.info(f"Keeping head and tail of large file {file_path} ({read.size / 1024:,.0f}KB)")
+    return read.text()
+
+
+class AsyncFileLoader:
+    """
+    Read project files on a bounded thread pool with a per-run cache.
+
+    Each distinct path is read at most once: concurrent requests for the same file
+    share one in-flight read and later requests reuse its content. Agents awaiting
+    `load` therefore proceed as soon as their own files are available, regardless
+    of how much other agents still have to read.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_workers: int = DEFAULT_FILE_LOADER_WORKERS,
+        executor: ThreadPoolExecutor | None = None,
+        file_index: FileIndex | None = None,
+    ) -> None:
+        self._directory = directory
+        self._file_index = file_index
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="agentrules-file-loader",
+        )
+        self._reads: dict[str, asyncio.Future[str | None]] = {}
+
+    @property
+    def cached_paths(self) -> int:
+        return len(self._reads)
+
+    async def read(self, file_path: str) -> str | None:
+        """Return the contents of ``file_path``, reading it at most once per loader."""
+
+        future = self._reads.get(file_path)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            args: tuple[object, ...] = (self._directory, file_path)
+            if self._file_index is not None:
+                args = (*args, self._file_index)
+            future = loop.run_in_executor(self._executor, read_project_file, *args)
+            self._reads[file_path] = future
+        return await asyncio.shield(future)
+
+    async def load(self, file_paths: Iterable[str]) -> dict[str, str]:
+        """Read ``file_paths`` concurrently and return ``{path: content}`` for the readable ones."""
+
+        paths = list(dict.fromkeys(file_paths))
+        contents = await asyncio.gather(*(self.read(path) for path in paths))
+        return {path: content for path, content in zip(paths, contents, strict=True) if content is not None}
+
+    def close(self) -> None:
+        """Release the cache and shut down the thread pool if this loader created it."""
+
+        self._reads.clear()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> AsyncFileLoader:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def load_files(
+    directory: Path,
+    file_paths: Iterable[str],
+    cache: MutableMapping[str, str | None] | None = None,
+    file_index: FileIndex | None = None,
+) -> dict[str, str]:
+    """Synchronous counterpart of `AsyncFileLoader.load` with an optional shared cache."""
+
+    cache = {} if cache is None else cache
+    contents: dict[str, str] = {}
+    for file_path in file_paths:
+        if file_path not in cache:
+            cache[file_path] = read_project_file(directory, file_path, file_index)
+        content = cache[file_path]
+        if content is not None:
+            contents[file_path] = content
+    return contents
+
+
+__all__ = [
+    "AsyncFileLoader",
+    "DEFAULT_FILE_LOADER_WORKERS",
+    "load_files",
+    "read_project_file",
+    "resolve_project_file",
+]
@@ -25,6 +25,11 @@ from pathlib import Path
 from pathspec import PathSpec
 
 from agentrules.config.exclusions import EXCLUDED_DIRS, EXCLUDED_EXTENSIONS, EXCLUDED_FILES
+from agentrules.core.utils.file_system.bounded_reader import read_bounded
+from agentrules.core.utils.file_system.content_extractors import extract_content
+from agentrules.core.utils.file_system.file_index import FileIndex, build_file_index
+from agentrules.core.utils.file_system.file_sniffer import TEXT, SniffResult, decode_bytes, sniff_content
+from agentrules.core.utils.file_system.path_index import PathIndex
 
 # ====================================================
 # Initial Setup
@@ -38,6 +43,9 @@ logger = logging.getLogger("project_extractor")
 # Define file encoding to try in order of preference
 ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
 
+# Default depth searched by list_files
+LIST_FILES_MAX_DEPTH = 10
+
 
 # ====================================================
 # Function: should_exclude
@@ -72,32 +80,59 @@ def should_exclude(path: Path, exclude_dirs: set[str], exclude_patterns: set[str
 
 # ====================================================
 # Function: read_file_with_fallback
-# This function tries to read a file using different encodings.
-# If it fails with one encoding, it tries the next until it can read the file.
+# This function reads a file once and decodes it with the first
+# encoding from ENCODINGS that accepts its bytes.
 # ====================================================
 
 def read_file_with_fallback(file_path: Path) -> tuple[str, str]:
     """
     Read file content with encoding fallback.
 
+    The file is read once; candidate encodings are tried on the bytes in memory.
+
     Args:
         file_path: Path to the file
 
     Returns:
         Tuple[str, str]: Tuple of (file_content, encoding_used)
     """
-    for encoding in ENCODINGS:
-        try:
-            with open(file_path, encoding=encoding) as f:
-                content = f.read()
-            return content, encoding
-        except UnicodeDecodeError:
-            continue
-
-    # If all encodings fail, read as binary and decode with replacement
     with open(file_path, 'rb') as f:
-        content = f.read().decode('utf-8', errors='replace')
-    return content, 'utf-8 (with replacement)'
+        data = f.read()
+    return decode_bytes(data, ENCODINGS)
+
+
+# ====================================================
+# Function: read_text_file
+# This function reads a file once, sniffs its first bytes and decodes
+# it only when it looks like text that belongs in a prompt. Files over
+# the size cap keep only their head and tail, notebooks keep only their
+# cells, and large data files keep only their schema and samples.
+# ====================================================
+
+def read_text_file(file_path: Path, max_bytes: int) -> tuple[str | None, SniffResult]:
+    """
+    Read a file as text unless it is binary, minified, encoded or generated.
+
+    Args:
+        file_path: Path to the file
+        max_bytes: Size cap; larger files are cut to their head and tail with a
+            line-count and size summary, without being loaded whole
+
+    Returns:
+        Tuple of (file_content or None when flagged, sniff result)
+    """
+    try:
+        extracted = extract_content(file_path, max_bytes)
+    except (ValueError, RecursionError, OSError) as error:
+        logger.debug(f"Reading {file_path} as is; extraction failed: {error}")
+        extracted = None
+    if extracted is not None:
+        return extracted, TEXT
+    read = read_bounded(file_path, max_bytes)
+    sniffed = sniff_content(read.head)
+    if sniffed.flagged:
+        return None, sniffed
+    return read.text(ENCODINGS), sniffed
 
 
 # ====================================================
@@ -132,7 +167,7 @@ def list_files(
     directory: Path,
     exclude_dirs: set[str] | None = None,
     exclude_patterns: set[str] | None = None,
-    max_depth: int = 10,
+    max_depth: int = LIST_FILES_MAX_DEPTH,
     *,
     gitignore_spec: PathSpec | None = None,
     root: Path | None = None,
@@ -205,7 +240,7 @@ def get_file_contents(
     directory: Path,
     exclude_dirs: set[str] | None = None,
     exclude_patterns: set[str] | None = None,
-    max_size_kb: int = 1000,  # Don't process files larger than 1MB by default
+    max_size_kb: int = 1000,  # Files larger than 1MB keep only their head and tail
     max_files: int = 100,  # Limit the number of files to process
     *,
     gitignore_spec: PathSpec | None = None,
@@ -217,7 +252,7 @@ def get_file_contents(
         directory: Directory to search
         exclude_dirs: Set of directory names to exclude
         exclude_patterns: Set of file patterns to exclude
-        max_size_kb: Maximum file size in KB to process
+        max_size_kb: Per-file cap in KB; larger files are cut to their head and tail
         max_files: Maximum number of files to process
 
     Returns:
@@ -237,16 +272,13 @@ def get_file_contents(
             logger.warning(f"Reached maximum file limit of {max_files}")
             break
 
-        # Check file size
         try:
-            file_size_kb = file_path.stat().st_size / 1024
-            if file_size_kb > max_size_kb:
-                logger.info(f"Skipping large file: {file_path} ({file_size_kb:.2f}KB)")
+            # Read file content, skipping files that would only add noise
+            content, sniffed = read_text_file(file_path, max_size_kb * 1024)
+            if content is None:
+                logger.info(f"Skipping {sniffed.kind} file: {file_path} ({sniffed.reason})")
                 continue
 
-            # Read file content
-            content, encoding = read_file_with_fallback(file_path)
-
             # Format content
             formatted_content = format_file_content(file_path, content)
 
@@ -294,28 +326,55 @@ def get_filtered_formatted_contents(
     files_to_include: list[str],
     *,
     gitignore_spec: PathSpec | None = None,
+    file_index: FileIndex | None = None,
+    max_size_kb: int = 1000,
 ) -> str:
     """
     Get formatted contents for only the specified files.
 
+    Paths are matched against a file index (the snapshot's when given, otherwise
+    one built from a metadata-only walk), so only the requested files are read.
+    Paths not found verbatim fall back to the first indexed path containing them,
+    looked up through a trigram index of the indexed paths.
+
     Args:
         directory: Base directory
         files_to_include: List of file paths to include
+        file_index: Optional index of the project files
+        max_size_kb: Per-file cap in KB; larger files are cut to their head and tail
 
     Returns:
         str: Formatted contents of the specified files
     """
-    all_contents = get_file_contents(directory, gitignore_spec=gitignore_spec)
+    if file_index is None:
+        file_index = build_file_index(
+            directory,
+            max_depth=LIST_FILES_MAX_DEPTH + 1,
+            exclude_dirs=set(EXCLUDED_DIRS),
+            gitignore_spec=gitignore_spec,
+        )
+    path_index: PathIndex | None = None
     filtered_contents = []
 
     for file_path in files_to_include:
-        if file_path in all_contents:
-            filtered_contents.append(all_contents[file_path])
-        else:
-            # Try to find the file with a fuzzy match
-            for path in all_contents:
-                if file_path in path or path.endswith(file_path):
-                    filtered_contents.append(all_contents[path])
-                    break
+        entry = file_index.get(file_path)
+        if entry is None or entry.excluded:
+            # Try to find the file with a fuzzy match; the path index is built on the first miss
+            if path_index is None:
+                path_index = PathIndex(indexed.path for indexed in file_index.files())
+            match = path_index.find(file_path)
+            entry = file_index.get(match) if match is not None else None
+        if entry is None:
+            continue
+        absolute_path = file_index.absolute_path(entry)
+        try:
+            content, sniffed = read_text_file(absolute_path, max_size_kb * 1024)
+        except Exception as e:
+            logger.error(f"Error processing file {absolute_path}: {str(e)}")
+            continue
+        if content is None:
+            logger.info(f"Skipping {sniffed.kind} file: {entry.path} ({sniffed.reason})")
+            continue
+        filtered_contents.append(format_file_content(absolute_path, content))
 
     return "\n\n".join(filtered_contents)
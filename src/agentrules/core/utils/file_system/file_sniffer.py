@@ -0,0 +1,175 @@
+"""Cheap content sniffing and single-pass decoding of project files.
+
+Extensions alone do not keep binaries, minified bundles, source maps or embedded
+base64 blobs out of prompts. `sniff_content` inspects the first few KB of a file
+(NUL bytes, control characters, byte entropy, base64-like runs, line length
+with whitespace density, and "generated" markers) and classifies it; callers skip flagged files or replace them with a
+one-line summary. `decode_bytes` turns the bytes read once into text, trying the
+candidate encodings in memory instead of re-reading the file for each.
+"""
+
+from __future__ import annotations
+
+import codecs
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+SNIFF_BYTES = 4096
+"""Bytes inspected from the start of a file."""
+
+MINIFIED_LINE_LENGTH = 300
+MINIFIED_MIN_BYTES = 2048
+"""Average line length above which text of at least ``MINIFIED_MIN_BYTES`` is treated as minified."""
+
+MINIFIED_WHITESPACE_SHARE = 0.1
+"""
+Share of whitespace bytes below which long lines count as minified. Minifiers
+keep only the spaces the syntax needs; JSON and data files with long prose
+values have long lines too, but far more whitespace.
+"""
+
+ENCODED_SHARE = 0.5
+"""Share of the sniffed bytes in unbroken base64/hex runs above which a file is an encoded blob."""
+
+BINARY_ENTROPY_BITS = 7.2
+CONTROL_BYTE_RATIO = 0.1
+
+DEFAULT_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
+FileKind = Literal["text", "binary", "minified", "encoded", "generated"]
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_GENERATED_MARKERS = re.compile(
+    rb"@generated|generated[^\n]*do not edit|do not edit[^\n]*generated|auto-?generated (?:file|code)"
+    rb"|this file (?:was |is )?(?:automatically |auto-?)?generated|generated by the protocol buffer compiler",
+    re.IGNORECASE,
+)
+_ENCODED_LINE = re.compile(rb"[A-Za-z0-9+/=_-]{%d,}" % 120)
+_SOURCE_MAP = re.compile(rb'^\s*\{\s*"version"\s*:\s*3\s*,')
+_TEXT_CONTROL_BYTES = frozenset(b"\t\n\r\f\b\x1b")
+
+
+@dataclass(frozen=True)
+class SniffResult:
+    """Classification of a file from its first bytes."""
+
+    kind: FileKind
+    reason: str = ""
+
+    @property
+    def flagged(self) -> bool:
+        return self.kind != "text"
+
+
+TEXT = SniffResult("text")
+
+
+def sniff_content(head: bytes) -> SniffResult:
+    """
+    Classify a file from its first bytes.
+
+    Args:
+        head: Leading bytes of the file (``SNIFF_BYTES`` is enough)
+
+    Returns:
+        The classification; ``kind == "text"`` for files that belong in a prompt
+    """
+    head = head[:SNIFF_BYTES]
+    if not head:
+        return TEXT
+    if _bom_encoding(head) is None:
+        if b"\x00" in head:
+            return SniffResult("binary", "contains NUL bytes")
+        control = sum(1 for byte in head if byte < 32 and byte not in _TEXT_CONTROL_BYTES)
+        if control / len(head) > CONTROL_BYTE_RATIO:
+            return SniffResult("binary", "mostly control characters")
+    entropy = byte_entropy(head)
+    if entropy > BINARY_ENTROPY_BITS:
+        return SniffResult("binary", f"high entropy ({entropy:.1f} bits/byte)")
+    if _GENERATED_MARKERS.search(head[:1024]):
+        return SniffResult("generated", "generated-code marker")
+    if _SOURCE_MAP.match(head):
+        return SniffResult("generated", "source map")
+
+    encoded = sum(len(match) for match in _ENCODED_LINE.findall(head))
+    if encoded / len(head) > ENCODED_SHARE:
+        return SniffResult("encoded", f"{encoded:,} of {len(head):,} bytes in base64-like runs")
+    average = len(head) / (head.count(b"\n") + 1)
+    if len(head) >= MINIFIED_MIN_BYTES and average > MINIFIED_LINE_LENGTH:
+        whitespace = sum(head.count(byte) for byte in (b" ", b"\t", b"\n", b"\r")) / len(head)
+        if whitespace < MINIFIED_WHITESPACE_SHARE:
+            return SniffResult("minified", f"average line length {average:,.0f}, {whitespace:.0%} whitespace")
+    return TEXT
+
+
+def sniff_file(path: Path) -> SniffResult:
+    """Classify the file at ``path`` from its first ``SNIFF_BYTES`` bytes."""
+
+    with open(path, "rb") as handle:
+        return sniff_content(handle.read(SNIFF_BYTES))
+
+
+def byte_entropy(data: bytes) -> float:
+    """Shannon entropy of ``data`` in bits per byte."""
+
+    if not data:
+        return 0.0
+    total = len(data)
+    return -sum(count / total * math.log2(count / total) for count in Counter(data).values())
+
+
+def decode_bytes(data: bytes, encodings: tuple[str, ...] | list[str] = DEFAULT_ENCODINGS) -> tuple[str, str]:
+    """
+    Decode ``data`` with the first encoding that accepts it.
+
+    A byte order mark decides the encoding outright. When no candidate decodes
+    the bytes, UTF-8 with replacement characters is used.
+
+    Returns:
+        Tuple of (text, encoding_used)
+    """
+    bom_encoding = _bom_encoding(data)
+    if bom_encoding is not None:
+        return data.decode(bom_encoding, errors="replace"), bom_encoding
+    for encoding in encodings:
+        try:
+            return data.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    return data.decode("utf-8", errors="replace"), "utf-8 (with replacement)"
+
+
+def summarize_flagged(result: SniffResult, size: int) -> str:
+    """One-line stand-in for a flagged file's contents."""
+
+    return f"[{result.kind} file omitted: {result.reason}; {size:,} bytes]"
+
+
+def _bom_encoding(data: bytes) -> str | None:
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    return None
+
+
+__all__ = [
+    "DEFAULT_ENCODINGS",
+    "FileKind",
+    "SNIFF_BYTES",
+    "SniffResult",
+    "byte_entropy",
+    "decode_bytes",
+    "sniff_content",
+    "sniff_file",
+    "summarize_flagged",
+]
@@ -0,0 +1,173 @@
+"""Incremental decoding of large JSON documents."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+JSON_CHUNK_CHARS = 64 * 1024
+"""Characters read from the file at a time."""
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class JsonStream:
+    """
+    Decode JSON values one at a time from a text file, reading only as far as needed.
+
+    The caller walks the document's structure (`expect`, `skip`, `members`,
+    `elements`) and decodes the values it wants with `value` or passes over them
+    with `skip_value`; only the unparsed remainder of the current value is
+    buffered.
+    """
+
+    def __init__(self, handle: TextIO, chunk_chars: int = JSON_CHUNK_CHARS) -> None:
+        self._handle = handle
+        self._chunk_chars = max(1, chunk_chars)
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, size: int) -> bool:
+        data = self._handle.read(size)
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or ``""`` at the end of the file."""
+
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read(self._chunk_chars):
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def skip(self, char: str) -> bool:
+        if self.peek() == char:
+            self._pos += 1
+            return True
+        return False
+
+    def value(self) -> Any:
+        """Decode the next value, reading more of the file until it is complete."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Double the unparsed text each time so a large value is decoded in amortized linear time
+                if not self._read(max(self._chunk_chars, len(self._buffer) - self._pos)):
+                    raise
+                continue
+            if end == len(self._buffer) and not self._eof and not isinstance(value, dict | list | str):
+                # A number or literal may continue in the next chunk
+                if self._read(self._chunk_chars):
+                    continue
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """
+        Move past the next value without decoding it.
+
+        Containers and strings are scanned for their closing character chunk by
+        chunk, so memory stays bounded by the chunk size whatever the value's size.
+        """
+        first = self.peek()
+        if first == "":
+            raise ValueError("unexpected end of JSON input")
+        if first not in '[{"':
+            self.value()  # Numbers and literals are short
+            return
+
+        depth = 0
+        in_string = False
+        escaped = False
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            end = len(buffer)
+            while pos < end:
+                if escaped:
+                    pos += 1
+                    escaped = False
+                    continue
+                match = (_STRING_SPECIAL if in_string else _STRUCTURE).search(buffer, pos)
+                if match is None:
+                    pos = end
+                    break
+                pos = match.end()
+                char = match.group()
+                if char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = not in_string
+                    if not in_string and depth == 0:
+                        self._pos = pos
+                        return
+                elif char in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self._pos = pos
+                        return
+            self._pos = end
+            if not self._read(self._chunk_chars):
+                raise ValueError("unexpected end of JSON input")
+
+    def members(self) -> Iterator[str]:
+        """Yield the keys of the object at the current position; the caller consumes each value."""
+
+        self.expect("{")
+        if self.skip("}"):
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError(f"expected an object key, found {key!r}")
+            self.expect(":")
+            yield key
+            if self.skip("}"):
+                return
+            self.expect(",")
+
+    def elements(self) -> Iterator[int]:
+        """Yield the index of each element of the array at the current position; the caller consumes each one."""
+
+        self.expect("[")
+        if self.skip("]"):
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.skip("]"):
+                return
+            self.expect(",")
+
+    def array(self) -> Iterator[Any]:
+        """Yield the elements of the array at the current position one by one."""
+
+        for _ in self.elements():
+            yield self.value()
+
+
+__all__ = ["JSON_CHUNK_CHARS", "JsonStream"]
@@ -0,0 +1,184 @@
+"""Jupyter notebooks reduced to their code and markdown before they reach a prompt.
+
+A notebook's JSON is mostly cell outputs: base64 images, HTML tables and long
+logs. `extract_notebook` reads the file incrementally, decoding one cell at a
+time from a growing buffer, so memory is bounded by the largest cell rather
+than the file. It keeps code and markdown cells in a ``# %%`` cell layout,
+optionally followed by each cell's text output cut to a few hundred characters.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .json_stream import JSON_CHUNK_CHARS, JsonStream
+
+logger = logging.getLogger("project_extractor")
+
+NOTEBOOK_SUFFIX = ".ipynb"
+
+NOTEBOOK_OUTPUT_CHARS = 500
+"""Characters of text output kept per code cell."""
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+_TEXT_MIME_TYPES = ("text/plain",)
+
+
+def is_notebook(path: Path | str) -> bool:
+    return str(path).lower().endswith(NOTEBOOK_SUFFIX)
+
+
+def extract_notebook(
+    path: Path,
+    *,
+    include_outputs: bool = True,
+    max_output_chars: int = NOTEBOOK_OUTPUT_CHARS,
+    max_chars: int | None = None,
+    chunk_chars: int = JSON_CHUNK_CHARS,
+) -> str | None:
+    """
+    Render a notebook's cells as text, dropping images and bulky outputs.
+
+    Args:
+        path: Notebook file
+        include_outputs: Keep each code cell's text output (streams, plain-text
+            results and errors), truncated to ``max_output_chars``
+        max_output_chars: Characters of output kept per cell
+        max_chars: Optional cap on the rendered text
+        chunk_chars: Characters read from the file at a time
+
+    Returns:
+        The rendered notebook, or ``None`` when the file is not notebook JSON so
+        callers can fall back to reading it as plain text
+    """
+    try:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            stream = JsonStream(handle, chunk_chars)
+            metadata: dict[str, Any] = {}
+            rendered: list[str] = []
+            counts = {"code": 0, "markdown": 0, "raw": 0}
+            omitted = 0
+            for cells in _top_level(stream, metadata):
+                for cell in cells:
+                    if not isinstance(cell, dict):
+                        continue
+                    cell_type = str(cell.get("cell_type") or "code")
+                    counts[cell_type] = counts.get(cell_type, 0) + 1
+                    text, dropped = _render_cell(cell, cell_type, include_outputs, max_output_chars)
+                    omitted += dropped
+                    if text:
+                        rendered.append(text)
+    except (OSError, ValueError) as error:
+        logger.debug(f"Reading {path} as plain text, not notebook JSON: {error}")
+        return None
+
+    language = _language(metadata)
+    summary = f"{counts['code']} code and {counts['markdown']} markdown cells"
+    if include_outputs:
+        summary += f"; text outputs cut to {max_output_chars} characters"
+    else:
+        summary += "; outputs removed"
+    if omitted:
+        summary += f"; {omitted} rich outputs (images, HTML) omitted"
+    text = f"# Jupyter notebook ({language}): {summary}\n\n" + "\n\n".join(rendered) + "\n"
+    if max_chars is not None and len(text) > max_chars:
+        text = f"{text[:max_chars].rstrip()}\n... [{len(text) - max_chars:,} characters of notebook omitted] ...\n"
+    return text
+
+
+def _top_level(stream: JsonStream, metadata: dict[str, Any]) -> Iterator[Iterator[Any]]:
+    """Yield the cell sequences of a notebook, filling ``metadata`` when it is reached."""
+
+    for key in stream.members():
+        if key == "cells":
+            yield stream.array()
+        elif key == "worksheets":
+            # nbformat 3 keeps cells inside worksheets
+            for worksheet in stream.value():
+                if isinstance(worksheet, dict):
+                    yield iter(worksheet.get("cells") or [])
+        elif key == "metadata":
+            value = stream.value()
+            if isinstance(value, dict):
+                metadata.update(value)
+        else:
+            stream.value()
+
+
+def _render_cell(cell: dict[str, Any], cell_type: str, include_outputs: bool, max_output_chars: int) -> tuple[str, int]:
+    """Render one cell; returns the text and the number of rich outputs omitted."""
+
+    source = _joined(cell.get("source", cell.get("input"))).rstrip()
+    if cell_type == "markdown":
+        return (f"# %% [markdown]\n{source}" if source else ""), 0
+    if cell_type != "code":
+        return (f"# %% [{cell_type}]\n{source}" if source else ""), 0
+    if not source:
+        return "", 0
+
+    text = f"# %%\n{source}"
+    outputs = cell.get("outputs") or []
+    if not include_outputs or not outputs:
+        return text, 0
+    kept: list[str] = []
+    omitted = 0
+    for output in outputs:
+        if not isinstance(output, dict):
+            continue
+        output_text, rich = _output_text(output)
+        omitted += rich
+        if output_text:
+            kept.append(output_text)
+    output_text = _ANSI_ESCAPE.sub("", "\n".join(kept)).strip()
+    if not output_text:
+        return text, omitted
+    if len(output_text) > max_output_chars:
+        cut = len(output_text) - max_output_chars
+        output_text = f"{output_text[:max_output_chars].rstrip()}\n... [{cut:,} more characters]"
+    commented = "\n".join(f"# {line}".rstrip() for line in output_text.splitlines())
+    return f"{text}\n# Output:\n{commented}", omitted
+
+
+def _output_text(output: dict[str, Any]) -> tuple[str, int]:
+    output_type = output.get("output_type")
+    if output_type == "stream":
+        return _joined(output.get("text")), 0
+    if output_type == "error":
+        return f"{output.get('ename', 'Error')}: {output.get('evalue', '')}", 0
+    # execute_result / display_data (nbformat 3 stores the mime bundle on the output itself)
+    data = output.get("data") if isinstance(output.get("data"), dict) else output
+    text = next((_joined(data[mime]) for mime in _TEXT_MIME_TYPES if mime in data), "")
+    if not text and "text" in data:
+        text = _joined(data["text"])
+    rich = sum(1 for mime in data if "/" in mime and mime not in _TEXT_MIME_TYPES)
+    if not rich:
+        rich = sum(1 for key in ("png", "jpeg", "svg", "html") if key in data)
+    return text, rich
+
+
+def _joined(value: Any) -> str:
+    if isinstance(value, list):
+        return "".join(str(part) for part in value)
+    return value if isinstance(value, str) else ""
+
+
+def _language(metadata: dict[str, Any]) -> str:
+    language_info = metadata.get("language_info")
+    if isinstance(language_info, dict) and language_info.get("name"):
+        return str(language_info["name"])
+    kernelspec = metadata.get("kernelspec")
+    if isinstance(kernelspec, dict) and kernelspec.get("language"):
+        return str(kernelspec["language"])
+    return "unknown language"
+
+
+__all__ = [
+    "NOTEBOOK_OUTPUT_CHARS",
+    "NOTEBOOK_SUFFIX",
+    "extract_notebook",
+    "is_notebook",
+]
@@ -0,0 +1,57 @@
+"""Trigram index for substring lookups over project paths.
+
+Matching a planner-written fragment such as ``models/user.py`` against every
+indexed path is a scan per lookup. `PathIndex` keeps, for every three-character
+sequence, the paths containing it; a lookup intersects the posting sets of the
+fragment's trigrams and only verifies the few candidates left.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
+def trigrams(text: str) -> set[str]:
+    """Distinct three-character sequences of ``text`` (lower-cased)."""
+
+    lowered = text.lower()
+    return {lowered[index:index + 3] for index in range(len(lowered) - 2)}
+
+
+class PathIndex:
+    """Paths in their original order with a trigram index for substring queries."""
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        self._paths = list(dict.fromkeys(paths))
+        self._order = {path: position for position, path in enumerate(self._paths)}
+        self._postings: dict[str, set[str]] = {}
+        for path in self._paths:
+            for gram in trigrams(path):
+                self._postings.setdefault(gram, set()).add(path)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def find_all(self, fragment: str) -> list[str]:
+        """Paths containing ``fragment`` (case-sensitive), in index order."""
+
+        if len(fragment) < 3:
+            return [path for path in self._paths if fragment in path]
+        candidates: set[str] | None = None
+        for gram in sorted(trigrams(fragment), key=lambda gram: len(self._postings.get(gram, ()))):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                return []
+        return sorted((path for path in candidates or () if fragment in path), key=self._order.__getitem__)
+
+    def find(self, fragment: str) -> str | None:
+        """First path, in index order, containing ``fragment``."""
+
+        matches = self.find_all(fragment)
+        return matches[0] if matches else None
+
+
+__all__ = ["PathIndex", "trigrams"]
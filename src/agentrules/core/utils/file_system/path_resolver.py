@@ -0,0 +1,204 @@
+"""Map the file paths a planner writes onto the project's canonical relative paths."""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+logger = logging.getLogger("project_extractor")
+
+ResolutionStatus = Literal["exact", "suffix", "ambiguous", "unresolved", "unindexed"]
+"""
+How a path was resolved: ``exact`` and ``suffix`` matches name one indexed file,
+``ambiguous`` suffixes match several, and ``unindexed`` paths lie below a
+directory the tree walk did not descend into (they may still exist on disk).
+"""
+
+_DRIVE = re.compile(r"^[A-Za-z]:/")
+_QUOTES = "`'\" "
+
+
+@dataclass(frozen=True, slots=True)
+class PathResolution:
+    """Outcome of resolving one planner-written path."""
+
+    query: str
+    status: ResolutionStatus
+    path: str | None = None
+    candidates: tuple[str, ...] = ()
+
+    @property
+    def resolved(self) -> bool:
+        return self.path is not None
+
+
+@dataclass
+class AssignmentResolution:
+    """Agent definitions with canonical file assignments, and the entries that were dropped."""
+
+    agents: list[dict] = field(default_factory=list)
+    unresolved: dict[str, list[str]] = field(default_factory=dict)
+    """Dropped entries per agent id, in assignment order."""
+    ambiguous: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    """Candidate paths of each dropped entry that matched several files."""
+
+
+class _Node:
+    __slots__ = ("children", "paths")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.paths: list[str] = []
+
+
+class PathResolver:
+    """
+    Suffix trie over a project's files, keyed by reversed path components.
+
+    Every file is inserted once, file name first, so a lookup walks the query's
+    components from the end and costs O(path length) regardless of project size.
+    Queries may use ``./`` prefixes, Windows separators, absolute paths inside or
+    outside ``root``, a leading project directory name, or any unambiguous suffix
+    such as a bare file name.
+    """
+
+    def __init__(self, paths: Iterable[str], *, root: Path | None = None, truncated: Iterable[str] = ()) -> None:
+        self._trie = _Node()
+        self._paths: set[str] = set()
+        for path in paths:
+            self._insert(path)
+        self._root = root.as_posix().rstrip("/") if root is not None else None
+        self._root_parts = tuple(part for part in (self._root or "").split("/") if part)
+        self._truncated = frozenset(truncated)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _insert(self, path: str) -> None:
+        if path in self._paths:
+            return
+        self._paths.add(path)
+        node = self._trie
+        for part in reversed(path.split("/")):
+            node = node.children.setdefault(part, _Node())
+            node.paths.append(path)
+
+    def resolve(self, query: str) -> PathResolution:
+        """Resolve one path as written by a planner."""
+
+        parts, absolute = self._normalize(query)
+        if not parts:
+            return PathResolution(query, "unresolved")
+        relative = "/".join(parts)
+        if not absolute and relative in self._paths:
+            return PathResolution(query, "exact", relative)
+
+        node = self._trie
+        matched = 0
+        for part in reversed(parts):
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            matched += 1
+
+        unmatched = parts[: len(parts) - matched]
+        # A partial match only counts when the unmatched prefix is a foreign root or the project's own name
+        if matched and (not unmatched or absolute or self._is_root_suffix(unmatched)):
+            if len(node.paths) == 1:
+                return PathResolution(query, "suffix", node.paths[0])
+            return PathResolution(query, "ambiguous", candidates=tuple(sorted(node.paths)))
+
+        if not absolute and self._below_truncated(parts):
+            return PathResolution(query, "unindexed", relative)
+        return PathResolution(query, "unresolved")
+
+    def resolve_agents(self, agents: Sequence[dict]) -> AssignmentResolution:
+        """
+        Replace each agent's ``file_assignments`` with canonical paths.
+
+        Unresolved and ambiguous entries are dropped and reported; paths below
+        directories the walk did not enter are kept so they can still be read.
+        """
+        result = AssignmentResolution()
+        for position, agent in enumerate(agents, start=1):
+            kept: list[str] = []
+            dropped: list[str] = []
+            for raw in agent.get("file_assignments") or []:
+                resolution = self.resolve(str(raw))
+                if resolution.path is None:
+                    dropped.append(str(raw))
+                    if resolution.status == "ambiguous":
+                        result.ambiguous[str(raw)] = resolution.candidates
+                elif resolution.path not in kept:
+                    kept.append(resolution.path)
+            if dropped:
+                result.unresolved[str(agent.get("id") or f"agent_{position}")] = dropped
+            result.agents.append({**agent, "file_assignments": kept})
+        return result
+
+    def _normalize(self, query: str) -> tuple[list[str], bool]:
+        """Split ``query`` into components relative to the root; the flag marks paths outside it."""
+
+        path = query.strip().strip(_QUOTES).replace("\\", "/")
+        absolute = path.startswith("/") or bool(_DRIVE.match(path))
+        if absolute and self._root is not None and (path + "/").startswith(self._root + "/"):
+            path = path[len(self._root) :]
+            absolute = False
+        parts: list[str] = []
+        for part in path.split("/"):
+            if part in ("", "."):
+                continue
+            if part == ".." and parts:
+                parts.pop()
+            else:
+                parts.append(part)
+        if absolute and parts and _DRIVE.match(parts[0] + "/"):
+            parts = parts[1:]
+        return parts, absolute
+
+    def _is_root_suffix(self, prefix: list[str]) -> bool:
+        return len(prefix) <= len(self._root_parts) and tuple(prefix) == self._root_parts[-len(prefix) :]
+
+    def _below_truncated(self, parts: list[str]) -> bool:
+        if "" in self._truncated:
+            return True
+        directory = ""
+        for part in parts[:-1]:
+            directory = f"{directory}/{part}" if directory else part
+            if directory in self._truncated:
+                return True
+        return False
+
+
+def log_assignment_resolution(resolution: AssignmentResolution) -> None:
+    """Report the entries `PathResolver.resolve_agents` dropped."""
+
+    dropped = sum(len(entries) for entries in resolution.unresolved.values())
+    if not dropped:
+        return
+    logger.warning(
+        f"[bold yellow]Warning:[/bold yellow] Dropped {dropped} file assignments that match no project file "
+        f"({len(resolution.ambiguous)} ambiguous)"
+    )
+    for agent_id, entries in resolution.unresolved.items():
+        for entry in entries:
+            candidates = resolution.ambiguous.get(entry)
+            if candidates:
+                more = ", ..." if len(candidates) > 3 else ""
+                logger.debug(f"  {agent_id}: {entry} (matches {', '.join(candidates[:3])}{more})")
+            else:
+                logger.debug(f"  {agent_id}: {entry}")
+
+
+__all__ = [
+    "AssignmentResolution",
+    "PathResolution",
+    "PathResolver",
+    "ResolutionStatus",
+    "log_assignment_resolution",
+]
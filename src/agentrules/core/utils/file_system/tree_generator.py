@@ -17,6 +17,7 @@ of project structures.
 
 import fnmatch  # Provides support for Unix shell-style wildcards
 from pathlib import Path  # Offers a way to interact with files and directories in a more object-oriented manner
+from typing import TYPE_CHECKING
 
 from pathspec import PathSpec
 
@@ -27,6 +28,9 @@ from agentrules.config.exclusions import (  # Importing predefined exclusion lis
 )
 from agentrules.core.utils.constants import DEFAULT_RULES_FILENAME
 
+if TYPE_CHECKING:
+    from .file_index import FileIndex
+
 # ====================================================
 # Setting Up Default Exclusion Constants
 # These constants define which directories, files, and file extensions
@@ -122,15 +126,29 @@ def get_file_icon(path: Path) -> str:
     Returns:
         str: Emoji icon representing the file type
     """
-    if path.is_dir():
+    return icon_for_name(path.name, path.is_dir())
+
+
+def icon_for_name(name: str, is_dir: bool) -> str:
+    """
+    Get the emoji icon for an entry without touching the file system.
+
+    Args:
+        name: File or directory name
+        is_dir: Whether the entry is a directory
+
+    Returns:
+        str: Emoji icon representing the file type
+    """
+    if is_dir:
         return '📁'
 
     # Check for exact filename matches first
-    if path.name in FILE_ICONS:
-        return FILE_ICONS[path.name]
+    if name in FILE_ICONS:
+        return FILE_ICONS[name]
 
     # Then check extensions
-    ext = path.suffix.lower()
+    ext = Path(name).suffix.lower()
     if ext in FILE_ICONS:
         return FILE_ICONS[ext]
 
@@ -349,6 +367,7 @@ def get_project_tree(
     exclude_files: set[str] | None = None,
     exclude_extensions: set[str] | None = None,
     gitignore_spec: PathSpec | None = None,
+    file_index: "FileIndex | None" = None,
 ) -> list[str]:
     """
     Generate a tree structure for a project directory.
@@ -357,24 +376,26 @@ def get_project_tree(
     Args:
         directory: The project directory path
         max_depth: Maximum depth to traverse
+        file_index: Index built from the same walk; when given the tree is rendered
+            from it instead of walking the directory again
 
     Returns:
         List of strings representing the tree structure with delimiters
     """
-    # Generate the tree
-    dirs = exclude_dirs or DEFAULT_EXCLUDE_DIRS
-    files = exclude_files or EXCLUDED_FILES
-    extensions = exclude_extensions or EXCLUDED_EXTENSIONS
-    patterns = _build_exclude_patterns(set(files), set(extensions))
-
-    tree = generate_tree(
-        directory,
-        max_depth=max_depth,
-        exclude_dirs=dirs,
-        exclude_patterns=patterns,
-        gitignore_spec=gitignore_spec,
-        root=directory,
-    )
+    if file_index is not None:
+        tree = file_index.render_tree()
+    else:
+        # Generate the tree
+        dirs, patterns = resolve_exclusions(exclude_dirs, exclude_files, exclude_extensions)
+
+        tree = generate_tree(
+            directory,
+            max_depth=max_depth,
+            exclude_dirs=dirs,
+            exclude_patterns=patterns,
+            gitignore_spec=gitignore_spec,
+            root=directory,
+        )
 
     # Add the key
     key = generate_key(tree)
@@ -389,3 +410,20 @@ def get_project_tree(
     delimited_tree = ["<project_structure>"] + complete_tree + ["</project_structure>"]
 
     return delimited_tree
+
+
+def resolve_exclusions(
+    exclude_dirs: set[str] | None = None,
+    exclude_files: set[str] | None = None,
+    exclude_extensions: set[str] | None = None,
+) -> tuple[set[str], set[str]]:
+    """
+    Apply the default exclusions and build the file patterns used by the tree walk.
+
+    Returns:
+        Tuple of (excluded directory names, excluded file patterns)
+    """
+    dirs = exclude_dirs or DEFAULT_EXCLUDE_DIRS
+    files = exclude_files or EXCLUDED_FILES
+    extensions = exclude_extensions or EXCLUDED_EXTENSIONS
+    return set(dirs), _build_exclude_patterns(set(files), set(extensions))
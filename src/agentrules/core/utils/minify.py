@@ -0,0 +1,225 @@
+"""Token-reducing normalization of file contents before they are inlined in prompts.
+
+The pass never changes what the code does, only what it costs to read: license
+banners are replaced by a one-line note, trailing whitespace is removed and runs
+of blank lines collapse to one. Optionally, whole-line comments are dropped
+(documentation comments are kept) and long runs of literal-only lines, such as
+lookup tables and fixtures, are cut down to their first rows.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+import tokenize
+from pathlib import PurePosixPath
+
+HASH_COMMENT_EXTENSIONS = frozenset(
+    {".py", ".pyi", ".sh", ".bash", ".zsh", ".rb", ".pl", ".r", ".yaml", ".yml", ".toml", ".cfg", ".conf"}
+)
+SLASH_COMMENT_EXTENSIONS = frozenset(
+    {
+        ".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".mts", ".cts", ".java", ".kt", ".kts", ".scala",
+        ".c", ".h", ".cc", ".cpp", ".hpp", ".cs", ".go", ".rs", ".swift", ".dart", ".php",
+        ".css", ".scss", ".less",
+    }
+)
+DASH_COMMENT_EXTENSIONS = frozenset({".sql", ".lua", ".hs"})
+MARKUP_COMMENT_EXTENSIONS = frozenset({".html", ".htm", ".xml", ".svg", ".vue", ".md"})
+
+LITERAL_TABLE_MIN_LINES = 12
+LITERAL_TABLE_KEEP_LINES = 3
+
+_LICENSE_MARKERS = re.compile(
+    r"copyright|\blicen[cs]ed?\b|spdx-license-identifier|permission is hereby granted|all rights reserved",
+    re.IGNORECASE,
+)
+_SPDX = re.compile(r"SPDX-License-Identifier:\s*([^\s*]+)")
+_STRING_LITERAL = re.compile(r"\"(?:[^\"\\\n]|\\.)*\"|'(?:[^'\\\n]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b0[xX][0-9a-fA-F_]+\b|(?<![\w.])[-+]?\d[\d_]*(?:\.\d*)?(?:[eE][-+]?\d+)?\b")
+_KEYWORD_LITERAL = re.compile(r"\b(?:true|false|null|None|True|False|nil|undefined)\b")
+_LITERAL_RESIDUE = re.compile(r"^[\s\x00\[\]{}(),:;=>+-]*$")
+
+
+def comment_prefix(path: str) -> str | None:
+    """Line comment marker of the language implied by ``path``, if it has one."""
+
+    suffix = PurePosixPath(path).suffix.lower()
+    if suffix in HASH_COMMENT_EXTENSIONS:
+        return "#"
+    if suffix in SLASH_COMMENT_EXTENSIONS:
+        return "//"
+    if suffix in DASH_COMMENT_EXTENSIONS:
+        return "--"
+    return None
+
+
+def minify_text(
+    path: str,
+    text: str,
+    *,
+    drop_comments: bool = False,
+    drop_literal_tables: bool = False,
+) -> str:
+    """
+    Normalize ``text`` to use fewer tokens.
+
+    Args:
+        path: File path, used to pick the comment syntax
+        text: File contents
+        drop_comments: Also remove whole-line comments
+        drop_literal_tables: Also shorten long runs of literal-only lines
+
+    Returns:
+        The normalized contents
+    """
+    text = strip_license_header(path, text)
+    if drop_comments:
+        text = drop_comment_lines(path, text)
+    lines = [line.rstrip() for line in text.splitlines()]
+    if drop_literal_tables:
+        lines = _shorten_literal_tables(path, lines)
+    collapsed: list[str] = []
+    for line in lines:
+        if not line and (not collapsed or not collapsed[-1]):
+            continue
+        collapsed.append(line)
+    while collapsed and not collapsed[-1]:
+        collapsed.pop()
+    result = "\n".join(collapsed)
+    return result + "\n" if result and text.endswith("\n") else result
+
+
+def strip_license_header(path: str, text: str) -> str:
+    """Replace a leading comment block that reads like a license with a one-line note."""
+
+    lines = text.splitlines(keepends=True)
+    start = 0
+    # Shebang and encoding declarations stay in place
+    while start < len(lines) and start < 2 and re.match(r"#!|#.*coding[:=]|<\?xml", lines[start]):
+        start += 1
+    while start < len(lines) and not lines[start].strip():
+        start += 1
+    if start >= len(lines):
+        return text
+
+    first = lines[start].lstrip()
+    prefix = comment_prefix(path)
+    if first.startswith("/*") or first.startswith("<!--"):
+        closing = "*/" if first.startswith("/*") else "-->"
+        end = start
+        while end < len(lines) and closing not in lines[end]:
+            end += 1
+        if end >= len(lines) or lines[end].split(closing, 1)[1].strip():
+            return text
+        end += 1
+        opener = "/*" if closing == "*/" else "<!--"
+        note_format = f"{opener} {{}} {closing}"
+    elif prefix is not None and first.startswith(prefix):
+        end = start
+        while end < len(lines) and lines[end].lstrip().startswith(prefix):
+            end += 1
+        note_format = f"{prefix} {{}}"
+    else:
+        return text
+
+    block = "".join(lines[start:end])
+    if not _LICENSE_MARKERS.search(block):
+        return text
+    spdx = _SPDX.search(block)
+    note = f"License header removed (SPDX: {spdx.group(1)})" if spdx else "License header removed"
+    newline = "\n" if end < len(lines) or block.endswith("\n") else ""
+    return "".join(lines[:start]) + note_format.format(note) + newline + "".join(lines[end:])
+
+
+def drop_comment_lines(path: str, text: str) -> str:
+    """Remove lines that only hold a comment; documentation comments and shebangs are kept."""
+
+    suffix = PurePosixPath(path).suffix.lower()
+    if suffix in {".py", ".pyi"}:
+        return _drop_python_comments(text)
+    prefix = comment_prefix(path)
+    if prefix is None:
+        return text
+    kept: list[str] = []
+    in_block = False
+    for number, line in enumerate(text.splitlines(keepends=True)):
+        stripped = line.strip()
+        if in_block:
+            if "*/" in line:
+                in_block = False
+                remainder = line.split("*/", 1)[1]
+                if remainder.strip():
+                    kept.append(remainder)
+            continue
+        if number == 0 and stripped.startswith("#!"):
+            kept.append(line)
+        elif prefix == "//" and stripped.startswith("/*") and not stripped.startswith("/**"):
+            if "*/" not in stripped:
+                in_block = True
+            elif stripped.split("*/", 1)[1].strip():
+                kept.append(line)
+        elif stripped.startswith(prefix) and not stripped.startswith("///"):
+            continue
+        else:
+            kept.append(line)
+    return "".join(kept)
+
+
+def _drop_python_comments(text: str) -> str:
+    comment_rows: set[int] = set()
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(text).readline):
+            if token.type == tokenize.COMMENT and not token.line[: token.start[1]].strip():
+                comment_rows.add(token.start[0])
+    except (tokenize.TokenError, SyntaxError):
+        return text
+    lines = text.splitlines(keepends=True)
+    return "".join(
+        line
+        for number, line in enumerate(lines, start=1)
+        if number not in comment_rows or (number <= 2 and re.match(r"#!|#.*coding[:=]", line))
+    )
+
+
+def _is_literal_line(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped:
+        return False
+    residue = _STRING_LITERAL.sub("\x00", stripped)
+    residue = _KEYWORD_LITERAL.sub("\x00", _NUMBER_LITERAL.sub("\x00", residue))
+    return "\x00" in residue and _LITERAL_RESIDUE.match(residue) is not None
+
+
+def _shorten_literal_tables(path: str, lines: list[str]) -> list[str]:
+    prefix = comment_prefix(path)
+    result: list[str] = []
+    index = 0
+    while index < len(lines):
+        end = index
+        while end < len(lines) and _is_literal_line(lines[end]):
+            end += 1
+        run = end - index
+        if run >= LITERAL_TABLE_MIN_LINES:
+            result.extend(lines[index:index + LITERAL_TABLE_KEEP_LINES])
+            indent = lines[index][: len(lines[index]) - len(lines[index].lstrip())]
+            elided = run - LITERAL_TABLE_KEEP_LINES
+            marker = f"{prefix} " if prefix else ""
+            result.append(f"{indent}{marker}... {elided} more literal lines")
+            index = end
+        elif run:
+            result.extend(lines[index:end])
+            index = end
+        else:
+            result.append(lines[index])
+            index += 1
+    return result
+
+
+__all__ = [
+    "LITERAL_TABLE_MIN_LINES",
+    "comment_prefix",
+    "drop_comment_lines",
+    "minify_text",
+    "strip_license_header",
+]
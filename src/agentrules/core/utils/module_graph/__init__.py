@@ -0,0 +1,16 @@
+"""Import graph of a project's Python, JavaScript/TypeScript, Go and Java modules."""
+
+from .cache import default_cache_path, load_module_graph
+from .graph import DirectoryCoupling, ModuleGraph, resolve_module_graph
+from .imports import ModuleImports, extract_imports, language_for
+
+__all__ = [
+    "DirectoryCoupling",
+    "ModuleGraph",
+    "ModuleImports",
+    "default_cache_path",
+    "extract_imports",
+    "language_for",
+    "load_module_graph",
+    "resolve_module_graph",
+]
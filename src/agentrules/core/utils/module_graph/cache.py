@@ -0,0 +1,184 @@
+"""Building a project's module graph from its snapshot, with a per-file cache.
+
+Extracted imports are persisted per project and keyed by each file's content
+hash, so only new or edited files are parsed again. On large trees the parsing
+runs in a process pool, since `ast` parsing is CPU-bound.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from agentrules.core.utils.file_system.file_index import FileIndex
+from agentrules.core.utils.module_graph.graph import ModuleGraph, resolve_module_graph
+from agentrules.core.utils.module_graph.imports import ModuleImports, extract_imports, language_for
+
+logger = logging.getLogger("project_extractor")
+
+CACHE_VERSION = 1
+DEFAULT_GRAPH_DIRNAME = "module_graph"
+MAX_GRAPH_FILE_BYTES = 1024 * 1024
+PROCESS_POOL_MIN_FILES = 64
+"""Fewer files than this are parsed in-process; starting workers would cost more than it saves."""
+
+_GO_MODULE = re.compile(r"^module\s+(\S+)", re.MULTILINE)
+
+
+def default_cache_path(root: Path) -> Path:
+    """Location of the persisted import cache for the project at ``root``."""
+
+    from agentrules.core.configuration import constants as configuration_constants
+
+    digest = hashlib.sha1(str(root.resolve()).encode("utf-8"), usedforsecurity=False).hexdigest()[:16]
+    return configuration_constants.CONFIG_DIR / DEFAULT_GRAPH_DIRNAME / f"{digest}.json"
+
+
+def load_module_graph(
+    file_index: FileIndex,
+    *,
+    cache_path: Path | None = None,
+    max_workers: int | None = None,
+) -> ModuleGraph:
+    """
+    Build the module graph of ``file_index``'s project.
+
+    Args:
+        file_index: Index of the project files from the snapshot walk
+        cache_path: Where extracted imports are persisted; defaults to `default_cache_path`
+        max_workers: Worker processes used for parsing; ``1`` parses in-process
+
+    Returns:
+        The resolved graph; the cache is saved back when any file was parsed
+    """
+    cache_path = cache_path or default_cache_path(file_index.root)
+    cached = _load_cache(cache_path, file_index.root)
+
+    hashes: dict[str, str] = {}
+    imports: dict[str, ModuleImports] = {}
+    pending: list[tuple[str, str]] = []
+    for entry in file_index.source_files():
+        if language_for(entry.path) is None or entry.size > MAX_GRAPH_FILE_BYTES:
+            continue
+        digest = file_index.content_hash(entry.path)
+        if digest is None:
+            continue
+        hashes[entry.path] = digest
+        hit = cached.get(entry.path)
+        if hit is not None and hit[0] == digest:
+            imports[entry.path] = hit[1]
+        else:
+            pending.append((entry.path, str(file_index.absolute_path(entry))))
+
+    for path, extracted in _extract_all(pending, max_workers):
+        if extracted is not None:
+            imports[path] = extracted
+    if pending or set(cached) - set(hashes):
+        logger.debug(f"Module graph: parsed {len(pending)} files, {len(imports) - len(pending)} from cache")
+        try:
+            _save_cache(cache_path, file_index.root, {path: (hashes[path], imports[path]) for path in imports})
+        except OSError as error:
+            logger.warning(f"[bold yellow]Warning:[/bold yellow] Could not save the module graph cache: {error}")
+
+    ordered = {entry.path: imports[entry.path] for entry in file_index.source_files() if entry.path in imports}
+    return resolve_module_graph(ordered, go_modules=_go_modules(file_index))
+
+
+def _extract_file(task: tuple[str, str]) -> tuple[str, ModuleImports | None]:
+    path, absolute = task
+    try:
+        text = Path(absolute).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return path, None
+    return path, extract_imports(path, text)
+
+
+def _extract_all(tasks: list[tuple[str, str]], max_workers: int | None) -> Iterable[tuple[str, ModuleImports | None]]:
+    if len(tasks) < PROCESS_POOL_MIN_FILES or max_workers == 1:
+        return [_extract_file(task) for task in tasks]
+    workers = max_workers or min(os.cpu_count() or 1, 8)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_extract_file, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    except (OSError, RuntimeError) as error:
+        # Sandboxes without process support still get a graph, just more slowly
+        logger.debug(f"Module graph: process pool unavailable ({error}); parsing in-process")
+        return [_extract_file(task) for task in tasks]
+
+
+def _go_modules(file_index: FileIndex) -> dict[str, str]:
+    modules: dict[str, str] = {}
+    for entry in file_index.files(include_excluded=True):
+        if entry.name != "go.mod":
+            continue
+        try:
+            match = _GO_MODULE.search(file_index.absolute_path(entry).read_text(encoding="utf-8", errors="replace"))
+        except OSError:
+            continue
+        if match:
+            parent = Path(entry.path).parent.as_posix()
+            modules["" if parent == "." else parent] = match.group(1)
+    return modules
+
+
+def _load_cache(path: Path, root: Path) -> dict[str, tuple[str, ModuleImports]]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION or payload.get("root") != str(root):
+        return {}
+    try:
+        return {
+            str(item["path"]): (
+                str(item["hash"]),
+                ModuleImports(str(item["language"]), tuple(item["imports"]), item.get("package")),
+            )
+            for item in payload.get("files", [])
+        }
+    except (KeyError, TypeError, ValueError):
+        logger.debug(f"Ignoring malformed module graph cache at {path}")
+        return {}
+
+
+def _save_cache(path: Path, root: Path, entries: dict[str, tuple[str, ModuleImports]]) -> None:
+    payload = {
+        "version": CACHE_VERSION,
+        "root": str(root),
+        "files": [
+            {
+                "path": file_path,
+                "hash": digest,
+                "language": extracted.language,
+                "imports": list(extracted.imports),
+                "package": extracted.package,
+            }
+            for file_path, (digest, extracted) in entries.items()
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as stream:
+            json.dump(payload, stream, separators=(",", ":"))
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+__all__ = [
+    "CACHE_VERSION",
+    "DEFAULT_GRAPH_DIRNAME",
+    "MAX_GRAPH_FILE_BYTES",
+    "PROCESS_POOL_MIN_FILES",
+    "default_cache_path",
+    "load_module_graph",
+]
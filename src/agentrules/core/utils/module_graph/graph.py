@@ -0,0 +1,407 @@
+"""Module-level import graph of a project.
+
+Extracted import specifiers are resolved to project modules: Python modules by
+dotted name (relative imports against the importing package), JavaScript and
+TypeScript relative specifiers by path with the usual extension and ``index``
+probes, Go import paths through the ``module`` line of ``go.mod`` to package
+directories, and Java imports by package and class name. Anything else is an
+external dependency. From the edges the graph derives import cycles (strongly
+connected components) and per-directory coupling.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import sys
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+
+from agentrules.core.utils.module_graph.imports import ModuleImports
+
+_JS_PROBES = (
+    "",
+    ".ts",
+    ".tsx",
+    ".js",
+    ".jsx",
+    ".mjs",
+    ".cjs",
+    "/index.ts",
+    "/index.tsx",
+    "/index.js",
+    "/index.jsx",
+)
+_PYTHON_STDLIB = frozenset(sys.stdlib_module_names)
+_SOURCE_ROOTS = frozenset({"src", "lib", "python"})
+
+
+@dataclass(frozen=True)
+class DirectoryCoupling:
+    """Import coupling of one directory's modules with the rest of the project."""
+
+    directory: str
+    modules: int
+    afferent: int
+    """Imports of this directory's modules from modules in other directories."""
+    efferent: int
+    """Imports of other directories' modules from this directory's modules."""
+
+    @property
+    def instability(self) -> float:
+        """``efferent / (afferent + efferent)``: 0 for directories only depended upon, 1 for pure dependents."""
+
+        total = self.afferent + self.efferent
+        return self.efferent / total if total else 0.0
+
+
+@dataclass(frozen=True)
+class ModuleGraph:
+    """
+    Resolved imports between the modules of a project.
+
+    Modules are file paths, except Go packages, which are their directory with a
+    trailing ``/``.
+    """
+
+    modules: tuple[str, ...]
+    languages: Mapping[str, str]
+    edges: Mapping[str, tuple[str, ...]]
+    """Project modules imported by each module."""
+    external: Mapping[str, tuple[str, ...]]
+    """Packages outside the project (standard libraries excluded) imported by each module."""
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(targets) for targets in self.edges.values())
+
+    def importers(self) -> Counter[str]:
+        """Number of modules importing each module."""
+
+        counts: Counter[str] = Counter()
+        for targets in self.edges.values():
+            counts.update(targets)
+        return counts
+
+    def external_packages(self) -> Counter[str]:
+        """Number of modules importing each external package."""
+
+        counts: Counter[str] = Counter()
+        for packages in self.external.values():
+            counts.update(packages)
+        return counts
+
+    def strongly_connected_components(self) -> list[tuple[str, ...]]:
+        """Import cycles: components of two or more modules that import each other, largest first."""
+
+        order = {module: position for position, module in enumerate(self.modules)}
+        cycles = [
+            tuple(sorted(component, key=order.__getitem__))
+            for component in _strongly_connected(self.modules, self.edges)
+            if len(component) > 1
+        ]
+        return sorted(cycles, key=len, reverse=True)
+
+    def directory_coupling(self) -> list[DirectoryCoupling]:
+        """Coupling of each directory containing modules, most coupled first."""
+
+        members: Counter[str] = Counter(_directory(module) for module in self.modules)
+        afferent: Counter[str] = Counter()
+        efferent: Counter[str] = Counter()
+        for source, targets in self.edges.items():
+            source_directory = _directory(source)
+            for target in targets:
+                target_directory = _directory(target)
+                if target_directory != source_directory:
+                    efferent[source_directory] += 1
+                    afferent[target_directory] += 1
+        coupling = [
+            DirectoryCoupling(directory, count, afferent[directory], efferent[directory])
+            for directory, count in members.items()
+        ]
+        return sorted(coupling, key=lambda item: (-(item.afferent + item.efferent), item.directory))
+
+    def summary(self, *, max_items: int = 10) -> str:
+        """Compact text description of the graph for planning prompts."""
+
+        if not self.modules:
+            return "No Python, JavaScript/TypeScript, Go or Java modules found."
+        languages = Counter(self.languages.values())
+        lines = [
+            f"Modules: {len(self.modules)} ("
+            + ", ".join(f"{language} {count}" for language, count in languages.most_common())
+            + f"); internal import edges: {self.edge_count}"
+        ]
+
+        importers = self.importers()
+        if importers:
+            lines.append(
+                "Most imported modules: "
+                + ", ".join(f"{module} ({count})" for module, count in importers.most_common(max_items))
+            )
+
+        cycles = self.strongly_connected_components()
+        lines.append(f"Import cycles: {len(cycles)}")
+        for cycle in cycles[:max_items]:
+            shown = " -> ".join(cycle[:6]) + (" -> ..." if len(cycle) > 6 else "")
+            lines.append(f"- {shown} ({len(cycle)} modules)")
+
+        coupling = [item for item in self.directory_coupling() if item.afferent or item.efferent]
+        if coupling:
+            lines.append("Directory coupling (in = imported by other directories, out = imports of other directories):")
+            for item in coupling[:max_items]:
+                lines.append(
+                    f"- {item.directory or '.'}: {item.modules} modules, in {item.afferent}, out {item.efferent}, "
+                    f"instability {item.instability:.2f}"
+                )
+
+        packages = self.external_packages()
+        if packages:
+            lines.append(
+                "External dependencies: "
+                + ", ".join(f"{package} ({count})" for package, count in packages.most_common(max_items))
+            )
+        return "\n".join(lines)
+
+
+def resolve_module_graph(
+    imports: Mapping[str, ModuleImports],
+    *,
+    go_modules: Mapping[str, str] | None = None,
+) -> ModuleGraph:
+    """
+    Resolve the extracted imports of each file into a module graph.
+
+    Args:
+        imports: Extracted imports keyed by project-relative file path
+        go_modules: Module path declared by each ``go.mod``, keyed by its directory
+
+    Returns:
+        The graph over the files' modules
+    """
+    resolver = _Resolver(imports, go_modules or {})
+    edges: dict[str, dict[str, None]] = defaultdict(dict)
+    external: dict[str, dict[str, None]] = defaultdict(dict)
+    languages: dict[str, str] = {}
+    modules: dict[str, None] = {}
+    for path, extracted in imports.items():
+        module = resolver.module_of(path, extracted.language)
+        modules[module] = None
+        languages[module] = extracted.language
+        for specifier in extracted.imports:
+            targets, package = resolver.resolve(path, extracted, specifier)
+            for target in targets:
+                if target != module:
+                    edges[module][target] = None
+            if not targets and package:
+                external[module][package] = None
+    return ModuleGraph(
+        modules=tuple(modules),
+        languages=languages,
+        edges={module: tuple(targets) for module, targets in edges.items() if targets},
+        external={module: tuple(packages) for module, packages in external.items() if packages},
+    )
+
+
+class _Resolver:
+    def __init__(self, imports: Mapping[str, ModuleImports], go_modules: Mapping[str, str]) -> None:
+        self._files = set(imports)
+        self._python: dict[str, list[str]] = defaultdict(list)
+        self._java: dict[str, list[str]] = defaultdict(list)
+        self._go_packages: set[str] = set()
+        self._go_modules = sorted(go_modules.items(), key=lambda item: -len(item[1]))
+        packages = {
+            _directory(path)
+            for path, extracted in imports.items()
+            if extracted.language == "python" and path.endswith("__init__.py")
+        }
+        for path, extracted in imports.items():
+            if extracted.language == "python":
+                parts = _python_parts(path)
+                for start in _python_roots(path, packages):
+                    self._python[".".join(parts[start:])].append(path)
+            elif extracted.language == "java":
+                class_name = PurePosixPath(path).stem
+                qualified = f"{extracted.package}.{class_name}" if extracted.package else class_name
+                self._java[qualified].append(path)
+            elif extracted.language == "go":
+                self._go_packages.add(_directory(path))
+
+    def module_of(self, path: str, language: str) -> str:
+        return f"{_directory(path) or '.'}/" if language == "go" else path
+
+    def resolve(self, path: str, extracted: ModuleImports, specifier: str) -> tuple[list[str], str | None]:
+        language = extracted.language
+        if language == "python":
+            return self._resolve_python(path, specifier)
+        if language in ("javascript", "typescript"):
+            return self._resolve_js(path, specifier)
+        if language == "go":
+            return self._resolve_go(specifier)
+        if language == "java":
+            return self._resolve_java(specifier)
+        return [], None
+
+    def _resolve_python(self, path: str, specifier: str) -> tuple[list[str], str | None]:
+        base, _, name = specifier.partition(":")
+        level = len(base) - len(base.lstrip("."))
+        module = base[level:]
+        if level:
+            package = _python_parts(path)
+            if not path.endswith("__init__.py"):
+                package = package[:-1]
+            package = package[: max(0, len(package) - (level - 1))]
+            candidates = [".".join(filter(None, (module, name))), module] if name else [module]
+            for candidate in candidates:
+                dotted = ".".join(filter(None, (*package, candidate)))
+                target = self._python_exact(dotted) if dotted else None
+                if target:
+                    return [target], None
+            return [], None
+
+        candidates = [f"{module}.{name}", module] if name else _prefixes(module)
+        for candidate in candidates:
+            matches = self._python.get(candidate)
+            if matches:
+                return [_closest(path, matches)], None
+        top_level = module.split(".", 1)[0]
+        return [], None if top_level in _PYTHON_STDLIB or not top_level else top_level
+
+    def _python_exact(self, dotted: str) -> str | None:
+        relative = dotted.replace(".", "/")
+        for candidate in (f"{relative}.py", f"{relative}/__init__.py"):
+            if candidate in self._files:
+                return candidate
+        return None
+
+    def _resolve_js(self, path: str, specifier: str) -> tuple[list[str], str | None]:
+        if specifier.startswith("."):
+            joined = posixpath.normpath(posixpath.join(_directory(path), specifier))
+            for probe in _JS_PROBES:
+                if f"{joined}{probe}" in self._files:
+                    return [f"{joined}{probe}"], None
+            return [], None
+        if specifier.startswith(("node:", "/")):
+            return [], None
+        parts = specifier.split("/")
+        return [], "/".join(parts[:2]) if specifier.startswith("@") else parts[0]
+
+    def _resolve_go(self, specifier: str) -> tuple[list[str], str | None]:
+        for directory, module_path in self._go_modules:
+            if specifier == module_path or specifier.startswith(f"{module_path}/"):
+                relative = specifier[len(module_path):].strip("/")
+                package = posixpath.normpath(posixpath.join(directory, relative)) if relative else directory
+                package = "" if package == "." else package
+                if package in self._go_packages:
+                    return [f"{package or '.'}/"], None
+                return [], None
+        first = specifier.split("/", 1)[0]
+        # Standard library import paths have no domain in their first element
+        return [], specifier if "." in first else None
+
+    def _resolve_java(self, specifier: str) -> tuple[list[str], str | None]:
+        if specifier.endswith(".*"):
+            package = specifier[:-2]
+            targets = [
+                path
+                for qualified, paths in self._java.items()
+                if qualified.rsplit(".", 1)[0] == package
+                for path in paths
+            ]
+            if targets:
+                return targets, None
+        else:
+            for candidate in _prefixes(specifier):
+                if candidate in self._java:
+                    return list(self._java[candidate]), None
+        if specifier.startswith(("java.", "javax.")):
+            return [], None
+        return [], ".".join(specifier.split(".")[:2])
+
+
+def _python_parts(path: str) -> list[str]:
+    parts = path[: -len(".py")].split("/")
+    return parts[:-1] if parts[-1] == "__init__" else parts
+
+
+def _python_roots(path: str, packages: set[str]) -> set[int]:
+    # A module is importable from the project root, from a src/lib layout root and
+    # from the directory above its outermost package
+    directories = path.split("/")[:-1]
+    roots = {0}
+    if directories and directories[0] in _SOURCE_ROOTS:
+        roots.add(1)
+    start = len(directories)
+    while start > 0 and "/".join(directories[:start]) in packages:
+        start -= 1
+    roots.add(start)
+    return roots
+
+
+def _prefixes(dotted: str) -> list[str]:
+    parts = dotted.split(".")
+    return [".".join(parts[:end]) for end in range(len(parts), 0, -1)]
+
+
+def _closest(path: str, candidates: list[str]) -> str:
+    # A module name present in several roots resolves to the one nearest the importer
+    if len(candidates) == 1:
+        return candidates[0]
+    return max(candidates, key=lambda candidate: (len(posixpath.commonprefix([path, candidate])), -len(candidate)))
+
+
+def _directory(module: str) -> str:
+    if module.endswith("/"):
+        directory = module.rstrip("/")
+        return "" if directory == "." else directory
+    parent = PurePosixPath(module).parent.as_posix()
+    return "" if parent == "." else parent
+
+
+def _strongly_connected(nodes: Iterable[str], edges: Mapping[str, tuple[str, ...]]) -> list[list[str]]:
+    # Iterative Tarjan so deep import chains cannot exhaust the recursion limit
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+        while work:
+            node, children = work[-1]
+            descended = False
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges.get(child, ()))))
+                    descended = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+__all__ = ["DirectoryCoupling", "ModuleGraph", "resolve_module_graph"]
@@ -0,0 +1,114 @@
+"""Extraction of the import statements of source files.
+
+Python is parsed with `ast`; JavaScript/TypeScript (``import``/``export ... from``/
+``require``/dynamic ``import()``), Go (``import`` lines and blocks) and Java
+(``package`` and ``import`` declarations) are matched with regular expressions.
+Specifiers are returned as written; `graph` resolves them to project modules.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+
+LANGUAGE_BY_SUFFIX = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".mts": "typescript",
+    ".cts": "typescript",
+    ".go": "go",
+    ".java": "java",
+}
+
+_PY_FALLBACK = re.compile(r"^\s*(?:from\s+(\.*[\w.]*)\s+import\s+([\w*, ]+)|import\s+([\w., ]+))", re.MULTILINE)
+_JS_SPECIFIER = re.compile(
+    r"""(?:\bimport\s+(?:[\w*{}\s,$]+?\s+from\s+)?|\bexport\s+(?:type\s+)?(?:\*(?:\s+as\s+\w+)?|\{[^}]*\})\s+from\s+"""
+    r"""|\brequire\s*\(\s*|\bimport\s*\(\s*)['"]([^'"\n]+)['"]"""
+)
+_GO_IMPORT_BLOCK = re.compile(r"^import\s*\((.*?)\)", re.MULTILINE | re.DOTALL)
+_GO_IMPORT_LINE = re.compile(r'^import\s+(?:[\w.]+\s+)?"([^"]+)"', re.MULTILINE)
+_GO_SPECIFIER = re.compile(r'"([^"]+)"')
+_JAVA_PACKAGE = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+_JAVA_IMPORT = re.compile(r"^\s*import\s+(?:static\s+)?([\w.]+(?:\.\*)?)\s*;", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class ModuleImports:
+    """
+    Import specifiers of one source file.
+
+    Python ``from a import b`` is recorded as ``a:b`` (module ``a.b`` if it exists,
+    otherwise ``a``), with relative imports keeping their leading dots. Java files
+    also record their ``package``.
+    """
+
+    language: str
+    imports: tuple[str, ...] = ()
+    package: str | None = None
+
+
+def language_for(path: str) -> str | None:
+    """Graph language of ``path``, or ``None`` when imports are not extracted for it."""
+
+    return LANGUAGE_BY_SUFFIX.get(PurePosixPath(path).suffix.lower())
+
+
+def extract_imports(path: str, text: str) -> ModuleImports | None:
+    """Import specifiers of ``text``, read from ``path``; ``None`` for unsupported languages."""
+
+    language = language_for(path)
+    if language == "python":
+        return ModuleImports(language, _python_imports(text))
+    if language in ("javascript", "typescript"):
+        return ModuleImports(language, _unique(_JS_SPECIFIER.findall(text)))
+    if language == "go":
+        specifiers = _GO_IMPORT_LINE.findall(text)
+        for block in _GO_IMPORT_BLOCK.findall(text):
+            specifiers.extend(_GO_SPECIFIER.findall(block))
+        return ModuleImports(language, _unique(specifiers))
+    if language == "java":
+        package = _JAVA_PACKAGE.search(text)
+        return ModuleImports(language, _unique(_JAVA_IMPORT.findall(text)), package.group(1) if package else None)
+    return None
+
+
+def _python_imports(text: str) -> tuple[str, ...]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return _python_imports_fallback(text)
+    specifiers: list[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            specifiers.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = "." * node.level + (node.module or "")
+            specifiers.extend(base if alias.name == "*" else f"{base}:{alias.name}" for alias in node.names)
+    return _unique(specifiers)
+
+
+def _python_imports_fallback(text: str) -> tuple[str, ...]:
+    # Files that do not parse (e.g. Python 2) still contribute their import lines
+    specifiers: list[str] = []
+    for base, names, modules in _PY_FALLBACK.findall(text):
+        if base:
+            specifiers.extend(
+                base if name.strip() == "*" else f"{base}:{name.strip()}" for name in names.split(",") if name.strip()
+            )
+        else:
+            specifiers.extend(module.strip().split(" ")[0] for module in modules.split(",") if module.strip())
+    return _unique(specifiers)
+
+
+def _unique(values: list[str]) -> tuple[str, ...]:
+    return tuple(dict.fromkeys(value.strip() for value in values if value.strip()))
+
+
+__all__ = ["LANGUAGE_BY_SUFFIX", "ModuleImports", "extract_imports", "language_for"]
@@ -0,0 +1,439 @@
+"""Structural outlines of source files.
+
+An outline keeps what an agent needs to understand a module's shape (imports,
+class and function signatures, decorators, docstrings and top-level constants)
+and elides the bodies. Python is outlined with the stdlib `ast`; JavaScript and
+TypeScript with a small brace-matching tokenizer that understands strings,
+template literals, comments and regex literals well enough to find the bodies.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from pathlib import PurePosixPath
+
+PYTHON_EXTENSIONS = frozenset({".py", ".pyi"})
+SCRIPT_EXTENSIONS = frozenset({".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".mts", ".cts"})
+
+MAX_DOCSTRING_LINES = 12
+MAX_COMMENT_LINES = 12
+MAX_STATEMENT_CHARS = 160
+ELIDED_BODY = "..."
+
+
+def supports_outline(path: str) -> bool:
+    """Whether ``path`` has a language the outliner understands."""
+
+    suffix = PurePosixPath(path).suffix.lower()
+    return suffix in PYTHON_EXTENSIONS or suffix in SCRIPT_EXTENSIONS
+
+
+def outline_source(path: str, text: str) -> str | None:
+    """
+    Outline ``text`` based on the language implied by ``path``.
+
+    Args:
+        path: File path, used to pick the language
+        text: Source code
+
+    Returns:
+        The outline with a header comment, or ``None`` when the language is not
+        supported, the source cannot be parsed, or the outline would not be smaller
+    """
+    suffix = PurePosixPath(path).suffix.lower()
+    if suffix in PYTHON_EXTENSIONS:
+        body, comment = outline_python(text), "#"
+    elif suffix in SCRIPT_EXTENSIONS:
+        body, comment = outline_script(text), "//"
+    else:
+        return None
+    if body is None:
+        return None
+    total = text.count("\n") + 1
+    header = f"{comment} outline: bodies elided ({body.count(chr(10)) + 1} of {total} lines shown)"
+    outlined = f"{header}\n{body}"
+    return outlined if len(outlined) < len(text) else None
+
+
+# ====================================================
+# Python
+# ====================================================
+
+
+def outline_python(source: str) -> str | None:
+    """Outline Python ``source``; ``None`` when it does not parse."""
+
+    try:
+        module = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    lines: list[str] = []
+    _render_statements(module.body, 0, lines, docstring_owner=module)
+    return "\n".join(lines).strip("\n")
+
+
+def _render_statements(
+    body: list[ast.stmt],
+    indent: int,
+    lines: list[str],
+    *,
+    docstring_owner: ast.AST | None = None,
+) -> None:
+    pad = " " * indent
+    if docstring_owner is not None and ast.get_docstring(docstring_owner) is not None:
+        _render_docstring(docstring_owner, indent, lines)
+        body = body[1:]
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            _render_function(node, indent, lines)
+        elif isinstance(node, ast.ClassDef):
+            _render_class(node, indent, lines)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            lines.append(pad + ast.unparse(node))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            lines.append(pad + _render_assignment(node))
+        elif isinstance(node, ast.If):
+            _render_block(f"if {ast.unparse(node.test)}:", node.body, indent, lines)
+            if node.orelse:
+                _render_block("else:", node.orelse, indent, lines)
+        elif isinstance(node, ast.Try):
+            _render_block("try:", node.body, indent, lines)
+            for handler in node.handlers:
+                caught = f" {ast.unparse(handler.type)}" if handler.type is not None else ""
+                alias = f" as {handler.name}" if handler.name else ""
+                _render_block(f"except{caught}{alias}:", handler.body, indent, lines)
+            if node.finalbody:
+                _render_block("finally:", node.finalbody, indent, lines)
+
+
+def _render_block(header: str, body: list[ast.stmt], indent: int, lines: list[str]) -> None:
+    lines.append(" " * indent + header)
+    start = len(lines)
+    _render_statements(body, indent + 4, lines)
+    if len(lines) == start:
+        lines.append(" " * (indent + 4) + ELIDED_BODY)
+
+
+_Definition = ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef
+
+
+def _render_decorators(node: _Definition, indent: int, lines: list[str]) -> None:
+    for decorator in node.decorator_list:
+        lines.append(" " * indent + "@" + ast.unparse(decorator))
+
+
+def _render_function(node: ast.FunctionDef | ast.AsyncFunctionDef, indent: int, lines: list[str]) -> None:
+    if lines and indent == 0:
+        lines.append("")
+    _render_decorators(node, indent, lines)
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+    lines.append(f"{' ' * indent}{prefix} {node.name}({ast.unparse(node.args)}){returns}:")
+    if ast.get_docstring(node) is not None:
+        _render_docstring(node, indent + 4, lines)
+    lines.append(" " * (indent + 4) + ELIDED_BODY)
+
+
+def _render_class(node: ast.ClassDef, indent: int, lines: list[str]) -> None:
+    if lines and indent == 0:
+        lines.append("")
+    _render_decorators(node, indent, lines)
+    bases = [ast.unparse(base) for base in node.bases]
+    for keyword in node.keywords:
+        value = ast.unparse(keyword.value)
+        bases.append(f"{keyword.arg}={value}" if keyword.arg else f"**{value}")
+    signature = f"({', '.join(bases)})" if bases else ""
+    lines.append(f"{' ' * indent}class {node.name}{signature}:")
+    start = len(lines)
+    _render_statements(node.body, indent + 4, lines, docstring_owner=node)
+    if len(lines) == start:
+        lines.append(" " * (indent + 4) + ELIDED_BODY)
+
+
+def _render_assignment(node: ast.Assign | ast.AnnAssign | ast.AugAssign) -> str:
+    text = ast.unparse(node)
+    if len(text) <= MAX_STATEMENT_CHARS and "\n" not in text:
+        return text
+    if isinstance(node, ast.Assign):
+        return " = ".join(ast.unparse(target) for target in node.targets) + " = " + ELIDED_BODY
+    if isinstance(node, ast.AnnAssign):
+        return f"{ast.unparse(node.target)}: {ast.unparse(node.annotation)} = {ELIDED_BODY}"
+    return f"{ast.unparse(node.target)} {_AUGMENTED_OPERATORS.get(type(node.op), '?')}= {ELIDED_BODY}"
+
+
+_AUGMENTED_OPERATORS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.BitOr: "|", ast.BitAnd: "&"}
+
+
+def _render_docstring(node: ast.AST, indent: int, lines: list[str]) -> None:
+    docstring = ast.get_docstring(node) or ""
+    doc_lines = docstring.replace('"""', '\\"\\"\\"').splitlines() or [""]
+    if len(doc_lines) > MAX_DOCSTRING_LINES:
+        doc_lines = [*doc_lines[:MAX_DOCSTRING_LINES], ELIDED_BODY]
+    pad = " " * indent
+    if len(doc_lines) == 1:
+        lines.append(f'{pad}"""{doc_lines[0]}"""')
+        return
+    lines.append(f'{pad}"""{doc_lines[0]}')
+    lines.extend(f"{pad}{line}" if line else "" for line in doc_lines[1:])
+    lines.append(f'{pad}"""')
+
+
+# ====================================================
+# JavaScript / TypeScript
+# ====================================================
+
+# Keyword that decides how a brace opened after it is treated; the last match before the brace wins
+_BRACE_OWNER = re.compile(
+    r"\b(?P<keep>class|namespace|module|global)\b"
+    r"|\b(?P<type>interface|enum)\b|(?P<alias>\btype\s+[A-Za-z_$][\w$]*\s*(?:<[^=]*>)?\s*=)"
+    r"|^\s*(?P<names>import\b|export(?:\s+type)?\s*$)"
+    r"|\b(?P<body>function|const|let|var|return|if|else|for|while|do|switch|try|catch|finally)\b"
+)
+_REGEX_PRECEDERS = frozenset("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORD_TAIL = re.compile(r"(?:^|[^\w$])(?:return|typeof|case|do|else|in|of|void|yield|await)\s*$")
+
+
+def outline_script(source: str) -> str:
+    """
+    Outline JavaScript or TypeScript ``source``.
+
+    Top-level statements, imports and class/interface/enum members are kept;
+    function, method and object-literal bodies collapse to ``{ ... }``.
+    """
+    return _ScriptOutliner(source).run()
+
+
+class _ScriptOutliner:
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.position = 0
+        # Open braces: "keep" (class or namespace), "type", "body" (elided) or "template"
+        self.stack: list[str] = []
+        self.elided_at: int | None = None
+        self.header: list[str] = []
+        self.paren_depth = 0
+        self.last_code = ""
+        self.line: list[str] = []
+        self.lines: list[str] = []
+
+    def run(self) -> str:
+        source = self.source
+        length = len(source)
+        while self.position < length:
+            char = source[self.position]
+            if char == "\n":
+                self._newline()
+            elif source.startswith("//", self.position):
+                self._copy(self._until("\n", self.position + 2, inclusive=False))
+            elif source.startswith("/*", self.position):
+                self._block_comment()
+            elif char in "'\"":
+                self._copy(self._string_end(char), code=True)
+            elif char == "`":
+                self._template()
+            elif char == "/" and self._regex_allowed():
+                self._copy(self._regex_end(), code=True)
+            elif char == "{":
+                self._open_brace()
+            elif char == "}":
+                self._close_brace()
+            else:
+                self._code(char)
+                self.position += 1
+        self._newline()
+        lines = [line for index, line in enumerate(self.lines) if line or (index and self.lines[index - 1])]
+        return "\n".join(lines).strip("\n")
+
+    # -- output ---------------------------------------------------------
+    def _emit(self, text: str) -> None:
+        if self.elided_at is None:
+            self.line.append(text)
+
+    def _code(self, char: str) -> None:
+        self._emit(char)
+        if char == "(":
+            self.paren_depth += 1
+        elif char == ")":
+            self.paren_depth = max(0, self.paren_depth - 1)
+        elif char == ";" and not self.paren_depth:
+            self.header.clear()
+            self.last_code = char
+            return
+        self.header.append(char)
+        if not char.isspace():
+            self.last_code = char
+
+    def _copy(self, end: int, *, code: bool = False) -> None:
+        text = self.source[self.position:end]
+        self._emit(text)
+        if code:
+            # Literal contents must not look like keywords when classifying the next brace
+            self.header.append('""')
+            self.last_code = text[-1:] or self.last_code
+        self.position = end
+
+    def _newline(self) -> None:
+        self.position += 1
+        if self.header:
+            self.header.append(" ")
+        # A statement elided across lines stays on its opening line
+        if self.elided_at is not None:
+            return
+        self.lines.append("".join(self.line).rstrip())
+        self.line = []
+
+    # -- braces ---------------------------------------------------------
+    def _open_brace(self) -> None:
+        self.position += 1
+        parent = self.stack[-1] if self.stack else "keep"
+        if self.elided_at is not None:
+            kind = "body"
+        elif parent == "type":
+            kind = "type"
+        else:
+            kind = self._classify("".join(self.header))
+        self.stack.append(kind)
+        self.header.clear()
+        self.last_code = "{"
+        if kind == "body" and self.elided_at is None:
+            self._emit("{ " + ELIDED_BODY + " }")
+            self.elided_at = len(self.stack)
+        else:
+            self._emit("{")
+
+    def _close_brace(self) -> None:
+        self.position += 1
+        kind = self.stack.pop() if self.stack else "keep"
+        if kind == "template" and self.elided_at is None:
+            self._emit("}")
+            self._template(resume=True)
+            return
+        if kind == "template":
+            self._template(resume=True)
+            return
+        if self.elided_at is not None and len(self.stack) < self.elided_at:
+            self.elided_at = None
+        else:
+            self._emit("}")
+        self.header.clear()
+        self.last_code = "}"
+
+    @staticmethod
+    def _classify(header: str) -> str:
+        owner = None
+        for match in _BRACE_OWNER.finditer(header):
+            owner = match.lastgroup
+        if owner == "keep":
+            return "keep"
+        if owner in {"type", "alias", "names"}:
+            return "type"
+        return "body"
+
+    # -- literals -------------------------------------------------------
+    def _until(self, terminator: str, start: int, *, inclusive: bool = True) -> int:
+        end = self.source.find(terminator, start)
+        if end == -1:
+            return len(self.source)
+        return end + len(terminator) if inclusive else end
+
+    def _block_comment(self) -> None:
+        end = self._until("*/", self.position + 2)
+        text = self.source[self.position:end]
+        comment_lines = text.split("\n")
+        if len(comment_lines) > MAX_COMMENT_LINES:
+            text = "\n".join([*comment_lines[:MAX_COMMENT_LINES], " * " + ELIDED_BODY, " */"])
+        if self.elided_at is None:
+            for index, part in enumerate(text.split("\n")):
+                if index:
+                    self.lines.append("".join(self.line).rstrip())
+                    self.line = []
+                self.line.append(part)
+        self.position = end
+
+    def _string_end(self, quote: str) -> int:
+        source = self.source
+        index = self.position + 1
+        while index < len(source):
+            char = source[index]
+            if char == "\\":
+                index += 2
+                continue
+            if char == quote:
+                return index + 1
+            if char == "\n":
+                # Unterminated string; stop at the line end so one stray quote cannot swallow the file
+                return index
+            index += 1
+        return len(source)
+
+    def _template(self, *, resume: bool = False) -> None:
+        source = self.source
+        start = self.position
+        index = start if resume else start + 1
+        while index < len(source):
+            char = source[index]
+            if char == "\\":
+                index += 2
+                continue
+            if char == "`":
+                index += 1
+                break
+            if source.startswith("${", index):
+                self._emit_text(source[start:index + 2])
+                self.stack.append("template")
+                self.position = index + 2
+                return
+            index += 1
+        self._emit_text(source[start:index])
+        self.header.append("``")
+        self.last_code = "`"
+        self.position = index
+
+    def _emit_text(self, text: str) -> None:
+        if self.elided_at is not None:
+            return
+        parts = text.split("\n")
+        for index, part in enumerate(parts):
+            if index:
+                self.lines.append("".join(self.line))
+                self.line = []
+            self.line.append(part)
+
+    def _regex_allowed(self) -> bool:
+        if not self.last_code or self.last_code in _REGEX_PRECEDERS:
+            return True
+        return _REGEX_KEYWORD_TAIL.search("".join(self.header[-12:])) is not None
+
+    def _regex_end(self) -> int:
+        source = self.source
+        index = self.position + 1
+        in_class = False
+        while index < len(source):
+            char = source[index]
+            if char == "\\":
+                index += 2
+                continue
+            if char == "\n":
+                return index
+            if char == "[":
+                in_class = True
+            elif char == "]":
+                in_class = False
+            elif char == "/" and not in_class:
+                index += 1
+                while index < len(source) and (source[index].isalnum() or source[index] in "_$"):
+                    index += 1
+                return index
+            index += 1
+        return len(source)
+
+
+__all__ = [
+    "PYTHON_EXTENSIONS",
+    "SCRIPT_EXTENSIONS",
+    "outline_python",
+    "outline_script",
+    "outline_source",
+    "supports_outline",
+]
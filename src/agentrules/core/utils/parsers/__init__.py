@@ -1,6 +1,12 @@
-from .agent_parser import get_agent_file_mapping, get_all_file_assignments, parse_agents_from_phase2
+from .agent_parser import (
+    IncrementalAgentParser,
+    get_agent_file_mapping,
+    get_all_file_assignments,
+    parse_agents_from_phase2,
+)
 
 __all__ = [
+    "IncrementalAgentParser",
     "parse_agents_from_phase2",
     "get_agent_file_mapping",
     "get_all_file_assignments",
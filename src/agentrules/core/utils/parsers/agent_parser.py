@@ -17,7 +17,10 @@ import json
 import logging
 import re
 import xml.etree.ElementTree as ET
-from typing import Any
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+from xml.sax.saxutils import unescape
 
 # ====================================================
 # Initialize Logger
@@ -32,6 +35,7 @@ logger = logging.getLogger("project_extractor")
 DESCRIPTION_TAG = "description"
 FILE_ASSIGNMENTS_TAG = "file_assignments"
 FILE_PATH_TAG = "file_path"
+GROUPS_TAG = "groups"
 NAME_TAG = "name"
 EXPERTISE_TAG = "expertise"
 RESPONSIBILITIES_TAG = "responsibilities"
@@ -39,6 +43,35 @@ RESPONSIBILITY_TAG = "responsibility"
 REASONING_TAG = "reasoning"
 ANALYSIS_PLAN_TAG = "analysis_plan"
 
+# ====================================================
+# Compiled Patterns
+# Compiled once; every pass over the plan text is linear in its length.
+# ====================================================
+
+# Any opening or closing tag; the attribute text may be malformed
+_TAG_PATTERN = re.compile(r"<(/?)([A-Za-z_][\w.-]*)([^<>]*)>")
+_AGENT_ID_PATTERN = re.compile(r"agent_\d+")
+# One attribute, quoted or not; a quoted value runs to the quote that ends the attribute,
+# so quotes inside it are kept instead of ending the value early
+_ATTRIBUTE_PATTERN = re.compile(
+    r"""([\w-]+)\s*=\s*(?:"(.*?)"|([^"\s][^=]*?))(?=\s+[\w-]+\s*=|\s*/?\s*$)""",
+    re.DOTALL,
+)
+_LIST_SEPARATOR = re.compile(r"[,\s]+")
+
+_FOUR_BACKTICK_BLOCK = re.compile(r"````(?:xml|)\s*\n?(.*?)```", re.DOTALL)
+_THREE_BACKTICK_BLOCK = re.compile(r"```(?:xml|)\s*\n?(.*?)```", re.DOTALL)
+_CODE_FENCE = re.compile(r"```(?:xml|)?\s*\n?")
+
+_REASONING_THEN_PLAN = re.compile(r"^\s*<reasoning>.*?</reasoning>\s*<analysis_plan>", re.DOTALL)
+_PLAN_BLOCK = re.compile(r"<analysis_plan>(.*?)</analysis_plan>", re.DOTALL)
+_AGENT_BLOCK = re.compile(r"<agent_\d+.*?>.*?</agent_\d+>", re.DOTALL)
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_AGENT_NAME_SHORTHAND = re.compile(r'<(agent_\d+)="([^"]*)">')
+_BARE_AMPERSAND = re.compile(r"&(?!amp;|lt;|gt;|quot;|apos;)")
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
+
 # ====================================================
 # Helper Functions
 # ====================================================
@@ -87,13 +120,13 @@ def extract_from_markdown_block(content: str) -> str:
         str: Content with markdown formatting removed
     """
     # Case 1: Four backticks format (````xml)
-    four_backticks = re.search(r'````(?:xml|)\s*\n?(.*?)```', content, re.DOTALL)
+    four_backticks = _FOUR_BACKTICK_BLOCK.search(content)
     if four_backticks:
         logger.debug("Extracted content from four-backtick format")
         return four_backticks.group(1).strip()
 
     # Case 2: Standard markdown block (```xml)
-    three_backticks = re.search(r'```(?:xml|)\s*\n?(.*?)```', content, re.DOTALL)
+    three_backticks = _THREE_BACKTICK_BLOCK.search(content)
     if three_backticks:
         logger.debug("Extracted content from three-backtick format")
         return three_backticks.group(1).strip()
@@ -101,7 +134,7 @@ def extract_from_markdown_block(content: str) -> str:
     # Case 3: Multiple code blocks or incomplete blocks
     if '```' in content:
         logger.debug("Cleaning up multiple markdown code blocks")
-        cleaned = re.sub(r'```(?:xml|)?\s*\n?', '', content)
+        cleaned = _CODE_FENCE.sub('', content)
         cleaned = cleaned.replace('```', '')
         return cleaned.strip()
 
@@ -119,36 +152,25 @@ def extract_xml_content(content: str) -> str:
         str: Properly formatted XML content
     """
     # Check if we have both reasoning and analysis_plan tags at the root level
-    if re.search(r'^\s*<reasoning>.*?</reasoning>\s*<analysis_plan>', content, re.DOTALL):
+    if _REASONING_THEN_PLAN.search(content):
         logger.info("Found both reasoning and analysis_plan tags, wrapping in root element")
         # Clean up empty lines and normalize spacing to avoid parsing issues
-        cleaned_content = re.sub(r'\n\s*\n', '\n', content)
+        cleaned_content = _BLANK_LINES.sub('\n', content)
         return f"<root>{cleaned_content}</root>"
 
     # Try to find <analysis_plan> tags
-    plan_match = re.search(r'<analysis_plan>(.*?)</analysis_plan>', content, re.DOTALL)
-
-    # If not found, check for <reasoning> followed by <analysis_plan>
-    if not plan_match:
-        reasoning_and_plan = re.search(
-            r'<reasoning>.*?</reasoning>.*?<analysis_plan>(.*?)</analysis_plan>',
-            content, re.DOTALL
-        )
-        if reasoning_and_plan:
-            logger.info("Found analysis_plan after reasoning tag")
-            return reasoning_and_plan.group(1).strip()
-        else:
-            # If still not found, look for agent tags directly
-            agent_matches = re.findall(r'<agent_\d+.*?>.*?</agent_\d+>', content, re.DOTALL)
-            if agent_matches:
-                logger.info("Extracted agent definitions without analysis_plan wrapper")
-                return "\n".join(agent_matches)
-            else:
-                logger.error("Could not find any valid agent definitions")
-                return ""
-    else:
+    plan_match = _PLAN_BLOCK.search(content)
+    if plan_match:
         return plan_match.group(1).strip()
 
+    # If not found, look for agent tags directly
+    agent_matches = _AGENT_BLOCK.findall(content)
+    if agent_matches:
+        logger.info("Extracted agent definitions without analysis_plan wrapper")
+        return "\n".join(agent_matches)
+    logger.error("Could not find any valid agent definitions")
+    return ""
+
 def clean_and_fix_xml(xml_content: str) -> str:
     """
     Clean and fix common XML issues.
@@ -163,28 +185,21 @@ def clean_and_fix_xml(xml_content: str) -> str:
         return "<analysis_plan></analysis_plan>"
 
     # Remove excessive whitespace and normalize newlines
-    xml_content = re.sub(r'\n\s*\n', '\n', xml_content)
+    xml_content = _BLANK_LINES.sub('\n', xml_content)
 
     # Fix non-standard attribute format in agent tags
     # Replace <agent_1="Name"> with <agent_1 name="Name">
-    fixed_content = re.sub(r'<(agent_\d+)="([^"]*)">', r'<\1 name="\2">', xml_content)
+    fixed_content = _AGENT_NAME_SHORTHAND.sub(r'<\1 name="\2">', xml_content)
 
     # Escape any potentially problematic characters in content between tags
-    fixed_content = re.sub(r'&(?!amp;|lt;|gt;|quot;|apos;)', '&amp;', fixed_content)
-
-    # Replace any double quotes inside attribute values that are already in double quotes
-    # This is a common issue with model-generated XML
-    # Look for patterns like name="This is a "quoted" word"
-    quote_pattern = r'(\w+)="([^"]*)"([^"]*)"([^"]*)"'
-    while re.search(quote_pattern, fixed_content):
-        fixed_content = re.sub(quote_pattern, r'\1="\2\'\3\'\4"', fixed_content)
+    fixed_content = _BARE_AMPERSAND.sub('&amp;', fixed_content)
 
-    # Fix missing quotes in attribute values
-    # Look for patterns like name=Some Value> and change to name="Some Value">
-    fixed_content = re.sub(r'(\w+)=([^"][^ >]*)([ >])', r'\1="\2"\3', fixed_content)
+    # Quote attribute values in a single pass over the tags: name="A "quoted" word"
+    # becomes name="A 'quoted' word" and name=Some Value becomes name="Some Value"
+    fixed_content = _TAG_PATTERN.sub(_fix_tag_attributes, fixed_content)
 
     # Remove any invalid XML characters
-    fixed_content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', fixed_content)
+    fixed_content = _INVALID_XML_CHARS.sub('', fixed_content)
 
     # Wrap in a root element if not already present
     if fixed_content.strip().startswith('<root>'):
@@ -194,6 +209,174 @@ def clean_and_fix_xml(xml_content: str) -> str:
 
     return fixed_content
 
+def _fix_tag_attributes(match: re.Match[str]) -> str:
+    """Rewrite the attributes of one tag matched by `_TAG_PATTERN` as well-formed XML."""
+    slash, tag, attributes = match.groups()
+    if not attributes.strip() or slash:
+        return match.group(0)
+    fixed = _ATTRIBUTE_PATTERN.sub(
+        lambda attribute: f'{attribute.group(1)}="{_attribute_value(attribute)}"', attributes.rstrip()
+    )
+    return f"<{tag}{fixed}>"
+
+def _attribute_value(attribute: re.Match[str]) -> str:
+    value = attribute.group(2) if attribute.group(2) is not None else attribute.group(3).strip()
+    return value.replace('"', "'")
+
+# ====================================================
+# Tag Tokenizer
+# A single forward pass over the plan text, tolerant of the malformed XML
+# models produce (bare ampersands, quotes inside attributes, missing closing tags).
+# ====================================================
+
+class PlanTag(NamedTuple):
+    """A tag found in the plan text, with its offsets."""
+
+    name: str
+    closing: bool
+    attributes: str
+    start: int
+    end: int
+
+def tokenize_plan(content: str) -> Iterator[PlanTag]:
+    """
+    Yield the tags of a plan in document order.
+
+    Args:
+        content: Raw plan text
+
+    Returns:
+        Iterator[PlanTag]: Opening and closing tags; the text between them is
+        recovered from the offsets
+    """
+    for match in _TAG_PATTERN.finditer(content):
+        yield PlanTag(match.group(2), bool(match.group(1)), match.group(3), match.start(), match.end())
+
+_TEXT_TAGS = frozenset({NAME_TAG, DESCRIPTION_TAG, EXPERTISE_TAG, RESPONSIBILITY_TAG, FILE_PATH_TAG, GROUPS_TAG})
+# Tags that end a text element whose closing tag is missing
+_STRUCTURE_TAGS = _TEXT_TAGS | {FILE_ASSIGNMENTS_TAG, RESPONSIBILITIES_TAG, ANALYSIS_PLAN_TAG, REASONING_TAG}
+
+@dataclass
+class PlanScan:
+    """Everything a single pass over a plan recovers."""
+
+    agents: list[dict] = field(default_factory=list)
+    assigned_files: list[str] = field(default_factory=list)
+    loose_files: list[str] = field(default_factory=list)
+
+def scan_agent_plan(content: str) -> PlanScan:
+    """
+    Extract agent definitions from plan text in one pass over its tags.
+
+    Agents inside ``<analysis_plan>`` are preferred; without one, every
+    ``<agent_N>`` block is used. An agent missing its closing tag ends at the
+    next agent or at the end of the plan.
+
+    Args:
+        content: Raw plan text, with or without a reasoning preamble
+
+    Returns:
+        PlanScan: The agents, plus file paths found outside any agent for the
+        last-resort fallbacks
+    """
+    scan = PlanScan()
+    plan_agents: list[dict] = []
+    loose_agents: list[dict] = []
+    in_plan = False
+    in_assignments = False
+    agent: dict | None = None
+    agent_in_plan = False
+    text_tag: str | None = None
+    text_start = 0
+
+    def close_agent() -> None:
+        nonlocal agent
+        if agent is None:
+            return
+        if not agent["name"]:
+            agent["name"] = agent["id"].replace("_", " ").title()
+        (plan_agents if agent_in_plan else loose_agents).append(agent)
+        agent = None
+
+    for tag in tokenize_plan(content):
+        if text_tag is not None:
+            if tag.name not in _STRUCTURE_TAGS and not _AGENT_ID_PATTERN.fullmatch(tag.name):
+                continue  # Markup inside a text element is part of its text
+            _store_text(scan, agent, text_tag, content[text_start:tag.start], in_assignments)
+            ends_text = tag.closing and tag.name == text_tag
+            text_tag = None
+            if ends_text:
+                continue
+
+        if _AGENT_ID_PATTERN.fullmatch(tag.name):
+            if tag.closing:
+                if agent is not None and agent["id"] == tag.name:
+                    close_agent()
+                continue
+            close_agent()
+            agent = _new_agent(tag.name, tag.attributes)
+            agent_in_plan = in_plan
+        elif tag.name == ANALYSIS_PLAN_TAG:
+            if tag.closing:
+                close_agent()
+            in_plan = not tag.closing
+        elif tag.name == FILE_ASSIGNMENTS_TAG:
+            in_assignments = not tag.closing
+        elif tag.name in _TEXT_TAGS and not tag.closing and not tag.attributes.rstrip().endswith("/"):
+            text_tag = tag.name
+            text_start = tag.end
+    close_agent()
+
+    scan.agents = plan_agents or loose_agents
+    return scan
+
+def _new_agent(agent_id: str, attributes: str) -> dict:
+    name = ""
+    attributes = attributes.strip()
+    if attributes.startswith("="):
+        # <agent_1="Name"> shorthand
+        attributes = f"name{attributes}"
+    for attribute in _ATTRIBUTE_PATTERN.finditer(attributes):
+        if attribute.group(1) == "name":
+            name = _clean_text(_attribute_value(attribute))
+            break
+    return {
+        "id": agent_id,
+        "name": name,
+        "description": "",
+        "expertise": [],
+        "responsibilities": [],
+        "file_assignments": [],
+    }
+
+def _store_text(scan: PlanScan, agent: dict | None, tag: str, raw: str, in_assignments: bool) -> None:
+    text = _clean_text(raw)
+    if tag == FILE_PATH_TAG:
+        if not text:
+            return
+        if agent is not None:
+            agent["file_assignments"].append(text)
+        elif in_assignments:
+            scan.assigned_files.append(text)
+        else:
+            scan.loose_files.append(text)
+        return
+    if agent is None or not text:
+        return
+    if tag == NAME_TAG:
+        agent["name"] = agent["name"] or text
+    elif tag == DESCRIPTION_TAG:
+        agent["description"] = agent["description"] or text
+    elif tag == EXPERTISE_TAG:
+        agent["expertise"] = [exp.strip() for exp in text.split(',')]
+    elif tag == RESPONSIBILITY_TAG:
+        agent["responsibilities"].append(text)
+    elif tag == GROUPS_TAG:
+        agent["groups"] = [group for group in _LIST_SEPARATOR.split(text) if group]
+
+def _clean_text(raw: str) -> str:
+    return unescape(_TAG_PATTERN.sub("", raw), {"&quot;": '"', "&apos;": "'"}).strip()
+
 # ====================================================
 # Main Parser Functions
 # ====================================================
@@ -254,11 +437,16 @@ def parse_agent_definition(agent_element: ET.Element) -> dict:
             if file_path_elem.text and file_path_elem.text.strip():
                 agent_info["file_assignments"].append(file_path_elem.text.strip())
 
+    # Get pre-clustered file groups (clustered planning only)
+    groups_elem = agent_element.find(GROUPS_TAG)
+    if groups_elem is not None and groups_elem.text:
+        agent_info["groups"] = [group.strip() for group in re.split(r"[,\s]+", groups_elem.text) if group.strip()]
+
     return agent_info
 
 def extract_agent_fallback(content: str) -> list[dict]:
     """
-    Extract agent definitions using regex as a fallback when XML parsing fails.
+    Extract agent definitions, falling back to catch-all agents when none are defined.
 
     Args:
         content: Raw text containing agent definitions
@@ -266,131 +454,34 @@ def extract_agent_fallback(content: str) -> list[dict]:
     Returns:
         List[Dict]: List of agent definitions
     """
-    agents = []
-
-    # Try to extract full analysis_plan section
-    plan_match = re.search(r'<analysis_plan>(.*?)</analysis_plan>', content, re.DOTALL)
-    if plan_match:
-        logger.info("Found analysis_plan section in fallback extraction")
-        content = plan_match.group(1)
-
-    # Find all file assignment blocks
-    assignment_blocks = re.findall(r'<file_assignments>(.*?)</file_assignments>', content, re.DOTALL)
-
-    # Try to extract agent blocks with full details
-    agent_block_pattern = (
-        r'<agent_(\d+)[^>]*>.*?<description>(.*?)</description>'
-        r'.*?<file_assignments>(.*?)</file_assignments>'
-    )
-    agent_blocks = re.findall(agent_block_pattern, content, re.DOTALL)
-
-    if agent_blocks:
-        logger.info(f"Found {len(agent_blocks)} complete agent blocks")
-        for num, desc, files_section in agent_blocks:
-            agent_id = f"agent_{num}"
-
-            # Try to find the agent name
-            name_match = re.search(rf'<{agent_id}[^>]*name="([^"]*)"', content)
-            if name_match:
-                agent_name = name_match.group(1)
-            else:
-                name_tag_match = re.search(rf'<{agent_id}[^>]*>.*?<name>(.*?)</name>', content, re.DOTALL)
-                if name_tag_match:
-                    agent_name = name_tag_match.group(1).strip()
-                else:
-                    # Extract name from description if not found otherwise
-                    name_from_desc = re.search(r'^([^\.,:]+)', desc.strip())
-                    agent_name = name_from_desc.group(1).strip() if name_from_desc else f"Agent {num}"
-
-            # Extract files
-            file_paths = re.findall(r'<file_path>(.*?)</file_path>', files_section, re.DOTALL)
-            file_paths = [path.strip() for path in file_paths if path.strip()]
-
-            agent_info = {
-                "id": agent_id,
-                "name": agent_name.replace("&amp;", "and"),
-                "description": desc.strip().replace("&amp;", "and"),
-                "expertise": [],
-                "responsibilities": [],
-                "file_assignments": file_paths
-            }
-
-            agents.append(agent_info)
-
-        if agents:
-            return agents
-
-    # If no complete blocks found, try simpler extraction
-    agent_matches = re.findall(r'<(agent_\d+)\s+name="([^"]*)"', content, re.DOTALL)
-
-    # If not found, look for agent tags and try to find names inside
-    if not agent_matches:
-        agent_ids = re.findall(r'<(agent_\d+)[^>]*>', content, re.DOTALL)
-        agent_matches = []
-
-        for agent_id in agent_ids:
-            name_pattern = f'<{agent_id}[^>]*>.*?<name>(.*?)</name>'
-            name_match = re.search(name_pattern, content, re.DOTALL)
-            name = name_match.group(1).strip() if name_match else f"Agent {agent_id.split('_')[1]}"
-            agent_matches.append((agent_id, name))
-
-    # Process the matches if found
-    if agent_matches:
-        for i, (agent_id, agent_name) in enumerate(agent_matches):
-            file_paths = []
-            if i < len(assignment_blocks):
-                block = assignment_blocks[i]
-                file_paths = re.findall(r'<file_path>(.*?)</file_path>', block, re.DOTALL)
-                file_paths = [path.strip() for path in file_paths if path.strip()]
-
-            # Try to get description
-            desc_pattern = f'<{agent_id}[^>]*>.*?<description>(.*?)</description>'
-            desc_match = re.search(desc_pattern, content, re.DOTALL)
-            description = desc_match.group(1).strip() if desc_match else f"Agent {i+1}"
-
-            agent_info = {
-                "id": agent_id,
-                "name": agent_name.replace("&amp;", "and"),
-                "description": description.replace("&amp;", "and"),
-                "expertise": [],
-                "responsibilities": [],
-                "file_assignments": file_paths
-            }
-
-            agents.append(agent_info)
-
-    # Last resort - if we have file assignments but no agents, create default agents
-    if not agents and assignment_blocks:
-        all_files = []
-        for block in assignment_blocks:
-            file_paths = re.findall(r'<file_path>(.*?)</file_path>', block, re.DOTALL)
-            all_files.extend([path.strip() for path in file_paths if path.strip()])
-
-        if all_files:
-            agents.append({
-                "id": "agent_1",
-                "name": "Fallback Agent",
-                "description": "Automatically created fallback agent",
-                "expertise": [],
-                "responsibilities": [],
-                "file_assignments": all_files
-            })
-
-    # Ultra fallback - search for file paths anywhere in the content
-    if not agents:
-        last_chance_files = re.findall(r'<file_path>(.*?)</file_path>', content, re.DOTALL)
-        if last_chance_files:
-            logger.info("Last resort extraction found some files")
-            agents.append({
-                "id": "agent_1",
-                "name": "Emergency Fallback Agent",
-                "description": "Emergency fallback agent created when no other extraction methods worked",
-                "expertise": [],
-                "responsibilities": [],
-                "file_assignments": [f.strip() for f in last_chance_files if f.strip()]
-            })
-
-    return agents
+    scan = scan_agent_plan(content)
+    return scan.agents or _fallback_agents(scan)
+
+def _fallback_agents(scan: PlanScan) -> list[dict]:
+    """Build a single catch-all agent from file paths found outside any agent."""
+    # File assignments without agents become one fallback agent
+    if scan.assigned_files:
+        return [{
+            "id": "agent_1",
+            "name": "Fallback Agent",
+            "description": "Automatically created fallback agent",
+            "expertise": [],
+            "responsibilities": [],
+            "file_assignments": scan.assigned_files,
+        }]
+
+    # Ultra fallback - file paths anywhere in the content
+    if scan.loose_files:
+        logger.info("Last resort extraction found some files")
+        return [{
+            "id": "agent_1",
+            "name": "Emergency Fallback Agent",
+            "description": "Emergency fallback agent created when no other extraction methods worked",
+            "expertise": [],
+            "responsibilities": [],
+            "file_assignments": scan.loose_files,
+        }]
+    return []
 
 def parse_agents_from_phase2(input_data: dict[str, Any] | str) -> list[dict]:
     """
@@ -401,7 +492,7 @@ def parse_agents_from_phase2(input_data: dict[str, Any] | str) -> list[dict]:
     - Dictionaries with "plan" or "agents" fields
     - JSON strings
     - XML wrapped in markdown code blocks
-    - Direct XML
+    - Direct XML, including malformed XML (see `scan_agent_plan`)
 
     Args:
         input_data: Phase 2 output in any supported format
@@ -431,46 +522,16 @@ def parse_agents_from_phase2(input_data: dict[str, Any] | str) -> list[dict]:
     # STEP 4: Extract from markdown code blocks if present
     content = extract_from_markdown_block(content)
 
-    # STEP 5: Try XML parsing first
-    try:
-        # Extract XML content and clean it
-        xml_content = extract_xml_content(content)
-        xml_content = clean_and_fix_xml(xml_content)
-
-        # Parse the XML
-        root = ET.fromstring(xml_content)
-
-        agents = []
-        # Extract agent definitions from the XML
-
-        # Check if we wrapped in a root element
-        if root.tag == "root":
-            # Find the analysis_plan element
-            analysis_plan = root.find("analysis_plan")
-            if analysis_plan is not None:
-                for element in analysis_plan:
-                    if element.tag.startswith("agent_"):
-                        agent_info = parse_agent_definition(element)
-                        agents.append(agent_info)
-        else:
-            # Regular agent extraction
-            for element in root:
-                if element.tag.startswith("agent_"):
-                    agent_info = parse_agent_definition(element)
-                    agents.append(agent_info)
-
-        if agents:
-            logger.info(f"[bold green]Success:[/bold green] Extracted {len(agents)} agents via XML parsing")
-            _log_detailed_agent_info(agents, "XML")
-            return agents
-    except ET.ParseError as e:
-        logger.debug(f"XML parsing failed: {e}. Falling back to regex method.")
-    except Exception as e:
-        logger.debug(f"Unexpected error during XML parsing: {str(e)}. Using fallback.")
-
-    # STEP 6: Fallback to regex extraction
-    logger.info("[bold yellow]Notice:[/bold yellow] Using regex-based extraction as fallback")
-    agents = extract_agent_fallback(content)
+    # STEP 5: Tokenize the plan in a single pass
+    scan = scan_agent_plan(content)
+    if scan.agents:
+        logger.info(f"[bold green]Success:[/bold green] Extracted {len(scan.agents)} agents from the plan")
+        _log_detailed_agent_info(scan.agents, "tokenizer")
+        return scan.agents
+
+    # STEP 6: Fall back to catch-all agents for stray file assignments
+    logger.info("[bold yellow]Notice:[/bold yellow] No agent definitions found, using fallback extraction")
+    agents = _fallback_agents(scan)
 
     # Report results
     if agents:
@@ -514,6 +575,142 @@ def _log_detailed_agent_info(agents: list[dict], method: str) -> None:
 
     logger.debug("================================")
 
+# ====================================================
+# Incremental Parsing
+# Parses agents while the Phase 2 plan is still being generated.
+# ====================================================
+
+_AGENT_OPEN_PATTERN = re.compile(r"<(agent_\d+)(?=[\s>=/])[^>]*>")
+_PLAN_OPEN_PATTERN = re.compile(rf"<{ANALYSIS_PLAN_TAG}(?=[\s>])[^>]*>")
+_PLAN_CLOSE = f"</{ANALYSIS_PLAN_TAG}>"
+# Longest unfinished opening tag kept between deltas
+_MAX_TAG_CARRY = 256
+
+class IncrementalAgentParser:
+    """
+    Parse agent definitions from a Phase 2 plan as it streams in.
+
+    Text deltas are passed to `feed`, which returns each ``<agent_N>`` block as
+    soon as its closing tag has arrived. Only text not searched before is scanned
+    for the closing tag, so the total work stays linear in the plan length.
+    Agent tags mentioned in the reasoning are not agents: once ``<analysis_plan>``
+    arrives everything before it is dropped, and an opening tag followed by another
+    opening tag before its own closing tag is given up for the newer one.
+    `complete` turns true once ``</analysis_plan>`` has arrived.
+    """
+
+    def __init__(self) -> None:
+        self.agents: list[dict] = []
+        self.complete = False
+        self._parts: list[str] = []
+        self._pending = ""
+        self._closing: str | None = None
+        self._scan_from = 0
+        self._in_plan = False
+        self._plan_from = 0
+        self._seen: set[str] = set()
+
+    @property
+    def text(self) -> str:
+        """The plan text received so far."""
+        return "".join(self._parts)
+
+    def feed(self, text: str) -> list[dict]:
+        """
+        Add a text delta to the plan.
+
+        Args:
+            text: Next piece of the plan text
+
+        Returns:
+            List[Dict]: Agent definitions completed by this delta
+        """
+        if self.complete or not text:
+            return []
+        self._parts.append(text)
+        self._pending += text
+
+        completed: list[dict] = []
+        while True:
+            if not self._in_plan and self._enter_plan():
+                continue
+            if self._closing is None:
+                opening = _AGENT_OPEN_PATTERN.search(self._pending)
+                plan_end = self._pending.find(_PLAN_CLOSE)
+                if plan_end != -1 and (opening is None or plan_end < opening.start()):
+                    self._finish()
+                    break
+                if opening is None:
+                    # Keep a tag split across deltas for the next one
+                    tag_start = self._pending.rfind("<")
+                    carry = len(self._pending) - tag_start if tag_start != -1 else 0
+                    self._drop(len(self._pending) - carry if carry <= _MAX_TAG_CARRY else len(self._pending))
+                    break
+                self._closing = f"</{opening.group(1)}>"
+                self._drop(opening.start())
+                self._scan_from = opening.end() - opening.start()
+
+            end = self._pending.find(self._closing, self._scan_from)
+            reopening = _AGENT_OPEN_PATTERN.search(self._pending, self._scan_from)
+            if reopening is not None and (end == -1 or reopening.start() < end):
+                # The open agent was only mentioned or never closed; start over at the newer opening
+                self._closing = None
+                self._drop(reopening.start())
+                continue
+            if end == -1:
+                if self._pending.find(_PLAN_CLOSE, self._scan_from) != -1:
+                    # An unterminated agent is left to the full-text parse that follows the stream
+                    self._finish()
+                    break
+                self._scan_from = self._resume_offset(self._closing)
+                break
+
+            block_end = end + len(self._closing)
+            agent = _parse_agent_block(self._pending[:block_end])
+            self._drop(block_end)
+            self._closing = None
+            self._scan_from = 0
+            if agent is not None and agent["id"] not in self._seen:
+                self._seen.add(agent["id"])
+                self.agents.append(agent)
+                completed.append(agent)
+        return completed
+
+    def _enter_plan(self) -> bool:
+        """Drop the text before ``<analysis_plan>`` once it has arrived."""
+        match = _PLAN_OPEN_PATTERN.search(self._pending, self._plan_from)
+        if match is None:
+            self._plan_from = max(self._plan_from, len(self._pending) - _MAX_TAG_CARRY)
+            return False
+        self._in_plan = True
+        self._closing = None
+        self._scan_from = 0
+        self._drop(match.end())
+        return True
+
+    def _resume_offset(self, closing: str) -> int:
+        """Where the next delta's search starts: late enough to stay linear, early enough for split tags."""
+        overlap = max(len(closing), len(_PLAN_CLOSE)) - 1
+        resume = max(self._scan_from, len(self._pending) - overlap)
+        tag_start = self._pending.rfind("<", self._scan_from)
+        if tag_start != -1 and len(self._pending) - tag_start <= _MAX_TAG_CARRY:
+            resume = min(resume, tag_start)
+        return resume
+
+    def _drop(self, count: int) -> None:
+        self._pending = self._pending[count:]
+        self._plan_from = max(0, self._plan_from - count)
+
+    def _finish(self) -> None:
+        self.complete = True
+        self._pending = ""
+        self._closing = None
+
+def _parse_agent_block(block: str) -> dict | None:
+    """Parse a single complete ``<agent_N>`` block."""
+    agents = scan_agent_plan(block).agents
+    return agents[0] if agents else None
+
 # ====================================================
 # Utility Functions
 # ====================================================
@@ -0,0 +1,181 @@
+"""Phase 2 agent plans requested as JSON conforming to a schema.
+
+Providers enforce `AGENT_PLAN_SCHEMA` natively (see each architect's
+``create_structured_plan``), so the plan is read with `json` and checked against
+the snapshot's file index instead of going through XML repair and regex
+fallbacks.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from agentrules.core.utils.file_system.file_index import FileIndex
+
+logger = logging.getLogger("project_extractor")
+
+PLAN_TOOL_NAME = "submit_agent_plan"
+"""Tool Anthropic models are forced to call with the plan as its input."""
+
+_STRING_LIST: dict[str, Any] = {"type": "array", "items": {"type": "string"}}
+
+AGENT_PLAN_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "reasoning": {"type": "string", "description": "Approach used to form the team and assign the files."},
+        "agents": {
+            "type": "array",
+            "description": "The team of 3 to 5 analysis agents.",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "description": "Short name using letters, digits and spaces."},
+                    "description": {"type": "string", "description": "The agent's role and expertise."},
+                    "expertise": _STRING_LIST,
+                    "responsibilities": _STRING_LIST,
+                    "file_assignments": {
+                        **_STRING_LIST,
+                        "description": "Project-relative paths exactly as shown in the project structure.",
+                    },
+                },
+                "required": ["name", "description", "expertise", "responsibilities", "file_assignments"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["reasoning", "agents"],
+    "additionalProperties": False,
+}
+
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+
+
+class PlanValidationError(ValueError):
+    """Raised when a structured plan is not JSON or does not match the schema."""
+
+
+@dataclass
+class StructuredPlan:
+    """A validated plan, with the assignments that did not survive validation."""
+
+    agents: list[dict[str, Any]]
+    reasoning: str = ""
+    unknown_files: list[str] = field(default_factory=list)
+    duplicate_files: list[str] = field(default_factory=list)
+
+
+def schema_without_additional_properties(schema: Mapping[str, Any]) -> dict[str, Any]:
+    """Copy of ``schema`` without ``additionalProperties``, for the OpenAPI subset Gemini accepts."""
+
+    cleaned: dict[str, Any] = {}
+    for key, value in schema.items():
+        if key == "additionalProperties":
+            continue
+        cleaned[key] = schema_without_additional_properties(value) if isinstance(value, Mapping) else value
+    return cleaned
+
+
+def parse_structured_plan(plan: str | Mapping[str, Any], file_index: FileIndex | None = None) -> StructuredPlan:
+    """
+    Validate a JSON agent plan and normalize it into Phase 3 agent definitions.
+
+    Args:
+        plan: The plan as returned by the model, either JSON text or already decoded
+        file_index: Optional snapshot index; assigned paths are resolved against it,
+            unknown paths are dropped, and a file assigned twice stays with its first agent
+
+    Returns:
+        The plan with agent ids ``agent_1``, ``agent_2``, ...; agents left without files are dropped
+
+    Raises:
+        PlanValidationError: If the plan is not JSON or does not match `AGENT_PLAN_SCHEMA`
+    """
+    data = _decode(plan) if not isinstance(plan, Mapping) else plan
+    agents_data = data.get("agents")
+    if not isinstance(agents_data, list) or not agents_data:
+        raise PlanValidationError("plan has no 'agents' list")
+
+    result = StructuredPlan(agents=[], reasoning=str(data.get("reasoning") or ""))
+    assigned: set[str] = set()
+    for position, item in enumerate(agents_data, start=1):
+        if not isinstance(item, Mapping):
+            raise PlanValidationError(f"agent {position} is not an object")
+        name = item.get("name")
+        files = item.get("file_assignments")
+        if not isinstance(name, str) or not isinstance(files, list):
+            raise PlanValidationError(f"agent {position} needs a 'name' string and a 'file_assignments' list")
+
+        kept: list[str] = []
+        for raw in files:
+            path = _resolve(str(raw).strip(), file_index)
+            if path is None:
+                result.unknown_files.append(str(raw))
+            elif path in assigned:
+                result.duplicate_files.append(path)
+            else:
+                assigned.add(path)
+                kept.append(path)
+        if not kept:
+            logger.debug(f"Dropping agent {name!r}: none of its files are in the project")
+            continue
+        result.agents.append(
+            {
+                "id": f"agent_{len(result.agents) + 1}",
+                "name": name.strip() or f"Agent {len(result.agents) + 1}",
+                "description": str(item.get("description") or "").strip(),
+                "expertise": _strings(item.get("expertise")),
+                "responsibilities": _strings(item.get("responsibilities")),
+                "file_assignments": kept,
+            }
+        )
+
+    if result.unknown_files or result.duplicate_files:
+        logger.info(
+            f"[bold yellow]Notice:[/bold yellow] Structured plan: dropped {len(result.unknown_files)} unknown "
+            f"and {len(result.duplicate_files)} duplicate file assignments"
+        )
+    return result
+
+
+def _decode(text: str) -> Mapping[str, Any]:
+    text = text.strip()
+    fenced = _JSON_FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as error:
+        raise PlanValidationError(f"plan is not valid JSON: {error}") from error
+    if not isinstance(data, dict):
+        raise PlanValidationError("plan is not a JSON object")
+    return data
+
+
+def _resolve(path: str, file_index: FileIndex | None) -> str | None:
+    if not path:
+        return None
+    if file_index is None:
+        return path
+    entry = file_index.resolve(path)
+    return entry.path if entry is not None else None
+
+
+def _strings(value: object) -> list[str]:
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+__all__ = [
+    "AGENT_PLAN_SCHEMA",
+    "PLAN_TOOL_NAME",
+    "PlanValidationError",
+    "StructuredPlan",
+    "parse_structured_plan",
+    "schema_without_additional_properties",
+]
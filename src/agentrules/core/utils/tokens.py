@@ -0,0 +1,33 @@
+"""Lightweight token estimation helpers.
+
+The analysis pipeline needs to reason about prompt sizes without depending on
+provider-specific tokenizers. These helpers use a conservative characters-per-token
+heuristic that is close enough for budgeting decisions across all providers.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+CHARS_PER_TOKEN = 4
+"""Approximate number of characters per token used for budgeting."""
+
+
+def estimate_tokens(text: str | None) -> int:
+    """Return an approximate token count for ``text``."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_payload_tokens(payload: Any) -> int:
+    """Return an approximate token count for a JSON-serialisable payload."""
+    if isinstance(payload, str):
+        return estimate_tokens(payload)
+    return estimate_tokens(json.dumps(payload, indent=2, default=str))
+
+
+def tokens_to_chars(tokens: int) -> int:
+    """Convert a token budget into an approximate character budget."""
+    return max(0, tokens) * CHARS_PER_TOKEN
@@ -1,4 +1,5 @@
 import io
+import os
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -75,6 +76,80 @@ class PipelineRunnerTests(unittest.TestCase):
         output = buffer.getvalue()
         self.assertIn("Analysis finished for:", output)
 
+    @patch.dict(os.environ, {"OFFLINE": "0"})
+    @patch("agentrules.cli.services.pipeline_runner.activate_offline_mode")
+    @patch("agentrules.cli.services.pipeline_runner.PipelineOutputWriter")
+    @patch("agentrules.cli.services.pipeline_runner.asyncio.run")
+    @patch("agentrules.cli.services.pipeline_runner.build_project_snapshot")
+    @patch("agentrules.cli.services.pipeline_runner.create_default_pipeline")
+    @patch("agentrules.cli.services.pipeline_runner.RunCache")
+    @patch("agentrules.cli.services.pipeline_runner.get_config_manager")
+    def test_offline_run_records_no_throughput(
+        self,
+        mock_get_config_manager,
+        mock_run_cache_cls,
+        mock_create_pipeline,
+        mock_build_snapshot,
+        mock_asyncio_run,
+        mock_output_writer_cls,
+        mock_activate_offline,
+    ) -> None:
+        context = CliContext(console=Console(file=io.StringIO(), width=120))
+        mock_config = MagicMock()
+        mock_config.get_effective_exclusions.return_value = (set(), set(), set())
+        mock_config.get_rules_filename.return_value = "AGENTS.md"
+        mock_get_config_manager.return_value = mock_config
+        mock_run_cache_cls.return_value.load.return_value = None
+        mock_output_writer_cls.return_value.persist.return_value = MagicMock(messages=[])
+
+        pipeline_runner.run_pipeline(Path.cwd(), offline=False, context=context)
+        self.assertIsNotNone(mock_create_pipeline.call_args.kwargs["throughput"])
+
+        pipeline_runner.run_pipeline(Path.cwd(), offline=True, context=context)
+        self.assertIsNone(mock_create_pipeline.call_args.kwargs["throughput"])
+
+    @patch("agentrules.cli.services.pipeline_runner.PipelineOutputWriter")
+    @patch("agentrules.cli.services.pipeline_runner.asyncio.run")
+    @patch("agentrules.cli.services.pipeline_runner.build_project_snapshot")
+    @patch("agentrules.cli.services.pipeline_runner.create_default_pipeline")
+    @patch("agentrules.cli.services.pipeline_runner.RunCache")
+    @patch("agentrules.cli.services.pipeline_runner.compute_run_fingerprint")
+    @patch("agentrules.cli.services.pipeline_runner.get_config_manager")
+    def test_run_pipeline_reuses_cached_run_unless_forced(
+        self,
+        mock_get_config_manager,
+        mock_fingerprint,
+        mock_run_cache_cls,
+        mock_create_pipeline,
+        mock_build_snapshot,
+        mock_asyncio_run,
+        mock_output_writer_cls,
+    ) -> None:
+        context = CliContext(console=Console(file=io.StringIO(), width=120))
+        mock_config = MagicMock()
+        mock_config.get_effective_exclusions.return_value = (set(), set(), set())
+        mock_config.get_rules_filename.return_value = "AGENTS.md"
+        mock_get_config_manager.return_value = mock_config
+        mock_fingerprint.return_value = MagicMock(short="abc123")
+        cached = MagicMock(created_at=0.0)
+        mock_run_cache_cls.return_value.load.return_value = cached
+        mock_output_writer_cls.return_value.persist.return_value = MagicMock(messages=[])
+
+        pipeline_runner.run_pipeline(Path.cwd(), offline=False, context=context)
+
+        mock_create_pipeline.assert_not_called()
+        mock_asyncio_run.assert_not_called()
+        persisted = mock_output_writer_cls.return_value.persist.call_args[0][0]
+        self.assertIs(persisted, cached.to_result.return_value)
+        self.assertIn("Reusing analysis", context.console.file.getvalue())
+
+        pipeline_runner.run_pipeline(Path.cwd(), offline=False, context=context, force=True)
+
+        mock_asyncio_run.assert_called_once()
+        mock_run_cache_cls.return_value.store.assert_called_once_with(
+            mock_fingerprint.return_value, mock_asyncio_run.return_value
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
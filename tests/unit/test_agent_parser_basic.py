@@ -1,12 +1,22 @@
 import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
 
 from agentrules.core.utils.parsers.agent_parser import (
     clean_and_fix_xml,
+    extract_agent_fallback,
     extract_from_json,
     extract_from_markdown_block,
     parse_agent_definition,
     parse_agents_from_phase2,
+    scan_agent_plan,
+    tokenize_plan,
 )
+from tests.utils import legacy_agent_parser
+
+PHASE2_TESTS = Path(__file__).resolve().parents[1] / "phase_2_test"
+RECORDED_PLANS = [PHASE2_TESTS / "output" / "analysis_plan.xml", *sorted((PHASE2_TESTS / "plans").iterdir())]
 
 
 def test_extract_from_json_dict_and_string():
@@ -86,3 +96,75 @@ def test_parse_agents_from_phase2_preparsed_and_markdown_xml():
     assert out2[0]["id"].startswith("agent_")
     assert out2[0]["file_assignments"] == ["a.py"]
 
+
+
+MESSY_PLAN = (
+    "<reasoning>Keep <agent_2> small: a < b & c=1 matters.</reasoning>\n"
+    "<analysis_plan>\n"
+    '<agent_1="R&D Tools">\n'
+    "  <description>Uses A & B</description>\n"
+    "  <expertise>python, <b>xml</b></expertise>\n"
+    "  <responsibilities><responsibility>r1</responsibility></responsibilities>\n"
+    "  <file_assignments><file_path>a.py</file_path><file_path>b.py\n"
+    "  </file_assignments>\n"
+    "</agent_1>\n"
+    '<agent_2 name="The "Core" Team" role="x">\n'
+    "  <file_assignments><file_path>core.py</file_path></file_assignments>\n"
+    "<agent_3 name=Infra Team>\n"
+    "  <name>Ignored</name><groups>group_1, group_2</groups>\n"
+    "</agent_3>\n"
+    "</analysis_plan>\n"
+    "<agent_9><file_path>late.py</file_path></agent_9>"
+)
+
+
+def test_scan_agent_plan_handles_malformed_plans_in_one_pass():
+    scan = scan_agent_plan(MESSY_PLAN)
+
+    assert [(agent["id"], agent["name"]) for agent in scan.agents] == [
+        ("agent_1", "R&D Tools"),
+        ("agent_2", "The 'Core' Team"),
+        ("agent_3", "Infra Team"),
+    ]
+    first = scan.agents[0]
+    assert first["description"] == "Uses A & B"
+    assert first["expertise"] == ["python", "xml"]
+    assert first["responsibilities"] == ["r1"]
+    # The unterminated file_path ends at the next structural tag
+    assert first["file_assignments"] == ["a.py", "b.py"]
+    # agent_2 is never closed and ends where agent_3 starts
+    assert scan.agents[1]["file_assignments"] == ["core.py"]
+    assert scan.agents[2]["groups"] == ["group_1", "group_2"]
+    assert parse_agents_from_phase2({"plan": MESSY_PLAN}) == scan.agents
+
+
+def test_tokenize_plan_reports_offsets():
+    tags = list(tokenize_plan('<agent_1 name="A">x</agent_1>'))
+
+    assert [(tag.name, tag.closing) for tag in tags] == [("agent_1", False), ("agent_1", True)]
+    assert tags[0].attributes == ' name="A"' and (tags[0].end, tags[1].start) == (18, 19)
+
+
+def test_fallback_agents_collect_stray_file_paths():
+    orphaned = "<file_assignments><file_path>a.py</file_path></file_assignments>"
+
+    assert extract_agent_fallback(orphaned)[0]["name"] == "Fallback Agent"
+    assert extract_agent_fallback("see <file_path>b.py</file_path>")[0]["file_assignments"] == ["b.py"]
+    assert parse_agents_from_phase2("no plan at all") == []
+
+
+def test_clean_and_fix_xml_quotes_attribute_values():
+    fixed = clean_and_fix_xml('<agent_1 name="The "Core" Team" role=lead dev>x=1 y</agent_1>')
+
+    assert '<agent_1 name="The \'Core\' Team" role="lead dev">x=1 y</agent_1>' in fixed
+    assert ET.fromstring(fixed).find("agent_1").attrib["role"] == "lead dev"
+
+
+@pytest.mark.parametrize("path", RECORDED_PLANS, ids=lambda path: path.name)
+def test_recorded_plans_parse_as_they_did_before_the_tokenizer(path: Path):
+    plan = path.read_text(encoding="utf-8")
+
+    agents = parse_agents_from_phase2({"plan": plan})
+
+    assert agents
+    assert agents == legacy_agent_parser.parse_agents_from_phase2({"plan": plan})
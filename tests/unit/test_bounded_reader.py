@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.utils.file_system import bounded_reader
+from agentrules.core.utils.file_system.bounded_reader import read_bounded
+from agentrules.core.utils.file_system.file_loader import read_project_file
+
+
+def _log(path: Path, lines: int) -> str:
+    text = "".join(f"line {index:06d} entry\n" for index in range(lines))
+    path.write_text(text)
+    return text
+
+
+def test_small_files_are_returned_whole(tmp_path: Path):
+    text = _log(tmp_path / "small.log", 10)
+
+    read = read_bounded(tmp_path / "small.log", max_bytes=10_000)
+
+    assert not read.truncated and read.text() == text and read.line_count == 10
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1 << 40])
+def test_large_files_keep_head_tail_and_summary(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mmap_threshold: int):
+    monkeypatch.setattr(bounded_reader, "MMAP_THRESHOLD", mmap_threshold)
+    _log(tmp_path / "big.log", 20_000)
+
+    read = read_bounded(tmp_path / "big.log", max_bytes=2_000)
+    text = read.text()
+
+    assert read.truncated and read.line_count == 20_000
+    assert len(read.head) + len(read.tail) <= 2_000
+    assert text.startswith("line 000000 entry\n") and text.endswith("line 019999 entry\n")
+    assert "file has 20,000 lines, 360,000 bytes" in text
+    # Cuts fall on line boundaries
+    assert all(line.startswith(("line ", "... [")) for line in text.splitlines())
+
+
+def test_phase3_loader_caps_file_size(tmp_path: Path):
+    _log(tmp_path / "dump.log", 50_000)
+
+    content = read_project_file(tmp_path, "dump.log", None, 4_096)
+
+    assert content is not None and len(content) < 5_000 and "lines omitted" in content
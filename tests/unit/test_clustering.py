@@ -0,0 +1,146 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.analysis import phase_2
+from agentrules.core.analysis.clustering import (
+    BALANCE_SLACK,
+    FileCluster,
+    apply_cluster_plan,
+    cluster_files,
+    cluster_paths,
+    local_agent_plan,
+)
+from agentrules.core.utils.file_system.file_index import build_file_index
+from agentrules.core.utils.module_graph import ModuleImports, resolve_module_graph
+from agentrules.core.utils.parsers.agent_parser import parse_agents_from_phase2
+
+TOKENS = {
+    "api/routes.py": 3000,
+    "api/schemas.py": 2000,
+    "core/models.py": 4000,
+    "core/services.py": 3000,
+    "web/app.ts": 3500,
+    "web/components/button.ts": 1500,
+    "cli/main.py": 1000,
+    "docs_gen/build.py": 1000,
+}
+
+
+def test_cluster_paths_is_balanced_and_deterministic():
+    clusters = cluster_paths(TOKENS, max_groups=3, min_group_tokens=1000)
+
+    assert [cluster.id for cluster in clusters] == ["group_1", "group_2", "group_3"]
+    assert sorted(path for cluster in clusters for path in cluster.files) == sorted(TOKENS)
+    capacity = sum(TOKENS.values()) / 3 * BALANCE_SLACK
+    assert all(cluster.tokens <= capacity for cluster in clusters)
+    assert cluster_paths(dict(reversed(TOKENS.items())), max_groups=3, min_group_tokens=1000) == clusters
+    # Directory subtrees that fit a group stay together
+    web = next(cluster for cluster in clusters if "web/app.ts" in cluster.files)
+    assert "web/components/button.ts" in web.files
+
+
+def test_imports_pull_directories_into_the_same_group():
+    graph = resolve_module_graph(
+        {
+            "cli/main.py": ModuleImports("python", ("api.routes",)),
+            "api/routes.py": ModuleImports("python", ()),
+        }
+    )
+    clusters = cluster_paths(TOKENS, graph, max_groups=3, min_group_tokens=1000)
+
+    owner = {path: cluster.id for cluster in clusters for path in cluster.files}
+    assert owner["cli/main.py"] == owner["api/routes.py"]
+
+
+def test_small_projects_form_a_single_group(tmp_path: Path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("import os\n")
+    (tmp_path / "README.md").write_text("# readme\n")
+
+    clusters = cluster_files(build_file_index(tmp_path))
+
+    assert len(clusters) == 1 and clusters[0].files == ("pkg/a.py",)
+    assert cluster_paths({}) == []
+
+
+def test_local_agent_plan_names_groups_after_their_directories():
+    agents = local_agent_plan(cluster_paths(TOKENS, max_groups=3, min_group_tokens=1000))
+
+    assert [agent["id"] for agent in agents] == ["agent_1", "agent_2", "agent_3"]
+    assert all(agent["name"] and agent["file_assignments"] for agent in agents)
+    assert len({agent["name"] for agent in agents}) == 3
+
+
+def _clusters() -> list[FileCluster]:
+    return [
+        FileCluster("group_1", ("api/routes.py", "api/schemas.py"), 5000, ("api",)),
+        FileCluster("group_2", ("core/models.py",), 4000, ("core",)),
+        FileCluster("group_3", ("web/app.ts",), 3500, ("web",)),
+    ]
+
+
+def test_apply_cluster_plan_expands_groups_and_moves_files():
+    agents = [
+        {"id": "agent_1", "name": "API", "groups": ["group_1"], "file_assignments": []},
+        {"id": "agent_2", "name": "Idle", "groups": ["group_9"], "file_assignments": []},
+        {"id": "agent_3", "name": "Core", "file_assignments": ["group_2", "api/schemas.py"]},
+    ]
+
+    plan = apply_cluster_plan(agents, _clusters())
+
+    assert [(agent["id"], agent["name"]) for agent in plan] == [
+        ("agent_1", "API"),
+        ("agent_2", "Idle"),
+        ("agent_3", "Core"),
+    ]
+    assert plan[0]["file_assignments"] == ["api/routes.py"]
+    # The unnamed group_3 goes to the agent with the fewest tokens
+    assert plan[1]["file_assignments"] == ["web/app.ts"]
+    assert plan[2]["file_assignments"] == ["api/schemas.py", "core/models.py"]
+    assert "groups" not in plan[0]
+    assert apply_cluster_plan([{"name": "Empty"}], _clusters()) == local_agent_plan(_clusters())
+
+
+def test_apply_cluster_plan_drops_agents_left_without_files():
+    agents = [
+        {"name": "API", "groups": ["group_1", "group_2", "group_3"]},
+        {"name": "Schemas", "file_assignments": ["api/schemas.py"]},
+        {"name": "Nothing", "groups": ["group_1"]},
+    ]
+
+    plan = apply_cluster_plan(agents, _clusters())
+
+    assert [agent["name"] for agent in plan] == ["API", "Schemas"]
+    assert plan[0]["file_assignments"] == ["api/routes.py", "core/models.py", "web/app.ts"]
+
+
+def test_parser_reads_group_lists():
+    plan = (
+        "<analysis_plan><agent_1><name>API</name><description>d</description>"
+        "<groups>group_1, group_3</groups></agent_1></analysis_plan>"
+    )
+
+    agents = parse_agents_from_phase2(plan)
+
+    assert agents[0]["groups"] == ["group_1", "group_3"]
+
+
+def test_phase2_local_planning_skips_the_model(monkeypatch: pytest.MonkeyPatch):
+    class _Architect:
+        async def create_analysis_plan(self, *args, **kwargs):  # pragma: no cover - must not be called
+            raise AssertionError("the model was called")
+
+    monkeypatch.setattr(phase_2, "get_architect_for_phase", lambda phase: _Architect())
+    analysis = phase_2.Phase2Analysis(planning="local")
+
+    result = asyncio.run(analysis.run({}, [], clusters=_clusters()))
+
+    assert result["planning"] == "local"
+    assert [agent["file_assignments"] for agent in result["agents"]] == [
+        ["api/routes.py", "api/schemas.py"],
+        ["core/models.py"],
+        ["web/app.ts"],
+    ]
+    assert "group_2" in result["plan"]
@@ -137,3 +137,68 @@ class ConfigServiceTestCase(unittest.TestCase):
         self.assertEqual(self.config_manager.get_tree_max_depth(), 5)
         cfg = self.config_manager.load()
         self.assertIsNone(cfg.exclusions.tree_max_depth)
+
+    def test_phase3_max_concurrency_set_and_reset(self) -> None:
+        self.assertIsNone(self.config_manager.get_phase3_max_concurrency())
+
+        self.config_manager.set_phase3_max_concurrency(4)
+        self.assertEqual(self.config_manager.get_phase3_max_concurrency(), 4)
+        self.assertEqual(self.config_manager.load().execution.phase3_max_concurrency, 4)
+
+        self.config_manager.set_phase3_max_concurrency(None)
+        self.assertIsNone(self.config_manager.get_phase3_max_concurrency())
+
+    def test_phase2_planning_defaults_set_and_normalize(self) -> None:
+        self.assertEqual(self.config_manager.get_phase2_planning(), "model")
+
+        self.config_manager.set_phase2_planning("LOCAL")
+        self.assertEqual(self.config_manager.get_phase2_planning(), "local")
+        self.assertFalse(self.config_manager.load().execution.is_default())
+
+        self.config_manager.set_phase2_planning("bogus")
+        self.assertEqual(self.config_manager.get_phase2_planning(), "model")
+        self.assertTrue(self.config_manager.load().execution.is_default())
+
+    def test_context_preferences_round_trip(self) -> None:
+        self.assertEqual(self.config_manager.get_context_preferences().mode, "full")
+
+        self.config_manager.set_context_mode("Outline")
+        self.config_manager.set_outline_threshold_kb(8)
+        self.config_manager.set_outline_keep_full(0)
+        preferences = self.config_manager.get_context_preferences()
+        self.assertEqual(
+            (preferences.mode, preferences.outline_threshold_kb, preferences.outline_keep_full), ("outline", 8, 0)
+        )
+
+        self.config_manager.set_context_mode("bogus")
+        self.assertEqual(self.config_manager.get_context_preferences().mode, "full")
+
+    def test_minify_preferences_persist_and_reset(self) -> None:
+        self.config_manager.set_minify(True, drop_comments=True)
+        preferences = self.config_manager.get_context_preferences()
+        self.assertTrue(preferences.minify and preferences.minify_drop_comments)
+        self.assertFalse(preferences.minify_drop_literal_tables)
+
+        self.config_manager.set_minify(False, drop_comments=True)
+        self.assertTrue(self.config_manager.load().context.is_default())
+
+    def test_deduplication_preferences_persist_and_reset(self) -> None:
+        self.assertTrue(self.config_manager.get_context_preferences().dedupe)
+
+        self.config_manager.set_deduplication(True, near_duplicates=True)
+        self.assertTrue(self.config_manager.get_context_preferences().near_duplicates)
+
+        self.config_manager.set_deduplication(False, near_duplicates=True)
+        preferences = self.config_manager.get_context_preferences()
+        self.assertFalse(preferences.dedupe or preferences.near_duplicates)
+
+        self.config_manager.set_deduplication(True)
+        self.assertTrue(self.config_manager.load().context.is_default())
+
+    def test_agent_token_budget_persists_and_clears(self) -> None:
+        self.config_manager.set_agent_token_budget(40_000)
+        self.assertEqual(self.config_manager.get_context_preferences().agent_token_budget, 40_000)
+
+        self.config_manager.set_agent_token_budget(0)
+        self.assertIsNone(self.config_manager.get_context_preferences().agent_token_budget)
+        self.assertTrue(self.config_manager.load().context.is_default())
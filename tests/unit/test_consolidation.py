@@ -0,0 +1,134 @@
+from typing import Any, cast
+
+import pytest
+
+from agentrules.config.context_windows import prompt_token_budget
+from agentrules.config.prompts.final_analysis_prompt import format_final_analysis_prompt
+from agentrules.core.analysis.consolidation import (
+    TreeReduceConsolidator,
+    consolidation_token_budget,
+    pack_sections,
+    reduce_payload,
+    split_into_sections,
+)
+from agentrules.core.analysis.final_analysis import FinalAnalysis
+from agentrules.core.analysis.phase_5 import Phase5Analysis
+from agentrules.core.utils.tokens import estimate_tokens
+from tests.utils.offline_stubs import patch_factory_offline
+
+
+def _large_results(agents: int = 12, size: int = 2_000) -> dict:
+    return {
+        "phase1": {"findings": "setup " * 50},
+        "phase3": {"findings": [{"agent": f"agent_{i}", "findings": f"finding {i} " * size} for i in range(agents)]},
+    }
+
+
+def test_split_into_sections_respects_budget_and_labels():
+    sections = split_into_sections(_large_results(), max_tokens=500)
+    assert len(sections) > 1
+    assert all(section.tokens <= 500 for section in sections)
+    assert any(section.label.startswith("phase3.findings[0]") for section in sections)
+
+
+def test_pack_sections_keeps_order_and_bounds_chunks():
+    sections = split_into_sections(_large_results(agents=6, size=100), max_tokens=300)
+    chunks = pack_sections(sections, 1_000)
+    flattened = [section for chunk in chunks for section in chunk]
+    assert flattened == sections
+    assert all(sum(section.tokens for section in chunk) <= 1_000 for chunk in chunks if len(chunk) > 1)
+
+
+@pytest.mark.asyncio
+async def test_tree_reduce_merges_recursively_until_within_budget():
+    calls: list[tuple[int, int, int]] = []
+
+    async def reducer(chunk: str, level: int, index: int, total: int) -> str:
+        calls.append((level, index, total))
+        return f"summary {level}.{index} " + chunk[: len(chunk) // 4]
+
+    consolidator = TreeReduceConsolidator(reducer, token_budget=2_000, max_parallel=2)
+    sections = await consolidator.reduce(_large_results())
+
+    assert sum(section.tokens for section in sections) <= 2_000
+    assert {level for level, _, _ in calls} >= {0, 1}
+
+
+@pytest.mark.asyncio
+async def test_tree_reduce_truncates_when_reducer_fails():
+    async def reducer(chunk: str, level: int, index: int, total: int) -> str:
+        raise RuntimeError("boom")
+
+    consolidator = TreeReduceConsolidator(reducer, token_budget=1_000, max_levels=2)
+    sections = await consolidator.reduce(_large_results())
+    assert sum(estimate_tokens(section.content) for section in sections) <= 1_500
+
+
+@pytest.mark.asyncio
+async def test_reduce_payload_returns_small_inputs_unchanged():
+    payload = {"phase4": {"analysis": "short"}}
+
+    class ArchStub:
+        async def consolidate_results(self, all_results, prompt=None):
+            raise AssertionError("should not be called")
+
+    assert await reduce_payload(payload, ArchStub()) is payload
+
+
+@pytest.mark.asyncio
+async def test_phase5_consolidates_large_inputs_hierarchically():
+    patch_factory_offline()
+    prompts: list[str] = []
+
+    class ArchStub:
+        async def consolidate_results(self, all_results, prompt=None):
+            prompts.append(prompt or "")
+            return {"phase": "Consolidation", "report": "condensed"}
+
+    p5 = Phase5Analysis(token_budget=1_000)
+    p5.architect = cast(Any, ArchStub())
+    out = await p5.run(_large_results())
+
+    assert out["report"] == "condensed"
+    assert len(prompts) > 2
+    assert all(estimate_tokens(prompt) < 1_500 for prompt in prompts)
+
+
+@pytest.mark.asyncio
+async def test_final_analysis_condenses_oversized_report_with_the_final_model():
+    prompts: list[str] = []
+    seen: dict[str, Any] = {}
+
+    class ArchStub:
+        model_name = "gpt-5.1"
+
+        async def consolidate_results(self, all_results, prompt=None):
+            raise AssertionError("the Phase 5 call should not be used")
+
+        async def final_analysis(self, consolidated_report, prompt=None):
+            prompts.append(prompt or "")
+            if "partial" in consolidated_report:
+                return {"analysis": "condensed report"}
+            seen["report"] = consolidated_report
+            return {"analysis": "rules"}
+
+    final = FinalAnalysis(token_budget=500)
+    final.architect = cast(Any, ArchStub())
+    out = await final.run({"report": "line of findings\n" * 2_000}, ["."])
+
+    assert out == {"analysis": "rules"}
+    assert "partial_reports" in seen["report"]
+    assert len(prompts) > 2
+    assert all("AGENTS.md" in prompt for prompt in prompts)
+
+
+def test_derived_budget_follows_the_model_and_leaves_room_for_the_tree():
+    template = format_final_analysis_prompt({}, ["."])
+    tree = [f"├── module_{i}.py" for i in range(20_000)]
+
+    small_window = consolidation_token_budget("deepseek-chat", template)
+    large_window = consolidation_token_budget("gpt-5.1", template)
+    with_tree = consolidation_token_budget("gpt-5.1", format_final_analysis_prompt({}, tree))
+
+    assert small_window < large_window < prompt_token_budget("gpt-5.1")
+    assert with_tree <= large_window - estimate_tokens("\n".join(tree)) + 1
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+
+from agentrules.config.context_windows import DEFAULT_MODEL_LIMITS, get_model_limits, prompt_token_budget
+from agentrules.core.analysis.context_packing import (
+    TRUNCATION_MARKER,
+    estimate_prompt_tokens,
+    merge_agent_results,
+    pack_agent_requests,
+)
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+
+AGENT = {"id": "agent_1", "name": "Core Agent", "description": "d"}
+
+
+def _agent(paths):
+    return {**AGENT, "file_assignments": list(paths)}
+
+
+def test_budget_comes_from_the_model_limits():
+    assert get_model_limits("unknown-model") == DEFAULT_MODEL_LIMITS
+    limits = get_model_limits("claude-sonnet-4-5")
+    assert prompt_token_budget("claude-sonnet-4-5") < limits.context_window - limits.output_reserve
+
+
+def test_context_that_fits_is_sent_unchanged():
+    agent = _agent(["a.py"])
+    requests = pack_agent_requests(agent, ["a.py"], {"a.py": "x = 1"}, token_budget=10_000)
+
+    assert len(requests) == 1
+    assert requests[0].agent is agent
+    assert requests[0].file_contents == {"a.py": "x = 1"}
+
+
+def test_oversized_agent_is_split_into_balanced_parts_within_budget():
+    contents = {f"f{index}.py": "x" * size for index, size in enumerate([4000, 3000, 2500, 2000, 1500, 1000, 800])}
+    agent = _agent(contents)
+    budget = 2000
+
+    requests = pack_agent_requests(agent, ["tree"], contents, token_budget=budget)
+
+    assert len(requests) > 1
+    assert all(request.total == len(requests) for request in requests)
+    assert sorted(path for request in requests for path in request.file_contents) == sorted(contents)
+    for request in requests:
+        assert estimate_prompt_tokens(request.agent, request.tree, request.file_contents) <= budget
+        assert request.agent["file_assignments"] == list(request.file_contents)
+        assert request.agent["id"].startswith("agent_1.")
+    sizes = [sum(len(text) for text in request.file_contents.values()) for request in requests]
+    assert max(sizes) - min(sizes) <= max(len(text) for text in contents.values())
+
+
+def test_single_file_larger_than_budget_is_truncated():
+    contents = {"huge.py": "y" * 40_000}
+    requests = pack_agent_requests(_agent(contents), [], contents, token_budget=1000)
+
+    assert len(requests) == 1
+    assert requests[0].truncated_files == ("huge.py",)
+    assert requests[0].file_contents["huge.py"].endswith(TRUNCATION_MARKER)
+    assert estimate_prompt_tokens(requests[0].agent, [], requests[0].file_contents) <= 1000
+
+
+def test_merge_keeps_partial_findings_and_errors():
+    merged = merge_agent_results(AGENT, [{"findings": "one"}, RuntimeError("boom"), {"findings": "three"}])
+
+    assert merged["agent"] == "Core Agent"
+    assert merged["parts"] == 3
+    assert "## Part 1/3\none" in merged["findings"] and "## Part 3/3\nthree" in merged["findings"]
+    assert merged["errors"] == ["part 2/3: boom"]
+    assert "error" not in merged
+
+
+@pytest.mark.asyncio
+async def test_phase3_runs_split_parts_and_merges_them(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text((name[0] * 59 + "\n") * 50)
+    seen: list[list[str]] = []
+
+    class _Architect:
+        async def analyze(self, context):
+            seen.append(sorted(context["file_contents"]))
+            return {"agent": context["agent_name"], "findings": ",".join(sorted(context["file_contents"]))}
+
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", lambda *a, **k: _Architect())
+    plan = {"agents": [_agent(["a.py", "b.py", "c.py"])]}
+
+    result = await Phase3Analysis(token_budget=1200).run(plan, [], tmp_path)
+
+    assert len(result["findings"]) == 1
+    finding = result["findings"][0]
+    assert finding["agent"] == "Core Agent" and finding["parts"] == len(seen) > 1
+    assert sorted(path for part in seen for path in part) == ["a.py", "b.py", "c.py"]
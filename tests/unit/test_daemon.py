@@ -0,0 +1,246 @@
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+import urllib.request
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+from agentrules.core.analysis.events import AnalysisEvent, AnalysisEventSink
+from agentrules.core.daemon import AnalysisDaemon, AnalysisService, Job, JobStatus, JobStore, service
+from agentrules.core.pipeline import EffectiveExclusions, PipelineSettings
+from agentrules.core.pipeline.snapshot_cache import SnapshotCache, compute_tree_signature
+
+
+class AnalysisServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = JobStore(Path(self.temp_dir.name) / "jobs")
+
+    async def asyncTearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    async def test_jobs_run_by_priority_and_persist_results(self) -> None:
+        order: list[str] = []
+
+        async def runner(job: Job, sink: AnalysisEventSink) -> dict[str, Any]:
+            order.append(job.target_directory)
+            sink.publish(AnalysisEvent(phase="phase3", type="agent_completed", payload={"id": "agent_1"}))
+            return {"target": job.target_directory}
+
+        service = AnalysisService(self.store, runner=runner, concurrency=1)
+        # Submit before the workers start so priority ordering is observable.
+        service._loop = asyncio.get_running_loop()
+        service._queue = asyncio.PriorityQueue()
+        low = service.submit("low", priority=0)
+        high = service.submit("high", priority=5)
+        await asyncio.sleep(0)
+        service._workers = [asyncio.create_task(service._worker())]
+        await service.wait_until_idle()
+        await service.stop()
+
+        self.assertEqual(order, ["high", "low"])
+        finished = service.get(low.id)
+        assert finished is not None
+        self.assertEqual(finished.status, JobStatus.SUCCEEDED)
+        self.assertEqual(finished.result, {"target": "low"})
+        self.assertIn("agent_completed", [event["type"] for event in finished.events])
+
+        persisted = {job.id: job for job in self.store.load_all()}
+        self.assertEqual(persisted[high.id].status, JobStatus.SUCCEEDED)
+
+    async def test_failed_and_cancelled_jobs(self) -> None:
+        async def runner(job: Job, sink: AnalysisEventSink) -> dict[str, Any]:
+            raise ValueError("boom")
+
+        service = AnalysisService(self.store, runner=runner, concurrency=1)
+        service._loop = asyncio.get_running_loop()
+        service._queue = asyncio.PriorityQueue()
+        failing = service.submit("a")
+        cancelled = service.submit("b")
+        service.cancel(cancelled.id)
+        await asyncio.sleep(0)
+        service._workers = [asyncio.create_task(service._worker())]
+        await service.wait_until_idle()
+        await service.stop()
+
+        failed = service.get(failing.id)
+        assert failed is not None
+        self.assertEqual(failed.status, JobStatus.FAILED)
+        self.assertEqual(failed.error, "boom")
+        skipped = service.get(cancelled.id)
+        assert skipped is not None
+        self.assertEqual(skipped.status, JobStatus.CANCELLED)
+
+    async def test_start_requeues_unfinished_jobs(self) -> None:
+        interrupted = Job.create("repo")
+        interrupted.status = JobStatus.RUNNING
+        self.store.save(interrupted)
+        ran: list[str] = []
+
+        async def runner(job: Job, sink: AnalysisEventSink) -> dict[str, Any]:
+            ran.append(job.id)
+            return {}
+
+        service = AnalysisService(self.store, runner=runner)
+        await service.start()
+        await service.wait_until_idle()
+        await service.stop()
+        self.assertEqual(ran, [interrupted.id])
+
+
+class AnalysisDaemonHttpTests(unittest.TestCase):
+    def test_submit_status_and_stream(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            async def runner(job: Job, sink: AnalysisEventSink) -> dict[str, Any]:
+                sink.publish(AnalysisEvent(phase="phase1", type="phase_started", payload={}))
+                return {"ok": True}
+
+            service = AnalysisService(JobStore(Path(temp_dir) / "jobs"), runner=runner)
+            daemon = AnalysisDaemon(service, port=0)
+            daemon.serve_in_background()
+            try:
+                host, port = daemon.address
+                base = f"http://{host}:{port}"
+                request = urllib.request.Request(
+                    f"{base}/jobs",
+                    data=json.dumps({"path": temp_dir, "priority": 1}).encode(),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    self.assertEqual(response.status, 202)
+                    job_id = json.loads(response.read())["id"]
+
+                with urllib.request.urlopen(f"{base}/jobs/{job_id}/stream", timeout=5) as response:
+                    lines = [json.loads(line) for line in response.read().splitlines() if line]
+                types = [line.get("type") for line in lines]
+                self.assertIn("phase_started", types)
+                self.assertEqual(lines[-1]["payload"]["status"], "succeeded")
+
+                deadline = time.time() + 5
+                status = None
+                while time.time() < deadline:
+                    with urllib.request.urlopen(f"{base}/jobs/{job_id}", timeout=5) as response:
+                        status = json.loads(response.read())
+                    if status["status"] == "succeeded":
+                        break
+                assert status is not None
+                self.assertEqual(status["result"], {"ok": True})
+            finally:
+                daemon.shutdown()
+
+
+class SnapshotCacheTests(unittest.TestCase):
+    def test_rebuilds_only_when_signature_changes(self) -> None:
+        builds: list[int] = []
+        signature = {"value": "a"}
+
+        def builder(settings: PipelineSettings) -> Any:
+            builds.append(1)
+            return object()
+
+        cache = SnapshotCache(builder=builder, signature=lambda settings: signature["value"])
+        settings = PipelineSettings(
+            target_directory=Path("/tmp/project"),
+            tree_max_depth=3,
+            respect_gitignore=True,
+            effective_exclusions=EffectiveExclusions(frozenset(), frozenset(), frozenset()),
+        )
+        first = cache.get(settings)
+        self.assertIs(cache.get(settings), first)
+        signature["value"] = "b"
+        self.assertIsNot(cache.get(settings), first)
+        self.assertEqual(len(builds), 2)
+
+    def test_signature_changes_when_a_file_is_edited(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "src").mkdir()
+            module = root / "src" / "app.py"
+            module.write_text("x = 1\n")
+            settings = PipelineSettings(
+                target_directory=root,
+                tree_max_depth=3,
+                respect_gitignore=True,
+                effective_exclusions=EffectiveExclusions(frozenset(), frozenset(), frozenset()),
+            )
+            before = compute_tree_signature(settings)
+            self.assertEqual(compute_tree_signature(settings), before)
+            module.write_text("x = 2\nprint(x)\n")
+            self.assertNotEqual(compute_tree_signature(settings), before)
+
+
+    def test_signature_ignores_gitignored_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / ".gitignore").write_text("*.log\nbuild/\n")
+            (root / "build").mkdir()
+            log = root / "debug.log"
+            log.write_text("start\n")
+            settings = PipelineSettings(
+                target_directory=root,
+                tree_max_depth=3,
+                respect_gitignore=True,
+                effective_exclusions=EffectiveExclusions(frozenset(), frozenset(), frozenset()),
+            )
+            before = compute_tree_signature(settings)
+            log.write_text("start\nmore output\n")
+            (root / "build" / "out.js").write_text("bundle")
+            self.assertEqual(compute_tree_signature(settings), before)
+
+            unfiltered = replace(settings, respect_gitignore=False)
+            before = compute_tree_signature(unfiltered)
+            log.write_text("start\nmore output\nand more\n")
+            self.assertNotEqual(compute_tree_signature(unfiltered), before)
+
+
+class PipelineJobRunnerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_pipelines_are_reused_across_jobs_with_the_same_config(self) -> None:
+        built: list[Any] = []
+        sinks: list[Any] = []
+
+        class _Pipeline:
+            def set_event_sink(self, sink: Any) -> None:
+                sinks.append(sink)
+
+            async def run(self, settings: Any, snapshot: Any) -> Any:
+                return SimpleNamespace(metrics=SimpleNamespace(elapsed_seconds=0.0), final_analysis={})
+
+        def factory(**kwargs: Any) -> _Pipeline:
+            built.append(kwargs)
+            return _Pipeline()
+
+        config = {"planning": "model"}
+        config_manager = mock.Mock()
+        config_manager.load.side_effect = lambda: dict(config)
+        snapshot_cache = mock.Mock()
+        output_writer = mock.Mock()
+        output_writer.persist.return_value = SimpleNamespace(messages=[])
+        runner = service.PipelineJobRunner(
+            config_manager=config_manager,
+            snapshot_cache=snapshot_cache,
+            output_writer=output_writer,
+            pipeline_factory=factory,
+        )
+        job = Job(id="job", target_directory="/tmp/project")
+        with (
+            mock.patch.object(service, "build_pipeline_settings", return_value=SimpleNamespace(target_directory=Path())),
+            mock.patch.object(service, "build_context_options"),
+            mock.patch.object(service, "build_output_options", return_value=SimpleNamespace(rules_filename="AGENTS.md")),
+        ):
+            await runner(job, mock.Mock())
+            await runner(job, mock.Mock())
+            self.assertEqual(len(built), 1)
+            config["planning"] = "clustered"
+            await runner(job, mock.Mock())
+        self.assertEqual(len(built), 2)
+        self.assertIsNone(sinks[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.utils.file_system import file_loader
+from agentrules.core.utils.file_system.data_files import extract_data_file
+from agentrules.core.utils.file_system.file_loader import read_project_file
+from agentrules.core.utils.file_system.file_retriever import read_text_file
+from agentrules.core.utils.file_system.json_stream import JsonStream
+
+
+def _csv(path: Path, rows: int, delimiter: str = ",") -> Path:
+    lines = [delimiter.join(["id", "name", "score", "active", "joined"])]
+    lines += [
+        delimiter.join([str(i), f"user {i}", f"{i * 1.5}", "true" if i % 2 else "false", "2024-01-02"])
+        for i in range(rows)
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_csv_summary_has_types_row_count_and_samples(tmp_path: Path):
+    summary = extract_data_file(_csv(tmp_path / "users.csv", 5000))
+
+    assert summary is not None
+    assert summary.startswith("# Data file (CSV): ~5,000 rows")
+    assert "id (integer), name (string), score (number), active (boolean), joined (date)" in summary
+    assert "0,user 0,0.0,false,2024-01-02" in summary
+    assert "user 5," not in summary
+    assert len(summary) < 1000
+
+
+def test_tsv_is_detected(tmp_path: Path):
+    summary = extract_data_file(_csv(tmp_path / "users.tsv", 5000, "\t"))
+
+    assert summary is not None and summary.startswith("# Data file (TSV)")
+    assert "1\tuser 1\t1.5\ttrue" in summary
+
+
+def test_json_array_and_object_with_array(tmp_path: Path):
+    records = [{"id": i, "tags": ["a"], "note": None if i % 2 else "x"} for i in range(3000)]
+    array = tmp_path / "records.json"
+    array.write_text(json.dumps(records))
+    wrapped = tmp_path / "fixture.json"
+    wrapped.write_text(json.dumps({"version": 2, "meta": {"source": "seed"}, "items": records}))
+
+    summary = extract_data_file(array)
+    assert summary is not None and summary.startswith("# Data file (JSON array): 3,000 records")
+    assert "id (integer), tags (array), note (null|string)" in summary
+
+    summary = extract_data_file(wrapped)
+    assert summary is not None and summary.startswith("# Data file (JSON object): 3 top-level keys")
+    assert '# "version": integer 2' in summary
+    assert '# "meta": object with 1 keys (source)' in summary
+    assert '# "items": array of 3,000 records' in summary
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 7, 4096])
+def test_json_stream_skips_values_without_decoding_them(chunk_chars: int):
+    document = {
+        "skipped": {"text": 'a "quoted" ] } \\ value', "nested": [[1, {"b": "["}], "\\"], "n": -1.5e3},
+        "number": 12345,
+        "kept": ["x", {"y": None}],
+    }
+    stream = JsonStream(io.StringIO(json.dumps(document)), chunk_chars)
+
+    decoded = {}
+    for key in stream.members():
+        if key == "kept":
+            decoded[key] = stream.value()
+        else:
+            stream.skip_value()
+    assert decoded == {"kept": ["x", {"y": None}]}
+    assert stream.peek() == ""
+
+    with pytest.raises(ValueError):
+        JsonStream(io.StringIO('{"a": [1, 2'), chunk_chars).skip_value()
+
+
+def test_json_keyed_records_are_streamed_and_nested_values_cut_short(tmp_path: Path):
+    path = tmp_path / "export.json"
+    records = {f"id_{i}": {"name": f"user {i}", "history": list(range(500))} for i in range(2000)}
+    path.write_text(json.dumps({"users": records, "total": 2000}))
+
+    summary = extract_data_file(path)
+
+    assert summary is not None
+    assert '# "users": object of 2,000 keyed records; fields: name (string), history (array)' in summary
+    assert '"id_0": {"name": "user 0", "history": [0, 1,' in summary
+    assert '"... 480 more"' in summary
+    assert '# "total": integer 2000' in summary
+
+
+def test_ndjson_counts_lines_and_reports_optional_fields(tmp_path: Path):
+    path = tmp_path / "events.jsonl"
+    lines = [json.dumps({"event": "click", "at": i} | ({"user": "u"} if i % 2 else {})) for i in range(4000)]
+    path.write_text("\n".join(lines) + "\n\n")
+
+    summary = extract_data_file(path)
+
+    assert summary is not None and summary.startswith("# Data file (JSON Lines): 4,000 records")
+    assert "event (string), at (integer), user (string, optional)" in summary
+    assert summary.count('"event": "click"') == 5
+
+
+def test_yaml_sequence_and_mapping_fixtures(tmp_path: Path):
+    sequence = tmp_path / "users.yaml"
+    sequence.write_text(
+        "# seed users\n" + "".join(f"- id: {i}\n  name: user {i}\n  roles:\n    - admin\n" for i in range(2000))
+    )
+    mapping = tmp_path / "config.yml"
+    mapping.write_text("".join(f"service_{i}:\n  image: app:{i}\n  port: {8000 + i}\n" for i in range(3000)))
+
+    summary = extract_data_file(sequence)
+    assert summary is not None and "root sequence of 2,000 entries" in summary
+    assert "# Item keys: id, name, roles" in summary
+    assert "- id: 4\n" in summary and "- id: 5\n" not in summary
+
+    summary = extract_data_file(mapping)
+    assert summary is not None and "root mapping of 3,000 entries" in summary
+    assert "# Entry keys: image, port" in summary
+
+
+def test_small_and_malformed_files_are_left_to_plain_reads(tmp_path: Path):
+    small = _csv(tmp_path / "small.csv", 3)
+    broken = tmp_path / "broken.json"
+    broken.write_text("{" + '"a": 1,' * 20_000)
+
+    assert extract_data_file(small) is None
+    assert extract_data_file(broken) is None
+    assert extract_data_file(tmp_path / "notes.txt") is None
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zz(value: int) -> bytes:
+    return _varint((value << 1) ^ (value >> 63))
+
+
+def _struct(fields: list[tuple[int, int, bytes]]) -> bytes:
+    out = bytearray()
+    last = 0
+    for field_id, kind, payload in fields:
+        out.append(((field_id - last) << 4) | kind)
+        out += payload
+        last = field_id
+    return bytes(out + b"\x00")
+
+
+def _string(text: str) -> bytes:
+    return _varint(len(text)) + text.encode()
+
+
+def _list(kind: int, items: list[bytes]) -> bytes:
+    return bytes([(len(items) << 4) | kind]) + b"".join(items)
+
+
+def _parquet(path: Path) -> Path:
+    schema = [
+        _struct([(4, 8, _string("schema")), (5, 5, _zz(2))]),
+        _struct([(1, 5, _zz(2)), (3, 5, _zz(0)), (4, 8, _string("id"))]),
+        _struct([(1, 5, _zz(6)), (3, 5, _zz(1)), (4, 8, _string("name")), (6, 5, _zz(0))]),
+    ]
+    footer = _struct(
+        [
+            (1, 5, _zz(1)),
+            (2, 9, _list(12, schema)),
+            (3, 6, _zz(1_250_000)),
+            (4, 9, _list(12, [_struct([]), _struct([])])),
+            (6, 8, _string("parquet-cpp version 14")),
+        ]
+    )
+    path.write_bytes(b"PAR1" + b"\x00" * 64 + footer + len(footer).to_bytes(4, "little") + b"PAR1")
+    return path
+
+
+def test_parquet_footer_metadata(tmp_path: Path):
+    summary = extract_data_file(_parquet(tmp_path / "events.parquet"))
+
+    assert summary is not None
+    assert summary.startswith("# Data file (Parquet): 1,250,000 rows in 2 row groups, 2 columns")
+    assert "# Columns: id (INT64, required), name (BYTE_ARRAY UTF8, optional)" in summary
+    assert "# Created by: parquet-cpp version 14" in summary
+
+    (tmp_path / "bad.parquet").write_bytes(b"PAR1 not really")
+    assert extract_data_file(tmp_path / "bad.parquet") is None
+
+
+@pytest.mark.parametrize("name", ["users.csv", "events.parquet"])
+def test_phase3_loading_and_retriever_summarize_data_files(tmp_path: Path, name: str):
+    path = _csv(tmp_path / name, 5000) if name.endswith(".csv") else _parquet(tmp_path / name)
+
+    loaded = read_project_file(tmp_path, name)
+    retrieved, sniffed = read_text_file(path, 1_000_000)
+
+    assert loaded is not None and loaded.startswith("# Data file")
+    assert retrieved == loaded
+    assert not sniffed.flagged
+
+
+def test_phase3_loading_falls_back_when_extraction_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = _csv(tmp_path / "users.csv", 5000)
+
+    def _broken(path: Path, max_chars: int) -> str:
+        raise RecursionError("too deep")
+
+    monkeypatch.setattr(file_loader, "extract_content", _broken)
+
+    loaded = read_project_file(tmp_path, path.name, max_bytes=200)
+    assert loaded is not None and loaded.startswith("id,name,score")
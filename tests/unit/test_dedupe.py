@@ -0,0 +1,78 @@
+from agentrules.core.analysis.context_packing import pack_agent_requests
+from agentrules.core.analysis.context_reduction import ContextOptions, duplicate_references, reduce_file_contents
+from agentrules.core.utils.dedupe import (
+    content_digest,
+    find_identical,
+    find_near_duplicates,
+    minhash_signature,
+    unified_diff_text,
+)
+
+BASE = "".join(f"def handler_{index}(request):\n    return respond(request, {index})\n\n" for index in range(40))
+VARIANT = BASE.replace("respond(request, 7)", "respond(request, 700)")
+
+
+def test_identical_files_map_to_the_first_copy():
+    contents = {"a/config.py": BASE, "b/config.py": BASE, "c/empty.py": "", "d/empty.py": "", "e.py": VARIANT}
+
+    assert content_digest(BASE) == content_digest(BASE) != content_digest(VARIANT)
+    assert find_identical(contents) == {"b/config.py": "a/config.py"}
+
+
+def test_minhash_similarity_separates_near_and_unrelated_files():
+    unrelated = "".join(f"class Model{index}:\n    field = {index}\n" for index in range(60))
+
+    assert minhash_signature(BASE).similarity(minhash_signature(BASE)) == 1.0
+    assert minhash_signature(BASE).similarity(minhash_signature(VARIANT)) > 0.8
+    assert minhash_signature(BASE).similarity(minhash_signature(unrelated)) < 0.2
+    assert find_near_duplicates({"a.py": BASE, "b.py": VARIANT, "c.py": unrelated}) == {"b.py": "a.py"}
+
+
+def test_unified_diff_only_carries_changed_lines():
+    diff = unified_diff_text("a.py", BASE, "b.py", VARIANT)
+
+    assert diff.startswith("--- a.py\n+++ b.py\n")
+    assert "-    return respond(request, 7)\n+    return respond(request, 700)\n" in diff
+    assert "handler_30" not in diff
+
+
+def test_reduction_sends_repeated_files_once():
+    contents = {"a.py": BASE, "b.py": BASE, "c.py": VARIANT}
+
+    reduced, reductions = reduce_file_contents({"name": "A"}, contents, ContextOptions())
+
+    assert reduced["a.py"] == BASE and reduced["c.py"] == VARIANT
+    assert reduced["b.py"] == "[identical to a.py]"
+    assert [(reduction.path, reduction.method) for reduction in reductions] == [("b.py", "dedupe")]
+
+    reduced, reductions = reduce_file_contents({"name": "A"}, contents, ContextOptions(near_duplicates=True))
+
+    assert reduced["c.py"].startswith("[near-duplicate of a.py; unified diff against it follows]\n--- a.py")
+    assert {reduction.path: reduction.method for reduction in reductions} == {
+        "b.py": "dedupe",
+        "c.py": "near-duplicate",
+    }
+    assert reduce_file_contents({"name": "A"}, contents, ContextOptions(dedupe=False))[0] == contents
+
+
+def test_files_other_files_point_to_are_never_outlined():
+    contents = {"a/util.py": BASE, "b/util.py": BASE, "c/util.py": VARIANT, "d/other.py": BASE.replace("handler", "h")}
+    options = ContextOptions(outline=True, outline_threshold_bytes=1, keep_full_files=0, near_duplicates=True)
+
+    reduced, _ = reduce_file_contents({"name": "A"}, contents, options)
+
+    assert reduced["a/util.py"] == BASE
+    assert reduced["b/util.py"] == "[identical to a/util.py]"
+    assert reduced["c/util.py"].startswith("[near-duplicate of a/util.py;")
+    assert duplicate_references(reduced) == {"b/util.py": "a/util.py", "c/util.py": "a/util.py"}
+
+
+def test_split_requests_keep_duplicates_with_their_original():
+    contents = {"a.py": "a" * 4000, "b.py": "b" * 3600, "c.py": "c" * 3200, "d.py": "[identical to c.py]"}
+    agent = {"id": "agent_1", "name": "A", "description": "d", "file_assignments": list(contents)}
+
+    requests = pack_agent_requests(agent, [], contents, token_budget=2_400)
+
+    assert len(requests) == 2
+    holder = next(request for request in requests if "d.py" in request.file_contents)
+    assert "c.py" in holder.file_contents
@@ -0,0 +1,174 @@
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+from agentrules.core.distributed import SqliteTaskQueue, TaskCoordinator, coordinator, open_task_queue, run_worker
+from tests.utils.offline_stubs import patch_factory_offline
+
+
+def test_sqlite_queue_claims_by_priority_and_reports_outcomes(tmp_path: Path):
+    queue = SqliteTaskQueue(tmp_path / "queue.db")
+    queue.enqueue("run", "small", {"n": 1}, priority=1)
+    queue.enqueue("run", "large", {"n": 2}, priority=10)
+
+    first = queue.claim("w1")
+    second = queue.claim("w2")
+    assert first is not None and second is not None
+    assert (first.task_id, second.task_id) == ("large", "small")
+    assert first.payload == {"n": 2}
+    assert queue.claim("w3") is None
+
+    queue.complete("large", {"findings": "ok"})
+    queue.fail("small", "boom")
+    outcomes = queue.fetch_outcomes(["large", "small", "missing"])
+    assert outcomes["large"].succeeded and outcomes["large"].result == {"findings": "ok"}
+    assert not outcomes["small"].succeeded and outcomes["small"].error == "boom"
+    assert "missing" not in outcomes
+
+    queue.purge_run("run")
+    assert queue.fetch_outcomes(["large"]) == {}
+
+
+def test_sqlite_queue_reclaims_expired_leases_until_max_attempts(tmp_path: Path):
+    queue = SqliteTaskQueue(tmp_path / "queue.db", max_attempts=2)
+    queue.enqueue("run", "task", {})
+
+    first = queue.claim("w1", lease_seconds=0.01)
+    time.sleep(0.02)
+    retried = queue.claim("w2", lease_seconds=0.01)
+    assert first is not None and retried is not None
+    assert retried.attempts == 2
+
+    time.sleep(0.02)
+    assert queue.claim("w3") is None
+    assert queue.fetch_outcomes(["task"])["task"].succeeded is False
+
+
+def test_sqlite_queue_only_accepts_outcomes_from_the_lease_holder(tmp_path: Path):
+    queue = SqliteTaskQueue(tmp_path / "queue.db", max_attempts=3)
+    queue.enqueue("run", "task", {})
+
+    first = queue.claim("w1", lease_seconds=0.05)
+    assert first is not None and queue.renew("task", "w1", lease_seconds=0.05)
+    assert not queue.renew("task", "w2")
+    time.sleep(0.06)
+    retried = queue.claim("w2")
+    assert retried is not None and retried.attempts == 2
+
+    # The first worker's lease expired and the task moved on; its late outcome is discarded
+    assert not queue.renew("task", "w1")
+    assert not queue.complete("task", {"findings": "late"}, worker_id="w1")
+    assert not queue.fail("task", "late", worker_id="w1")
+    assert queue.fetch_outcomes(["task"]) == {}
+    assert queue.complete("task", {"findings": "ok"}, worker_id="w2")
+    assert queue.fetch_outcomes(["task"])["task"].result == {"findings": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_worker_renews_the_lease_of_long_running_tasks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    queue = SqliteTaskQueue(tmp_path / "queue.db", max_attempts=1)
+    queue.enqueue("run", "task", {"agent": {"name": "Slow Agent"}})
+    claims_while_running: list[object] = []
+
+    async def slow_agent(payload):
+        for _ in range(5):
+            await asyncio.sleep(0.05)
+            claims_while_running.append(queue.claim("other", lease_seconds=0.05))
+        return {"findings": "done"}
+
+    monkeypatch.setattr(coordinator, "run_agent_payload", slow_agent)
+    processed = await run_worker(queue, lease_seconds=0.06, poll_interval=0.01, exit_when_idle=True)
+
+    assert processed == 1
+    assert claims_while_running == [None] * 5
+    outcome = queue.fetch_outcomes(["task"])["task"]
+    assert outcome.succeeded and outcome.result == {"findings": "done"}
+
+
+def test_open_task_queue_parses_sqlite_locations(tmp_path: Path):
+    queue = open_task_queue(f"sqlite://{tmp_path / 'a.db'}")
+    assert isinstance(queue, SqliteTaskQueue)
+    assert queue.path == tmp_path / "a.db"
+    assert isinstance(open_task_queue(str(tmp_path / "b.db")), SqliteTaskQueue)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_raises_for_failed_tasks(tmp_path: Path):
+    queue = SqliteTaskQueue(tmp_path / "queue.db")
+    coordinator = TaskCoordinator(queue, poll_interval=0.01)
+
+    async def fail_next() -> None:
+        while (task := queue.claim("w")) is None:
+            await asyncio.sleep(0.01)
+        queue.fail(task.task_id, "worker exploded")
+
+    failer = asyncio.create_task(fail_next())
+    with pytest.raises(RuntimeError, match="worker exploded"):
+        await coordinator.run("run", "run:agent", {"agent": {}, "context": {}})
+    await failer
+    await coordinator.close("run")
+
+
+@pytest.mark.asyncio
+async def test_coordinator_retries_failed_polls_then_fails_waiters(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    queue = SqliteTaskQueue(tmp_path / "queue.db")
+    fetch_outcomes = queue.fetch_outcomes
+    calls = {"count": 0}
+
+    def flaky(task_ids):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return fetch_outcomes(task_ids)
+
+    monkeypatch.setattr(queue, "fetch_outcomes", flaky)
+    coordinator = TaskCoordinator(queue, poll_interval=0.01, max_poll_failures=3)
+
+    async def complete_next() -> None:
+        while (task := queue.claim("w")) is None:
+            await asyncio.sleep(0.01)
+        queue.complete(task.task_id, {"findings": "ok"})
+
+    completer = asyncio.create_task(complete_next())
+    assert await coordinator.run("run", "run:a", {"agent": {}, "context": {}}) == {"findings": "ok"}
+    await completer
+
+    def broken(task_ids):
+        raise sqlite3.DatabaseError("file is not a database")
+
+    monkeypatch.setattr(queue, "fetch_outcomes", broken)
+    with pytest.raises(RuntimeError, match="task queue polling failed"):
+        await asyncio.wait_for(coordinator.run("run", "run:b", {"agent": {}, "context": {}}), 5)
+    await coordinator.close("run")
+
+
+@pytest.mark.asyncio
+async def test_phase3_dispatches_agents_to_workers(tmp_path: Path):
+    patch_factory_offline()
+    (tmp_path / "a.py").write_text("print('a')")
+    (tmp_path / "b.py").write_text("print('b')")
+    queue = SqliteTaskQueue(tmp_path / "queue.db")
+    plan = {
+        "agents": [
+            {"id": "agent_1", "name": "Alpha Agent", "description": "alpha", "file_assignments": ["a.py"]},
+            {"id": "agent_2", "name": "Beta Agent", "description": "beta", "file_assignments": ["b.py"]},
+        ]
+    }
+
+    phase3 = Phase3Analysis(task_queue=queue)
+    phase3_task = asyncio.create_task(phase3.run(plan, ["a.py", "b.py"], tmp_path))
+    processed = 0
+    while not phase3_task.done():
+        processed += await run_worker(queue, concurrency=2, poll_interval=0.01, exit_when_idle=True)
+        await asyncio.sleep(0.01)
+    result = await phase3_task
+
+    assert processed == 2
+    assert [finding["agent"] for finding in result["findings"]] == ["Alpha Agent", "Beta Agent"]
+    # Results are purged from the queue once the coordinator has collected them.
+    with sqlite3.connect(queue.path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 0
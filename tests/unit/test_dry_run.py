@@ -0,0 +1,176 @@
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.analysis.context_reduction import ContextOptions
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+from agentrules.core.pipeline.config import EffectiveExclusions, PipelineSettings
+from agentrules.core.pipeline.dry_run import (
+    build_dry_run_report,
+    deterministic_plan,
+    projected_makespan,
+    tree_file_paths,
+)
+from agentrules.core.pipeline.snapshot import build_project_snapshot
+
+MODELS = {phase: "gemini-2.5-flash" for phase in ("phase1", "phase2", "phase3", "phase4", "phase5", "final")}
+
+
+def _settings(root: Path) -> PipelineSettings:
+    return PipelineSettings(
+        target_directory=root,
+        tree_max_depth=5,
+        respect_gitignore=False,
+        effective_exclusions=EffectiveExclusions(frozenset(), frozenset(), frozenset()),
+    )
+
+
+def _project(root: Path) -> None:
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "pkg" / "sub" / "deep.py").write_text("x = 1\n" * 50)
+    (root / "pkg" / "mod.py").write_text("def f():\n    return 1\n")
+    (root / "docs").mkdir()
+    (root / "docs" / "guide.md").write_text("# Guide\n")
+    (root / "main.py").write_text("print('hi')\n")
+
+
+def test_tree_file_paths_recovers_nested_paths(tmp_path: Path):
+    _project(tmp_path)
+    snapshot = build_project_snapshot(_settings(tmp_path))
+
+    assert sorted(tree_file_paths(snapshot.tree)) == ["docs/guide.md", "main.py", "pkg/mod.py", "pkg/sub/deep.py"]
+
+
+def test_deterministic_plan_groups_by_top_level_directory():
+    tree = ["├── 📁 pkg", "│   ├── 🐍 a.py", "│   └── 🐍 b.py", "├── 📁 docs", "│   └── 📝 x.md", "└── 🐍 main.py"]
+
+    agents = deterministic_plan(tree, max_agents=2)
+
+    assert [agent["file_assignments"] for agent in agents] == [["pkg/a.py", "pkg/b.py"], ["main.py", "docs/x.md"]]
+
+
+def test_projected_makespan_respects_concurrency_cap():
+    assert projected_makespan([4, 3, 2, 1], None) == 4
+    assert projected_makespan([4, 3, 2, 1], 2) == 5
+    assert projected_makespan([4, 3, 2, 1], 1) == 10
+    assert projected_makespan([], 3) == 0
+
+
+def test_dry_run_measures_phase3_prompts_without_model_calls(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    _project(tmp_path)
+    settings = _settings(tmp_path)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("dry run must not create architects")
+
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", _fail)
+    report = build_dry_run_report(
+        settings,
+        build_project_snapshot(settings),
+        researcher_enabled=False,
+        phase3_max_concurrency=1,
+        model_names=MODELS,
+    )
+
+    assert report.plan_source == "deterministic"
+    assert [phase.phase for phase in report.phases] == ["phase1", "phase2", "phase3", "phase4", "phase5", "final"]
+    phase3 = report.phase("phase3")
+    assert phase3.file_count == 4
+    assert phase3.input_bytes > len("x = 1\n" * 50)
+    assert phase3.wall_seconds == pytest.approx(sum(call.seconds for call in phase3.calls))
+    assert report.cost is not None and report.cost > 0
+    assert len(report.phase("phase1").calls) == 3
+
+
+def test_dry_run_prefers_cached_phase2_plan(tmp_path: Path):
+    _project(tmp_path)
+    (tmp_path / "phases_output").mkdir()
+    (tmp_path / "phases_output" / "phase2_planning.md").write_text(
+        '<analysis_plan>\n<agent_1 name="Core Agent">\n<description>Core</description>\n'
+        "<file_assignments>\n<file_path>pkg/mod.py</file_path>\n</file_assignments>\n</agent_1>\n</analysis_plan>\n"
+    )
+    settings = _settings(tmp_path)
+
+    report = build_dry_run_report(
+        settings,
+        build_project_snapshot(settings),
+        researcher_enabled=False,
+        model_names={**MODELS, "phase3": "unpriced-model"},
+    )
+
+    assert report.plan_source.startswith("cached")
+    assert [call.label for call in report.phase("phase3").calls] == ["Core Agent"]
+    assert report.phase("phase3").cost is None and report.cost is None
+
+
+def test_dry_run_follows_the_configured_phase2_planning(tmp_path: Path):
+    _project(tmp_path)
+    settings = _settings(tmp_path)
+    snapshot = build_project_snapshot(settings)
+
+    def _report(planning: str):
+        return build_dry_run_report(
+            settings, snapshot, researcher_enabled=False, model_names=MODELS, phase2_planning=planning
+        )
+
+    model, structured, local = _report("model"), _report("structured"), _report("local")
+
+    assert model.plan_source == structured.plan_source == "deterministic"
+    assert structured.phase("phase2").input_tokens > model.phase("phase2").input_tokens
+    assert local.plan_source == "local file groups"
+    assert local.phase("phase2").calls == ()
+    assert local.phase("phase3").file_count == 3  # Clusters hold source files only
+
+
+def test_dry_run_prices_tool_access_with_the_manifest_prompt(tmp_path: Path):
+    _project(tmp_path)
+    (tmp_path / "pkg" / "big.py").write_text("value = 'x'\n" * 20_000)
+    settings = _settings(tmp_path)
+    snapshot = build_project_snapshot(settings)
+
+    inline = build_dry_run_report(settings, snapshot, researcher_enabled=False, model_names=MODELS)
+    tools = build_dry_run_report(
+        settings,
+        snapshot,
+        researcher_enabled=False,
+        model_names=MODELS,
+        context_options=ContextOptions(tool_access=True),
+    )
+
+    assert tools.phase("phase3").file_count == inline.phase("phase3").file_count == 5
+    assert tools.phase("phase3").input_tokens * 10 < inline.phase("phase3").input_tokens
+
+
+@pytest.mark.asyncio
+async def test_phase3_honours_max_concurrency(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    import asyncio
+
+    running = 0
+    peak = 0
+
+    class _Architect:
+        async def analyze(self, context):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"agent": context["agent_name"], "findings": "ok"}
+
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", lambda *a, **k: _Architect())
+    monkeypatch.setattr(Phase3Analysis, "_get_file_contents", lambda self, d, files: _contents(files))
+    plan = {
+        "agents": [
+            {"id": f"agent_{i}", "name": f"Agent {i}", "description": "d", "file_assignments": [f"{i}.py"]}
+            for i in range(1, 5)
+        ]
+    }
+
+    result = await Phase3Analysis(max_concurrency=2).run(plan, [], tmp_path)
+
+    assert len(result["findings"]) == 4
+    assert peak == 2
+
+
+async def _contents(files):
+    return {path: "" for path in files}
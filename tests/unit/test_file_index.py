@@ -0,0 +1,88 @@
+import hashlib
+from pathlib import Path
+
+from pathspec import PathSpec
+
+from agentrules.core.analysis.phase_3 import resolve_agent_definitions
+from agentrules.core.utils.dependency_scanner import collect_dependency_info
+from agentrules.core.utils.file_system.file_index import build_file_index
+from agentrules.core.utils.file_system.file_loader import resolve_project_file
+from agentrules.core.utils.file_system.tree_generator import (
+    DEFAULT_EXCLUDE_DIRS,
+    DEFAULT_EXCLUDE_PATTERNS,
+    generate_tree,
+    get_project_tree,
+)
+
+
+def _make_project(root: Path) -> None:
+    (root / "src" / "pkg" / "deep" / "deeper").mkdir(parents=True)
+    (root / "src" / "pkg" / "__init__.py").write_text("")
+    (root / "src" / "pkg" / "core.py").write_text("print('core')\n")
+    (root / "src" / "pkg" / "deep" / "deeper" / "leaf.py").write_text("leaf")
+    (root / "web").mkdir()
+    (root / "web" / "app.ts").write_text("export {}")
+    (root / "web" / "bundle.min.js").write_text("x")
+    (root / "node_modules" / "lib").mkdir(parents=True)
+    (root / "node_modules" / "lib" / "index.js").write_text("x")
+    (root / "logo.png").write_bytes(b"\x89PNG")
+    (root / "README.md").write_text("# demo")
+    (root / "requirements.txt").write_text("requests==2.0\n")
+    (root / "ignored.log").write_text("log")
+    (root / ".gitignore").write_text("*.log\n")
+
+
+def test_render_tree_matches_generate_tree(tmp_path: Path):
+    _make_project(tmp_path)
+    spec = PathSpec.from_lines("gitwildmatch", ["*.log"])
+
+    for depth in (1, 3, 5):
+        index = build_file_index(tmp_path, max_depth=depth, gitignore_spec=spec)
+        expected = generate_tree(tmp_path, max_depth=depth, gitignore_spec=spec, root=tmp_path)
+        assert index.render_tree() == expected
+        assert get_project_tree(tmp_path, file_index=index) == get_project_tree(
+            tmp_path, max_depth=depth, gitignore_spec=spec
+        )
+
+    index = build_file_index(tmp_path)
+    hidden = DEFAULT_EXCLUDE_DIRS | {"web"}
+    assert index.render_tree(exclude_dirs=hidden) == generate_tree(
+        tmp_path, exclude_dirs=hidden, exclude_patterns=DEFAULT_EXCLUDE_PATTERNS, root=tmp_path
+    )
+
+
+def test_entries_record_metadata_and_lazy_hashes(tmp_path: Path):
+    _make_project(tmp_path)
+    index = build_file_index(tmp_path)
+
+    core = index.get("./src/pkg/core.py")
+    assert core is not None and core.language == "python" and core.size == len("print('core')\n")
+    assert index.get("web/app.ts").language == "typescript"
+    assert index.get("web/bundle.min.js").is_generated
+    assert index.get("logo.png").is_binary
+    assert index.get("requirements.txt").excluded
+    assert "node_modules/lib/index.js" not in index
+
+    assert sorted(entry.path for entry in index.source_files()) == [
+        "src/pkg/__init__.py",
+        "src/pkg/core.py",
+        "src/pkg/deep/deeper/leaf.py",
+        "web/app.ts",
+    ]
+    expected_hash = hashlib.sha256(b"print('core')\n").hexdigest()
+    assert index.content_hash("src/pkg/core.py") == expected_hash
+    assert index.content_hash("missing.py") is None
+
+
+def test_consumers_use_the_index(tmp_path: Path):
+    _make_project(tmp_path)
+    index = build_file_index(tmp_path)
+
+    agents = resolve_agent_definitions({}, [], index)
+    assert agents[0]["file_assignments"] == [entry.path for entry in index.source_files()]
+
+    assert resolve_project_file(tmp_path, "./web/app.ts", index) == tmp_path / "web" / "app.ts"
+    assert resolve_project_file(tmp_path, str(tmp_path / "README.md"), index) == tmp_path / "README.md"
+
+    info = collect_dependency_info(tmp_path, file_index=index)
+    assert [Path(manifest["path"]).name for manifest in info["manifests"]] == ["requirements.txt"]
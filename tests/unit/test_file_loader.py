@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+from agentrules.core.utils.file_system import file_loader
+from agentrules.core.utils.file_system.file_loader import AsyncFileLoader
+
+
+@pytest.mark.asyncio
+async def test_loader_reads_each_path_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    (tmp_path / "a.py").write_text("a")
+    (tmp_path / "b.py").write_text("b")
+    reads: list[str] = []
+    original = file_loader.read_project_file
+
+    def _counting(directory: Path, file_path: str):
+        reads.append(file_path)
+        return original(directory, file_path)
+
+    monkeypatch.setattr(file_loader, "read_project_file", _counting)
+
+    async with AsyncFileLoader(tmp_path, max_workers=2) as loader:
+        first, second = await asyncio.gather(loader.load(["a.py", "b.py"]), loader.load(["./a.py", "a.py", "missing.py"]))
+        third = await loader.load(["b.py"])
+
+    assert first == {"a.py": "a", "b.py": "b"}
+    assert second == {"./a.py": "a", "a.py": "a"}
+    assert third == {"b.py": "b"}
+    assert sorted(reads) == ["./a.py", "a.py", "b.py", "missing.py"]
+
+
+@pytest.mark.asyncio
+async def test_phase3_dispatches_agents_as_their_files_become_ready(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    (tmp_path / "fast.py").write_text("fast")
+    (tmp_path / "slow.py").write_text("slow")
+    release_slow = threading.Event()
+    original = file_loader.read_project_file
+    dispatched: list[str] = []
+
+    def _read(directory: Path, file_path: str):
+        if file_path == "slow.py":
+            release_slow.wait(timeout=5)
+        return original(directory, file_path)
+
+    class _Architect:
+        async def analyze(self, context):
+            dispatched.append(context["agent_name"])
+            if context["agent_name"] == "Fast":
+                release_slow.set()
+            return {"agent": context["agent_name"], "files": sorted(context["file_contents"])}
+
+    monkeypatch.setattr(file_loader, "read_project_file", _read)
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", lambda *a, **k: _Architect())
+    plan = {
+        "agents": [
+            {"id": "agent_1", "name": "Slow", "description": "d", "file_assignments": ["slow.py", "fast.py"]},
+            {"id": "agent_2", "name": "Fast", "description": "d", "file_assignments": ["fast.py"]},
+        ]
+    }
+
+    result = await Phase3Analysis().run(plan, [], tmp_path)
+
+    assert dispatched == ["Fast", "Slow"]
+    assert result["findings"][0] == {"agent": "Slow", "files": ["fast.py", "slow.py"]}
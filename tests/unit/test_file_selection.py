@@ -0,0 +1,153 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.analysis.context_reduction import ContextOptions
+from agentrules.core.analysis.file_selection import (
+    git_churn,
+    import_counts,
+    is_entry_point,
+    score_files,
+    select_files,
+)
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+from agentrules.core.pipeline.config import EffectiveExclusions, PipelineSettings
+from agentrules.core.pipeline.dry_run import build_dry_run_report
+from agentrules.core.pipeline.snapshot import build_project_snapshot
+
+CONTENTS = {
+    "pkg/models.py": "class Model:\n    pass\n" * 20,
+    "pkg/views.py": "from pkg.models import Model\n" + "x = 1\n" * 200,
+    "pkg/api.py": "from pkg.models import Model\nfrom pkg import views\n" + "y = 2\n" * 50,
+    "pkg/notes.py": "# mentions models in a comment only\n" + "z = 3\n" * 400,
+    "pkg/cli.py": "def run():\n    pass\n",
+}
+
+
+def test_import_counts_only_follow_import_statements():
+    counts = import_counts(CONTENTS)
+
+    assert counts["pkg/models.py"] == 2
+    assert counts["pkg/views.py"] == 1
+    assert counts["pkg/notes.py"] == 0
+
+
+def test_entry_points_are_recognized_by_name_or_main_guard():
+    assert is_entry_point("pkg/cli.py")
+    assert is_entry_point("src/index.ts")
+    assert is_entry_point("tools/run.py", 'if __name__ == "__main__":\n    run()\n')
+    assert not is_entry_point("pkg/models.py", "class Model: ...\n")
+
+
+def test_scores_combine_centrality_churn_entry_points_and_size():
+    scores = {score.path: score for score in score_files(CONTENTS, churn={"pkg/notes.py": 9})}
+
+    assert scores["pkg/models.py"].importers == 2
+    assert scores["pkg/notes.py"].commits == 9
+    assert scores["pkg/cli.py"].entry_point
+    assert scores["pkg/models.py"].score > scores["pkg/views.py"].score > 0
+
+
+def test_selection_fills_the_budget_greedily_and_explains_omissions():
+    scores = {score.path: score for score in score_files(CONTENTS)}
+    budget = scores["pkg/models.py"].tokens + scores["pkg/cli.py"].tokens + scores["pkg/api.py"].tokens
+
+    selection = select_files({"name": "A"}, CONTENTS, token_budget=budget)
+
+    assert list(selection.contents) == ["pkg/models.py", "pkg/api.py", "pkg/cli.py"]
+    assert selection.kept_tokens <= budget
+    assert [item.path for item in selection.omitted] == ["pkg/views.py", "pkg/notes.py"]
+    assert "needs ~" in selection.omitted[0].reason and "left in the budget" in selection.omitted[0].reason
+    assert not select_files({"name": "A"}, CONTENTS, token_budget=10**6).omitted
+
+
+def test_git_churn_counts_commits_per_file(tmp_path: Path):
+    def git(*args: str) -> None:
+        subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+    try:
+        git("init", "-q")
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("git is not available")
+    git("config", "user.email", "dev@example.com")
+    git("config", "user.name", "Dev")
+    (tmp_path / "sub").mkdir()
+    for round_ in range(3):
+        (tmp_path / "sub" / "hot.py").write_text(f"x = {round_}\n")
+        if round_ == 0:
+            (tmp_path / "sub" / "cold.py").write_text("y = 1\n")
+        git("add", ".")
+        git("commit", "-q", "-m", f"change {round_}")
+
+    assert git_churn(tmp_path / "sub") == {"hot.py": 3, "cold.py": 1}
+    assert git_churn(tmp_path.parent / "missing") == {}
+
+
+def test_dry_run_reports_omitted_files(tmp_path: Path):
+    for path, text in CONTENTS.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    settings = PipelineSettings(
+        target_directory=tmp_path,
+        tree_max_depth=5,
+        respect_gitignore=False,
+        effective_exclusions=EffectiveExclusions(frozenset(), frozenset(), frozenset()),
+    )
+
+    report = build_dry_run_report(
+        settings,
+        build_project_snapshot(settings),
+        researcher_enabled=False,
+        context_options=ContextOptions(agent_token_budget=300),
+    )
+
+    assert {item.path for item in report.omitted} >= {"pkg/notes.py", "pkg/views.py"}
+    assert report.phase("phase3").file_count < len(CONTENTS)
+
+
+@pytest.mark.asyncio
+async def test_phase3_sends_only_selected_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    for path, text in CONTENTS.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    seen: dict[str, list[str]] = {}
+
+    class _Architect:
+        async def analyze(self, context):
+            seen["files"] = list(context["file_contents"])
+            seen["assigned"] = list(context["assigned_files"])
+            return {"agent": context["agent_name"], "findings": "ok"}
+
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", lambda *a, **k: _Architect())
+    plan = {"agents": [{"id": "agent_1", "name": "A", "description": "d", "file_assignments": list(CONTENTS)}]}
+
+    await Phase3Analysis(context_options=ContextOptions(agent_token_budget=300)).run(plan, [], tmp_path)
+
+    assert "pkg/models.py" in seen["files"] and "pkg/notes.py" not in seen["files"]
+    assert seen["assigned"] == seen["files"]
+
+
+@pytest.mark.asyncio
+async def test_phase3_never_keeps_a_dedupe_stub_without_its_original(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    util = "def helper(value):\n    return value * 2\n" * 30
+    files = {"a/util.py": util, "b/util.py": util, "c.py": "print('c')\n"}
+    for path, text in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    seen: dict[str, str] = {}
+
+    class _Architect:
+        async def analyze(self, context):
+            seen.update(context["file_contents"])
+            return {"agent": context["agent_name"], "findings": "ok"}
+
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", lambda *a, **k: _Architect())
+    plan = {"agents": [{"id": "agent_1", "name": "A", "description": "d", "file_assignments": list(files)}]}
+
+    await Phase3Analysis(context_options=ContextOptions(agent_token_budget=200)).run(plan, [], tmp_path)
+
+    assert "c.py" in seen
+    for text in seen.values():
+        if text.startswith("[identical to "):
+            assert text[len("[identical to ") : -1] in seen
@@ -0,0 +1,46 @@
+import base64
+import codecs
+from pathlib import Path
+
+from agentrules.core.utils.file_system.file_loader import read_project_file
+from agentrules.core.utils.file_system.file_retriever import get_filtered_formatted_contents
+from agentrules.core.utils.file_system.file_sniffer import decode_bytes, sniff_content, sniff_file
+
+FIXTURES = Path(__file__).resolve().parents[1]
+
+
+def test_sniffing_flags_binary_minified_encoded_and_generated_content():
+    assert sniff_content(b"def f():\n    return 1\n" * 200).kind == "text"
+    assert sniff_content(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR").kind == "binary"
+    assert sniff_content(b"!function(e){return e+1};var t=" * 200).kind == "minified"
+    blob = b'LOGO = "' + base64.b64encode(bytes(range(256)) * 12) + b'"\n'
+    assert sniff_content(blob).kind == "encoded"
+    assert sniff_content(b"// Code generated by protoc-gen-go. DO NOT EDIT.\npackage pb\n").kind == "generated"
+    assert sniff_content(b'{"version":3,"sources":["a.ts"],"mappings":"AAAA"}').kind == "generated"
+    # A UTF-16 BOM explains the NUL bytes
+    assert sniff_content(codecs.BOM_UTF16_LE + "text".encode("utf-16-le")).kind == "text"
+
+
+def test_json_with_long_prose_values_is_not_minified():
+    # Single-line phase results: long lines, but prose strings full of spaces
+    for fixture in ("phase_3_test/output/phase3_results.json", "phase_5_test/test5_input.json"):
+        assert sniff_file(FIXTURES / fixture).kind == "text", fixture
+    assert sniff_content(b'{"a":1,"b":[2,3],"c":"x"}' * 200).kind == "minified"
+
+
+def test_decode_bytes_tries_encodings_in_memory():
+    assert decode_bytes("café".encode()) == ("café", "utf-8")
+    assert decode_bytes("café".encode("cp1252")) == ("café", "cp1252")
+    assert decode_bytes(codecs.BOM_UTF8 + b"x") == ("x", "utf-8-sig")
+
+
+def test_flagged_files_are_summarized_for_agents_and_skipped_by_the_retriever(tmp_path: Path):
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    (tmp_path / "bundle.js").write_text("var a=function(b){return b};" * 200)
+
+    summary = read_project_file(tmp_path, "bundle.js")
+    assert summary is not None and summary.startswith("[minified file omitted:")
+    assert read_project_file(tmp_path, "app.py") == "print('hi')\n"
+
+    formatted = get_filtered_formatted_contents(tmp_path, ["app.py", "bundle.js"])
+    assert "app.py" in formatted and "bundle.js" not in formatted
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from agentrules.core.analysis.context_reduction import ContextOptions, reduce_file_contents
+from agentrules.core.pipeline.config import EffectiveExclusions, PipelineSettings
+from agentrules.core.pipeline.dry_run import build_dry_run_report
+from agentrules.core.pipeline.snapshot import build_project_snapshot
+from agentrules.core.utils.minify import drop_comment_lines, minify_text, strip_license_header
+
+LICENSED_PY = """#!/usr/bin/env python
+# Copyright (c) 2024 Example Corp.
+# SPDX-License-Identifier: Apache-2.0
+# Licensed under the Apache License, Version 2.0.
+
+import os\x20\x20
+
+
+# explain the constant
+LIMIT = 3  # inline comments stay
+
+
+
+def f():
+    '''# not a comment'''
+    return LIMIT
+"""
+
+
+def test_license_header_is_replaced_by_a_note():
+    stripped = strip_license_header("a.py", LICENSED_PY)
+    assert stripped.startswith("#!/usr/bin/env python\n# License header removed (SPDX: Apache-2.0)\n\nimport os")
+
+    js = "/*\n * Copyright 2020 Someone\n * MIT License\n */\nexport const a = 1;\n"
+    assert strip_license_header("a.js", js) == "/* License header removed */\nexport const a = 1;\n"
+    assert strip_license_header("a.js", "/* Utilities */\nexport const a = 1;\n").startswith("/* Utilities */")
+
+
+def test_minify_collapses_whitespace_and_optionally_drops_comments():
+    minified = minify_text("a.py", LICENSED_PY)
+    assert "import os\n\n# explain the constant\nLIMIT = 3  # inline comments stay\n\ndef f():" in minified
+    assert minified.endswith("return LIMIT\n")
+
+    without_comments = minify_text("a.py", LICENSED_PY, drop_comments=True)
+    assert "# explain" not in without_comments
+    assert "#!/usr/bin/env python" in without_comments
+    assert "'''# not a comment'''" in without_comments and "# inline comments stay" in without_comments
+
+    js = "// setup\n/** Docs. */\nfunction f() {}\n/* block\n   comment */\nconst x = 1; // trailing\n"
+    assert drop_comment_lines("a.ts", js) == "/** Docs. */\nfunction f() {}\nconst x = 1; // trailing\n"
+
+
+def test_literal_tables_are_shortened():
+    rows = "\n".join(f"    ({index}, 'name{index}', 0x{index:02x}, True)," for index in range(40))
+    source = f"TABLE = [\n{rows}\n]\n"
+
+    minified = minify_text("table.py", source, drop_literal_tables=True)
+
+    assert "(2, 'name2', 0x02, True)," in minified and "(3, 'name3'" not in minified
+    assert "    # ... 37 more literal lines" in minified
+    assert minify_text("table.py", source) == source
+
+
+def test_reductions_report_savings_per_file(tmp_path: Path):
+    (tmp_path / "a.py").write_text(LICENSED_PY)
+    (tmp_path / "b.py").write_text("x = 1\n")
+    options = ContextOptions(minify=True)
+
+    contents, reductions = reduce_file_contents({"name": "A"}, {"a.py": LICENSED_PY, "b.py": "x = 1\n"}, options)
+
+    assert contents["b.py"] == "x = 1\n"
+    assert [(reduction.path, reduction.method) for reduction in reductions] == [("a.py", "minify")]
+    assert reductions[0].bytes_saved == len(LICENSED_PY) - len(contents["a.py"]) > 0
+    assert reductions[0].tokens_saved > 0
+
+    settings = PipelineSettings(
+        target_directory=tmp_path,
+        tree_max_depth=5,
+        respect_gitignore=False,
+        effective_exclusions=EffectiveExclusions(frozenset(), frozenset(), frozenset()),
+    )
+    report = build_dry_run_report(
+        settings, build_project_snapshot(settings), researcher_enabled=False, context_options=options
+    )
+    assert [reduction.path for reduction in report.reductions] == ["a.py"]
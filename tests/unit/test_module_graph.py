@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+
+from agentrules.config.prompts.phase_2_prompts import format_phase2_prompt
+from agentrules.core.utils.file_system.file_index import build_file_index
+from agentrules.core.utils.module_graph import ModuleImports, extract_imports, load_module_graph, resolve_module_graph
+from agentrules.core.utils.module_graph import cache as graph_cache
+
+PROJECT = {
+    "src/app/__init__.py": "",
+    "src/app/models.py": "import os\nfrom app import services\n",
+    "src/app/services.py": "from .models import User\nfrom . import utils\nimport requests\n",
+    "src/app/utils.py": "from app.models import *\n",
+    "web/src/index.ts": "import { api } from './api';\nimport React from 'react';\nimport '@scope/pkg/sub';\n",
+    "web/src/api/index.ts": "const helpers = require('../helpers');\nexport * from './types';\n",
+    "web/src/api/types.ts": "export type Id = string;\n",
+    "web/src/helpers.js": "import fs from 'node:fs';\nexport default () => import('./index');\n",
+    "go.mod": "module example.com/shop\n\ngo 1.22\n",
+    "cmd/server/main.go": 'package main\n\nimport (\n\t"fmt"\n\t"example.com/shop/internal/store"\n)\n',
+    "internal/store/store.go": 'package store\n\nimport "github.com/lib/pq"\n',
+    "java/com/acme/App.java": "package com.acme;\n\nimport com.acme.util.*;\nimport org.slf4j.Logger;\n",
+    "java/com/acme/util/Strings.java": "package com.acme.util;\n\nimport static com.acme.App.main;\nimport java.util.List;\n",
+}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    for path, text in PROJECT.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    return tmp_path
+
+
+def test_extract_imports_per_language():
+    assert extract_imports("a.py", "import x.y\nfrom . import z\nfrom ..p import q, r\n").imports == (
+        "x.y",
+        ".:z",
+        "..p:q",
+        "..p:r",
+    )
+    assert extract_imports("a.py", "print 'py2'\nimport legacy\n").imports == ("legacy",)
+    assert extract_imports("a.tsx", "import type { A } from './a';\nexport { b } from \"./b\";").imports == (
+        "./a",
+        "./b",
+    )
+    assert extract_imports("main.go", PROJECT["cmd/server/main.go"]).imports == (
+        "fmt",
+        "example.com/shop/internal/store",
+    )
+    java = extract_imports("App.java", PROJECT["java/com/acme/App.java"])
+    assert java == ModuleImports("java", ("com.acme.util.*", "org.slf4j.Logger"), "com.acme")
+    assert extract_imports("notes.md", "import x") is None
+
+
+def test_load_module_graph_resolves_edges_cycles_and_coupling(project: Path, tmp_path: Path):
+    graph = load_module_graph(build_file_index(project), cache_path=tmp_path / "cache" / "graph.json")
+
+    assert graph.edges["src/app/services.py"] == ("src/app/models.py", "src/app/utils.py")
+    assert graph.edges["web/src/index.ts"] == ("web/src/api/index.ts",)
+    assert set(graph.edges["web/src/api/index.ts"]) == {"web/src/helpers.js", "web/src/api/types.ts"}
+    assert graph.edges["cmd/server/"] == ("internal/store/",)
+    assert graph.edges["java/com/acme/App.java"] == ("java/com/acme/util/Strings.java",)
+    assert graph.external["src/app/services.py"] == ("requests",)
+    assert set(graph.external["web/src/index.ts"]) == {"react", "@scope/pkg"}
+    assert graph.external["internal/store/"] == ("github.com/lib/pq",)
+    assert "src/app/models.py" not in graph.external
+
+    cycles = {frozenset(cycle) for cycle in graph.strongly_connected_components()}
+    assert cycles == {
+        frozenset({"src/app/models.py", "src/app/services.py", "src/app/utils.py"}),
+        frozenset({"web/src/index.ts", "web/src/api/index.ts", "web/src/helpers.js"}),
+        frozenset({"java/com/acme/App.java", "java/com/acme/util/Strings.java"}),
+    }
+
+    coupling = {item.directory: item for item in graph.directory_coupling()}
+    assert (coupling["cmd/server"].afferent, coupling["cmd/server"].efferent) == (0, 1)
+    assert coupling["internal/store"].instability == 0.0
+
+    summary = graph.summary()
+    assert "Import cycles: 3" in summary
+    assert "internal/store/ (1)" in summary and "requests (1)" in summary
+
+
+def test_imports_are_cached_by_content_hash(project: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache_path = tmp_path / "graph.json"
+    load_module_graph(build_file_index(project), cache_path=cache_path)
+    parsed: list[str] = []
+    original = graph_cache.extract_imports
+
+    def _counting(path: str, text: str):
+        parsed.append(path)
+        return original(path, text)
+
+    monkeypatch.setattr(graph_cache, "extract_imports", _counting)
+    (project / "src/app/utils.py").write_text("from app import services\n")
+
+    graph = load_module_graph(build_file_index(project), cache_path=cache_path)
+
+    assert parsed == ["src/app/utils.py"]
+    assert graph.edges["src/app/utils.py"] == ("src/app/services.py",)
+
+
+def test_process_pool_matches_in_process_parsing(project: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(graph_cache, "PROCESS_POOL_MIN_FILES", 1)
+    pooled = load_module_graph(build_file_index(project), cache_path=tmp_path / "a.json", max_workers=2)
+    serial = load_module_graph(build_file_index(project), cache_path=tmp_path / "b.json", max_workers=1)
+
+    assert pooled.edges == serial.edges and pooled.external == serial.external
+
+
+def test_phase2_prompt_renders_the_graph_summary():
+    graph = resolve_module_graph(
+        {"a.py": ModuleImports("python", ("b",)), "b.py": ModuleImports("python", ("a",))}
+    )
+    prompt = format_phase2_prompt({"phase": "Initial Discovery", "module_graph": graph.summary()}, ["a.py"])
+
+    assert "<module_graph>\nModules: 2 (python 2); internal import edges: 2" in prompt
+    assert "- a.py -> b.py (2 modules)" in prompt
+    assert '"module_graph"' not in prompt
+    assert "<module_graph>" not in format_phase2_prompt({}, ["a.py"])
@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.utils.file_system.file_loader import read_project_file
+from agentrules.core.utils.file_system.file_retriever import read_text_file
+from agentrules.core.utils.file_system.notebook import extract_notebook
+
+IMAGE = "iVBORw0KGgo" + "A" * 200_000
+
+
+def _notebook(**overrides) -> dict:
+    notebook = {
+        "cells": [
+            {"cell_type": "markdown", "metadata": {}, "source": ["# Churn model\n", "Loads the data."]},
+            {
+                "cell_type": "code",
+                "execution_count": 1,
+                "metadata": {},
+                "source": ["import pandas as pd\n", "df = pd.read_csv('churn.csv')"],
+                "outputs": [
+                    {"output_type": "stream", "name": "stdout", "text": ["\x1b[1mloaded\x1b[0m\n"] + ["row\n"] * 500},
+                    {
+                        "output_type": "display_data",
+                        "metadata": {},
+                        "data": {"image/png": IMAGE, "text/plain": ["<Figure size 640x480>"]},
+                    },
+                ],
+            },
+            {"cell_type": "code", "execution_count": None, "metadata": {}, "source": "", "outputs": []},
+            {
+                "cell_type": "code",
+                "execution_count": 2,
+                "metadata": {},
+                "source": "1 / 0",
+                "outputs": [{"output_type": "error", "ename": "ZeroDivisionError", "evalue": "division by zero",
+                             "traceback": ["\x1b[31m" + "x" * 5000]}],
+            },
+        ],
+        "metadata": {"kernelspec": {"name": "python3", "language": "python"}, "language_info": {"name": "python"}},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    notebook.update(overrides)
+    return notebook
+
+
+@pytest.fixture
+def notebook_path(tmp_path: Path) -> Path:
+    path = tmp_path / "analysis.ipynb"
+    path.write_text(json.dumps(_notebook(), indent=1))
+    return path
+
+
+@pytest.mark.parametrize("chunk_chars", [7, 4096, 1 << 20])
+def test_extract_notebook_keeps_cells_and_truncated_text_outputs(notebook_path: Path, chunk_chars: int):
+    text = extract_notebook(notebook_path, max_output_chars=100, chunk_chars=chunk_chars)
+
+    assert text is not None
+    assert text.startswith("# Jupyter notebook (python): 3 code and 1 markdown cells")
+    assert "1 rich outputs (images, HTML) omitted" in text.splitlines()[0]
+    assert "# %% [markdown]\n# Churn model\nLoads the data." in text
+    assert "# %%\nimport pandas as pd\ndf = pd.read_csv('churn.csv')\n# Output:\n# loaded\n# row" in text
+    assert "more characters]" in text and "<Figure size" not in text
+    assert "# ZeroDivisionError: division by zero" in text
+    assert "iVBORw0KGgo" not in text and "\x1b" not in text and "xxxx" not in text
+    assert len(text) < 1000
+
+
+def test_extract_notebook_without_outputs_and_with_a_cap(notebook_path: Path):
+    bare = extract_notebook(notebook_path, include_outputs=False)
+    capped = extract_notebook(notebook_path, max_chars=80)
+
+    assert bare is not None and "# Output:" not in bare and "outputs removed" in bare
+    assert capped is not None and capped.endswith("characters of notebook omitted] ...\n")
+
+
+def test_extract_notebook_reads_nbformat3_and_rejects_other_json(tmp_path: Path):
+    legacy = tmp_path / "legacy.ipynb"
+    legacy.write_text(
+        json.dumps(
+            {
+                "metadata": {"language": "python"},
+                "nbformat": 3,
+                "worksheets": [
+                    {"cells": [{"cell_type": "code", "input": "print(1)", "outputs": [
+                        {"output_type": "pyout", "text": ["1"], "png": IMAGE}
+                    ]}]}
+                ],
+            }
+        )
+    )
+    broken = tmp_path / "broken.ipynb"
+    broken.write_text('{"cells": [{"cell_type": "code"')
+
+    text = extract_notebook(legacy)
+
+    assert text is not None and "print(1)\n# Output:\n# 1" in text and IMAGE not in text
+    assert extract_notebook(broken) is None
+    # Files that are not notebook JSON are read as plain text instead
+    assert read_text_file(broken, 1024)[0] == '{"cells": [{"cell_type": "code"'
+
+
+def test_phase3_loading_and_retriever_extract_notebooks(notebook_path: Path):
+    loaded = read_project_file(notebook_path.parent, notebook_path.name)
+    retrieved, sniffed = read_text_file(notebook_path, 256 * 1024)
+
+    assert loaded == retrieved == extract_notebook(notebook_path, max_chars=256 * 1024)
+    assert loaded is not None and "iVBORw0KGgo" not in loaded
+    assert not sniffed.flagged
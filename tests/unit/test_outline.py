@@ -0,0 +1,145 @@
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.analysis.context_reduction import ContextOptions, prepare_file_contents, rank_central_files
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+from agentrules.core.utils.outline import outline_python, outline_script, outline_source
+
+PYTHON_SOURCE = '''"""Storage helpers."""
+
+import os
+from typing import Any
+
+LIMIT = 10
+
+
+@dataclass(frozen=True)
+class Store(Base):
+    """Keeps things."""
+
+    name: str = "default"
+
+    @property
+    def size(self) -> int:
+        """Number of items."""
+        return len(os.listdir(self.name))
+
+    async def put(self, key: str, value: Any = None) -> None:
+        for _ in range(LIMIT):
+            await self._write(key, value)
+
+
+def helper(x):
+    return x * 2
+'''
+
+SCRIPT_SOURCE = """import { useState } from "react";
+const pattern = /[{}]/g;
+export interface Props {
+  name: string;
+  nested: { depth: number };
+}
+export class Widget extends Base {
+  private count = 0;
+  render(props: Props): string {
+    if (props.name) { return `${props.name} }`; }
+    return "";
+  }
+}
+export function build(options) {
+  return new Widget(options);
+}
+"""
+
+
+def test_python_outline_keeps_structure_and_drops_bodies():
+    outline = outline_python(PYTHON_SOURCE)
+
+    assert outline is not None
+    for kept in (
+        '"""Storage helpers."""',
+        "from typing import Any",
+        "LIMIT = 10",
+        "@dataclass(frozen=True)",
+        "class Store(Base):",
+        "name: str = 'default'",
+        "    @property",
+        "    def size(self) -> int:",
+        '        """Number of items."""',
+        "    async def put(self, key: str, value: Any=None) -> None:",
+        "def helper(x):",
+    ):
+        assert kept in outline
+    assert "listdir" not in outline and "_write" not in outline and "x * 2" not in outline
+    assert outline_python("def broken(:\n") is None
+
+
+def test_script_outline_elides_bodies_but_keeps_declarations():
+    outline = outline_script(SCRIPT_SOURCE)
+
+    assert 'import { useState } from "react";' in outline
+    assert "const pattern = /[{}]/g;" in outline
+    assert "  nested: { depth: number };" in outline
+    assert "export class Widget extends Base {" in outline
+    assert "  private count = 0;" in outline
+    assert "  render(props: Props): string { ... }" in outline
+    assert "export function build(options) { ... }" in outline
+    assert "new Widget" not in outline and "props.name" not in outline
+
+
+def test_outline_source_adds_header_and_skips_unknown_languages():
+    outlined = outline_source("pkg/store.py", PYTHON_SOURCE)
+
+    assert outlined is not None and outlined.startswith("# outline: bodies elided")
+    assert outline_source("README.md", "# Title\n" * 100) is None
+
+
+def test_central_files_keep_full_bodies_in_outline_mode():
+    agent = {"name": "Storage Agent", "description": "Owns the store module", "file_assignments": []}
+    contents = {
+        "pkg/store.py": PYTHON_SOURCE,
+        "pkg/cache.py": "from pkg.helpers import helper\n" + PYTHON_SOURCE,
+        "pkg/helpers.py": PYTHON_SOURCE,
+    }
+
+    assert rank_central_files(agent, contents)[:2] == ["pkg/store.py", "pkg/helpers.py"]
+
+    options = ContextOptions(outline=True, outline_threshold_bytes=100, keep_full_files=1, dedupe=False)
+    prepared = prepare_file_contents(agent, contents, options)
+
+    assert prepared["pkg/store.py"] == PYTHON_SOURCE
+    assert prepared["pkg/cache.py"].startswith("# outline:")
+    assert prepared["pkg/helpers.py"].startswith("# outline:")
+    assert prepare_file_contents(agent, contents, None) == contents
+
+
+def test_central_files_count_whole_name_mentions_by_other_files():
+    agent = {"name": "Agent"}
+    contents = {
+        "a/util.py": "import util\n",
+        "b/my-plugin.js": "",
+        "c/main.py": "from utils import x\nload('my-plugin')\n",
+        "d/app.py": "import util, my-plugin\n",
+    }
+
+    assert rank_central_files(agent, contents) == ["b/my-plugin.js", "a/util.py", "c/main.py", "d/app.py"]
+
+
+@pytest.mark.asyncio
+async def test_phase3_sends_outlines_when_configured(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    (tmp_path / "big.py").write_text(PYTHON_SOURCE)
+    seen: dict[str, str] = {}
+
+    class _Architect:
+        async def analyze(self, context):
+            seen.update(context["file_contents"])
+            return {"agent": context["agent_name"], "findings": "ok"}
+
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", lambda *a, **k: _Architect())
+    plan = {"agents": [{"id": "agent_1", "name": "A", "description": "d", "file_assignments": ["big.py"]}]}
+    options = ContextOptions(outline=True, outline_threshold_bytes=100, keep_full_files=0)
+
+    await Phase3Analysis(context_options=options).run(plan, [], tmp_path)
+
+    assert seen["big.py"].startswith("# outline:")
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.analysis.phase_3 import resolve_agent_definitions
+from agentrules.core.utils.file_system.file_index import build_file_index
+from agentrules.core.utils.file_system.file_loader import resolve_project_file
+from agentrules.core.utils.file_system.path_resolver import PathResolver
+
+PATHS = ["main.py", "src/app/main.py", "src/app/models.py", "src/lib/models.py", "web/index.ts"]
+
+
+@pytest.fixture
+def resolver() -> PathResolver:
+    return PathResolver(PATHS, root=Path("/home/dev/shop"), truncated=["deep/a/b"])
+
+
+@pytest.mark.parametrize(
+    ("query", "status", "path"),
+    [
+        ("src/app/main.py", "exact", "src/app/main.py"),
+        ("./src/app/main.py", "exact", "src/app/main.py"),
+        ("src\\app\\models.py", "exact", "src/app/models.py"),
+        ("`web/index.ts`", "exact", "web/index.ts"),
+        ("/home/dev/shop/web/index.ts", "exact", "web/index.ts"),
+        ("index.ts", "suffix", "web/index.ts"),
+        ("app/models.py", "suffix", "src/app/models.py"),
+        ("shop/src/lib/models.py", "suffix", "src/lib/models.py"),
+        ("/tmp/checkout/src/lib/models.py", "suffix", "src/lib/models.py"),
+        ("C:\\work\\shop\\web\\index.ts", "suffix", "web/index.ts"),
+        ("src/app/../lib/models.py", "exact", "src/lib/models.py"),
+        ("main.py", "exact", "main.py"),
+        ("deep/a/b/c/x.py", "unindexed", "deep/a/b/c/x.py"),
+    ],
+)
+def test_resolve_maps_planner_paths_to_canonical_paths(resolver: PathResolver, query: str, status: str, path: str):
+    resolution = resolver.resolve(query)
+
+    assert (resolution.status, resolution.path) == (status, path)
+
+
+def test_resolve_reports_ambiguous_and_unknown_paths(resolver: PathResolver):
+    ambiguous = resolver.resolve("models.py")
+
+    assert ambiguous.status == "ambiguous" and not ambiguous.resolved
+    assert ambiguous.candidates == ("src/app/models.py", "src/lib/models.py")
+    # A wrong leading directory is not silently matched by its suffix
+    assert resolver.resolve("tests/app/models.py").status == "unresolved"
+    assert resolver.resolve("missing.py").status == "unresolved"
+    assert resolver.resolve("./").status == "unresolved"
+
+
+def test_resolve_agents_canonicalizes_and_drops_entries(resolver: PathResolver):
+    result = resolver.resolve_agents(
+        [
+            {"id": "agent_1", "file_assignments": ["./web/index.ts", "index.ts", "models.py", "nope.py"]},
+            {"id": "agent_2", "file_assignments": ["app/main.py"]},
+        ]
+    )
+
+    assert [agent["file_assignments"] for agent in result.agents] == [["web/index.ts"], ["src/app/main.py"]]
+    assert result.unresolved == {"agent_1": ["models.py", "nope.py"]}
+    assert set(result.ambiguous) == {"models.py"}
+
+
+def test_phase3_and_loader_use_the_snapshot_resolver(tmp_path: Path):
+    (tmp_path / "pkg" / "deep").mkdir(parents=True)
+    (tmp_path / "pkg" / "api.py").write_text("x = 1\n")
+    (tmp_path / "pkg" / "deep" / "hidden.py").write_text("y = 2\n")
+    index = build_file_index(tmp_path, max_depth=2)
+
+    agents = resolve_agent_definitions({"agents": [{"id": "agent_1", "file_assignments": ["api.py", "x.py"]}]}, [], index)
+
+    assert agents[0]["file_assignments"] == ["pkg/api.py"]
+    assert index.path_resolver() is index.path_resolver()
+    assert resolve_project_file(tmp_path, str(tmp_path / "pkg" / "api.py"), index) == tmp_path / "pkg" / "api.py"
+    # Files below the depth limit are not indexed but are still found on disk
+    assert resolve_project_file(tmp_path, "pkg/deep/hidden.py", index) == tmp_path / "pkg" / "deep" / "hidden.py"
+    assert resolve_project_file(tmp_path, "pkg/deep/gone.py", index) is None
@@ -61,6 +61,7 @@ class BuildProjectSnapshotTests(unittest.TestCase):
         mock_collect_dependency.assert_called_once_with(
             target_directory,
             gitignore_spec=spec,
+            file_index=snapshot.file_index,
         )
 
         self.assertEqual(snapshot.tree_with_delimiters, ("<project_structure>", "src/", "</project_structure>"))
@@ -110,6 +111,7 @@ class BuildProjectSnapshotTests(unittest.TestCase):
         mock_collect_dependency.assert_called_once_with(
             target_directory,
             gitignore_spec=None,
+            file_index=snapshot.file_index,
         )
 
         self.assertEqual(snapshot.tree_with_delimiters, ("src/", "tests/"))
@@ -0,0 +1,232 @@
+import asyncio
+import io
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+from rich.console import Console
+
+from agentrules.cli.context import CliContext
+from agentrules.cli.services import pipeline_runner
+from agentrules.core.analysis import phase_2, phase_3
+from agentrules.core.analysis.phase_2 import Phase2Analysis
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+from agentrules.core.pipeline.orchestrator import AnalysisPipeline
+from agentrules.core.streaming import StreamChunk, StreamEventType
+from agentrules.core.utils.parsers import IncrementalAgentParser, parse_agents_from_phase2
+
+PLAN = (
+    "Plan follows.\n<analysis_plan>\n"
+    '<agent_1 name="API & Routes">\n  <description>HTTP layer</description>\n'
+    "  <file_assignments><file_path>api.py</file_path></file_assignments>\n</agent_1>\n"
+    "<agent_2>\n  <name>Core</name>\n  <description>Domain</description>\n"
+    "  <file_assignments><file_path>core.py</file_path><file_path>models.py</file_path></file_assignments>\n"
+    "</agent_2>\n</analysis_plan>\n"
+)
+
+
+@pytest.mark.parametrize("step", [1, 5, len(PLAN)])
+def test_incremental_parser_matches_the_full_parse(step: int):
+    parser = IncrementalAgentParser()
+    completed = []
+    for start in range(0, len(PLAN), step):
+        completed.extend(agent["id"] for agent in parser.feed(PLAN[start : start + step]))
+
+    assert completed == ["agent_1", "agent_2"]
+    assert parser.complete and parser.text.rstrip() == PLAN.rstrip()
+    assert parser.agents == parse_agents_from_phase2(PLAN)
+    assert parser.feed("<agent_3><name>Late</name></agent_3>") == []
+
+
+def test_incremental_parser_emits_each_agent_when_it_closes():
+    parser = IncrementalAgentParser()
+
+    assert parser.feed(PLAN[: PLAN.index("</agent_1>")]) == []
+    assert [agent["name"] for agent in parser.feed("</agent_1>\n<agent_2>")] == ["API & Routes"]
+    assert not parser.complete
+
+
+@pytest.mark.parametrize("step", [1, 40])
+def test_incremental_parser_ignores_agent_mentions_in_the_reasoning(step: int):
+    plan = (
+        "<reasoning>\nThe routes are small, so <agent_2> also takes the models; <agent_1 name=\"API\"> stays lean.\n"
+        "</reasoning>\n" + PLAN[PLAN.index("<analysis_plan>") :]
+    )
+    parser = IncrementalAgentParser()
+    emitted_at: dict[str, int] = {}
+    for start in range(0, len(plan), step):
+        for agent in parser.feed(plan[start : start + step]):
+            emitted_at[agent["id"]] = start + step
+
+    assert list(emitted_at) == ["agent_1", "agent_2"]
+    assert emitted_at["agent_1"] - plan.index("</agent_1>") <= len("</agent_1>") + step
+    assert parser.agents == parse_agents_from_phase2(plan)
+
+
+def test_incremental_parser_gives_up_an_opening_that_another_opening_follows():
+    parser = IncrementalAgentParser()
+    text = "Assign <agent_3> later.\n" + PLAN.replace("Plan follows.\n<analysis_plan>\n", "")
+
+    completed = [agent["id"] for agent in parser.feed(text)]
+
+    assert completed == ["agent_1", "agent_2"]
+
+
+class _StreamingPlanner:
+    supports_streaming = True
+
+    def __init__(self, pieces: list[str], gate: asyncio.Event | None = None) -> None:
+        self.pieces = pieces
+        self.gate = gate
+        self.sent = 0
+        self.closed = False
+        self.events: list[str] = []
+
+    def stream_analyze(self, context: dict[str, Any], tools: Any = None):
+        async def _generator():
+            try:
+                for piece in self.pieces:
+                    if self.gate is not None and piece.startswith("</agent_2>"):
+                        # Only finish the plan once the first agent is already running
+                        await asyncio.wait_for(self.gate.wait(), timeout=5)
+                    self.sent += 1
+                    yield StreamChunk(StreamEventType.TEXT_DELTA, text=piece)
+            finally:
+                self.closed = True
+                self.events.append("phase2 finished")
+
+        return _generator()
+
+
+def _pieces(trailing: int = 0) -> list[str]:
+    split = PLAN.index("</agent_2>")
+    return [PLAN[:split], PLAN[split:]] + ["ignored text "] * trailing
+
+
+def test_phase2_streams_agents_and_stops_at_the_end_of_the_plan():
+    analysis = Phase2Analysis()
+    planner = _StreamingPlanner(_pieces(trailing=50))
+    analysis.architect = cast(Any, planner)
+    received: list[str] = []
+
+    result = asyncio.run(analysis.run({}, [], on_agent=lambda agent: received.append(agent["id"])))
+
+    assert analysis.streams_agents
+    assert received == ["agent_1", "agent_2"]
+    assert [agent["id"] for agent in result["agents"]] == received
+    assert result["streamed"] and result["plan"] == PLAN
+    assert planner.sent == 2 and planner.closed
+
+
+def test_phase3_agents_start_before_phase2_finishes(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    first_agent_running = asyncio.Event()
+
+    class _Agent:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        async def analyze(self, context: dict) -> dict:
+            if self.name == "API & Routes":
+                first_agent_running.set()
+            return {"agent": self.name, "findings": "ok"}
+
+    planner = _StreamingPlanner(_pieces(), gate=first_agent_running)
+    monkeypatch.setattr(phase_2, "get_architect_for_phase", lambda phase: planner)
+    monkeypatch.setattr(phase_3, "get_architect_for_phase", lambda phase, name=None, **kwargs: _Agent(name))
+
+    async def _contents(self, directory, files):
+        return {path: "" for path in files}
+
+    monkeypatch.setattr(Phase3Analysis, "_get_file_contents", _contents)
+    pipeline = AnalysisPipeline(
+        phase1=cast(Any, None),
+        phase2=Phase2Analysis(),
+        phase3=Phase3Analysis(),
+        phase4=cast(Any, None),
+        phase5=cast(Any, None),
+        final=cast(Any, None),
+    )
+    snapshot = cast(Any, SimpleNamespace(tree=("api.py", "core.py"), file_index=None))
+    settings = cast(Any, SimpleNamespace(target_directory=tmp_path))
+
+    assert pipeline.streams_phase2
+    phase2_results, phase3_results = asyncio.run(pipeline.run_phase2_and_3({}, settings, snapshot))
+
+    assert [agent["id"] for agent in phase2_results["agents"]] == ["agent_1", "agent_2"]
+    assert [finding["agent"] for finding in phase3_results["findings"]] == ["API & Routes", "Core"]
+
+
+def test_phase2_dispatches_an_agent_left_open_at_the_end_of_the_plan():
+    unterminated = PLAN.replace("</agent_2>\n", "")
+    split = unterminated.index("<agent_2>")
+    analysis = Phase2Analysis()
+    analysis.architect = cast(Any, _StreamingPlanner([unterminated[:split], unterminated[split:]]))
+    received: list[str] = []
+
+    result = asyncio.run(analysis.run({}, [], on_agent=lambda agent: received.append(agent["name"])))
+
+    expected = [agent["name"] for agent in parse_agents_from_phase2(unterminated)]
+    assert expected == ["API & Routes", "Core"]
+    assert received == expected
+    assert [agent["name"] for agent in result["agents"]] == expected
+
+
+def test_cli_runner_starts_phase3_agents_before_phase2_finishes(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    first_agent_running = asyncio.Event()
+    planner = _StreamingPlanner(_pieces(), gate=first_agent_running)
+
+    class _Agent:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        async def analyze(self, context: dict) -> dict:
+            planner.events.append(f"{self.name} started")
+            first_agent_running.set()
+            return {"agent": self.name, "findings": "ok"}
+
+    class _Phase:
+        def __init__(self, result: dict) -> None:
+            self.result = result
+
+        async def run(self, *args: Any, **kwargs: Any) -> dict:
+            return self.result
+
+    async def _contents(self, directory, files):
+        return {path: "" for path in files}
+
+    monkeypatch.setattr(phase_2, "get_architect_for_phase", lambda phase: planner)
+    monkeypatch.setattr(phase_3, "get_architect_for_phase", lambda phase, name=None, **kwargs: _Agent(name))
+    monkeypatch.setattr(Phase3Analysis, "_get_file_contents", _contents)
+    pipeline = AnalysisPipeline(
+        phase1=cast(Any, _Phase({})),
+        phase2=Phase2Analysis(),
+        phase3=Phase3Analysis(),
+        phase4=cast(Any, _Phase({})),
+        phase5=cast(Any, _Phase({"report": ""})),
+        final=cast(Any, _Phase({"analysis": ""})),
+    )
+    snapshot = SimpleNamespace(tree=("api.py", "core.py"), file_index=None, module_graph=None, dependency_info={})
+    config = SimpleNamespace(
+        is_researcher_enabled=lambda: False,
+        get_phase2_planning=lambda: "model",
+        get_phase3_max_concurrency=lambda: None,
+    )
+    persisted: list[Any] = []
+    monkeypatch.setattr(pipeline_runner, "get_config_manager", lambda: config)
+    monkeypatch.setattr(
+        pipeline_runner, "build_pipeline_settings", lambda path, manager: SimpleNamespace(target_directory=path)
+    )
+    monkeypatch.setattr(pipeline_runner, "build_output_options", lambda manager: SimpleNamespace(rules_filename=None))
+    monkeypatch.setattr(pipeline_runner, "build_context_options", lambda manager: None)
+    monkeypatch.setattr(pipeline_runner, "compute_run_fingerprint", lambda *args, **kwargs: None)
+    monkeypatch.setattr(pipeline_runner, "build_project_snapshot", lambda settings: snapshot)
+    monkeypatch.setattr(pipeline_runner, "create_default_pipeline", lambda **kwargs: pipeline)
+    monkeypatch.setattr(pipeline_runner, "_persist", lambda context, path, result, *args: persisted.append(result))
+
+    pipeline_runner.run_pipeline(tmp_path, False, CliContext(Console(file=io.StringIO())))
+
+    assert planner.events.index("API & Routes started") < planner.events.index("phase2 finished")
+    (result,) = persisted
+    assert [agent["id"] for agent in result.phase2["agents"]] == ["agent_1", "agent_2"]
+    assert [finding["agent"] for finding in result.phase3["findings"]] == ["API & Routes", "Core"]
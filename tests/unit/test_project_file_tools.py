@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from agentrules.config.prompts.phase_3_prompts import format_phase3_tools_prompt
+from agentrules.core.agent_tools.project_files import ProjectFileTools
+from agentrules.core.agent_tools.tool_calls import parse_tool_calls
+from agentrules.core.analysis.context_reduction import ContextOptions
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+from agentrules.core.utils.file_system.file_index import build_file_index
+
+FILES = {
+    "pkg/models.py": "class Model:\n    name = 'model'\n",
+    "pkg/views.py": "from pkg.models import Model\n\n\ndef render(model: Model) -> str:\n    return model.name\n",
+    "pkg/sub/helpers.py": "".join(f"line_{number} = {number}\n" for number in range(1, 1001)),
+    "README.md": "# Demo\n",
+}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    for path, text in FILES.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    return tmp_path
+
+
+def _result(record: dict) -> dict:
+    return json.loads(record["result"])
+
+
+def test_read_file_returns_numbered_line_ranges(project: Path):
+    tools = ProjectFileTools(build_file_index(project))
+
+    record = tools.execute("read_file", {"path": "pkg/views.py", "start_line": 4, "end_line": 5})
+    assert record["success"]
+    assert _result(record)["content"] == "4: def render(model: Model) -> str:\n5:     return model.name"
+
+    capped = _result(tools.execute("read_file", {"path": "./pkg/sub/helpers.py"}))
+    assert (capped["start_line"], capped["end_line"], capped["total_lines"]) == (1, 400, 1000)
+
+    missing = tools.execute("read_file", {"path": "../outside.py"})
+    assert "no such file" in missing["error"]
+
+
+def test_grep_and_list_dir(project: Path):
+    tools = ProjectFileTools(build_file_index(project))
+
+    matches = _result(tools.execute("grep", {"pattern": r"import\s+model", "path": "pkg"}))["matches"]
+    assert matches == [{"path": "pkg/views.py", "line": 1, "text": "from pkg.models import Model"}]
+    assert _result(tools.execute("grep", {"pattern": "line_", "path": "pkg/sub"}))["truncated"]
+    assert "error" in tools.execute("grep", {"pattern": "("})
+
+    listing = _result(tools.execute("list_dir", {"path": "pkg"}))
+    assert listing["directories"] == ["sub"]
+    assert [item["name"] for item in listing["files"]] == ["models.py", "views.py"]
+    assert _result(tools.execute("list_dir", {}))["directories"] == ["pkg"]
+    assert "unsupported tool" in tools.execute("delete_file", {"path": "README.md"})["error"]
+
+
+def test_parse_tool_calls_normalizes_provider_formats():
+    openai = {"tool_calls": [{"function": {"name": "read_file", "arguments": '{"path": "a.py"}'}}]}
+    anthropic = {"tool_calls": [{"name": "grep", "input": {"pattern": "x"}}]}
+    gemini = {"function_calls": [{"name": "list_dir", "args": {"path": "pkg"}}]}
+    malformed = {"tool_calls": [{"function": {"name": "read_file", "arguments": "{not json"}}]}
+
+    assert parse_tool_calls(openai) == [("read_file", {"path": "a.py"})]
+    assert parse_tool_calls(anthropic) == [("grep", {"pattern": "x"})]
+    assert parse_tool_calls(gemini) == [("list_dir", {"path": "pkg"})]
+    assert parse_tool_calls(malformed) == [("read_file", {})]
+    assert parse_tool_calls({"findings": "done"}) == []
+
+
+def test_tools_prompt_lists_the_manifest_instead_of_contents():
+    prompt = format_phase3_tools_prompt(
+        {
+            "agent_name": "A",
+            "file_manifest": [{"path": "pkg/models.py", "size": 2048}, {"path": "gone.py", "size": None}],
+            "tool_results": [{"name": "read_file", "args": {"path": "pkg/models.py"}, "result": '{"content": "1: x"}'}],
+        }
+    )
+
+    assert "- pkg/models.py (2,048 bytes)" in prompt and "- gone.py\n" in prompt
+    assert "<tool_result call=\"read_file(path='pkg/models.py')\">" in prompt
+    assert "No further tool calls" in format_phase3_tools_prompt({"final_turn": True})
+
+
+@pytest.mark.asyncio
+async def test_phase3_agents_fetch_files_through_tools(project: Path, monkeypatch: pytest.MonkeyPatch):
+    prompts: list[str] = []
+    offered: list[object] = []
+
+    class _Architect:
+        async def analyze(self, context, tools=None):
+            prompts.append(context["formatted_prompt"])
+            offered.append(tools)
+            if len(prompts) == 1:
+                return {"findings": None, "tool_calls": [{"name": "read_file", "input": {"path": "pkg/models.py"}}]}
+            return {"agent": context["agent_name"], "findings": "Model is a plain class"}
+
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", lambda *a, **k: _Architect())
+    plan = {"agents": [{"id": "agent_1", "name": "A", "description": "d", "file_assignments": list(FILES)[:2]}]}
+
+    result = await Phase3Analysis(context_options=ContextOptions(tool_access=True)).run(plan, [], project)
+
+    finding = result["findings"][0]
+    assert finding["findings"] == "Model is a plain class" and "tool_calls" not in finding
+    assert [record["name"] for record in finding["executed_tools"]] == ["read_file"]
+    assert "class Model" not in prompts[0] and "- pkg/views.py (" in prompts[0]
+    assert "1: class Model:" in prompts[1]
+    assert [tool["function"]["name"] for tool in offered[0]] == ["read_file", "grep", "list_dir"]
@@ -0,0 +1,134 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agentrules.core.pipeline.config import (
+    EffectiveExclusions,
+    PipelineMetrics,
+    PipelineResult,
+    PipelineSettings,
+)
+from agentrules.core.pipeline.fingerprint import compute_run_fingerprint
+from agentrules.core.pipeline.run_cache import RunCache
+
+MODELS = {"phase1": {"model_name": "a"}, "phase3": {"model_name": "b"}}
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    root.mkdir()
+    _git(root, "init", "-q")
+    (root / "app.py").write_text("print('hi')\n")
+    _git(root, "add", "app.py")
+    _git(root, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-m", "init")
+    return root
+
+
+def _settings(
+    root: Path,
+    *,
+    depth: int = 5,
+    extensions: frozenset[str] = frozenset(),
+    respect_gitignore: bool = True,
+) -> PipelineSettings:
+    return PipelineSettings(
+        target_directory=root,
+        tree_max_depth=depth,
+        respect_gitignore=respect_gitignore,
+        effective_exclusions=EffectiveExclusions(frozenset({"node_modules"}), frozenset(), extensions),
+    )
+
+
+def _fingerprint(root: Path, **kwargs):
+    return compute_run_fingerprint(
+        _settings(root, **kwargs),
+        researcher_enabled=False,
+        rules_filename="AGENTS.md",
+        model_config=MODELS,
+    )
+
+
+def test_fingerprint_is_stable_and_ignores_generated_artifacts(repo: Path):
+    first = _fingerprint(repo)
+    assert first is not None and first.components["dirty"] == "clean"
+
+    (repo / "AGENTS.md").write_text("rules")
+    (repo / "phases_output").mkdir()
+    (repo / "phases_output" / "phase1_discovery.md").write_text("report")
+    (repo / "node_modules").mkdir()
+    (repo / "node_modules" / "dep.js").write_text("x")
+
+    assert _fingerprint(repo).digest == first.digest
+
+
+def test_fingerprint_tracks_changes_and_configuration(repo: Path):
+    clean = _fingerprint(repo)
+
+    (repo / "app.py").write_text("print('changed')\n")
+    modified = _fingerprint(repo)
+    (repo / "new.py").write_text("x = 1\n")
+    untracked = _fingerprint(repo)
+
+    assert len({clean.digest, modified.digest, untracked.digest}) == 3
+    assert _fingerprint(repo, depth=3).digest != untracked.digest
+    assert _fingerprint(repo, extensions=frozenset({".md"})).digest != untracked.digest
+    assert compute_run_fingerprint(
+        _settings(repo), researcher_enabled=False, model_config={"phase1": {"model_name": "c"}}
+    ).digest != untracked.digest
+
+
+def test_fingerprint_covers_ignored_files_when_gitignore_is_not_respected(repo: Path):
+    (repo / ".gitignore").write_text("local.py\n")
+    _git(repo, "add", ".gitignore")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-m", "ignore")
+    clean = _fingerprint(repo, respect_gitignore=False)
+    assert clean.components["dirty"] == "clean"
+
+    (repo / "local.py").write_text("x = 1\n")
+    first = _fingerprint(repo, respect_gitignore=False)
+    (repo / "local.py").write_text("x = 2\n")
+    second = _fingerprint(repo, respect_gitignore=False)
+
+    assert len({clean.digest, first.digest, second.digest}) == 3
+    assert _fingerprint(repo).components["dirty"] == "clean"
+
+
+def test_fingerprint_requires_git(tmp_path: Path):
+    assert _fingerprint(tmp_path) is None
+
+
+def test_run_cache_round_trips_complete_results(repo: Path, tmp_path: Path):
+    fingerprint = _fingerprint(repo)
+    cache = RunCache(tmp_path / "runs")
+    phases = {
+        "phase1": {"findings": 1},
+        "phase2": {"plan": "p"},
+        "phase3": {"findings": []},
+        "phase4": {"analysis": "a"},
+        "consolidated_report": {"report": "r"},
+        "final_analysis": {"analysis": "rules"},
+    }
+    result = PipelineResult(snapshot=None, metrics=PipelineMetrics(elapsed_seconds=3.5), **phases)  # type: ignore[arg-type]
+
+    assert cache.load(fingerprint) is None
+    assert cache.store(fingerprint, result) is not None
+    cached = cache.load(fingerprint.digest)
+    assert cached is not None
+    restored = cached.to_result(snapshot=None)  # type: ignore[arg-type]
+    assert restored.final_analysis == {"analysis": "rules"}
+    assert restored.metrics.elapsed_seconds == 3.5
+
+    failed = PipelineResult(
+        snapshot=None,  # type: ignore[arg-type]
+        metrics=PipelineMetrics(elapsed_seconds=1.0),
+        **{**phases, "phase4": {"error": "boom"}},
+    )
+    other = _fingerprint(repo, depth=2)
+    assert cache.store(other, failed) is None
+    assert cache.load(other) is None
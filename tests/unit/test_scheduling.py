@@ -0,0 +1,85 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from agentrules.config.agents import MODEL_CONFIG
+from agentrules.core.analysis.phase_3 import Phase3Analysis
+from agentrules.core.analysis.scheduling import (
+    PrioritySemaphore,
+    ThroughputStore,
+    estimate_input_tokens,
+    lpt_order,
+    projected_makespan,
+)
+
+
+def test_lpt_order_and_makespan():
+    costs = [1, 5, 3, 5]
+    assert lpt_order(costs) == [1, 3, 2, 0]
+    # Plan order leaves the long job for last; LPT finishes sooner
+    assert projected_makespan([1, 1, 1, 1, 8], 2) > projected_makespan([8, 1, 1, 1, 1], 2)
+
+
+def test_estimate_input_tokens_uses_file_sizes(tmp_path: Path):
+    (tmp_path / "a.py").write_text("x" * 400)
+    assert estimate_input_tokens(["a.py", "missing.py"], tmp_path) == 100
+
+
+@pytest.mark.asyncio
+async def test_priority_semaphore_serves_largest_waiter_first():
+    semaphore = PrioritySemaphore(1)
+    await semaphore.acquire()
+    served: list[int] = []
+
+    async def _waiter(priority: int) -> None:
+        async with semaphore.slot(priority):
+            served.append(priority)
+
+    tasks = [asyncio.create_task(_waiter(priority)) for priority in (1, 7, 3)]
+    await asyncio.sleep(0)
+    semaphore.release()
+    await asyncio.gather(*tasks)
+
+    assert served == [7, 3, 1]
+
+
+@pytest.mark.asyncio
+async def test_phase3_starts_largest_agents_first_and_keeps_plan_order(tmp_path: Path, monkeypatch):
+    sizes = {"tiny.py": 10, "huge.py": 9000, "mid.py": 3000, "big.py": 6000}
+    for name, size in sizes.items():
+        (tmp_path / name).write_text("x" * size)
+    started: list[str] = []
+
+    class _Architect:
+        async def analyze(self, context):
+            started.append(context["agent_name"])
+            await asyncio.sleep(0.01)
+            return {"agent": context["agent_name"], "findings": "ok"}
+
+    monkeypatch.setattr("agentrules.core.analysis.phase_3.get_architect_for_phase", lambda *a, **k: _Architect())
+    plan = {
+        "agents": [
+            {"id": f"agent_{i}", "name": name, "description": "d", "file_assignments": [name]}
+            for i, name in enumerate(sizes, start=1)
+        ]
+    }
+    store = ThroughputStore(tmp_path / "throughput.json")
+
+    result = await Phase3Analysis(max_concurrency=1, throughput=store).run(plan, [], tmp_path)
+
+    assert started == ["huge.py", "big.py", "mid.py", "tiny.py"]
+    assert [finding["agent"] for finding in result["findings"]] == list(sizes)
+    reloaded = ThroughputStore(tmp_path / "throughput.json")
+    assert reloaded.predict_seconds(MODEL_CONFIG["phase3"].model_name, 1000) is not None
+
+
+def test_throughput_fit_learns_overhead_and_rate(tmp_path: Path):
+    store = ThroughputStore(tmp_path / "throughput.json")
+    assert store.predict_seconds("m", 1000) is None
+    for tokens in (1000, 5000, 9000):
+        store.record("m", tokens, 2.0 + tokens / 1000)
+    store.save()
+
+    reloaded = ThroughputStore(tmp_path / "throughput.json")
+    assert reloaded.predict_seconds("m", 20_000) == pytest.approx(22.0)
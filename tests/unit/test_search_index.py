@@ -0,0 +1,126 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from rich.console import Console
+from typer.testing import CliRunner
+
+from agentrules.core.pipeline.config import EffectiveExclusions, PipelineSettings
+from agentrules.core.pipeline.snapshot import build_project_snapshot
+from agentrules.core.search import SearchIndex, load_search_index, tokenize
+from agentrules.core.utils.file_system.file_index import build_file_index
+from agentrules.core.utils.file_system.path_index import PathIndex
+
+FILES = {
+    "app/config_loader.py": "def loadConfig(path):\n    return parse_toml(path)\n",
+    "app/http_client.py": "class HTTPClient:\n    def fetch(self, url):\n        return self.session.get(url)\n",
+    "app/views.py": "from app.config_loader import loadConfig\n\nCONFIG = loadConfig('settings.toml')\n",
+    "docs/guide.md": "Call the HTTP client to fetch pages.\n",
+    "assets/logo.png": "\x89PNG\x00\x00",
+}
+
+
+def _write_project(root: Path) -> None:
+    for path, text in FILES.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(text)
+
+
+def test_tokenize_splits_identifiers_into_parts():
+    assert tokenize("getHTTPResponse snake_case x") == [
+        "gethttpresponse",
+        "get",
+        "http",
+        "response",
+        "snake_case",
+        "snake",
+        "case",
+    ]
+
+
+def test_path_index_finds_first_path_containing_fragment():
+    index = PathIndex(["src/app/models.py", "src/app/models_test.py", "lib/models.py", "a.py"])
+
+    assert index.find("models.py") == "src/app/models.py"
+    assert index.find_all("app/models") == ["src/app/models.py", "src/app/models_test.py"]
+    assert index.find("a.p") == "a.py"
+    assert index.find("missing.py") is None
+    assert index.find("py") == "src/app/models.py"
+
+
+def test_bm25_ranks_files_by_identifier_parts(tmp_path: Path):
+    _write_project(tmp_path)
+    index = SearchIndex(tmp_path)
+    index.update(build_file_index(tmp_path))
+
+    hits = index.search("load config", limit=2)
+
+    assert {hit.path for hit in hits} == {"app/config_loader.py", "app/views.py"}
+    top = index.search("parse toml")[0]
+    assert (top.path, top.line_number, top.line) == ("app/config_loader.py", 2, "return parse_toml(path)")
+    assert index.search("http client")[0].path == "app/http_client.py"
+    assert index.search("nonexistent") == []
+
+
+def test_grep_reads_only_trigram_candidates(tmp_path: Path):
+    _write_project(tmp_path)
+    index = SearchIndex(tmp_path)
+    index.update(build_file_index(tmp_path))
+
+    assert index.candidates("session.get") == ["app/http_client.py"]
+    hits = index.grep("SESSION.get")
+    assert [(hit.path, hit.line_number) for hit in hits] == [("app/http_client.py", 3)]
+    assert index.candidates("zzzq") == []
+
+
+def test_index_persists_and_updates_incrementally(tmp_path: Path):
+    project = tmp_path / "project"
+    project.mkdir()
+    _write_project(project)
+    store = tmp_path / "index.json"
+
+    first = load_search_index(build_file_index(project), path=store)
+    assert "app/views.py" in first and store.is_file()
+
+    (project / "app/views.py").write_text("def render_page():\n    return 'ok'\n")
+    (project / "docs/guide.md").unlink()
+    (project / "app/new_module.py").write_text("WIDGET_COUNT = 3\n")
+
+    reloaded = SearchIndex.load(store, project)
+    update = reloaded.update(build_file_index(project))
+    assert update.added == ("app/new_module.py",)
+    assert update.updated == ("app/views.py",)
+    assert update.removed == ("docs/guide.md",)
+    assert reloaded.search("render page")[0].path == "app/views.py"
+    assert [hit.path for hit in reloaded.search("parse toml")] == ["app/config_loader.py"]
+
+    assert len(SearchIndex.load(store, tmp_path / "elsewhere")) == 0
+
+
+def test_snapshot_and_cli_expose_the_index(tmp_path: Path):
+    project = tmp_path / "project"
+    project.mkdir()
+    _write_project(project)
+    settings = PipelineSettings(
+        target_directory=project,
+        tree_max_depth=5,
+        respect_gitignore=False,
+        effective_exclusions=EffectiveExclusions(frozenset(), frozenset(), frozenset()),
+    )
+    store = tmp_path / "index.json"
+
+    with patch("agentrules.core.search.index.default_index_path", return_value=store):
+        snapshot = build_project_snapshot(settings, search_index=True)
+        assert snapshot.search_index is not None and store.is_file()
+        assert build_project_snapshot(settings).search_index is None
+
+        from agentrules import cli
+
+        console = Console(record=True, width=200)
+        with patch("agentrules.cli.commands.search.bootstrap_runtime", return_value=MagicMock(console=console)), patch(
+            "agentrules.cli.commands.search.build_pipeline_settings", return_value=settings
+        ):
+            result = CliRunner().invoke(cli.app, ["search", "fetch", "--path", str(project), "--substring"])
+
+    assert result.exit_code == 0, result.output
+    output = console.export_text()
+    assert "app/http_client.py" in output and "docs/guide.md" in output
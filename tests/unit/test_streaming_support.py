@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 import unittest
 from collections.abc import Iterator
 from typing import Any, cast
@@ -51,6 +52,29 @@ class AsyncStreamAdapterTests(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             asyncio.run(consume())
 
+    def test_iterate_in_thread_closes_the_source_when_closed_early(self) -> None:
+        closed = threading.Event()
+
+        def factory() -> Iterator[int]:
+            try:
+                value = 0
+                while True:
+                    value += 1
+                    yield value
+            finally:
+                closed.set()
+
+        async def consume() -> int:
+            iterator = iterate_in_thread(factory)
+            async for value in iterator:
+                if value == 3:
+                    break
+            await iterator.aclose()  # type: ignore[attr-defined]
+            return value
+
+        self.assertEqual(asyncio.run(consume()), 3)
+        self.assertTrue(closed.wait(timeout=5))
+
 
 class BaseArchitectStreamingTests(unittest.TestCase):
     def test_stream_analyze_missing_override_raises(self) -> None:
@@ -0,0 +1,185 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from agentrules.core.agents.anthropic.request_builder import prepare_request as anthropic_request
+from agentrules.core.agents.base import ReasoningMode
+from agentrules.core.agents.deepseek.config import resolve_model_defaults as deepseek_defaults
+from agentrules.core.agents.deepseek.request_builder import prepare_request as deepseek_request
+from agentrules.core.agents.openai.request_builder import prepare_request as openai_request
+from agentrules.core.agents.xai.config import resolve_model_defaults as xai_defaults
+from agentrules.core.agents.xai.request_builder import prepare_request as xai_request
+from agentrules.core.analysis.phase_2 import Phase2Analysis
+from agentrules.core.utils.file_system.file_index import build_file_index
+from agentrules.core.utils.parsers.structured_plan import (
+    AGENT_PLAN_SCHEMA,
+    PLAN_TOOL_NAME,
+    PlanValidationError,
+    parse_structured_plan,
+    schema_without_additional_properties,
+)
+
+PLAN = {
+    "reasoning": "Split by layer.",
+    "agents": [
+        {
+            "name": "API",
+            "description": "HTTP layer",
+            "expertise": ["FastAPI", " "],
+            "responsibilities": ["Routes"],
+            "file_assignments": ["api.py", "./core.py", "missing.py"],
+        },
+        {
+            "name": "Ghost",
+            "description": "Nothing real",
+            "expertise": [],
+            "responsibilities": [],
+            "file_assignments": ["missing.py"],
+        },
+        {
+            "name": "Core",
+            "description": "Domain",
+            "expertise": [],
+            "responsibilities": [],
+            "file_assignments": ["core.py", "models.py"],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def file_index(tmp_path: Path):
+    for name in ("api.py", "core.py", "models.py"):
+        (tmp_path / name).write_text("x = 1\n")
+    return build_file_index(tmp_path)
+
+
+def test_parse_structured_plan_validates_against_the_file_index(file_index):
+    plan = parse_structured_plan("```json\n" + json.dumps(PLAN) + "\n```", file_index)
+
+    assert [(agent["id"], agent["name"]) for agent in plan.agents] == [("agent_1", "API"), ("agent_2", "Core")]
+    assert plan.agents[0]["file_assignments"] == ["api.py", "core.py"]
+    assert plan.agents[0]["expertise"] == ["FastAPI"]
+    assert plan.agents[1]["file_assignments"] == ["models.py"]
+    assert plan.unknown_files == ["missing.py", "missing.py"]
+    assert plan.duplicate_files == ["core.py"]
+    assert plan.reasoning == "Split by layer."
+
+
+def test_parse_structured_plan_rejects_malformed_plans():
+    with pytest.raises(PlanValidationError):
+        parse_structured_plan("<analysis_plan></analysis_plan>")
+    with pytest.raises(PlanValidationError):
+        parse_structured_plan({"agents": []})
+    with pytest.raises(PlanValidationError):
+        parse_structured_plan({"agents": [{"name": "API"}]})
+
+
+def test_schema_is_cleaned_for_gemini():
+    cleaned = schema_without_additional_properties(AGENT_PLAN_SCHEMA)
+
+    assert "additionalProperties" not in json.dumps(cleaned)
+    assert cleaned["properties"]["agents"]["items"]["required"] == AGENT_PLAN_SCHEMA["properties"]["agents"]["items"][
+        "required"
+    ]
+
+
+def test_openai_requests_strict_json_schema_on_both_apis():
+    common: dict[str, Any] = {
+        "model_name": "gpt-4.1",
+        "content": "plan",
+        "reasoning": ReasoningMode.DISABLED,
+        "temperature": None,
+        "tools": None,
+        "text_verbosity": None,
+        "response_schema": AGENT_PLAN_SCHEMA,
+        "schema_name": "agent_plan",
+    }
+
+    responses = openai_request(**common, use_responses_api=True).payload
+    chat = openai_request(**common, use_responses_api=False).payload
+
+    assert responses["text"]["format"] == {
+        "type": "json_schema",
+        "name": "agent_plan",
+        "schema": AGENT_PLAN_SCHEMA,
+        "strict": True,
+    }
+    assert chat["response_format"]["json_schema"]["strict"] is True
+    assert "response_format" not in openai_request(**{**common, "response_schema": None}, use_responses_api=False).payload
+
+
+def test_anthropic_forces_the_plan_tool_unless_thinking():
+    tool = {"name": PLAN_TOOL_NAME, "description": "Submit the plan", "input_schema": AGENT_PLAN_SCHEMA}
+
+    forced = anthropic_request(
+        model_name="claude-sonnet-4-5", prompt="plan", reasoning=ReasoningMode.DISABLED, tools=None, forced_tool=tool
+    ).payload
+    thinking = anthropic_request(
+        model_name="claude-sonnet-4-5", prompt="plan", reasoning=ReasoningMode.ENABLED, tools=None, forced_tool=tool
+    ).payload
+
+    assert forced["tool_choice"] == {"type": "tool", "name": PLAN_TOOL_NAME}
+    assert forced["tools"] == [tool]
+    assert thinking["tool_choice"] == {"type": "auto"}
+
+
+def test_json_mode_for_openai_compatible_providers():
+    def _deepseek(model: str) -> dict[str, Any]:
+        return deepseek_request(
+            model_name=model,
+            content="plan",
+            reasoning=ReasoningMode.DISABLED,
+            defaults=deepseek_defaults(model),
+            tools=None,
+            json_mode=True,
+        ).payload
+
+    xai = xai_request(
+        model_name="grok-4-0709",
+        content="plan",
+        reasoning=ReasoningMode.DISABLED,
+        defaults=xai_defaults("grok-4-0709"),
+        tools=None,
+        json_mode=True,
+    ).payload
+
+    assert _deepseek("deepseek-chat")["response_format"] == {"type": "json_object"}
+    assert "response_format" not in _deepseek("deepseek-reasoner")
+    assert xai["response_format"] == {"type": "json_object"}
+
+
+class _StructuredPlanner:
+    def __init__(self, plan: str) -> None:
+        self.plan = plan
+        self.prompts: list[str] = []
+
+    async def create_structured_plan(self, phase1_results: dict, prompt: str, schema: dict) -> dict:
+        self.prompts.append(prompt)
+        return {"plan": self.plan}
+
+
+def test_phase2_structured_mode_returns_validated_agents(file_index):
+    analysis = Phase2Analysis(planning="structured")
+    planner = _StructuredPlanner(json.dumps(PLAN))
+    analysis.architect = cast(Any, planner)
+
+    result = asyncio.run(analysis.run({}, ["api.py", "core.py", "models.py"], file_index=file_index))
+
+    assert result["planning"] == "structured"
+    assert [agent["name"] for agent in result["agents"]] == ["API", "Core"]
+    assert result["unknown_files"] == ["missing.py", "missing.py"]
+    assert '"file_assignments"' in planner.prompts[0]
+    assert not analysis.streams_agents
+
+
+def test_phase2_structured_mode_reports_invalid_plans(file_index):
+    analysis = Phase2Analysis(planning="structured")
+    analysis.architect = cast(Any, _StructuredPlanner("not json"))
+
+    result = asyncio.run(analysis.run({}, [], file_index=file_index))
+
+    assert result["agents"] == [] and "Invalid structured plan" in result["error"]